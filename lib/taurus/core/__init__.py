@@ -35,4 +35,17 @@ LIGHTWEIGHT_IMPORTS = getattr(
 if LIGHTWEIGHT_IMPORTS:
     from init_lightweight import *
 else:
-    from init_bkcomp import *
+    # the rest of the core modules are only imported when one of their names
+    # is first accessed (see LAZY_IMPORTS in tauruscustomsettings)
+    import release as Release
+    from .taurusbasetypes import *
+    from taurus.core.util.lazymodule import LazyModule as _LazyModule
+    _LazyModule.install(__name__, ['taurusexception', 'taurusmodel',
+                                   'tauruslistener', 'taurusdevice',
+                                   'taurusattribute', 'taurusconfiguration',
+                                   'taurusauthority', 'taurusfactory',
+                                   'taurusmanager', 'taurusoperation',
+                                   'tauruspollingtimer', 'taurusvalidator',
+                                   # compatibility code with tau V1
+                                   'tauv1'],
+                        optional=['tauv1'])
@@ -459,12 +459,12 @@ class TangoAttribute(TaurusAttribute):
                     raise self.__attr_err
         except PyTango.DevFailed, df:
             self.__subscription_event.set()
-            self.debug("Error polling: %s" % df[0].desc)
+            self.debug("Error polling: %s", df[0].desc)
             self.traceback()
             self.fireEvent(TaurusEventType.Error, self.__attr_err)
         except Exception, e:
             self.__subscription_event.set()
-            self.debug("Error polling: %s" % str(e))
+            self.debug("Error polling: %s", e)
             self.fireEvent(TaurusEventType.Error, self.__attr_err)
         else:
             self.__subscription_event.set()
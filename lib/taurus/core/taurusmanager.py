@@ -31,6 +31,7 @@ __docformat__ = "restructuredtext"
 
 import os
 import atexit
+import importlib
 
 from .util.singleton import Singleton
 from .util.log import Logger, taurus4_deprecation
@@ -55,6 +56,18 @@ class TaurusManager(Singleton, Logger):
            >>> manager = taurus.core.taurusmanager.TaurusManager()
            >>> print manager == taurus.core.taurusmanager.TaurusManager()
            True
+
+       The scheme plugins are the subpackages of :mod:`taurus.core` which
+       contain a `__taurus_plugin__` file, plus the modules listed in the
+       `EXTRA_SCHEME_MODULES` setting. The `__taurus_plugin__` file (and the
+       `EXTRA_SCHEME_PLUGINS` setting) may declare the factory of each scheme
+       with lines like::
+
+           tango = taurus.core.tango.tangofactory:TangoFactory
+
+       in which case the factory module is only imported when its scheme is
+       first used. The modules without declarations are imported (and
+       inspected) when a scheme which is not declared is requested.
     """
     PLUGIN_KEY = "__taurus_plugin__"
 
@@ -90,6 +103,10 @@ class TaurusManager(Singleton, Logger):
         else:
             self._thread_pool = None
         self._plugins = None
+        self._plugin_registry = None
+        self._undeclared_plugins = None
+        self._unavailable_schemes = set()
+        self._polling_period = None
 
         self._initial_default_scheme = self.default_scheme
 
@@ -168,15 +185,19 @@ class TaurusManager(Singleton, Logger):
 
         :return: (taurus.core.taurusfactory.TaurusFactory) the default taurus factory
         """
-        return self.getPlugins().get(self.default_scheme, None)
+        return self.getFactory(self.default_scheme)
 
     def getPlugins(self):
-        """Gives the information about the existing plugins
+        """Gives the information about the existing plugins. Note that this
+        imports the factories of all the schemes (see :meth:`getFactory`)
 
         :return: (dict<str, class taurus.core.taurusfactory.TaurusFactory>)the list of plugins
         """
         if self._plugins is None:
-            self._plugins = self._build_plugins()
+            self._plugins = {}
+        for scheme in self._get_plugin_registry().keys():
+            self._load_plugin(scheme)
+        self._load_undeclared_plugins()
         return self._plugins
 
     def getFactory(self, scheme=None):
@@ -188,7 +209,8 @@ class TaurusManager(Singleton, Logger):
         """
         if scheme is None:
             return self.getDefaultFactory()
-        return self.getPlugins().get(scheme)
+        self._load_plugin(scheme)
+        return self._plugins.get(scheme)
 
     def getObject(self, cls, name):
         """Gives the object for the given class with the given name
@@ -269,7 +291,7 @@ class TaurusManager(Singleton, Logger):
         if scheme is None:
             return
         try:
-            return self.getPlugins()[scheme]()
+            return self.getFactory(scheme)()
         except:
             raise TaurusException('Invalid scheme "%s"' % scheme)
 
@@ -285,6 +307,105 @@ class TaurusManager(Singleton, Logger):
         raise DeprecationWarning(
             '_get_schema is deprecated. Use getScheme instead')
 
+    def _get_plugin_registry(self):
+        """returns a dict of scheme -> "module:FactoryClass" with the
+        declared plugins (see :class:`TaurusManager`)"""
+        if self._plugin_registry is None:
+            self._plugin_registry, self._undeclared_plugins = \
+                self._read_plugin_registry()
+        return self._plugin_registry
+
+    def _read_plugin_registry(self):
+        registry, undeclared = {}, []
+        for elem in self._get_plugin_dirs():
+            module_name = 'taurus.core.%s' % os.path.basename(elem)
+            plugin_file = os.path.join(elem, self.PLUGIN_KEY)
+            try:
+                with open(plugin_file) as f:
+                    lines = f.readlines()
+            except IOError:
+                lines = []
+            declared = False
+            for line in lines:
+                line = line.split('#', 1)[0].strip()
+                if not line:
+                    continue
+                try:
+                    scheme, factory = [e.strip() for e in line.split('=')]
+                    factory_module, factory_class = factory.split(':')
+                except ValueError:
+                    self.warning('Invalid line in %s: "%s"', plugin_file, line)
+                    continue
+                self._register_plugin(registry, scheme, factory)
+                declared = True
+            if not declared:
+                undeclared.append(module_name)
+        extra = getattr(tauruscustomsettings, 'EXTRA_SCHEME_PLUGINS', {})
+        for scheme, factory in extra.items():
+            self._register_plugin(registry, scheme, factory)
+        undeclared.extend(
+            getattr(tauruscustomsettings, 'EXTRA_SCHEME_MODULES', []))
+        return registry, undeclared
+
+    def _register_plugin(self, registry, scheme, factory):
+        if registry.get(scheme, factory) != factory:
+            self.warning("Conflicting plugins: %s and %s both implement "
+                         "scheme %s. Will keep using %s", registry[scheme],
+                         factory, scheme, registry[scheme])
+        else:
+            registry[scheme] = factory
+
+    def _load_plugin(self, scheme):
+        """imports the factory of the given scheme if it is declared and
+        it was not imported yet. If the scheme is not declared, the plugins
+        without declarations are imported"""
+        if self._plugins is None:
+            self._plugins = {}
+        if scheme in self._plugins or scheme in self._unavailable_schemes:
+            return
+        registry = self._get_plugin_registry()
+        factory = registry.get(scheme)
+        if factory is None:
+            self._load_undeclared_plugins()
+            return
+        schemes = [s for s, f in registry.items() if f == factory]
+        factory_module, factory_class = factory.split(':')
+        try:
+            m = importlib.import_module(factory_module)
+            plugin = getattr(m, factory_class)
+        except Exception:
+            self.debug('Failed to load %s' % factory)
+            self.debug('Details:', exc_info=1)
+            self._unavailable_schemes.update(schemes)
+            return
+        self.debug('Loaded plugin %s' % plugin.__name__)
+        self._add_plugin(plugin, schemes)
+
+    def _load_undeclared_plugins(self):
+        self._get_plugin_registry()
+        if not self._undeclared_plugins:
+            return
+        module_names, self._undeclared_plugins = self._undeclared_plugins, []
+        for plugin in self._get_plugin_classes(module_names):
+            # the declared plugins have precedence
+            schemes = [s for s in plugin.schemes
+                       if s not in self._plugin_registry]
+            self._add_plugin(plugin, schemes)
+
+    def _add_plugin(self, plugin, schemes):
+        if self._plugins is None:
+            self._plugins = {}
+        for scheme in schemes:
+            k = self._plugins.get(scheme)
+            if k is None:
+                self._plugins[scheme] = plugin
+            elif k is not plugin:
+                self.warning("Conflicting plugins: %s and %s both implement "
+                             "scheme %s. Will keep using %s" % (k.__name__,
+                                                                plugin.__name__, scheme, k.__name__))
+        if self._polling_period is not None:
+            plugin().changeDefaultPollingPeriod(self._polling_period)
+
     def _build_plugins(self):
         plugin_classes = self._get_plugin_classes()
         plugins = {}
@@ -307,9 +428,7 @@ class TaurusManager(Singleton, Logger):
         '''
         return self._build_plugins()
 
-    def _get_plugin_classes(self):
-        upgrade_classes = []
-
+    def _get_plugin_dirs(self):
         elems = os.listdir(self._this_path)
         dirs = []
         for elem in elems:
@@ -324,15 +443,21 @@ class TaurusManager(Singleton, Logger):
             if not os.path.exists(os.path.join(elem, '__init__.py')):
                 continue
             dirs.append(elem)
+        return dirs
+
+    def _get_plugin_classes(self, full_module_names=None):
+        if full_module_names is None:
+            full_module_names = ['taurus.core.%s' % os.path.basename(d)
+                                 for d in self._get_plugin_dirs()]
+            full_module_names.extend(
+                getattr(tauruscustomsettings, 'EXTRA_SCHEME_MODULES', []))
+            full_module_names.extend(
+                f.split(':')[0] for f in
+                getattr(tauruscustomsettings, 'EXTRA_SCHEME_PLUGINS',
+                        {}).values())
 
         plugins = []
 
-        full_module_names = ['taurus.core.%s' %
-                             d.split(os.path.sep)[-1] for d in dirs]
-        from taurus import tauruscustomsettings
-        full_module_names.extend(
-            getattr(tauruscustomsettings, 'EXTRA_SCHEME_MODULES', []))
-
         for full_module_name in full_module_names:
             try:
                 m = __import__(full_module_name, fromlist=['*'], level=0)
@@ -381,10 +506,13 @@ class TaurusManager(Singleton, Logger):
             o.execute()
 
     def changeDefaultPollingPeriod(self, period):
-        plugin_classes = self._get_plugin_classes()
-        for plugin_class in plugin_classes:
-            scheme = plugin_class.schemes[0]
-            self.getFactory(scheme)().changeDefaultPollingPeriod(period)
+        """Changes the default polling period of the factories already in
+        use and of the ones loaded afterwards
+
+        :param period: (int) the polling period (in ms)"""
+        self._polling_period = period
+        for plugin_class in set((self._plugins or {}).values()):
+            plugin_class().changeDefaultPollingPeriod(period)
 
     def __str__name__(self, name):
         return '{0}({1})'.format(self.__class__.__name__, name)
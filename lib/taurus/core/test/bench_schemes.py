@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Startup benchmark of the scheme plugins of the
+:class:`taurus.core.taurusmanager.TaurusManager`: it measures, in a fresh
+interpreter, the time needed to import taurus and read an attribute of a
+given scheme when only the factory of that scheme is imported (the default)
+and when the factories of all the schemes are imported first (as
+:meth:`TaurusManager.getPlugins` does).
+
+Run it with::
+
+    python -m taurus.core.test.bench_schemes [model [repeat]]
+"""
+
+__all__ = ['benchmark_startup', 'main']
+
+__docformat__ = 'restructuredtext'
+
+import sys
+import time
+import subprocess
+
+_CODE = '''
+import sys, time
+t0 = time.time()
+import taurus
+if %(all)r:
+    taurus.Manager().getPlugins()
+taurus.Attribute(%(model)r).read()
+sys.stdout.write('%%f %%d\\n' %% (time.time() - t0, len(sys.modules)))
+'''
+
+
+def benchmark_startup(model='eval:1', all_plugins=False, repeat=5):
+    '''Measures the time needed for importing taurus and reading the given
+    model in a new interpreter.
+
+    :param model: (str) the attribute model to read
+    :param all_plugins: (bool) whether to import all the scheme plugins
+                        before reading the model
+    :param repeat: (int) number of measurements (the best one is returned)
+
+    :return: (tuple<float,int>) seconds and number of loaded modules
+    '''
+    code = _CODE % dict(model=model, all=all_plugins)
+    results = []
+    for _ in range(repeat):
+        out = subprocess.check_output([sys.executable, '-c', code])
+        seconds, modules = out.split()[-2:]
+        results.append((float(seconds), int(modules)))
+    return min(results)
+
+
+def main():
+    model = sys.argv[1] if len(sys.argv) > 1 else 'eval:1'
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    print 'Import taurus and read %s' % model
+    print '%-20s %10s %10s' % ('plugins', 'ms', 'modules')
+    for name, all_plugins in (('on demand', False), ('all', True)):
+        seconds, modules = benchmark_startup(model, all_plugins, repeat)
+        print '%-20s %10.1f %10d' % (name, seconds * 1e3, modules)
+
+
+if __name__ == '__main__':
+    main()
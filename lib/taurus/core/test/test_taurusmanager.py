@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.taurusmanager"""
+
+__docformat__ = 'restructuredtext'
+
+import sys
+import subprocess
+from taurus.external import unittest
+from taurus.core.taurusmanager import TaurusManager
+
+
+class PluginRegistryTestCase(unittest.TestCase):
+    '''Test case for the declarative scheme plugins of the TaurusManager'''
+
+    def test_registry(self):
+        '''check the schemes declared in the __taurus_plugin__ files'''
+        registry, _ = TaurusManager()._read_plugin_registry()
+        evalfactory = 'taurus.core.evaluation.evalfactory:EvaluationFactory'
+        self.assertEqual(registry['eval'], evalfactory)
+        self.assertEqual(registry['evaluation'], evalfactory)
+        self.assertEqual(registry['tango'],
+                         'taurus.core.tango.tangofactory:TangoFactory')
+
+    def test_getFactory(self):
+        '''check getFactory for supported and unsupported schemes'''
+        from taurus.core.evaluation.evalfactory import EvaluationFactory
+        manager = TaurusManager()
+        self.assertTrue(manager.getFactory('eval') is EvaluationFactory)
+        self.assertTrue(manager.getPlugins()['eval'] is EvaluationFactory)
+        self.assertEqual(manager.getFactory('_unsupported_'), None)
+
+    def test_on_demand(self):
+        '''check that only the factory of the used scheme is imported'''
+        code = ('import sys, taurus; taurus.Attribute("eval:1").read(); '
+                'print "taurus.core.resource" in sys.modules')
+        out = subprocess.check_output([sys.executable, '-c', code])
+        self.assertEqual(out.split()[-1], 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
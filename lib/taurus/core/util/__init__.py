@@ -44,4 +44,18 @@ LIGHTWEIGHT_IMPORTS = getattr(
 if LIGHTWEIGHT_IMPORTS:
     from init_lightweight import *
 else:
-    from init_bkcomp import *
+    # the essential modules are imported now and the rest only when one of
+    # their names is first accessed (see LAZY_IMPORTS in tauruscustomsettings)
+    from init_lightweight import *
+
+    def _lxml_etree():
+        try:
+            from lxml import etree
+        except:
+            etree = None
+        return etree
+
+    from .lazymodule import LazyModule as _LazyModule
+    _LazyModule.install(__name__, ['codecs', 'colors', 'constant', 'timer',
+                                   'safeeval', 'prop', 'threadpool', 'user'],
+                        names={'etree': _lxml_etree})
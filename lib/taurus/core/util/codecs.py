@@ -63,8 +63,9 @@ A Taurus related example::
     >>> f, d = codec.decode((v.format, v.value))
 """
 
-__all__ = ["Codec", "NullCodec", "ZIPCodec", "BZ2Codec", "JSONCodec",
-           "FunctionCodec", "PlotCodec", "CodecPipeline", "CodecFactory"]
+__all__ = ["Codec", "NullCodec", "CompressionCodec", "ZIPCodec", "BZ2Codec",
+           "LZ4Codec", "ZstdCodec", "JSONCodec", "FunctionCodec", "PlotCodec",
+           "CodecPipeline", "CodecFactory", "BufferPool"]
 
 __docformat__ = "restructuredtext"
 
@@ -142,7 +143,173 @@ class NullCodec(Codec):
         return format, data[1]
 
 
-class ZIPCodec(Codec):
+def _asReadBuffer(obj):
+    """Returns an object that can be passed to the compression modules
+    (str or read-only buffer) avoiding copies where possible.
+
+    :param obj: (str or buffer or bytearray or memoryview or numpy.ndarray)
+                the data
+
+    :return: (str or buffer)"""
+    if isinstance(obj, (str, buffer)):
+        return obj
+    if isinstance(obj, memoryview):
+        obj = numpy.asarray(obj)
+    if isinstance(obj, numpy.ndarray):
+        obj = numpy.ascontiguousarray(obj)
+    return buffer(obj)
+
+
+def _asBytes(obj):
+    """Returns the given buffer-protocol object as a str (copying it if it is
+    not already a str)"""
+    if isinstance(obj, str):
+        return obj
+    return str(_asReadBuffer(obj))
+
+
+class BufferPool(object):
+    """A thread-safe pool of reusable bytearray buffers. It can be passed to
+    the decode method of the compression codecs (using the `pool` keyword
+    argument) to decompress into a recycled buffer instead of allocating a new
+    string for each decoded message.
+
+    Example::
+
+        >>> from taurus.core.util.codecs import CodecFactory, BufferPool
+        >>> pool = BufferPool()
+        >>> codec = CodecFactory().getCodec('zip')
+        >>> format, decoded_data = codec.decode(encoded, pool=pool)
+        >>> # ... use decoded_data (a numpy.uint8 array) ...
+        >>> pool.release(decoded_data)
+
+    .. note:: the released buffer must not be used after releasing it"""
+
+    def __init__(self, maxBuffers=4):
+        """Constructor
+
+        :param maxBuffers: (int) maximum number of idle buffers kept"""
+        import threading
+        self._lock = threading.Lock()
+        self._buffers = []
+        self._maxBuffers = maxBuffers
+
+    def acquire(self):
+        """Returns a buffer from the pool (or a new one if the pool is empty)
+
+        :return: (bytearray)"""
+        with self._lock:
+            if self._buffers:
+                return self._buffers.pop()
+        return bytearray()
+
+    def release(self, buf):
+        """Returns a buffer to the pool
+
+        :param buf: (bytearray or numpy.ndarray) the buffer (or a numpy array
+                    returned by a codec using this pool)"""
+        if isinstance(buf, numpy.ndarray):
+            buf = buf.base
+        if not isinstance(buf, bytearray):
+            return
+        with self._lock:
+            if len(self._buffers) < self._maxBuffers:
+                self._buffers.append(buf)
+
+
+class CompressionCodec(Codec):
+    """Base class for codecs that compress/decompress a sequence of bytes.
+
+    The data to be encoded/decoded can be any object supporting the buffer
+    protocol (str, buffer, bytearray, memoryview or a contiguous numpy array)
+    and it is passed to the compression library without copying it.
+
+    By default, decode returns a str. If a :class:`BufferPool` is passed with
+    the `pool` keyword argument, the data is decompressed into a buffer from
+    the pool and a numpy.uint8 array view of it is returned instead.
+
+    Subclasses must set the :attr:`FORMAT` and implement :meth:`compressobj`
+    and :meth:`decompressobj` (and optionally reimplement :meth:`compress` and
+    :meth:`decompress` for faster one-shot operation)."""
+
+    #: the format (prefix) handled by this codec
+    FORMAT = None
+
+    #: maximum size of the decompressed chunks written into pooled buffers
+    CHUNK_SIZE = 1 << 20
+
+    def compressobj(self):
+        """Returns an incremental compressor object (with `compress(data)`
+        and `flush()` methods)"""
+        raise NotImplementedError("compressobj cannot be called on abstract CompressionCodec")
+
+    def decompressobj(self):
+        """Returns an incremental decompressor object (with a
+        `decompress(data)` method)"""
+        raise NotImplementedError("decompressobj cannot be called on abstract CompressionCodec")
+
+    def compress(self, buf):
+        """Compresses a buffer in one shot"""
+        c = self.compressobj()
+        return c.compress(buf) + c.flush()
+
+    def decompress(self, buf):
+        """Decompresses a buffer in one shot"""
+        return self.decompressobj().decompress(buf)
+
+    def decompressChunks(self, buf):
+        """Generator of decompressed chunks of the given buffer. Reimplement
+        it if the library allows to limit the size of the output chunks"""
+        yield self.decompress(buf)
+
+    def encode(self, data, *args, **kwargs):
+        """compresses the given data. The given data **must** support the
+        buffer protocol
+
+        :param data: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object
+
+        :return: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object"""
+        format = self.FORMAT
+        if len(data[0]):
+            format += '_%s' % data[0]
+        return format, self.compress(_asReadBuffer(data[1]))
+
+    def decode(self, data, *args, **kwargs):
+        """decompresses the given data.
+
+        :param data: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object
+
+        :return: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object"""
+        if not data[0].startswith(self.FORMAT):
+            return data
+        format = data[0].partition('_')[2]
+        buf = _asReadBuffer(data[1])
+        pool = kwargs.get('pool')
+        if pool is None:
+            return format, self.decompress(buf)
+        return format, self._decompressInto(buf, pool)
+
+    def _decompressInto(self, buf, pool):
+        out = pool.acquire()
+        pos = 0
+        for chunk in self.decompressChunks(buf):
+            end = pos + len(chunk)
+            try:
+                out[pos:end] = chunk
+            except BufferError:
+                # the pooled buffer is still referenced: do not reuse it
+                out = out[:pos]
+                out[pos:end] = chunk
+            pos = end
+        if len(out) > pos:
+            try:
+                del out[pos:]
+            except BufferError:
+                out = out[:pos]
+        return numpy.frombuffer(out, dtype=numpy.uint8)
+
+
+class ZIPCodec(CompressionCodec):
     """A codec able to encode/decode to/from gzip format. It uses the :mod:`zlib` module
 
     Example::
@@ -160,32 +327,39 @@ class ZIPCodec(Codec):
         >>> print decoded_data[20]
         'Hello world\\nHello wo'"""
 
-    def encode(self, data, *args, **kwargs):
-        """encodes the given data to a gzip string. The given data **must** be a string
+    FORMAT = 'zip'
 
-        :param data: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object
+    #: compression level used by encode
+    LEVEL = 6
 
-        :return: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object"""
+    def compressobj(self):
         import zlib
-        format = 'zip'
-        if len(data[0]):
-            format += '_%s' % data[0]
-        return format, zlib.compress(data[1])
+        return zlib.compressobj(self.LEVEL)
 
-    def decode(self, data, *args, **kwargs):
-        """decodes the given data from a gzip string.
+    def decompressobj(self):
+        import zlib
+        return zlib.decompressobj()
 
-        :param data: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object
+    def compress(self, buf):
+        import zlib
+        return zlib.compress(buf, self.LEVEL)
 
-        :return: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object"""
+    def decompress(self, buf):
         import zlib
-        if not data[0].startswith('zip'):
-            return data
-        format = data[0].partition('_')[2]
-        return format, zlib.decompress(data[1])
+        return zlib.decompress(buf)
 
+    def decompressChunks(self, buf):
+        d = self.decompressobj()
+        chunk = d.decompress(buf, self.CHUNK_SIZE)
+        while chunk:
+            yield chunk
+            chunk = d.decompress(d.unconsumed_tail, self.CHUNK_SIZE)
+        chunk = d.flush()
+        if chunk:
+            yield chunk
 
-class BZ2Codec(Codec):
+
+class BZ2Codec(CompressionCodec):
     """A codec able to encode/decode to/from BZ2 format. It uses the :mod:`bz2` module
 
     Example::
@@ -203,29 +377,147 @@ class BZ2Codec(Codec):
         >>> print decoded_data[20]
         'Hello world\\nHello wo'"""
 
-    def encode(self, data, *args, **kwargs):
-        """encodes the given data to a bz2 string. The given data **must** be a string
-
-        :param data: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object
+    FORMAT = 'bz2'
 
-        :return: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object"""
+    def compressobj(self):
         import bz2
-        format = 'bz2'
-        if len(data[0]):
-            format += '_%s' % data[0]
-        return format, bz2.compress(data[1])
+        return bz2.BZ2Compressor()
 
-    def decode(self, data, *args, **kwargs):
-        """decodes the given data from a bz2 string.
+    def decompressobj(self):
+        import bz2
+        return bz2.BZ2Decompressor()
 
-        :param data: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object
+    def compress(self, buf):
+        import bz2
+        return bz2.compress(buf)
 
-        :return: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object"""
+    def decompress(self, buf):
         import bz2
-        if not data[0].startswith('bz2'):
-            return data
-        format = data[0].partition('_')[2]
-        return format, bz2.decompress(data[1])
+        return bz2.decompress(buf)
+
+
+class _LZ4FrameCompressor(object):
+    """Adapter of lz4.frame.LZ4FrameCompressor to the zlib compressobj API"""
+
+    def __init__(self):
+        import lz4.frame
+        self._c = lz4.frame.LZ4FrameCompressor()
+        self._header = self._c.begin()
+
+    def compress(self, buf):
+        ret = self._header + self._c.compress(buf)
+        self._header = b''
+        return ret
+
+    def flush(self):
+        return self._header + self._c.flush()
+
+
+class LZ4Codec(CompressionCodec):
+    """A codec able to encode/decode to/from the LZ4 frame format. It uses the
+    :mod:`lz4` module. LZ4 is much faster than zlib at the expense of a lower
+    compression ratio.
+
+    If :mod:`lz4` is not installed, data is encoded with (fast) zlib instead
+    and the resulting format is "zip" (so that it can be decoded anywhere).
+    Decoding LZ4 data requires :mod:`lz4`.
+
+    Example::
+
+        >>> from taurus.core.util.codecs import CodecFactory
+        >>> codec = CodecFactory().getCodec('lz4')
+        >>> format, encoded_data = codec.encode(("", 100 * "Hello world\\n"))
+        >>> format, decoded_data = codec.decode((format, encoded_data))"""
+
+    FORMAT = 'lz4'
+
+    def __init__(self):
+        CompressionCodec.__init__(self)
+        self._fallback = None
+        try:
+            import lz4.frame
+        except ImportError:
+            self.info('lz4 module not available. Encoding with zlib')
+            self._fallback = _FastZIPCodec()
+
+    def compressobj(self):
+        return _LZ4FrameCompressor()
+
+    def decompressobj(self):
+        import lz4.frame
+        return lz4.frame.LZ4FrameDecompressor()
+
+    def compress(self, buf):
+        import lz4.frame
+        return lz4.frame.compress(buf)
+
+    def decompress(self, buf):
+        import lz4.frame
+        return lz4.frame.decompress(buf)
+
+    def encode(self, data, *args, **kwargs):
+        if self._fallback is not None:
+            return self._fallback.encode(data, *args, **kwargs)
+        return CompressionCodec.encode(self, data, *args, **kwargs)
+
+
+class ZstdCodec(CompressionCodec):
+    """A codec able to encode/decode to/from the Zstandard format. It uses the
+    :mod:`zstandard` module. Zstandard is faster than zlib and usually
+    achieves better compression ratios.
+
+    If :mod:`zstandard` is not installed, data is encoded with (fast) zlib
+    instead and the resulting format is "zip" (so that it can be decoded
+    anywhere). Decoding Zstandard data requires :mod:`zstandard`.
+
+    Example::
+
+        >>> from taurus.core.util.codecs import CodecFactory
+        >>> codec = CodecFactory().getCodec('zstd')
+        >>> format, encoded_data = codec.encode(("", 100 * "Hello world\\n"))
+        >>> format, decoded_data = codec.decode((format, encoded_data))"""
+
+    FORMAT = 'zstd'
+
+    #: compression level used by encode
+    LEVEL = 3
+
+    def __init__(self):
+        CompressionCodec.__init__(self)
+        self._fallback = None
+        try:
+            import zstandard
+        except ImportError:
+            self.info('zstandard module not available. Encoding with zlib')
+            self._fallback = _FastZIPCodec()
+
+    def compressobj(self):
+        import zstandard
+        return zstandard.ZstdCompressor(level=self.LEVEL).compressobj()
+
+    def decompressobj(self):
+        import zstandard
+        return zstandard.ZstdDecompressor().decompressobj()
+
+    def compress(self, buf):
+        import zstandard
+        return zstandard.ZstdCompressor(level=self.LEVEL).compress(buf)
+
+    def decompress(self, buf):
+        # the decompressobj does not require the content size in the frame
+        return self.decompressobj().decompress(buf)
+
+    def encode(self, data, *args, **kwargs):
+        if self._fallback is not None:
+            return self._fallback.encode(data, *args, **kwargs)
+        return CompressionCodec.encode(self, data, *args, **kwargs)
+
+
+class _FastZIPCodec(ZIPCodec):
+    """A ZIPCodec using the fastest compression level (used as a fallback
+    when the fast compression libraries are not available)"""
+
+    LEVEL = 1
 
 
 class PickleCodec(Codec):
@@ -278,8 +570,8 @@ class PickleCodec(Codec):
             return data
         format = data[0].partition('_')[2]
 
-        if isinstance(data[1], buffer):
-            data = data[0], str(data[1])
+        if not isinstance(data[1], str):
+            data = data[0], _asBytes(data[1])
 
         return format, pickle.loads(data[1])
 
@@ -338,8 +630,8 @@ class JSONCodec(Codec):
 
         ensure_ascii = kwargs.pop('ensure_ascii', False)
 
-        if isinstance(data[1], buffer):
-            data = data[0], str(data[1])
+        if not isinstance(data[1], basestring):
+            data = data[0], _asBytes(data[1])
 
         data = json.loads(data[1])
         if ensure_ascii:
@@ -522,6 +814,13 @@ class VideoImageCodec(Codec):
     def decode(self, data, *args, **kwargs):
         """decodes the given data from a LImA's video_image.
 
+        Grey-scale images are returned as a read-only view of the encoded
+        buffer (no copy is done). Colour images (RGB32 and YUV modes) are
+        returned as a (height, width, 3) uint8 RGB array. An already allocated
+        array can be passed with the `out` keyword argument to be filled with
+        the decoded image (useful for reusing the same buffer across frames).
+        It is only used if its shape and dtype match those of the image.
+
         :param data: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object
 
         :return: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object"""
@@ -533,117 +832,105 @@ class VideoImageCodec(Codec):
             _, _, fmt = data[0].partition('_')
         else:
             return data
-        header = self.__unpackHeader(
-            data[1][:struct.calcsize(self.VIDEO_HEADER_FORMAT)])
-
-        imgBuffer = data[1][struct.calcsize(self.VIDEO_HEADER_FORMAT):]
-        dtype = self.__getDtypeId(header['imageMode'])
-        if header['imageMode'] == 7:
-            # RGBA 4 bytes per pixel
-            rgba = numpy.fromstring(imgBuffer, dtype)
-            bbuf = rgba[0::4]
-            gbuf = rgba[1::4]
-            rbuf = rgba[2::4]
-            #abuf = rgba[3::4]
-            r = rbuf.reshape(header['height'], header['width'])
-            g = gbuf.reshape(header['height'], header['width'])
-            b = bbuf.reshape(header['height'], header['width'])
-            #a = abuf.reshape(header['height'],header['width'])
-            img2D = numpy.dstack((r, g, b))
-
-        elif header['imageMode'] == 17:
-            # YUV444 3 bytes per pixel
-            yuv = numpy.fromstring(imgBuffer, dtype)
-            y = yuv[0::3]
-            u = yuv[1::3]
-            v = yuv[2::3]
-
-            rbuff, gbuff, bbuff = self.__yuv2rgb(y, u, v)
-
-            # Shape buffers to image size
-            r = rbuff.reshape(header['height'], header['width'])
-            g = gbuff.reshape(header['height'], header['width'])
-            b = bbuff.reshape(header['height'], header['width'])
-
-            # Build the RGB image
-            img2D = numpy.dstack((r, g, b))
-
-        elif header['imageMode'] == 16:
-            # YUV422 4 bytes per 2 pixels
-            yuv = numpy.fromstring(imgBuffer, dtype)
-            u = yuv[0::4]
-            y1 = yuv[1::4]
-            v = yuv[2::4]
-            y2 = yuv[3::4]
-
-            r1, g1, b1 = self.__yuv2rgb(y1, u, v)
-            r2, g2, b2 = self.__yuv2rgb(y2, u, v)
-
-            # Create RGB buffers
-            rbuff = numpy.dstack((r1, r2)).reshape(
-                header['height'] * header['width'])
-            gbuff = numpy.dstack((g1, g2)).reshape(
-                header['height'] * header['width'])
-            bbuff = numpy.dstack((b1, b2)).reshape(
-                header['height'] * header['width'])
-
-            # Shape buffers to image size
-            r = rbuff.reshape(header['height'], header['width'])
-            g = gbuff.reshape(header['height'], header['width'])
-            b = bbuff.reshape(header['height'], header['width'])
-
-            # Build the RGB image
-            img2D = numpy.dstack((r, g, b))
-
-        elif header['imageMode'] == 15:
-            # YUV411 6 bytes per 4 pixels
-            yuv = numpy.fromstring(imgBuffer, dtype)
-            u = yuv[0::6]
-            y1 = yuv[1::6]
-            y2 = yuv[2::6]
-            v = yuv[3::6]
-            y3 = yuv[4::6]
-            y4 = yuv[5::6]
-
-            r1, g1, b1 = self.__yuv2rgb(y1, u, v)
-            r2, g2, b2 = self.__yuv2rgb(y2, u, v)
-            r3, g3, b3 = self.__yuv2rgb(y3, u, v)
-            r4, g4, b4 = self.__yuv2rgb(y4, u, v)
-
-            # Create RGB buffers
-            rbuff = numpy.dstack((r1, r2, r3, r4)).reshape(
-                header['height'] * header['width'])
-            gbuff = numpy.dstack((g1, g2, g3, g4)).reshape(
-                header['height'] * header['width'])
-            bbuff = numpy.dstack((b1, b2, b3, b4)).reshape(
-                header['height'] * header['width'])
-
-            # Shape buffers to image size
-            r = rbuff.reshape(header['height'], header['width'])
-            g = gbuff.reshape(header['height'], header['width'])
-            b = bbuff.reshape(header['height'], header['width'])
-
-            img2D = numpy.dstack((r, g, b))
-
-        else:
-            img1D = numpy.fromstring(imgBuffer, dtype)
-            img2D = img1D.reshape(header['height'], header['width'])
-
+        header = self.__unpackHeader(data[1])
+        height, width = header['height'], header['width']
+        mode = header['imageMode']
+        dtype = self.__getDtypeId(mode)
+        offset = struct.calcsize(self.VIDEO_HEADER_FORMAT)
+        # number of bytes per group of pixels and pixels per group
+        nbytes, npixels = self.__getPixelGroup(mode)
+        count = height * width * nbytes // npixels
+        # zero-copy view of the image buffer
+        buf = numpy.frombuffer(data[1], dtype=dtype, count=count,
+                               offset=offset)
+
+        if nbytes == 1:
+            # grey-scale
+            img2D = buf.reshape(height, width)
+            out = self.__checkOut(kwargs.get('out'), img2D.shape, img2D.dtype)
+            if out is not None:
+                out[...] = img2D
+                img2D = out
+            return fmt, img2D
+
+        img2D = self.__checkOut(kwargs.get('out'), (height, width, 3),
+                                numpy.uint8)
+        if img2D is None:
+            img2D = numpy.empty((height, width, 3), dtype=numpy.uint8)
+
+        if mode == 7:
+            # RGB32: BGRA 4 bytes per pixel
+            bgra = buf.reshape(height, width, 4)
+            # (copying channel by channel is faster than a single
+            # assignment from a reversed view)
+            img2D[..., 0] = bgra[..., 2]
+            img2D[..., 1] = bgra[..., 1]
+            img2D[..., 2] = bgra[..., 0]
+        elif mode == 17:
+            # YUV444 3 bytes per pixel (y, u, v)
+            yuv = buf.reshape(-1, 3)
+            self.__yuv2rgb(yuv[:, 0:1], yuv[:, 1:2], yuv[:, 2:3],
+                           img2D.reshape(-1, 1, 3))
+        elif mode == 16:
+            # YUV422 4 bytes per 2 pixels (u, y1, v, y2)
+            yuv = buf.reshape(-1, 2, 2)
+            self.__yuv2rgb(yuv[:, :, 1], yuv[:, 0:1, 0], yuv[:, 1:2, 0],
+                           img2D.reshape(-1, 2, 3))
+        elif mode == 15:
+            # YUV411 6 bytes per 4 pixels (u, y1, y2, v, y3, y4)
+            yuv = buf.reshape(-1, 2, 3)
+            self.__yuv2rgb(yuv[:, :, 1:].reshape(-1, 4), yuv[:, 0:1, 0],
+                           yuv[:, 1:2, 0], img2D.reshape(-1, 4, 3))
         return fmt, img2D
 
-    def __yuv2rgb(self, y, u, v):
-        '''YUV444 to RGB888 conversion'''
-        Cr = v - 128.0
-        Cb = u - 128.0
-
-        R = y + 1.402 * Cr
-        G = y - 0.344 * Cb - 0.714 * Cr
-        B = y + 1.772 * Cb
-
-        return (numpy.clip(R, 0, 255), numpy.clip(G, 0, 255), numpy.clip(B, 0, 255))
-
-    def __unpackHeader(self, header):
-        h = struct.unpack(self.VIDEO_HEADER_FORMAT, header)
+    def __checkOut(self, out, shape, dtype):
+        '''returns out if it can hold an image of the given shape and dtype.
+        Otherwise returns None'''
+        if out is None:
+            return None
+        if out.shape != shape or out.dtype != dtype:
+            self.debug('Ignoring output buffer (shape or dtype mismatch)')
+            return None
+        return out
+
+    def __getPixelGroup(self, mode):
+        '''returns the number of bytes per group of pixels and the number of
+        pixels in the group for the given image mode'''
+        return {7: (4, 1),  # RGB32
+                15: (6, 4),  # YUV411
+                16: (4, 2),  # YUV422
+                17: (3, 1),  # YUV444
+                }.get(mode, (1, 1))
+
+    def __yuv2rgb(self, y, u, v, out):
+        '''YUV to RGB888 conversion using integer (8 bit fixed point)
+        arithmetic. The chroma components are shared by all the luma samples
+        in a pixel group.
+
+        :param y: (numpy.ndarray) (n, k) array of luma samples
+        :param u: (numpy.ndarray) (n, 1) array of Cb samples
+        :param v: (numpy.ndarray) (n, 1) array of Cr samples
+        :param out: (numpy.ndarray) (n, k, 3) uint8 array for the RGB output
+        '''
+        y = y.astype(numpy.int32)
+        cb = u.astype(numpy.int32)
+        cb -= 128
+        cr = v.astype(numpy.int32)
+        cr -= 128
+        tmp = numpy.empty_like(y)
+        # R = Y + 1.402 * Cr
+        numpy.add(y, (359 * cr + 128) >> 8, out=tmp)
+        out[..., 0] = numpy.clip(tmp, 0, 255, out=tmp)
+        # G = Y - 0.344 * Cb - 0.714 * Cr
+        numpy.subtract(y, (88 * cb + 183 * cr + 128) >> 8, out=tmp)
+        out[..., 1] = numpy.clip(tmp, 0, 255, out=tmp)
+        # B = Y + 1.772 * Cb
+        numpy.add(y, (454 * cb + 128) >> 8, out=tmp)
+        out[..., 2] = numpy.clip(tmp, 0, 255, out=tmp)
+        return out
+
+    def __unpackHeader(self, buffer):
+        h = struct.unpack_from(self.VIDEO_HEADER_FORMAT, buffer)
         headerDict = {}
         headerDict['magic'] = h[0]
         headerDict['headerVersion'] = h[1]
@@ -695,9 +982,9 @@ class VideoImageCodec(Codec):
             #'BAYER BG8'  : 12,#Core.BAYER_BG8,
             #'BAYER BG16' : 13,#Core.BAYER_BG16,
             #'I420'       : 14,#Core.I420,
-            #'YUV411'     : 15,#Core.YUV411,
+            'YUV411': 15,  # Core.YUV411,
             'YUV422': 16,  # Core.YUV422,
-            #'YUV444'     : 17,#Core.YUV444
+            'YUV444': 17,  # Core.YUV444
         }[mode]
 
     def __getFormatId(self, mode):
@@ -716,9 +1003,9 @@ class VideoImageCodec(Codec):
                 #'BAYER BG8'  : Core.BAYER_BG8,
                 #'BAYER BG16' : Core.BAYER_BG16,
                 #'I420'       : Core.I420,
-                #'YUV411'     : Core.YUV411,
+                15: 'YUV411',  # Core.YUV411,
                 16: 'YUV422',  # Core.YUV422,
-                #'YUV444'     : Core.YUV444
+                17: 'YUV444',  # Core.YUV444
                 }[mode]
 
     def __getDtypeId(self, mode):
@@ -737,9 +1024,9 @@ class VideoImageCodec(Codec):
                 #'BAYER BG8'  : Core.BAYER_BG8,
                 #'BAYER BG16' : Core.BAYER_BG16,
                 #'I420'       : Core.I420,
-                #'YUV411'     : Core.YUV411,
+                15: 'uint8',  # Core.YUV411,
                 16: 'uint8',  # Core.YUV422,
-                #'YUV444'     : Core.YUV444
+                17: 'uint8',  # Core.YUV444
                 }[mode]
 
 
@@ -845,6 +1132,8 @@ class CodecFactory(Singleton, Logger):
         'bson': BSONCodec,
         'bz2': BZ2Codec,
         'zip': ZIPCodec,
+        'lz4': LZ4Codec,
+        'zstd': ZstdCodec,
         'pickle': PickleCodec,
         'plot': PlotCodec,
         'VIDEO_IMAGE': VideoImageCodec,  # deprecated
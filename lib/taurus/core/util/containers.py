@@ -31,7 +31,8 @@ python distribution.
 __all__ = ["CaselessList", "CaselessDict", "CaselessWeakValueDict", "LoopList",
            "CircBuf", "LIFO", "TimedQueue", "self_locked", "ThreadDict",
            "defaultdict", "defaultdict_fromkey", "CaselessDefaultDict",
-           "DefaultThreadDict", "getDictAsTree", "ArrayBuffer", ]
+           "DefaultThreadDict", "getDictAsTree", "ArrayBuffer",
+           "LatestValueMailbox"]
 
 __docformat__ = "restructuredtext"
 
@@ -1311,6 +1312,96 @@ class ArrayBuffer(object):
         return self.maxSize() - self.contentsSize()
 
 
+class LatestValueMailbox(object):
+    '''A thread-safe single-slot mailbox in which the latest value wins.
+
+    A producer (e.g. an event thread) :meth:`put` s values and a consumer
+    (e.g. the GUI thread) :meth:`take` s them. If a new value is put before
+    the previous one was taken, the previous one is discarded (and counted as
+    dropped) instead of being queued. This is useful for decoupling fast
+    producers from slower consumers which are only interested in the most
+    recent value (e.g. image frames to be displayed).
+
+    Examples::
+
+        >>> m = LatestValueMailbox()
+        >>> m.put('first')
+        True
+        >>> m.put('second')
+        False
+        >>> m.take()
+        'second'
+        >>> m.take() is None
+        True
+        >>> m.counters()['dropped']
+        1
+    '''
+
+    def __init__(self):
+        import threading
+        self.__lock = threading.Lock()
+        self.__value = None
+        self.__full = False
+        self.__received = 0
+        self.__taken = 0
+        self.__dropped = 0
+
+    def put(self, value):
+        '''Stores a value, replacing (and dropping) any value not yet taken
+
+        :param value: (object) the value to store
+
+        :return: (bool) True if the mailbox was empty before this call (i.e.,
+                 the consumer needs to be notified). False if an older value
+                 was replaced (a notification is already pending)
+        '''
+        with self.__lock:
+            wasEmpty = not self.__full
+            if not wasEmpty:
+                self.__dropped += 1
+            self.__value = value
+            self.__full = True
+            self.__received += 1
+        return wasEmpty
+
+    def take(self, default=None):
+        '''Returns the stored value and empties the mailbox
+
+        :param default: (object) value returned if the mailbox is empty
+
+        :return: (object) the latest value put or `default`
+        '''
+        with self.__lock:
+            if not self.__full:
+                return default
+            value = self.__value
+            self.__value = None
+            self.__full = False
+            self.__taken += 1
+        return value
+
+    def isEmpty(self):
+        '''Whether there is a value waiting to be taken
+
+        :return: (bool)
+        '''
+        return not self.__full
+
+    def counters(self):
+        '''Returns the number of values received, taken and dropped
+
+        :return: (dict) with "received", "taken" and "dropped" keys
+        '''
+        with self.__lock:
+            return dict(received=self.__received, taken=self.__taken,
+                        dropped=self.__dropped)
+
+    def resetCounters(self):
+        '''Resets the received/taken/dropped counters to 0'''
+        with self.__lock:
+            self.__received = self.__taken = self.__dropped = 0
+
+
 def chunks(l, n):
     '''Generator which yields successive n-sized chunks from l'''
     for i in xrange(0, len(l), n):
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""
+This module provides functions for exporting x-y data sets (e.g. the curves
+of a plot) to files. The data is written in chunks, so that long data sets
+can be exported without building the whole text in memory, and a progress
+callback can be used to monitor (and abort) the export.
+
+The supported formats are:
+
+- "ascii": tab-separated text columns (written with :func:`numpy.savetxt`)
+- "npz": numpy's compressed archive (see :func:`numpy.savez_compressed`)
+- "hdf5": HDF5 file (requires :mod:`h5py`)
+
+Example::
+
+    >>> import numpy
+    >>> from taurus.core.util.dataexport import exportDataSets
+    >>> x = numpy.arange(1e6)
+    >>> datadict = {'sin': (x, numpy.sin(x)), 'cos': (x, numpy.cos(x))}
+    >>> exportDataSets('/tmp/data.h5', datadict)
+"""
+
+__all__ = ["EXPORT_FORMATS", "ExportAborted", "getExportFormat",
+           "exportDataSets"]
+
+__docformat__ = "restructuredtext"
+
+import os
+from datetime import datetime
+
+import numpy
+
+#: map of export format to the file extensions associated to it
+EXPORT_FORMATS = {'ascii': ('.dat', '.txt', '.csv'),
+                  'npz': ('.npz',),
+                  'hdf5': ('.h5', '.hdf5', '.nxs')}
+
+#: default number of rows written per chunk
+CHUNK_SIZE = 65536
+
+
+class ExportAborted(Exception):
+    """Raised when an export is aborted from the progress callback"""
+    pass
+
+
+def getExportFormat(fname, default='ascii'):
+    """Returns the export format corresponding to the extension of the given
+    file name
+
+    :param fname: (str) file name
+    :param default: (str) format returned if the extension is not known
+
+    :return: (str) one of the keys of :obj:`EXPORT_FORMATS`
+    """
+    ext = os.path.splitext(fname)[1].lower()
+    for fmt, extensions in EXPORT_FORMATS.iteritems():
+        if ext in extensions:
+            return fmt
+    return default
+
+
+def exportDataSets(fname, datadict, sortedNames=None, fmt=None,
+                   xIsTime=False, chunkSize=CHUNK_SIZE, progress=None):
+    """Writes the given data sets to a file.
+
+    :param fname: (str) name of the output file
+    :param datadict: (dict<str,tuple>) a dictionary of {name:(x,y)} where x
+                     and y are sequences (preferably numpy arrays) of the same
+                     length
+    :param sortedNames: (seq<str>) names of the sets to export (in order). If
+                        None, all the sets are exported sorted by name
+    :param fmt: (str) export format (see :obj:`EXPORT_FORMATS`). If None, it
+                is guessed from the extension of `fname`
+    :param xIsTime: (bool) if True, the x values are timestamps (and will be
+                    written as ISO dates in the ascii format)
+    :param chunkSize: (int) maximum number of rows written at once
+    :param progress: (callable) if given, it will be called as
+                     `progress(done, total)` (in number of points) after
+                     each chunk is written. If it returns True, the export is
+                     aborted (and :class:`ExportAborted` is raised)
+
+    :return: (str) the format used
+    """
+    if sortedNames is None:
+        sortedNames = sorted(datadict.keys())
+    if fmt is None:
+        fmt = getExportFormat(fname)
+    try:
+        writer = _WRITERS[fmt]
+    except KeyError:
+        raise ValueError('Unsupported export format "%s"' % fmt)
+    sets = [(name,) + tuple(numpy.asarray(a) for a in datadict[name])
+            for name in sortedNames]
+    _Progress.check(sets)
+    writer(fname, sets, xIsTime=xIsTime, chunkSize=chunkSize,
+           progress=_Progress(sets, progress))
+    return fmt
+
+
+class _Progress(object):
+    """Helper for accounting the written points and calling the callback"""
+
+    def __init__(self, sets, callback):
+        self.total = sum([len(x) for _, x, _ in sets])
+        self.done = 0
+        self.callback = callback
+
+    @staticmethod
+    def check(sets):
+        for name, x, y in sets:
+            if len(x) != len(y):
+                raise ValueError('x and y of "%s" have different lengths' %
+                                 name)
+
+    def __call__(self, n):
+        self.done += n
+        if self.callback is not None and self.callback(self.done, self.total):
+            raise ExportAborted('Export aborted after %i points' % self.done)
+
+
+def _commonX(sets):
+    """returns the x array shared by all sets or None if they differ"""
+    x0 = sets[0][1]
+    for _, x, _ in sets[1:]:
+        if x is not x0 and not numpy.array_equal(x, x0):
+            return None
+    return x0
+
+
+def _formatTimes(x):
+    return numpy.array([datetime.fromtimestamp(t).isoformat('_') for t in x])
+
+
+def _writeAsciiTable(f, x, ys, xIsTime, chunkSize, progress):
+    """writes a table with columns x, y1, y2,... in chunks"""
+    if xIsTime:
+        fmt = '%s' + '\t%.17g' * len(ys)
+    else:
+        fmt = '\t'.join(['%.17g'] * (len(ys) + 1))
+    for start in xrange(0, len(x), chunkSize):
+        end = start + chunkSize
+        xchunk = x[start:end]
+        if xIsTime:
+            # the x column is written as strings: use an object table
+            table = numpy.empty((len(xchunk), len(ys) + 1), dtype=object)
+            table[:, 0] = _formatTimes(xchunk)
+            for i, y in enumerate(ys):
+                table[:, i + 1] = y[start:end]
+        else:
+            table = numpy.column_stack([xchunk] + [y[start:end] for y in ys])
+        numpy.savetxt(f, table, fmt=fmt, delimiter='\t')
+        progress(len(xchunk) * len(ys))
+
+
+def _writeAscii(fname, sets, xIsTime=False, chunkSize=CHUNK_SIZE,
+                progress=None):
+    """ascii writer. If all the sets share the same x values, a single table
+    is written. Otherwise, one table per set is written (one after the other)
+    """
+    snapshot = datetime.now().isoformat('_')
+    with open(fname, 'w') as f:
+        x = _commonX(sets) if len(sets) > 1 else None
+        if x is not None:
+            names = ' , '.join(['"%s"' % name for name, _, _ in sets])
+            f.write('# DATASET= "abscissa" , %s\n' % names)
+            f.write('# SNAPSHOT_TIME= %s\n' % snapshot)
+            _writeAsciiTable(f, x, [y for _, _, y in sets], xIsTime,
+                             chunkSize, progress)
+            return
+        for name, x, y in sets:
+            f.write('# DATASET= "%s"\n' % name)
+            f.write('# SNAPSHOT_TIME= %s\n' % snapshot)
+            _writeAsciiTable(f, x, [y], xIsTime, chunkSize, progress)
+
+
+def _writeNpz(fname, sets, xIsTime=False, chunkSize=CHUNK_SIZE,
+              progress=None):
+    """npz writer. For each set i, arrays "x<i>" and "y<i>" are stored. The
+    names of the sets are stored in the "names" array"""
+    arrays = {'names': numpy.array([name for name, _, _ in sets])}
+    for i, (name, x, y) in enumerate(sets):
+        arrays['x%i' % i] = x
+        arrays['y%i' % i] = y
+    numpy.savez_compressed(fname, **arrays)
+    progress(progress.total)
+
+
+def _writeHdf5(fname, sets, xIsTime=False, chunkSize=CHUNK_SIZE,
+               progress=None):
+    """HDF5 writer. One group per set (with "x" and "y" datasets and a "name"
+    attribute) is written"""
+    try:
+        import h5py
+    except ImportError:
+        raise ImportError('h5py is required for exporting to HDF5')
+    with h5py.File(fname, 'w') as f:
+        f.attrs['SNAPSHOT_TIME'] = datetime.now().isoformat('_')
+        for i, (name, x, y) in enumerate(sets):
+            grp = f.create_group('set%03i' % i)
+            grp.attrs['name'] = name
+            grp.attrs['xIsTime'] = xIsTime
+            n = len(x)
+            chunks = (min(max(n, 1), chunkSize),)
+            dx = grp.create_dataset('x', shape=(n,), dtype=x.dtype,
+                                    chunks=chunks)
+            dy = grp.create_dataset('y', shape=(n,), dtype=y.dtype,
+                                    chunks=chunks)
+            for start in xrange(0, n, chunkSize):
+                end = min(start + chunkSize, n)
+                dx[start:end] = x[start:end]
+                dy[start:end] = y[start:end]
+                progress(end - start)
+
+
+_WRITERS = {'ascii': _writeAscii, 'npz': _writeNpz, 'hdf5': _writeHdf5}
@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""This module provides :class:`LazyModule`, a module type that imports the
+submodules of a package only when one of the names they provide is first
+accessed. It is used by the taurus packages which used to import all their
+submodules in their ``__init__`` (see the `LAZY_IMPORTS` option in
+:mod:`taurus.tauruscustomsettings`)::
+
+    # in the __init__.py of the package
+    from taurus.core.util.lazymodule import LazyModule
+    LazyModule.install(__name__, ['module1', 'module2'],
+                       names={'Klass': 'module3'})
+
+is equivalent to::
+
+    from .module1 import *
+    from .module2 import *
+    from .module3 import Klass
+"""
+
+__all__ = ["LazyModule"]
+
+__docformat__ = "restructuredtext"
+
+import os
+import re
+import imp
+import sys
+import ast
+import types
+import importlib
+
+_ALL_RE = re.compile(r'^__all__\s*=\s*([\[(].*?[\])])\s*$', re.M | re.S)
+_ALL_CHANGE_RE = re.compile(r'\b__all__\s*(\+=|\.|\[)|^\s*__all__\s*=', re.M)
+_DYNAMIC_RE = re.compile(r'\bimport\s+\*|\b(globals|locals|vars|setattr|exec|'
+                         r'execfile|__dict__|__import__)\b')
+
+
+def _lazy_imports_enabled():
+    try:
+        from taurus import tauruscustomsettings
+        return getattr(tauruscustomsettings, 'LAZY_IMPORTS', True)
+    except ImportError:
+        return True
+
+
+def _provided_names(source):
+    """Returns a set containing (at least) the public names that a module
+    with the given source provides to a star import, without importing it,
+    or None if they cannot be determined.
+
+    They are the names in a literal ``__all__`` or, if there is no such
+    ``__all__``, all the identifiers found in the source (unless it star
+    imports or defines names dynamically)"""
+    literals = _ALL_RE.findall(source)
+    if len(literals) == 1 and len(_ALL_CHANGE_RE.findall(source)) == 1:
+        try:
+            names = ast.literal_eval(literals[0])
+        except (ValueError, SyntaxError):
+            pass
+        else:
+            if isinstance(names, (list, tuple)) and \
+                    all(isinstance(n, basestring) for n in names):
+                return set(names)
+    if _DYNAMIC_RE.search(source):
+        return None
+    return set(re.findall(r'[A-Za-z_]\w*', source))
+
+
+class LazyModule(types.ModuleType):
+    """A module that takes the public names of its submodules from them when
+    they are first requested.
+
+    :param module: (module) the original package module (its contents are
+                   copied)
+    :param submodules: (seq<str>) names of the submodules whose public names
+                       (``__all__`` or the names not starting with
+                       underscore) are provided, in the same order as they
+                       would be star-imported
+    :param names: (dict<str,str or callable>) maps single names to the
+                  submodule providing them or to a function returning their
+                  value
+    :param optional: (seq<str>) submodules whose import errors are ignored
+
+    When a name provided by several submodules is requested all of them are
+    imported, so that it takes the value from the last one, like the star
+    imports would do. To find the submodules that may provide a name without
+    importing them, their sources are scanned (see :func:`_provided_names`)
+    the first time a name is not found. Names which are not found are
+    remembered, so that asking for them again (e.g. with :func:`hasattr`)
+    does not repeat the search.
+    """
+
+    def __init__(self, module, submodules, names=None, optional=()):
+        types.ModuleType.__init__(self, module.__name__, module.__doc__)
+        self.__dict__.update(module.__dict__)
+        d = self.__dict__
+        # the original module must be kept alive: python 2 clears the
+        # globals of the functions defined in it when it is deleted
+        d['_LazyModule__module'] = module
+        d['_LazyModule__pending'] = list(submodules)
+        d['_LazyModule__names'] = dict(names or {})
+        d['_LazyModule__optional'] = set(optional)
+        # position of each submodule in the star import order and of the
+        # submodule that provided each name
+        d['_LazyModule__order'] = dict((s, i) for i, s in enumerate(submodules))
+        d['_LazyModule__origin'] = {}
+        # submodule -> names it may provide (None if unknown)
+        d['_LazyModule__provided'] = {}
+        d['_LazyModule__missing'] = set()
+
+    @classmethod
+    def install(cls, name, submodules, names=None, optional=()):
+        """Replaces the (package) module called name in :data:`sys.modules`
+        with a LazyModule. It must be called at the end of the ``__init__``
+        of the package. If the `LAZY_IMPORTS` setting is False, the
+        submodules are imported right away instead.
+
+        :return: (module) the module that is now in sys.modules
+        """
+        module = sys.modules[name]
+        lazy = cls(module, submodules, names=names, optional=optional)
+        if not _lazy_imports_enabled():
+            lazy._LazyModule__loadAll()
+            module.__dict__.update((k, v) for k, v in lazy.__dict__.items()
+                                   if not k.startswith('_LazyModule__'))
+            return module
+        sys.modules[name] = lazy
+        return lazy
+
+    def __loadSubmodule(self, submodule):
+        """imports a submodule and copies its public names"""
+        pending = self.__pending
+        # removed before importing it (the submodule may access the package)
+        index = pending.index(submodule)
+        del pending[index]
+        try:
+            module = importlib.import_module('.' + submodule, self.__name__)
+        except Exception:
+            if submodule not in self.__optional:
+                pending.insert(index, submodule)
+                raise
+            from taurus.core.util.log import Logger
+            logger = Logger(self.__name__)
+            logger.debug('%s could not be initialized', submodule)
+            logger.traceback()
+            return
+        public = getattr(module, '__all__', None)
+        if public is None:
+            public = [n for n in dir(module) if not n.startswith('_')]
+        d, origin = self.__dict__, self.__origin
+        position = self.__order[submodule]
+        for n in public:
+            # a submodule imported later must not override the names of the
+            # ones after it in the star import order
+            if origin.get(n, -1) <= position:
+                d[n] = getattr(module, n)
+                origin[n] = position
+
+    def __providedNames(self, submodule):
+        """returns the names that a pending submodule may provide (None if
+        unknown)"""
+        provided = self.__provided
+        if submodule not in provided:
+            names = None
+            try:
+                f, filename, desc = imp.find_module(submodule,
+                                                    self.__dict__['__path__'])
+            except (ImportError, KeyError):
+                pass
+            else:
+                if f is not None:
+                    f.close()
+                if desc[2] == imp.PKG_DIRECTORY:
+                    filename = os.path.join(filename, '__init__.py')
+                    desc = (None, None, imp.PY_SOURCE)
+                if desc[2] == imp.PY_SOURCE:
+                    try:
+                        with open(filename) as f:
+                            names = _provided_names(f.read())
+                    except IOError:
+                        pass
+            provided[submodule] = names
+        return provided[submodule]
+
+    def __candidates(self, name):
+        """returns the pending submodules which may provide name"""
+        result = []
+        for submodule in self.__pending:
+            names = self.__providedNames(submodule)
+            if names is None or name in names:
+                result.append(submodule)
+        return result
+
+    def __loadAll(self):
+        while self.__pending:
+            self.__loadSubmodule(self.__pending[0])
+        for n in list(self.__names):
+            self.__loadName(n)
+
+    def __loadName(self, name):
+        source = self.__names.pop(name)
+        if callable(source):
+            value = source()
+        else:
+            module = importlib.import_module('.' + source, self.__name__)
+            value = getattr(module, name)
+        self.__dict__[name] = value
+
+    def __getattr__(self, name):
+        # only called when name is not (yet) in the module
+        if name.startswith('__') and name not in ('__all__',):
+            raise AttributeError(name)
+        d = self.__dict__
+        if name in d['_LazyModule__missing']:
+            raise AttributeError("'module' object has no attribute '%s'" %
+                                 name)
+        # the import lock also protects against concurrent imports of the
+        # submodules
+        imp.acquire_lock()
+        try:
+            if name in d:
+                return d[name]
+            if name == '__all__':
+                self.__loadAll()
+                d['__all__'] = sorted(n for n in d if not n.startswith('_'))
+            elif name in self.__names:
+                self.__loadName(name)
+            elif name in self.__pending:
+                # the name of a submodule
+                self.__loadSubmodule(name)
+            else:
+                for submodule in self.__candidates(name):
+                    if submodule in self.__pending:
+                        self.__loadSubmodule(submodule)
+            path = d.get('__path__')
+            if name not in d and path is not None:
+                # maybe a submodule which is not star-imported
+                try:
+                    f = imp.find_module(name, path)[0]
+                except ImportError:
+                    pass
+                else:
+                    if f is not None:
+                        f.close()
+                    importlib.import_module('.' + name, self.__name__)
+            if name not in d:
+                self.__missing.add(name)
+        finally:
+            imp.release_lock()
+        try:
+            return d[name]
+        except KeyError:
+            raise AttributeError("'module' object has no attribute '%s'" %
+                                 name)
+
+    def __dir__(self):
+        self.__getattr__('__all__')
+        return sorted(self.__dict__)
@@ -27,7 +27,8 @@
 :mod:`logging` system."""
 
 __all__ = ["LogIt", "TraceIt", "DebugIt", "InfoIt", "WarnIt", "ErrorIt",
-           "CriticalIt", "MemoryLogHandler", "LogExceptHook", "Logger",
+           "CriticalIt", "MemoryLogHandler", "QueueLogHandler",
+           "LogExceptHook", "Logger",
            "LogFilter",
            "_log", "trace", "debug", "info", "warning", "error", "fatal",
            "critical", "deprecated", "deprecation_decorator",
@@ -44,6 +45,7 @@ import traceback
 import inspect
 import threading
 import functools
+import Queue
 
 from object import Object
 from wrap import wraps
@@ -383,6 +385,137 @@ class MemoryLogHandler(list, logging.handlers.BufferingHandler):
         logging.handlers.BufferingHandler.close(self)
 
 
+class QueueLogHandler(logging.Handler):
+    """A log handler that passes the records to other handlers from a
+    background thread, so that slow handlers (e.g. files or sockets) never
+    block the thread which logs the message.
+
+    The message of each record is formatted when it is queued (in the thread
+    which logs it). If the queue is full, the records are dropped (see
+    :meth:`getDroppedCount`) instead of blocking.
+
+    Example::
+
+        >>> import logging.handlers
+        >>> h = logging.handlers.RotatingFileHandler('/tmp/taurus.log')
+        >>> Logger.addRootLogHandler(QueueLogHandler(h))
+
+    :param handlers: (logging.Handler or sequence<logging.Handler>) the
+                     handler(s) which emit the records
+    :param capacity: (int) maximum number of records in the queue
+    """
+
+    def __init__(self, handlers=(), capacity=10000):
+        logging.Handler.__init__(self)
+        if isinstance(handlers, logging.Handler):
+            handlers = (handlers,)
+        self._handlers = list(handlers)
+        self._queue = Queue.Queue(capacity)
+        self._dropped = 0
+        self._thread = threading.Thread(target=self._run,
+                                        name='TaurusLogQueue')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def addHandler(self, handler):
+        """Adds a handler to which the records are passed
+
+           :param handler: (logging.Handler) the handler
+        """
+        if handler not in self._handlers:
+            self._handlers.append(handler)
+
+    def removeHandler(self, handler):
+        """Removes a handler added with :meth:`addHandler`
+
+           :param handler: (logging.Handler) the handler
+        """
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+
+    def getHandlers(self):
+        """Returns the handlers to which the records are passed
+
+           :return: (sequence<logging.Handler>) the handlers
+        """
+        return tuple(self._handlers)
+
+    def getDroppedCount(self):
+        """Returns the number of records dropped because the queue was full
+
+           :return: (int) number of dropped records
+        """
+        return self._dropped
+
+    def setFormatter(self, fmt):
+        """Sets the formatter of the handlers (records are not formatted
+           by this handler)"""
+        logging.Handler.setFormatter(self, fmt)
+        for handler in self._handlers:
+            handler.setFormatter(fmt)
+
+    def prepare(self, record):
+        """Merges the arguments and the exception information into the
+           message of the record, so that it does not keep references to
+           objects that may change before it is emitted
+
+           :param record: (logging.LogRecord) a log record
+           :return: (logging.LogRecord) the record
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exc_formatter.formatException(
+                    record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        try:
+            self._queue.put_nowait(self.prepare(record))
+        except Queue.Full:
+            self._dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def _run(self):
+        queue = self._queue
+        while True:
+            record = queue.get()
+            try:
+                if record is None:
+                    return
+                for handler in self._handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            except Exception:
+                pass
+            finally:
+                queue.task_done()
+
+    def flush(self):
+        """Waits until the queued records have been passed to the handlers
+           and flushes them"""
+        if self._thread.is_alive() and \
+                self._thread is not threading.current_thread():
+            self._queue.join()
+        for handler in self._handlers:
+            handler.flush()
+
+    def close(self):
+        """Passes the pending records to the handlers and stops the
+           background thread (the handlers are not closed)"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            if self._thread is not threading.current_thread():
+                self._thread.join()
+        logging.Handler.close(self)
+
+
+_exc_formatter = logging.Formatter()
+
+
 class LogExceptHook(BaseExceptHook):
     """A callable class that acts as an excepthook that logs the exception in
     the python logging system.
@@ -408,8 +541,71 @@ class LogExceptHook(BaseExceptHook):
         self._log.log(self._level, "Unhandled exception:\n%s", text)
 
 
+#: incremented whenever the level of a logger changes, which invalidates
+#: the levels cached by the taurus loggers
+_levelGeneration = [0]
+
+
+def _levelChanged():
+    """Invalidates the cached levels of all the taurus loggers"""
+    _levelGeneration[0] += 1
+
+
+_loggingSetLevel = logging.Logger.setLevel
+
+
+def _setLevel(self, level):
+    _loggingSetLevel(self, level)
+    _levelChanged()
+
+
+_setLevel.__doc__ = _loggingSetLevel.__doc__
+# the level of any logger (e.g. a non taurus ancestor of a taurus logger) may
+# change the effective level of the taurus loggers
+logging.Logger.setLevel = _setLevel
+
+
 class _Logger(logging.Logger):
 
+    def __init__(self, name, level=logging.NOTSET):
+        # level -> enabled (valid while _levelGeneration does not change)
+        self._enabled_cache = {}
+        self._cache_generation = None
+        logging.Logger.__init__(self, name, level)
+
+    def _getLevel(self):
+        return self._level
+
+    def _setLevelAttr(self, level):
+        self._level = level
+        _levelChanged()
+
+    #: the level of the logger (assigning it directly also invalidates the
+    #: cached levels)
+    level = property(_getLevel, _setLevelAttr)
+
+    def isEnabledFor(self, level):
+        """
+        Is this logger enabled for level 'level'? The result is cached, so
+        that disabled log calls do not walk the logger hierarchy each time.
+
+        The cache is invalidated when the level of any logger is changed
+        with setLevel and when the level of a taurus logger is assigned.
+        Assigning the ``level`` attribute of other loggers directly (instead
+        of calling their setLevel) is not detected.
+        """
+        if self.manager.disable >= level:
+            return False
+        cache = self._enabled_cache
+        if self._cache_generation != _levelGeneration[0]:
+            cache.clear()
+            self._cache_generation = _levelGeneration[0]
+        try:
+            return cache[level]
+        except KeyError:
+            enabled = cache[level] = level >= self.getEffectiveLevel()
+            return enabled
+
     def findCaller(self):
         """
         Find the stack frame of the caller so that we can note the source
@@ -423,8 +619,13 @@ class _Logger(logging.Logger):
         rv = "(unknown file)", 0, "(unknown function)"
         while hasattr(f, "f_code"):
             co = f.f_code
-            filename = os.path.normcase(co.co_filename)
-            if filename in (_srcfile, logging._srcfile):
+            try:
+                internal = _internal_files[co.co_filename]
+            except KeyError:
+                filename = os.path.normcase(co.co_filename)
+                internal = filename in (_srcfile, logging._srcfile)
+                _internal_files[co.co_filename] = internal
+            if internal:
                 f = f.f_back
                 continue
             rv = (co.co_filename, f.f_lineno, co.co_name)
@@ -432,10 +633,22 @@ class _Logger(logging.Logger):
         return rv
 
 
+# co_filename -> whether it is this module or the logging module
+_internal_files = {}
+
+
 class Logger(Object):
     """The taurus logger class. All taurus pertinent classes should inherit
     directly or indirectly from this class if they need taurus logging
-    facilities."""
+    facilities.
+
+    The log methods return immediately if their level is not enabled: the
+    arguments are only merged into the message (and the caller frame is only
+    looked up) for the records which are actually emitted. Hence, prefer
+    ``self.debug("read %s", value)`` to ``self.debug("read %s" % value)``
+    in frequently called code. Use :meth:`isLogEnabledFor` to avoid
+    computing expensive arguments.
+    """
 
     #: Internal usage
     root_inited = False
@@ -708,6 +921,15 @@ class Logger(Object):
         for handler in other.log_handlers:
             self.addLogHandler(handler)
 
+    def isLogEnabledFor(self, level):
+        """Checks if messages of the given level would be recorded by this
+           object's logger
+
+           :param level: (int) the log level
+           :return: (bool) True if the level is enabled
+        """
+        return self.log_obj.isEnabledFor(level)
+
     def trace(self, msg, *args, **kw):
         """Record a trace message in this object's logger. Accepted *args* and
            *kwargs* are the same as :meth:`logging.Logger.log`.
@@ -716,7 +938,8 @@ class Logger(Object):
            :param args: list of arguments
            :param kw: list of keyword arguments
         """
-        self.log_obj.log(self.Trace, msg, *args, **kw)
+        if self.log_obj.isEnabledFor(TRACE):
+            self.log_obj._log(TRACE, msg, args, **kw)
 
     def traceback(self, level=Trace, extended=True):
         """Log the usual traceback information, followed by a listing of all the
@@ -725,8 +948,11 @@ class Logger(Object):
            :param level: (int) the log level assigned to the traceback record
            :param extended: (bool) if True, the log record message will have multiple lines
 
-           :return: (str) The traceback string representation
+           :return: (str) The traceback string representation (or None if
+                    the level is not enabled)
         """
+        if not self.log_obj.isEnabledFor(level):
+            return None
         out = traceback.format_exc()
         if extended:
             out += "\n"
@@ -741,8 +967,11 @@ class Logger(Object):
 
            :param target: (int) the log level assigned to the record
 
-           :return: (str) The stack string representation
+           :return: (str) The stack string representation (or None if the
+                    level is not enabled)
         """
+        if not self.log_obj.isEnabledFor(target):
+            return None
         out = self._format_stack()
         self.log_obj.log(target, out)
         return out
@@ -802,7 +1031,8 @@ class Logger(Object):
            :param args: list of arguments
            :param kw: list of keyword arguments
         """
-        self.log_obj.log(level, msg, *args, **kw)
+        if self.log_obj.isEnabledFor(level):
+            self.log_obj._log(level, msg, args, **kw)
 
     def debug(self, msg, *args, **kw):
         """Record a debug message in this object's logger. Accepted *args* and
@@ -812,7 +1042,8 @@ class Logger(Object):
            :param args: list of arguments
            :param kw: list of keyword arguments
         """
-        self.log_obj.debug(msg, *args, **kw)
+        if self.log_obj.isEnabledFor(logging.DEBUG):
+            self.log_obj._log(logging.DEBUG, msg, args, **kw)
 
     def info(self, msg, *args, **kw):
         """Record an info message in this object's logger. Accepted *args* and
@@ -822,7 +1053,8 @@ class Logger(Object):
            :param args: list of arguments
            :param kw: list of keyword arguments
         """
-        self.log_obj.info(msg, *args, **kw)
+        if self.log_obj.isEnabledFor(logging.INFO):
+            self.log_obj._log(logging.INFO, msg, args, **kw)
 
     def warning(self, msg, *args, **kw):
         """Record a warning message in this object's logger. Accepted *args* and
@@ -832,7 +1064,8 @@ class Logger(Object):
            :param args: list of arguments
            :param kw: list of keyword arguments
         """
-        self.log_obj.warning(msg, *args, **kw)
+        if self.log_obj.isEnabledFor(logging.WARNING):
+            self.log_obj._log(logging.WARNING, msg, args, **kw)
 
     def deprecated(self, msg=None, dep=None, alt=None, rel=None, dbg_msg=None,
                    _callerinfo=None, **kw):
@@ -894,7 +1127,8 @@ class Logger(Object):
            :param args: list of arguments
            :param kw: list of keyword arguments
         """
-        self.log_obj.error(msg, *args, **kw)
+        if self.log_obj.isEnabledFor(logging.ERROR):
+            self.log_obj._log(logging.ERROR, msg, args, **kw)
 
     def fatal(self, msg, *args, **kw):
         """Record a fatal message in this object's logger. Accepted *args* and
@@ -904,7 +1138,8 @@ class Logger(Object):
            :param args: list of arguments
            :param kw: list of keyword arguments
         """
-        self.log_obj.fatal(msg, *args, **kw)
+        if self.log_obj.isEnabledFor(logging.FATAL):
+            self.log_obj._log(logging.FATAL, msg, args, **kw)
 
     def critical(self, msg, *args, **kw):
         """Record a critical message in this object's logger. Accepted *args* and
@@ -914,7 +1149,8 @@ class Logger(Object):
            :param args: list of arguments
            :param kw: list of keyword arguments
         """
-        self.log_obj.critical(msg, *args, **kw)
+        if self.log_obj.isEnabledFor(logging.CRITICAL):
+            self.log_obj._log(logging.CRITICAL, msg, args, **kw)
 
     def exception(self, msg, *args):
         """Log a message with severity 'ERROR' on the root logger, with
@@ -972,7 +1208,7 @@ class Logger(Object):
         else:
             self.log_full_name = name
 
-        self.log_obj = logging.getLogger(self.log_full_name)
+        self.log_obj = self._getLogger(self.log_full_name)
         for handler in self.log_handlers:
             self.log_obj.addHandler(handler)
 
@@ -23,54 +23,185 @@
 ##
 #############################################################################
 
-"""Useful module for remote logging"""
+"""Useful module for remote logging
+
+The records are received by a :class:`LogRecordSocketReceiver`, which serves
+all the connections from a single thread with a :func:`select.select` loop
+and passes the records received on each connection in batches to its
+:class:`LogRecordStreamHandler`.
+
+Two wire formats are accepted on the same port: the one of the standard
+:class:`logging.handlers.SocketHandler` (pickled record dictionaries) and the
+compact format sent by :class:`CompactSocketHandler`, in which the name and
+the level of the record precede its JSON encoded attributes, so that the
+records discarded by the receiver filter are never decoded. The pickled
+records are loaded without allowing any global (class or function) reference
+and they can be rejected altogether with the REMOTE_LOG_ALLOW_PICKLE option
+of :mod:`taurus.tauruscustomsettings`.
+"""
 
 from __future__ import print_function
 from __future__ import with_statement
 
-__all__ = ["LogRecordStreamHandler", "LogRecordSocketReceiver", "log"]
+__all__ = ["LogRecordStreamHandler", "LogRecordSocketReceiver",
+           "CompactSocketHandler", "log"]
 
-import time
+import errno
+import json
+import select
 import socket
-import pickle
 import logging
 import logging.handlers
 import struct
-import weakref
+import threading
 
 try:
-    import socketserver
-except:
-    import SocketServer as socketserver
-
-
-class LogRecordStreamHandler(socketserver.StreamRequestHandler):
-
-    def handle(self):
-        try:
-            return self._handle()
-        except:
-            pass
-
-    def _handle(self):
-        self._stop = stop = 0
-        self.hostName = self.server.hostName
-        self.server.registerHandler(self)
-        while not stop:
-            chunk = self.connection.recv(4)
-            if len(chunk) < 4:
+    import cPickle
+
+    def _safe_loads(data):
+        from cStringIO import StringIO
+        unpickler = cPickle.Unpickler(StringIO(data))
+        # disables the loading of any global (class, function...)
+        unpickler.find_global = None
+        return unpickler.load()
+
+except ImportError:
+    import io
+    import pickle
+
+    class _SafeUnpickler(pickle.Unpickler):
+
+        def find_class(self, module, name):
+            raise pickle.UnpicklingError("global '%s.%s' is forbidden" %
+                                         (module, name))
+
+    def _safe_loads(data):
+        return _SafeUnpickler(io.BytesIO(data)).load()
+
+#: first byte of the records in the compact format (a pickle never starts
+#: with it)
+COMPACT_MARKER = b'\x01'
+
+_LENGTH = struct.Struct('>L')
+# marker, levelno, length of the name
+_COMPACT_HEADER = struct.Struct('>cHH')
+
+# the attributes of the records sent in the compact format, in order,
+# followed by a dict with the other ones
+_COMPACT_FIELDS = ('msg', 'levelno', 'levelname', 'pathname', 'filename',
+                   'module', 'lineno', 'funcName', 'created', 'msecs',
+                   'relativeCreated', 'thread', 'threadName', 'process',
+                   'processName', 'exc_text')
+_COMPACT_SKIP = frozenset(_COMPACT_FIELDS + ('name', 'args', 'exc_info'))
+
+_json_decode = json.JSONDecoder().decode
+
+_RETRY_ERRNOS = (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR)
+
+
+class CompactSocketHandler(logging.handlers.SocketHandler):
+    """A :class:`logging.handlers.SocketHandler` which sends the records in
+    the compact format understood by :class:`LogRecordSocketReceiver`
+    instead of pickling them: the name and the level of the record followed
+    by a JSON list with the values of its standard attributes and a dict
+    with the other ones. Values which are not JSON serializable are sent as
+    strings"""
+
+    def makePickle(self, record):
+        if record.exc_info:
+            # sets record.exc_text
+            self.format(record)
+        d = record.__dict__
+        values = [d.get(k) for k in _COMPACT_FIELDS]
+        values[0] = record.getMessage()
+        values.append(dict((k, v) for k, v in d.items()
+                           if k not in _COMPACT_SKIP))
+        name = record.name
+        if not isinstance(name, bytes):
+            name = name.encode('utf-8')
+        body = json.dumps(values, default=str, separators=(',', ':'))
+        if not isinstance(body, bytes):
+            body = body.encode('utf-8')
+        levelno = min(max(record.levelno, 0), 0xffff)
+        data = b''.join((_COMPACT_HEADER.pack(COMPACT_MARKER, levelno,
+                                              len(name)), name, body))
+        return _LENGTH.pack(len(data)) + data
+
+
+class LogRecordStreamHandler(object):
+    """Handles the records received on one connection of a
+    :class:`LogRecordSocketReceiver`. The receiver passes the received bytes
+    to :meth:`feed`, which decodes the complete records and handles them
+    together with :meth:`handleLogRecords`"""
+
+    #: maximum size (bytes) of a record. Larger ones close the connection
+    max_record_size = 1 << 24
+
+    def __init__(self, request, client_address, server):
+        self.request = self.connection = request
+        self.client_address = client_address
+        self.server = server
+        self.hostName = server.hostName
+        self._buffer = b''
+        self._stop = 0
+        server.registerHandler(self)
+
+    def feed(self, data):
+        """Handles the complete records found in the received data (the rest
+        is kept until more data arrives). Returns the number of records"""
+        buf = self._buffer + data if self._buffer else data
+        size, pos = len(buf), 0
+        records = []
+        while size - pos >= 4:
+            slen = _LENGTH.unpack_from(buf, pos)[0]
+            if slen > self.max_record_size:
+                raise ValueError("record of %d bytes exceeds the maximum"
+                                 % slen)
+            end = pos + 4 + slen
+            if end > size:
                 break
-            slen = struct.unpack('>L', chunk)[0]
-            chunk = self.connection.recv(slen)
-            while len(chunk) < slen:
-                chunk = chunk + self.connection.recv(slen - len(chunk))
-            obj = self.unPickle(chunk)
-            record = self.makeLogRecord(obj)
-            self.handleLogRecord(record)
-            stop = self._stop
+            record = self.decodeRecord(buf[pos + 4:end])
+            if record is not None:
+                records.append(record)
+            pos = end
+        self._buffer = buf[pos:]
+        if records:
+            self.handleLogRecords(records)
+        return len(records)
+
+    def decodeRecord(self, data):
+        """Returns the record encoded in the given data or None if the
+        receiver filter discards it or it cannot be decoded"""
+        server = self.server
+        server.received += 1
+        try:
+            if data[:1] == COMPACT_MARKER:
+                _, levelno, nlen = _COMPACT_HEADER.unpack_from(data)
+                end = _COMPACT_HEADER.size + nlen
+                name = data[_COMPACT_HEADER.size:end].decode('utf-8')
+                if not server.acceptsRecord(name, levelno):
+                    server.filtered += 1
+                    return None
+                values = _json_decode(data[end:].decode('utf-8'))
+                obj = values.pop()
+                obj.update(zip(_COMPACT_FIELDS, values))
+                obj['name'] = name
+            elif server.allow_pickle:
+                obj = self.unPickle(data)
+                if not server.acceptsRecord(obj.get('name'),
+                                            obj.get('levelno')):
+                    server.filtered += 1
+                    return None
+            else:
+                server.rejected += 1
+                return None
+            return self.makeLogRecord(obj)
+        except Exception:
+            server.rejected += 1
+            return None
 
     def unPickle(self, data):
-        return pickle.loads(data)
+        return _safe_loads(data)
 
     def makeLogRecord(self, obj):
         record = logging.makeLogRecord(obj)
@@ -78,6 +209,12 @@ class LogRecordStreamHandler(socketserver.StreamRequestHandler):
             record.hostName = self.hostName
         return record
 
+    def handleLogRecords(self, records):
+        """Handles the records received together"""
+        handleLogRecord = self.handleLogRecord
+        for record in records:
+            handleLogRecord(record)
+
     def handleLogRecord(self, record):
         logger = self.server.data.get("logger")
         if logger is None:
@@ -89,60 +226,166 @@ class LogRecordStreamHandler(socketserver.StreamRequestHandler):
     def stop(self):
         self._stop = 1
 
+    def finish(self):
+        pass
+
 
-class LogRecordSocketReceiver(socketserver.ThreadingTCPServer):
+class LogRecordSocketReceiver(object):
     """
-    Simple TCP socket-based logging receiver suitable for testing.
+    TCP socket-based logging receiver. All the connections are served by
+    the thread which calls :meth:`serve_until_stopped`.
+
+    The pickled records (see :class:`logging.handlers.SocketHandler`) are
+    only accepted if allow_pickle is True (by default, the
+    REMOTE_LOG_ALLOW_PICKLE option of :mod:`taurus.tauruscustomsettings`).
+    The records can be filtered by name and level with :meth:`setFilter`
     """
 
     allow_reuse_address = 1
-    daemon_threads = True
+    request_queue_size = 128
+    #: maximum number of bytes read at once from a connection
+    max_read_size = 1 << 18
 
     def __init__(self, host='localhost',
                  port=logging.handlers.DEFAULT_TCP_LOGGING_PORT,
-                 handler=LogRecordStreamHandler, **kwargs):
-        socketserver.ThreadingTCPServer.__init__(self, (host, port), handler)
+                 handler=LogRecordStreamHandler, allow_pickle=None,
+                 **kwargs):
+        if allow_pickle is None:
+            from taurus import tauruscustomsettings
+            allow_pickle = getattr(tauruscustomsettings,
+                                   'REMOTE_LOG_ALLOW_PICKLE', True)
+        self.RequestHandlerClass = handler
+        self.allow_pickle = allow_pickle
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            if self.allow_reuse_address:
+                self.socket.setsockopt(socket.SOL_SOCKET,
+                                       socket.SO_REUSEADDR, 1)
+            self.socket.bind((host, port))
+            self.socket.listen(self.request_queue_size)
+        except:
+            self.socket.close()
+            raise
+        self.socket.setblocking(0)
+        self.server_address = self.socket.getsockname()
         self.hostName = socket.gethostbyaddr(host)[0]
-        self.port = port
+        self.port = self.server_address[1]
         self._stop = 0
-        self._stopped = 0
-        self.timeout = 1
+        # set while serve_until_stopped is not running
+        self._stopped = threading.Event()
+        self._stopped.set()
+        self.timeout = 0.5
         self.data = kwargs
-        self.__handlers = []
+        self.__handlers = {}
+        self._filterName = None
+        self._filterLevel = None
+        self.received = self.filtered = self.rejected = 0
+
+    def fileno(self):
+        return self.socket.fileno()
+
+    def setFilter(self, name=None, level=None):
+        """Discards the records whose name is not the given one or whose
+        level is lower than the given one (None means no filter)"""
+        self._filterName = name
+        self._filterLevel = level
+
+    def acceptsRecord(self, name, levelno):
+        """Returns whether a record with the given name and level passes the
+        receiver filter"""
+        if self._filterName is not None and name != self._filterName:
+            return False
+        level = self._filterLevel
+        return level is None or levelno is None or levelno >= level
+
+    def getStats(self):
+        """Returns a dict with the number of open connections and of
+        received, filtered and rejected (undecodable or pickled when pickle
+        is not allowed) records"""
+        return dict(connections=len(self.__handlers), received=self.received,
+                    filtered=self.filtered, rejected=self.rejected)
 
     def registerHandler(self, handler):
         if handler is not None:
-            self.__handlers.append(weakref.ref(handler))
+            self.__handlers[handler.connection] = handler
 
     def unregisterHandler(self, handler):
+        self.__handlers.pop(handler.connection, None)
+
+    def close_request(self, handler):
+        self.unregisterHandler(handler)
+        handler.stop()
+        handler.finish()
         try:
-            self.__handlers.remove(handler)
-        except ValueError:
+            handler.connection.close()
+        except socket.error:
             pass
 
+    def _accept(self):
+        while True:
+            try:
+                conn, address = self.socket.accept()
+            except socket.error as e:
+                if e.args[0] in _RETRY_ERRNOS:
+                    return
+                raise
+            conn.setblocking(0)
+            self.RequestHandlerClass(conn, address, self)
+
+    def _read(self, handler):
+        try:
+            data = handler.connection.recv(self.max_read_size)
+        except socket.error as e:
+            if e.args[0] in _RETRY_ERRNOS:
+                return
+            data = None
+        if data:
+            try:
+                handler.feed(data)
+                if not handler._stop:
+                    return
+            except Exception:
+                pass
+        self.close_request(handler)
+
+    def handle_events(self, timeout=None):
+        """Waits up to timeout seconds for new connections or records and
+        handles them"""
+        handlers = self.__handlers
+        try:
+            rd, _, _ = select.select([self.socket] + list(handlers), [], [],
+                                     timeout)
+        except select.error as e:
+            if e.args[0] == errno.EINTR:
+                return
+            raise
+        for sock in rd:
+            if sock is self.socket:
+                self._accept()
+            else:
+                handler = handlers.get(sock)
+                if handler is not None:
+                    self._read(handler)
+
     def serve_until_stopped(self):
-        import select
-        stop = 0
-        while not stop:
-            rd, wr, ex = select.select([self.socket.fileno()],
-                                       [], [],
-                                       self.timeout)
-            if rd:
-                self.handle_request()
-            stop = self._stop
-        self._stopped = 1
+        self._stopped.clear()
+        try:
+            while not self._stop:
+                self.handle_events(self.timeout)
+        finally:
+            self._stopped.set()
+
+    def server_close(self):
+        for handler in list(self.__handlers.values()):
+            self.close_request(handler)
+        self.socket.close()
 
     def stop(self):
+        """Stops serving (waiting for the :meth:`serve_until_stopped` loop to
+        exit) and closes all the connections"""
         self._stop = True
-        while not self._stopped:
-            time.sleep(0.1)
-        for handler in self.__handlers:
-            h = handler()
-            if h is not None:
-                h.stop()
-                h.finish()
-                self.close_request(h.connection)
-        self.socket.close()
+        self._stopped.wait()
+        self.server_close()
 
 
 class LogNameFilter(logging.Filter):
@@ -157,7 +400,7 @@ class LogNameFilter(logging.Filter):
         return record.name == name
 
 
-def log(host, port, name=None, level=None):
+def log(host, port, name=None, level=None, allow_pickle=None):
     local_logger_name = "RemoteLogger.%s.%d" % (host, port)
     local_logger = logging.getLogger(local_logger_name)
 
@@ -168,7 +411,10 @@ def log(host, port, name=None, level=None):
         local_logger.setLevel(level)
 
     tcpserver = LogRecordSocketReceiver(host=host, port=port,
+                                        allow_pickle=allow_pickle,
                                         logger=local_logger)
+    # discard the filtered records before decoding them
+    tcpserver.setFilter(name=name, level=level)
     msg = "logging for '%s' on port %d" % (host, port)
     if name is not None:
         msg += " for " + name
@@ -178,6 +424,8 @@ def log(host, port, name=None, level=None):
         tcpserver.serve_until_stopped()
     except KeyboardInterrupt:
         print("\nCancelled", msg)
+    finally:
+        tcpserver.server_close()
 
 
 def main(argv=None):
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Benchmarks for the decoding of LImA video images with
+:class:`taurus.core.util.codecs.VideoImageCodec` and for the compression
+codecs.
+
+Run it with::
+
+    python -m taurus.core.util.test.bench_codecs [width height [repeat]]
+"""
+
+__docformat__ = 'restructuredtext'
+
+import sys
+import struct
+import timeit
+import numpy
+from taurus.core.util.codecs import CodecFactory, BufferPool
+
+#: image modes supported by the VideoImageCodec: (mode, name, dtype,
+#: number of bytes per pixel group, number of pixels per group)
+VIDEO_MODES = ((0, 'Y8', 'uint8', 1, 1),
+               (1, 'Y16', 'uint16', 1, 1),
+               (2, 'Y32', 'uint32', 1, 1),
+               (3, 'Y64', 'uint64', 1, 1),
+               (7, 'RGB32', 'uint8', 4, 1),
+               (15, 'YUV411', 'uint8', 6, 4),
+               (16, 'YUV422', 'uint8', 4, 2),
+               (17, 'YUV444', 'uint8', 3, 1))
+
+
+def make_video_image(mode, dtype, nbytes, npixels, width, height):
+    '''returns a ('videoimage', buffer) tuple with random contents'''
+    fmt = '!IHHqiiHHHH'
+    header = struct.pack(fmt, 0x5644454f, 1, mode, -1, width, height, 0,
+                         struct.calcsize(fmt), 0, 0)
+    count = width * height * nbytes // npixels
+    payload = numpy.random.randint(0, 255, count).astype(dtype)
+    return 'videoimage', header + payload.tostring()
+
+
+def benchmark_videoimage(width=2048, height=2048, repeat=10, reuse=False):
+    '''Measures the time needed for decoding a video image of the given size
+    for each supported image mode.
+
+    :param width: (int) image width
+    :param height: (int) image height
+    :param repeat: (int) number of decodings per mode
+    :param reuse: (bool) whether to pass a preallocated output buffer
+
+    :return: (list<tuple>) list of (mode name, seconds per frame) tuples
+    '''
+    codec = CodecFactory().getCodec('videoimage')
+    results = []
+    for mode, name, dtype, nbytes, npixels in VIDEO_MODES:
+        data = make_video_image(mode, dtype, nbytes, npixels, width, height)
+        kwargs = {}
+        if reuse:
+            _, img = codec.decode(data)
+            kwargs['out'] = img.copy()
+        t = timeit.Timer(lambda: codec.decode(data, **kwargs))
+        results.append((name, min(t.repeat(3, repeat)) / repeat))
+    return results
+
+
+def benchmark_compression(formats=('zip', 'bz2', 'lz4', 'zstd'),
+                          size=1 << 22, repeat=5):
+    '''Measures the encoding and decoding times of the compression codecs
+    for an array of 16 bit integers (a noisy ramp, similar to detector data).
+
+    :param formats: (seq<str>) the formats to benchmark
+    :param size: (int) size of the data in bytes
+    :param repeat: (int) number of encodings/decodings per format
+
+    :return: (list<tuple>) list of (format, compression ratio, seconds per
+             encoding, seconds per decoding, seconds per pooled decoding)
+             tuples. Formats whose library is not available are skipped
+    '''
+    data = numpy.arange(size // 2, dtype='uint16') % 1024
+    data += numpy.random.randint(0, 8, data.size).astype('uint16')
+    results = []
+    for fmt in formats:
+        codec = CodecFactory().getCodec(fmt)
+        encoded = codec.encode(('', data))
+        if encoded[0] != fmt:
+            continue  # fallback codec used (library not available)
+        pool = BufferPool()
+
+        def pooled_decode():
+            pool.release(codec.decode(encoded, pool=pool)[1])
+        times = [min(timeit.Timer(f).repeat(3, repeat)) / repeat
+                 for f in (lambda: codec.encode(('', data)),
+                           lambda: codec.decode(encoded), pooled_decode)]
+        results.append((fmt, float(size) / len(encoded[1])) + tuple(times))
+    return results
+
+
+def main():
+    args = [int(a) for a in sys.argv[1:]]
+    width, height, repeat = (args + [2048, 2048, 10][len(args):])[:3]
+    print 'VideoImageCodec decoding of %ix%i images' % (width, height)
+    print '%-8s %12s %12s' % ('mode', 'ms/frame', 'ms/frame(out)')
+    plain = benchmark_videoimage(width, height, repeat)
+    reused = benchmark_videoimage(width, height, repeat, reuse=True)
+    for (name, t), (_, t_out) in zip(plain, reused):
+        print '%-8s %12.2f %12.2f' % (name, t * 1e3, t_out * 1e3)
+    print
+    print 'Compression codecs (%i bytes)' % (width * height * 2)
+    print '%-8s %8s %12s %12s %12s' % ('format', 'ratio', 'enc(ms)',
+                                       'dec(ms)', 'dec pool(ms)')
+    for fmt, ratio, enc, dec, dec_pool in benchmark_compression(
+            size=width * height * 2, repeat=repeat):
+        print '%-8s %8.2f %12.2f %12.2f %12.2f' % (fmt, ratio, enc * 1e3,
+                                                   dec * 1e3, dec_pool * 1e3)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Microbenchmark of the log calls of :class:`taurus.core.util.log.Logger`:
+it measures the cost of disabled and enabled log calls (compared with the
+plain :mod:`logging` loggers) and the time that the caller is blocked by a
+slow handler with and without a
+:class:`taurus.core.util.log.QueueLogHandler`.
+
+Run it with::
+
+    python -m taurus.core.util.test.bench_log [number]
+"""
+
+__all__ = ['benchmark_calls', 'benchmark_slow_handler', 'main']
+
+__docformat__ = 'restructuredtext'
+
+import sys
+import time
+import timeit
+import logging
+
+from taurus.core.util.log import Logger, QueueLogHandler
+
+
+class _NullHandler(logging.Handler):
+    '''a handler that formats the records and discards them'''
+
+    def emit(self, record):
+        self.format(record)
+
+
+class _SlowHandler(_NullHandler):
+    '''a handler that takes some time to emit (as a file on a busy disk)'''
+
+    def __init__(self, delay):
+        _NullHandler.__init__(self)
+        self.delay = delay
+
+    def emit(self, record):
+        time.sleep(self.delay)
+        self.format(record)
+
+
+def _loggers(name):
+    '''returns a taurus Logger and a plain logging logger that only send
+    their records to a _NullHandler. As usual, their level is not set (it is
+    inherited from an ancestor, see :func:`_setLevel`)'''
+    taurus_logger = Logger('%s.Taurus.Device.Attribute' % name)
+    plain_logger = logging.getLogger('%s.Plain.Device.Attribute' % name)
+    for log_obj in (taurus_logger.log_obj, plain_logger):
+        log_obj.propagate = False
+        log_obj.addHandler(_NullHandler())
+    return taurus_logger, plain_logger
+
+
+def _setLevel(name, level):
+    for ancestor in ('%s.Taurus' % name, '%s.Plain' % name):
+        Logger.getLogger(ancestor).setLevel(level)
+
+
+def benchmark_calls(number=100000):
+    '''Measures the time per call of disabled and enabled log calls (it
+    includes the overhead of calling a python function)
+
+    :param number: (int) number of calls of each measurement
+
+    :return: (list<tuple<str,float>>) (description, seconds per call)
+    '''
+    t, p = _loggers('BenchCalls')
+    data = range(10)
+    disabled = (('disabled debug (Logger)', lambda: t.debug('v %s', data)),
+                ('disabled debug (logging)', lambda: p.debug('v %s', data)),
+                ('disabled debug, eager %', lambda: t.debug('v %s' % data)),
+                ('disabled trace (Logger)', lambda: t.trace('v %s', data)))
+    enabled = (('enabled debug (Logger)', lambda: t.debug('v %s', data)),
+               ('enabled debug (logging)', lambda: p.debug('v %s', data)))
+    results = []
+    for level, cases, n in ((Logger.Info, disabled, number),
+                            (Logger.Trace, enabled, number // 10)):
+        _setLevel('BenchCalls', level)
+        for name, func in cases:
+            seconds = min(timeit.repeat(func, number=n, repeat=3))
+            results.append((name, seconds / n))
+    return results
+
+
+def benchmark_slow_handler(number=100, delay=0.001):
+    '''Measures the time for which the caller is blocked when logging to a
+    slow handler, directly and through a QueueLogHandler
+
+    :param number: (int) number of messages
+    :param delay: (float) time (in s) spent by the handler on each record
+
+    :return: (list<tuple<str,float>>) (description, seconds per call)
+    '''
+    results = []
+    for name, use_queue in (('slow handler', False),
+                            ('slow handler (queued)', True)):
+        logger = logging.getLogger('BenchSlowHandler.%s' % use_queue)
+        logger.propagate = False
+        handler = _SlowHandler(delay)
+        if use_queue:
+            handler = QueueLogHandler(handler, capacity=number)
+        logger.addHandler(handler)
+        t0 = time.time()
+        for i in range(number):
+            logger.warning('message %d', i)
+        results.append((name, (time.time() - t0) / number))
+        handler.close()
+        logger.removeHandler(handler)
+    return results
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print '%-28s %12s' % ('log call', 'us/call')
+    for name, t in benchmark_calls(number) + benchmark_slow_handler():
+        print '%-28s %12.3f' % (name, t * 1e6)
+
+
+if __name__ == '__main__':
+    main()
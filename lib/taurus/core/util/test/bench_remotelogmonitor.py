@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Load test of :class:`taurus.core.util.remotelogmonitor.LogRecordSocketReceiver`:
+many local clients send records at the same time (pickled by the standard
+:class:`logging.handlers.SocketHandler` or in the compact format of
+:class:`taurus.core.util.remotelogmonitor.CompactSocketHandler`) and it
+measures the rate at which the receiver decodes them, with and without a
+filter which discards most of them.
+
+Run it with::
+
+    python -m taurus.core.util.test.bench_remotelogmonitor [clients] [records]
+"""
+
+__all__ = ['benchmark_receiver', 'main']
+
+__docformat__ = 'restructuredtext'
+
+import sys
+import time
+import socket
+import logging
+import logging.handlers
+import threading
+
+from taurus.core.util.remotelogmonitor import LogRecordStreamHandler, \
+    LogRecordSocketReceiver, CompactSocketHandler
+
+
+class _CountingHandler(LogRecordStreamHandler):
+    '''counts the handled records instead of logging them'''
+
+    def handleLogRecords(self, records):
+        self.server.data['counts'].append(len(records))
+
+
+def _encode(handler_klass, records, index):
+    '''returns the records of a client encoded by the given handler class
+    (so that the cost of encoding them is not measured)'''
+    handler = handler_klass('localhost', 0)
+    name = 'Bench.Client%d' % (index % 10)
+    return b''.join(handler.makePickle(logging.makeLogRecord(
+        dict(name=name, levelno=logging.INFO, levelname='INFO',
+             msg='record %d of client %d', args=(i, index))))
+        for i in range(records))
+
+
+def _client(port, data, chunk=4096):
+    conn = socket.create_connection(('localhost', port))
+    for i in range(0, len(data), chunk):
+        conn.sendall(data[i:i + chunk])
+    conn.close()
+
+
+def benchmark_receiver(clients=40, records=2500, handler_klass=None,
+                       filtered=False):
+    '''Measures the rate at which the records sent by many clients at once
+    are received
+
+    :param clients: (int) number of clients (each one in its own thread)
+    :param records: (int) number of records sent by each client
+    :param handler_klass: (class) client handler class (default:
+                          :class:`CompactSocketHandler`)
+    :param filtered: (bool) if True, the receiver only accepts the records
+                     of 1 of each 10 clients
+
+    :return: (tuple<float,float,int>) (received records/s, handled
+             records/s, number of batches)
+    '''
+    if handler_klass is None:
+        handler_klass = CompactSocketHandler
+    counts = []
+    receiver = LogRecordSocketReceiver(host='localhost', port=0,
+                                       handler=_CountingHandler,
+                                       allow_pickle=True, counts=counts)
+    if filtered:
+        receiver.setFilter(name='Bench.Client0')
+    server = threading.Thread(target=receiver.serve_until_stopped)
+    server.start()
+    threads = [threading.Thread(target=_client,
+                                args=(receiver.port,
+                                      _encode(handler_klass, records, i)))
+               for i in range(clients)]
+    total = clients * records
+    t0 = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    while receiver.getStats()['received'] < total:
+        time.sleep(0.001)
+    dt = time.time() - t0
+    receiver.stop()
+    server.join()
+    return total / dt, sum(counts) / dt, len(counts)
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    records = int(sys.argv[2]) if len(sys.argv) > 2 else 2500
+    print '%d clients x %d records' % (clients, records)
+    print '%-30s %12s %12s %10s' % ('client', 'received/s', 'handled/s',
+                                    'batches')
+    for name, klass in (('SocketHandler', logging.handlers.SocketHandler),
+                        ('CompactSocketHandler', CompactSocketHandler)):
+        for filtered in (False, True):
+            received, handled, batches = benchmark_receiver(
+                clients, records, klass, filtered)
+            label = name + (' (filter)' if filtered else '')
+            print '%-30s %12.0f %12.0f %10d' % (label, received, handled,
+                                                batches)
+
+
+if __name__ == '__main__':
+    main()
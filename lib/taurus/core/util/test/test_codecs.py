@@ -30,15 +30,30 @@
 __docformat__ = 'restructuredtext'
 
 import copy
+import struct
 from taurus.external import unittest
 from taurus.test import insertTest
-from taurus.core.util.codecs import CodecFactory
+from taurus.core.util.codecs import CodecFactory, BufferPool
 import numpy
 
+try:
+    import lz4.frame
+    _HAS_LZ4 = True
+except ImportError:
+    _HAS_LZ4 = False
+
+try:
+    import zstandard
+    _HAS_ZSTD = True
+except ImportError:
+    _HAS_ZSTD = False
+
 
 @insertTest(helper_name='encDec', cname='json', data=[1, 2, 3])
 @insertTest(helper_name='encDec', cname='zip', data='foobar')
 @insertTest(helper_name='encDec', cname='zip_json', data=[1, 2, 3])
+@insertTest(helper_name='encDec', cname='bz2', data='foobar')
+@insertTest(helper_name='encDec', cname='bz2_json', data=[1, 2, 3])
 @insertTest(helper_name='encDec', cname='videoimage',
             data=numpy.ones((2, 2), dtype='uint8'))
 @insertTest(helper_name='encDec', cname='zip_null_zip_videoimage',
@@ -89,5 +104,124 @@ class CodecTest(unittest.TestCase):
             self.assertTrue(equal, msg)
         return fmt, dec
 
+
+@insertTest(helper_name='compress', cname='zip')
+@insertTest(helper_name='compress', cname='bz2')
+@insertTest(helper_name='compress', cname='lz4', skip=not _HAS_LZ4)
+@insertTest(helper_name='compress', cname='zstd', skip=not _HAS_ZSTD)
+class CompressionCodecTest(unittest.TestCase):
+    '''TestCase for the compression codecs'''
+
+    data = numpy.arange(100000, dtype='int32')
+
+    def compress(self, cname=None, skip=False):
+        '''Check buffer inputs, incremental API and pooled decoding'''
+        if skip:
+            self.skipTest('%s compression library not available' % cname)
+        codec = CodecFactory().getCodec(cname)
+        # numpy arrays, memoryviews and bytearrays can be encoded
+        expected = self.data.tostring()
+        for d in (self.data, memoryview(expected), bytearray(expected)):
+            fmt, enc = codec.encode(('', d))
+            self.assertEqual(fmt, cname)
+            _, dec = codec.decode((fmt, enc))
+            self.assertEqual(dec, expected)
+        # incremental compression and decompression
+        c = codec.compressobj()
+        enc = c.compress(expected[:1000]) + c.compress(expected[1000:])
+        enc += c.flush()
+        _, dec = codec.decode((cname, enc))
+        self.assertEqual(dec, expected)
+        self.assertEqual(codec.decompressobj().decompress(enc), expected)
+        # decoding into pooled buffers (reusing them)
+        pool = BufferPool()
+        _, dec1 = codec.decode((cname, enc), pool=pool)
+        self.assertTrue(numpy.all(dec1.view('int32') == self.data))
+        buf = dec1.base
+        del dec1
+        pool.release(buf)
+        _, dec2 = codec.decode((cname, enc), pool=pool)
+        self.assertTrue(dec2.base is buf)
+        self.assertTrue(numpy.all(dec2.view('int32') == self.data))
+
+
+def _videoImage(mode, width, height, payload):
+    '''returns a LImA video image encoded buffer with the given payload'''
+    fmt = '!IHHqiiHHHH'
+    header = struct.pack(fmt, 0x5644454f, 1, mode, -1, width, height, 0,
+                         struct.calcsize(fmt), 0, 0)
+    return header + payload.tostring()
+
+
+def _yuv2rgbRef(y, u, v):
+    '''floating point reference for the YUV to RGB conversion'''
+    cr = v - 128.0
+    cb = u - 128.0
+    r = y + 1.402 * cr
+    g = y - 0.344 * cb - 0.714 * cr
+    b = y + 1.772 * cb
+    return numpy.dstack([numpy.clip(c, 0, 255) for c in (r, g, b)])
+
+
+@insertTest(helper_name='decodeYUV', mode=17, ysamples=(0,), u=1, v=2)
+@insertTest(helper_name='decodeYUV', mode=16, ysamples=(1, 3), u=0, v=2)
+@insertTest(helper_name='decodeYUV', mode=15, ysamples=(1, 2, 4, 5), u=0,
+            v=3)
+class VideoImageCodecTest(unittest.TestCase):
+    '''TestCase for the colour modes of the VideoImageCodec'''
+
+    width, height = 8, 6
+
+    def setUp(self):
+        self.codec = CodecFactory().getCodec('videoimage')
+
+    def decodeYUV(self, mode=None, ysamples=(), u=None, v=None):
+        '''Check YUV decoding against a floating point reference'''
+        groupsize = len(ysamples) + 2
+        npixels = self.width * self.height
+        numpy.random.seed(mode)
+        groups = numpy.random.randint(0, 256, (npixels // len(ysamples),
+                                               groupsize)).astype('uint8')
+        data = _videoImage(mode, self.width, self.height, groups)
+        _, img = self.codec.decode(('videoimage', data))
+        self.assertEqual(img.shape, (self.height, self.width, 3))
+        self.assertEqual(img.dtype, numpy.uint8)
+        y = groups[:, list(ysamples)].astype(float)
+        expected = _yuv2rgbRef(y.reshape(-1), groups[:, u].repeat(len(ysamples)),
+                               groups[:, v].repeat(len(ysamples)))
+        expected = expected.reshape(self.height, self.width, 3)
+        diff = numpy.abs(img - expected).max()
+        self.assertLessEqual(diff, 1.5, 'max deviation: %g' % diff)
+
+    def test_rgb32(self):
+        '''Check RGB32 decoding (BGRA order)'''
+        bgra = numpy.random.randint(0, 256, (self.height, self.width, 4))
+        bgra = bgra.astype('uint8')
+        data = _videoImage(7, self.width, self.height, bgra)
+        _, img = self.codec.decode(('videoimage', data))
+        self.assertTrue(numpy.all(img == bgra[:, :, 2::-1]))
+
+    def test_output_buffer_reuse(self):
+        '''Check that a given output buffer is filled and returned'''
+        bgra = numpy.ones((self.height, self.width, 4), dtype='uint8')
+        data = _videoImage(7, self.width, self.height, bgra)
+        out = numpy.zeros((self.height, self.width, 3), dtype='uint8')
+        _, img = self.codec.decode(('videoimage', data), out=out)
+        self.assertTrue(img is out)
+        self.assertTrue(numpy.all(out == 1))
+        # a non-matching output buffer is ignored
+        out = numpy.zeros((2, 2, 3), dtype='uint8')
+        _, img = self.codec.decode(('videoimage', data), out=out)
+        self.assertFalse(img is out)
+
+    def test_grey_no_copy(self):
+        '''Check that grey images are decoded without copying'''
+        grey = numpy.arange(self.width * self.height, dtype='uint16')
+        data = _videoImage(1, self.width, self.height, grey)
+        _, img = self.codec.decode(('videoimage', data))
+        self.assertFalse(img.flags.owndata)
+        self.assertTrue(numpy.all(img.ravel() == grey))
+
+
 if __name__ == '__main__':
     pass
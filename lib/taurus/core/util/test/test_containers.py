@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.containers"""
+
+__docformat__ = 'restructuredtext'
+
+import threading
+from taurus.external import unittest
+from taurus.core.util.containers import LatestValueMailbox
+
+
+class LatestValueMailboxTestCase(unittest.TestCase):
+    '''Test case for the LatestValueMailbox class'''
+
+    def test_latest_wins(self):
+        '''check that only the latest value is kept and older ones dropped'''
+        m = LatestValueMailbox()
+        self.assertTrue(m.isEmpty())
+        self.assertTrue(m.put(1))
+        self.assertFalse(m.put(2))
+        self.assertFalse(m.put(3))
+        self.assertEqual(m.take(), 3)
+        self.assertTrue(m.isEmpty())
+        self.assertEqual(m.take('empty'), 'empty')
+        self.assertEqual(m.counters(),
+                         dict(received=3, taken=1, dropped=2))
+        m.resetCounters()
+        self.assertEqual(m.counters(),
+                         dict(received=0, taken=0, dropped=0))
+
+    def test_threaded_put(self):
+        '''check counters consistency with concurrent producers'''
+        m = LatestValueMailbox()
+        n, nthreads = 1000, 4
+
+        def producer():
+            for i in xrange(n):
+                m.put(i)
+
+        threads = [threading.Thread(target=producer) for _ in range(nthreads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        m.take()
+        c = m.counters()
+        self.assertEqual(c['received'], n * nthreads)
+        self.assertEqual(c['received'], c['taken'] + c['dropped'])
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.dataexport"""
+
+__docformat__ = 'restructuredtext'
+
+import os
+import shutil
+import tempfile
+import numpy
+from taurus.external import unittest
+from taurus.test import insertTest
+from taurus.core.util.dataexport import (exportDataSets, getExportFormat,
+                                         ExportAborted)
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+
+@insertTest(helper_name='checkFormat', fname='a.dat', expected='ascii')
+@insertTest(helper_name='checkFormat', fname='a.CSV', expected='ascii')
+@insertTest(helper_name='checkFormat', fname='a.npz', expected='npz')
+@insertTest(helper_name='checkFormat', fname='a.h5', expected='hdf5')
+@insertTest(helper_name='checkFormat', fname='a', expected='ascii')
+class DataExportTestCase(unittest.TestCase):
+    '''TestCase for the exportDataSets function'''
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        x = numpy.arange(1000, dtype=float)
+        self.datadict = {'a/b/c/d': (x, x ** 2),
+                         'eval:rand(1000)': (x, numpy.random.rand(1000))}
+        self.names = sorted(self.datadict.keys())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def checkFormat(self, fname=None, expected=None):
+        '''check the format guessing from the file extension'''
+        self.assertEqual(getExportFormat(fname), expected)
+
+    def test_ascii_table(self):
+        '''check ascii export of sets sharing the x values'''
+        fname = os.path.join(self.tmpdir, 'table.dat')
+        exportDataSets(fname, self.datadict, chunkSize=300)
+        data = numpy.loadtxt(fname)
+        self.assertEqual(data.shape, (1000, 3))
+        for i, name in enumerate(self.names):
+            x, y = self.datadict[name]
+            self.assertTrue(numpy.all(data[:, 0] == x))
+            self.assertTrue(numpy.all(data[:, i + 1] == y))
+
+    def test_ascii_blocks(self):
+        '''check ascii export of sets with different x values'''
+        fname = os.path.join(self.tmpdir, 'blocks.dat')
+        datadict = {'a': (numpy.arange(3), numpy.arange(3)),
+                    'b': (numpy.arange(5), numpy.arange(5))}
+        exportDataSets(fname, datadict)
+        lines = open(fname).read().splitlines()
+        self.assertEqual(len(lines), 3 + 5 + 2 * 2)
+        self.assertEqual(lines[0], '# DATASET= "a"')
+        self.assertEqual(lines[5], '# DATASET= "b"')
+
+    def test_npz(self):
+        '''check npz export'''
+        fname = os.path.join(self.tmpdir, 'data.npz')
+        exportDataSets(fname, self.datadict)
+        f = numpy.load(fname)
+        self.assertEqual(list(f['names']), self.names)
+        for i, name in enumerate(self.names):
+            x, y = self.datadict[name]
+            self.assertTrue(numpy.all(f['x%i' % i] == x))
+            self.assertTrue(numpy.all(f['y%i' % i] == y))
+
+    @unittest.skipIf(h5py is None, 'h5py not available')
+    def test_hdf5(self):
+        '''check HDF5 export'''
+        fname = os.path.join(self.tmpdir, 'data.h5')
+        exportDataSets(fname, self.datadict, chunkSize=300)
+        with h5py.File(fname, 'r') as f:
+            for i, name in enumerate(self.names):
+                x, y = self.datadict[name]
+                grp = f['set%03i' % i]
+                self.assertEqual(grp.attrs['name'], name)
+                self.assertTrue(numpy.all(grp['x'][:] == x))
+                self.assertTrue(numpy.all(grp['y'][:] == y))
+
+    def test_progress_and_abort(self):
+        '''check the progress reporting and the abort mechanism'''
+        fname = os.path.join(self.tmpdir, 'data.dat')
+        calls = []
+
+        def progress(done, total):
+            calls.append((done, total))
+            return done >= 1000
+
+        self.assertRaises(ExportAborted, exportDataSets, fname,
+                          self.datadict, chunkSize=250, progress=progress)
+        self.assertEqual(calls, [(500, 2000), (1000, 2000)])
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.lazymodule"""
+
+__docformat__ = 'restructuredtext'
+
+import os
+import sys
+import shutil
+import tempfile
+from taurus.external import unittest
+from taurus.core.util.lazymodule import LazyModule
+
+_INIT = '''
+from taurus.core.util.lazymodule import LazyModule
+LazyModule.install(__name__, ['mod1', 'mod2', 'broken', 'mod5', 'mod6'],
+                   names={'Single': 'mod3', 'computed': lambda: 42},
+                   optional=['broken'])
+'''
+
+_MODULES = {'mod1': "__all__ = ['A', 'shared']\nA = 1\nshared = 'mod1'\n",
+            'mod2': "B = 2\nshared = 'mod2'\n_private = 0\n",
+            'mod3': "Single = 3\nOther = 4\n",
+            'mod4': "D = 4\n",
+            'mod5': "__all__ = ('E',\n           'F')\nE = F = 5\n",
+            'mod6': "from %(pkg)s.mod5 import *\n",
+            'broken': "raise RuntimeError('cannot be imported')\n"}
+
+
+class LazyModuleTestCase(unittest.TestCase):
+    '''Test case for :class:`taurus.core.util.lazymodule.LazyModule` using
+    a package created in a temporary directory'''
+
+    _count = 0
+
+    def setUp(self):
+        LazyModuleTestCase._count += 1
+        self.name = '_lazypkg%i' % self._count
+        self.tmpdir = tempfile.mkdtemp()
+        path = os.path.join(self.tmpdir, self.name)
+        os.mkdir(path)
+        with open(os.path.join(path, '__init__.py'), 'w') as f:
+            f.write(_INIT)
+        for name, code in _MODULES.items():
+            with open(os.path.join(path, name + '.py'), 'w') as f:
+                f.write(code % {'pkg': self.name})
+        sys.path.insert(0, self.tmpdir)
+        self.pkg = __import__(self.name)
+
+    def tearDown(self):
+        sys.path.remove(self.tmpdir)
+        for name in list(sys.modules):
+            if name == self.name or name.startswith(self.name + '.'):
+                del sys.modules[name]
+        shutil.rmtree(self.tmpdir)
+
+    def isLoaded(self, submodule):
+        return sys.modules.get('%s.%s' % (self.name, submodule)) is not None
+
+    def test_install(self):
+        '''check that the package is replaced and no submodule is imported'''
+        self.assertTrue(isinstance(self.pkg, LazyModule))
+        self.assertTrue(sys.modules[self.name] is self.pkg)
+        for submodule in _MODULES:
+            self.assertFalse(self.isLoaded(submodule))
+
+    def test_names(self):
+        '''check that names are loaded from their submodule on demand'''
+        self.assertEqual(self.pkg.A, 1)
+        self.assertTrue(self.isLoaded('mod1'))
+        self.assertFalse(self.isLoaded('mod2'))
+        self.assertEqual(self.pkg.B, 2)
+        self.assertTrue(self.isLoaded('mod2'))
+        self.assertFalse(hasattr(self.pkg, '_private'))
+
+    def test_star_import_order(self):
+        '''check that later submodules override the names of earlier ones'''
+        self.assertEqual(self.pkg.shared, 'mod2')
+        self.assertTrue(self.isLoaded('mod1'))
+        self.assertEqual(self.pkg.A, 1)
+        self.assertEqual(self.pkg.shared, 'mod2')
+
+    def test_import_order(self):
+        '''check that a submodule imported after a later one does not
+        override its names'''
+        self.assertTrue(self.pkg.mod2 is sys.modules[self.name + '.mod2'])
+        self.assertEqual(self.pkg.shared, 'mod2')
+        self.assertTrue(self.pkg.mod1 is sys.modules[self.name + '.mod1'])
+        self.assertEqual(self.pkg.shared, 'mod2')
+
+    def test_candidates(self):
+        '''check that only the submodules which may provide a name are
+        imported'''
+        self.assertEqual(self.pkg.B, 2)
+        self.assertFalse(self.isLoaded('mod1'))
+        # mod6 star imports, so it may provide any name
+        self.assertEqual(self.pkg.F, 5)
+        self.assertTrue(self.isLoaded('mod5'))
+        self.assertTrue(self.isLoaded('mod6'))
+        self.assertFalse(self.isLoaded('mod1'))
+
+    def test_missing(self):
+        '''check that unknown names only import the submodules which may
+        provide them and that they are remembered'''
+        self.assertFalse(hasattr(self.pkg, 'shared_missing'))
+        self.assertTrue(self.isLoaded('mod6'))
+        for submodule in ('mod1', 'mod2'):
+            self.assertFalse(self.isLoaded(submodule))
+        self.assertTrue('shared_missing' in self.pkg._LazyModule__missing)
+        self.assertRaises(AttributeError, getattr, self.pkg, 'shared_missing')
+
+    def test_explicit_names(self):
+        '''check the names given explicitly'''
+        self.assertEqual(self.pkg.computed, 42)
+        self.assertFalse(self.isLoaded('mod3'))
+        self.assertEqual(self.pkg.Single, 3)
+        self.assertTrue(self.isLoaded('mod3'))
+        self.assertFalse(hasattr(self.pkg, 'Other'))
+
+    def test_from_import(self):
+        '''check the "from package import name" statement'''
+        ns = {}
+        exec 'from %s import B, Single' % self.name in ns
+        self.assertEqual((ns['B'], ns['Single']), (2, 3))
+
+    def test_submodules(self):
+        '''check the access to the submodules as attributes'''
+        self.assertTrue(self.pkg.mod2 is sys.modules[self.name + '.mod2'])
+        self.assertEqual(self.pkg.B, 2)
+        # submodule which is not star-imported
+        self.assertEqual(self.pkg.mod4.D, 4)
+        self.assertFalse(hasattr(self.pkg, 'D'))
+
+    def test_optional(self):
+        '''check that the import errors of optional submodules are ignored'''
+        self.assertRaises(AttributeError, getattr, self.pkg, 'missing')
+        self.assertEqual(self.pkg.B, 2)
+
+    def test_all(self):
+        '''check __all__ and dir()'''
+        expected = ['A', 'B', 'Single', 'computed', 'shared']
+        for name in expected:
+            self.assertTrue(name in self.pkg.__all__)
+        self.assertTrue(set(expected) <= set(dir(self.pkg)))
+        ns = {}
+        exec 'from %s import *' % self.name in ns
+        self.assertEqual(ns['shared'], 'mod2')
+
+
+class TaurusLazyImportsTestCase(unittest.TestCase):
+    '''Checks that the taurus packages import their submodules lazily'''
+
+    def test_core(self):
+        '''check that importing taurus.core does not import the manager'''
+        from taurus.core.util.lazymodule import _lazy_imports_enabled
+        if not _lazy_imports_enabled():
+            self.skipTest('LAZY_IMPORTS is disabled')
+        from taurus.test.bench_imports import loaded_modules
+        modules = loaded_modules('taurus.core')
+        self.assertFalse('taurus.core.taurusmanager' in modules)
+        self.assertFalse('taurus.core.util.codecs' in modules)
+
+    def test_core_names(self):
+        '''check that the public names of taurus.core are available'''
+        import taurus.core
+        from taurus.core.taurusmanager import TaurusManager
+        from taurus.core.taurusexception import TaurusException
+        self.assertTrue(taurus.core.TaurusManager is TaurusManager)
+        self.assertTrue(taurus.core.TaurusException is TaurusException)
+        self.assertTrue('TaurusAttribute' in taurus.core.__all__)
+
+
+if __name__ == '__main__':
+    unittest.main()
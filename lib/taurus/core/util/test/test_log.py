@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for taurus.core.util.log"""
+
+import time
+import logging
+import threading
+
+from taurus.external import unittest
+from taurus.core.util.log import Logger, QueueLogHandler, _Logger
+
+
+class _RecordingHandler(logging.Handler):
+
+    def __init__(self, delay=0):
+        logging.Handler.__init__(self)
+        self.delay = delay
+        self.records = []
+        self.threads = set()
+
+    def emit(self, record):
+        time.sleep(self.delay)
+        self.threads.add(threading.current_thread().name)
+        self.records.append((record.levelno, self.format(record)))
+
+
+class _Unformattable(object):
+
+    def __str__(self):
+        raise AssertionError('the message should not be formatted')
+
+
+class LoggerTestCase(unittest.TestCase):
+    """Test cases for the level checks of the Logger"""
+
+    def setUp(self):
+        self.logger = Logger('TestLogger')
+        self.handler = _RecordingHandler()
+        self.logger.addLogHandler(self.handler)
+        self.logger.log_obj.propagate = False
+        self._level = self.logger.log_obj.level
+
+    def tearDown(self):
+        self.logger.log_obj.removeHandler(self.handler)
+        self.logger.log_obj.propagate = True
+        self.logger.log_obj.setLevel(self._level)
+
+    def test_disabled(self):
+        """Check that disabled messages are neither formatted nor recorded"""
+        self.logger.log_obj.setLevel(Logger.Info)
+        self.logger.debug('%s', _Unformattable())
+        self.logger.trace('%s', _Unformattable())
+        self.assertEqual(self.logger.traceback(Logger.Debug), None)
+        self.assertEqual(self.handler.records, [])
+        self.assertFalse(self.logger.isLogEnabledFor(Logger.Debug))
+
+    def test_level_change(self):
+        """Check that the cached levels follow the changes of level"""
+        self.logger.log_obj.setLevel(Logger.Info)
+        self.logger.debug('hidden')
+        self.logger.log_obj.setLevel(Logger.Debug)
+        self.logger.debug('shown %d', 1)
+        self.assertEqual(self.handler.records, [(Logger.Debug, 'shown 1')])
+        self.logger.log_obj.setLevel(logging.NOTSET)
+        parent = logging.getLogger()
+        level = parent.level
+        try:
+            parent.setLevel(Logger.Error)
+            self.assertFalse(self.logger.isLogEnabledFor(Logger.Warning))
+            parent.setLevel(Logger.Warning)
+            self.assertTrue(self.logger.isLogEnabledFor(Logger.Warning))
+        finally:
+            parent.setLevel(level)
+
+    def test_ancestor_level(self):
+        """Check that the cached levels follow the changes of level of the
+        ancestors which are not taurus loggers"""
+        parent = logging.Logger('TestParent')
+        parent.setLevel(Logger.Error)
+        child = _Logger('TestParent.child')
+        child.parent = parent
+        self.assertFalse(child.isEnabledFor(Logger.Warning))
+        parent.setLevel(Logger.Warning)
+        self.assertTrue(child.isEnabledFor(Logger.Warning))
+
+    def test_level_assignment(self):
+        """Check that assigning the level of a taurus logger is detected"""
+        self.assertTrue(isinstance(self.logger.log_obj, _Logger))
+        self.logger.log_obj.level = Logger.Info
+        self.assertFalse(self.logger.isLogEnabledFor(Logger.Debug))
+        self.logger.log_obj.level = Logger.Debug
+        self.assertTrue(self.logger.isLogEnabledFor(Logger.Debug))
+        self.assertEqual(self.logger.log_obj.level, Logger.Debug)
+
+    def test_caller(self):
+        """Check that the records point to the code which logs"""
+        records = []
+        self.handler.emit = records.append
+        self.logger.warning('caller')
+        self.assertEqual(records[0].funcName, 'test_caller')
+        self.assertTrue(records[0].pathname.startswith(__file__[:-4]))
+
+
+class QueueLogHandlerTestCase(unittest.TestCase):
+    """Test cases for the QueueLogHandler"""
+
+    def setUp(self):
+        self.target = _RecordingHandler(delay=0.01)
+        self.handler = QueueLogHandler(self.target)
+        self.logger = logging.getLogger('TestQueueLogHandler')
+        self.logger.addHandler(self.handler)
+        self.logger.propagate = False
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+    def test_emit(self):
+        """Check that records are emitted in a background thread"""
+        data = [1]
+        t0 = time.time()
+        for i in range(10):
+            self.logger.warning('message %d %s', i, data)
+        self.assertTrue(time.time() - t0 < 0.1)
+        data.append(2)  # the message was already formatted
+        self.handler.flush()
+        self.assertEqual(len(self.target.records), 10)
+        self.assertEqual(self.target.records[-1],
+                         (logging.WARNING, 'message 9 [1]'))
+        self.assertEqual(self.target.threads, set(['TaurusLogQueue']))
+
+    def test_exception(self):
+        """Check that the exception information is kept"""
+        try:
+            raise RuntimeError('boom')
+        except RuntimeError:
+            self.logger.exception('failed')
+        self.handler.flush()
+        msg = self.target.records[0][1]
+        self.assertTrue(msg.startswith('failed\nTraceback'))
+        self.assertTrue('RuntimeError: boom' in msg)
+
+    def test_full(self):
+        """Check that records are dropped when the queue is full"""
+        handler = QueueLogHandler(self.target, capacity=2)
+        try:
+            for i in range(20):
+                handler.handle(logging.makeLogRecord(
+                    {'msg': str(i), 'levelno': logging.WARNING}))
+            self.assertTrue(handler.getDroppedCount() > 0)
+        finally:
+            handler.close()
+        self.assertEqual(len(self.target.records) + handler.getDroppedCount(),
+                         20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for taurus.core.util.remotelogmonitor"""
+
+import sys
+import time
+import socket
+import struct
+import pickle
+import logging
+import logging.handlers
+import threading
+
+from taurus.external import unittest
+from taurus.core.util.remotelogmonitor import LogRecordStreamHandler, \
+    LogRecordSocketReceiver, CompactSocketHandler
+
+
+class _BatchHandler(LogRecordStreamHandler):
+
+    def handleLogRecords(self, records):
+        self.server.data['batches'].append(records)
+
+
+class _Evil(object):
+
+    def __reduce__(self):
+        return (_Evil, ())
+
+
+class RemoteLogMonitorTestCase(unittest.TestCase):
+    """Test cases for the LogRecordSocketReceiver"""
+
+    def setUp(self):
+        self.batches = []
+        self.receiver = None
+        self.clients = []
+
+    def tearDown(self):
+        for client in self.clients:
+            client.close()
+        if self.receiver is not None:
+            self.receiver.stop()
+            self.thread.join()
+
+    def _serve(self, **kwargs):
+        self.receiver = LogRecordSocketReceiver(host='localhost', port=0,
+                                                handler=_BatchHandler,
+                                                batches=self.batches,
+                                                **kwargs)
+        self.receiver.timeout = 0.05
+        self.thread = threading.Thread(
+            target=self.receiver.serve_until_stopped)
+        self.thread.daemon = True
+        self.thread.start()
+        return self.receiver
+
+    def _client(self, klass=CompactSocketHandler):
+        client = klass('localhost', self.receiver.port)
+        self.clients.append(client)
+        return client
+
+    def _records(self, n, timeout=5):
+        t0 = time.time()
+        while time.time() - t0 < timeout:
+            records = [r for batch in self.batches for r in batch]
+            if len(records) >= n:
+                return records
+            time.sleep(0.01)
+        self.fail('%d records received (%d expected)' % (len(records), n))
+
+    def _send(self, client, name, level, msg, *args):
+        client.handle(logging.makeLogRecord(
+            dict(name=name, levelno=level, levelname='X', msg=msg,
+                 args=args)))
+
+    def _wait_stats(self, key, n, timeout=5):
+        t0 = time.time()
+        while time.time() - t0 < timeout:
+            if self.receiver.getStats()[key] >= n:
+                return
+            time.sleep(0.01)
+        self.fail('%s: %r' % (key, self.receiver.getStats()))
+
+    def test_formats(self):
+        """Check the records sent in both wire formats"""
+        self._serve(allow_pickle=True)
+        compact = self._client()
+        pickled = self._client(logging.handlers.SocketHandler)
+        self._send(compact, 'a.b', logging.INFO, 'compact %d', 1)
+        self._send(pickled, u'a.c', logging.ERROR, 'pickled %s', 'x')
+        records = sorted(self._records(2), key=lambda r: r.name)
+        self.assertEqual([(r.name, r.levelno, r.getMessage())
+                          for r in records],
+                         [('a.b', logging.INFO, 'compact 1'),
+                          ('a.c', logging.ERROR, 'pickled x')])
+        for r in records:
+            self.assertEqual(r.hostName, self.receiver.hostName)
+
+    def test_compact_attributes(self):
+        """Check that the compact format keeps the record attributes"""
+        self._serve()
+        client = self._client()
+        try:
+            raise RuntimeError('compact error')
+        except RuntimeError:
+            record = logging.getLogger('compact').makeRecord(
+                'compact', logging.ERROR, 'file.py', 10, 'failed %s',
+                ('here',), sys.exc_info(), extra=dict(custom=[1, 2]))
+        client.handle(record)
+        received = self._records(1)[0]
+        self.assertEqual(received.getMessage(), 'failed here')
+        self.assertTrue('compact error' in received.exc_text)
+        self.assertEqual(received.custom, [1, 2])
+        for attr in ('levelno', 'levelname', 'pathname', 'lineno',
+                     'created', 'thread', 'process'):
+            self.assertEqual(getattr(received, attr), getattr(record, attr))
+
+    def test_batches(self):
+        """Check that the records received together are handled together"""
+        self._serve()
+        client = self._client()
+        data = b''
+        for i in range(100):
+            data += client.makePickle(logging.makeLogRecord(
+                dict(name='batch', levelno=logging.INFO, msg=str(i))))
+        # split a record among two sends
+        client.send(data[:-10])
+        time.sleep(0.1)
+        client.send(data[-10:])
+        records = self._records(100)
+        self.assertEqual([r.msg for r in records],
+                         [str(i) for i in range(100)])
+        self.assertTrue(len(self.batches) < 10)
+
+    def test_filter(self):
+        """Check that the filtered records are discarded"""
+        receiver = self._serve()
+        receiver.setFilter(name='keep', level=logging.WARNING)
+        compact = self._client()
+        pickled = self._client(logging.handlers.SocketHandler)
+        for client in compact, pickled:
+            self._send(client, 'keep', logging.INFO, 'low')
+            self._send(client, 'other', logging.ERROR, 'other')
+            self._send(client, 'keep', logging.ERROR, 'kept')
+        self._wait_stats('received', 6)
+        records = self._records(2)
+        self.assertEqual([r.msg for r in records], ['kept', 'kept'])
+        self.assertEqual(receiver.getStats()['filtered'], 4)
+
+    def test_pickle_rejected(self):
+        """Check that the pickled records are rejected if not allowed and
+        that the ones with globals are always rejected"""
+        receiver = self._serve(allow_pickle=False)
+        pickled = self._client(logging.handlers.SocketHandler)
+        self._send(pickled, 'pickled', logging.INFO, 'pickled')
+        self._wait_stats('rejected', 1)
+        receiver.allow_pickle = True
+        data = pickle.dumps(dict(name='evil', levelno=logging.INFO,
+                                 msg=_Evil()), 1)
+        pickled.send(struct.pack('>L', len(data)) + data)
+        self._wait_stats('rejected', 2)
+        compact = self._client()
+        self._send(compact, 'compact', logging.INFO, 'compact')
+        self.assertEqual([r.name for r in self._records(1)], ['compact'])
+        self.assertEqual(len(self._records(1)), 1)
+
+    def test_many_clients(self):
+        """Check that many clients are served at the same time"""
+        receiver = self._serve()
+        clients = [self._client() for _ in range(50)]
+        for i, client in enumerate(clients):
+            self._send(client, 'client', logging.INFO, '%d', i)
+        records = self._records(50)
+        self.assertEqual(sorted(int(r.getMessage()) for r in records),
+                         list(range(50)))
+        self.assertEqual(receiver.getStats()['connections'], 50)
+        for client in clients:
+            client.close()
+        t0 = time.time()
+        while receiver.getStats()['connections'] and time.time() - t0 < 5:
+            time.sleep(0.01)
+        self.assertEqual(receiver.getStats()['connections'], 0)
+
+    def test_bad_record(self):
+        """Check that a connection sending a too large record is closed"""
+        receiver = self._serve()
+        conn = socket.create_connection(('localhost', receiver.port))
+        try:
+            conn.sendall(struct.pack('>L', 1 << 30) + b'x' * 10)
+            self.assertEqual(conn.recv(10), b'')
+        finally:
+            conn.close()
+
+    def test_stop(self):
+        """Check that stop waits for the serving loop to exit"""
+        receiver = self._serve()
+        receiver.timeout = 0.2
+        serving = []
+        handle_events = receiver.handle_events
+
+        def _handle_events(timeout=None):
+            serving.append(True)
+            handle_events(timeout)
+            serving.pop()
+        receiver.handle_events = _handle_events
+        time.sleep(0.1)
+        self.assertEqual(serving, [True])
+        receiver.stop()
+        self.assertEqual(serving, [])
+        self.thread.join(1)
+        self.assertFalse(self.thread.is_alive())
+        self.receiver = None
+
+    def test_stop_not_serving(self):
+        """Check that a receiver which is not serving is stopped at once"""
+        receiver = LogRecordSocketReceiver(host='localhost', port=0)
+        t0 = time.time()
+        receiver.stop()
+        self.assertTrue(time.time() - t0 < 0.1)
+        # and that it does not serve once stopped
+        receiver.serve_until_stopped()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -27,3 +27,4 @@
 configuration features to the classes that inherit from them"""
 
 from .configuration import *
+from .serializer import *
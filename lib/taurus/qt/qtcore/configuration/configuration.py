@@ -169,8 +169,8 @@ class BaseConfigurableClass:
         dictionary as a string (which you can store as a QSetting, or as a Tango
         Attribute, provided that allowUnpickable==False)::
 
-            import pickle
-            s = pickle.dumps(widget.createConfig())  #s is a string that can be stored
+            from taurus.qt.qtcore.configuration import serializer
+            s = serializer.dumps(widget.createConfig())  #s is a string that can be stored
 
         :param alllowUnpickable:  (bool) if False the returned dict is
                                   guaranteed to be a pickable object. This is
@@ -396,28 +396,34 @@ class BaseConfigurableClass:
         returns the current configuration status encoded as a QByteArray. This
         state can therefore be easily stored using QSettings
 
-        :return: (QByteArray) (in the current implementation this is just a
-                 pickled configdict encoded as a QByteArray
+        :return: (QByteArray) (the configdict serialized with
+                 :mod:`taurus.qt.qtcore.configuration.serializer` and encoded
+                 as a QByteArray)
 
         .. seealso:: :meth:`restoreQConfig`
         '''
         from taurus.external.qt import Qt
-        import cPickle as pickle
+        from taurus.qt.qtcore.configuration import serializer
         configdict = self.createConfig(allowUnpickable=False)
-        return Qt.QByteArray(pickle.dumps(configdict))
+        return Qt.QByteArray(serializer.dumps(configdict))
 
     def applyQConfig(self, qstate):
         '''
         restores the configuration from a qstate generated by :meth:`getQState`.
 
+        The configurations of the registered items are only decoded when they
+        are applied (so those of items not registered in this object are
+        skipped). Configurations pickled by older versions of Taurus are also
+        accepted (unless the CONFIG_ALLOW_PICKLE option is set to False)
+
         :param qstate: (QByteArray)
 
         .. seealso:: :meth:`createQConfig`
         '''
         if qstate.isNull():
             return
-        import cPickle as pickle
-        configdict = pickle.loads(qstate.data())
+        from taurus.qt.qtcore.configuration import serializer
+        configdict = serializer.loads(qstate.data())
         self.applyConfig(configdict)
 
     def saveConfigFile(self, ofile=None):
@@ -427,7 +433,7 @@ class BaseConfigurableClass:
 
         :return: (str) file name used
         """
-        import cPickle as pickle
+        from taurus.qt.qtcore.configuration import serializer
         if ofile is None:
             from taurus.external.qt import Qt
             ofile = unicode(Qt.QFileDialog.getSaveFileName(
@@ -435,10 +441,10 @@ class BaseConfigurableClass:
             if not ofile:
                 return
         if not isinstance(ofile, file):
-            ofile = open(ofile, 'w')
+            ofile = open(ofile, 'wb')
         configdict = self.createConfig(allowUnpickable=False)
         self.info("Saving current settings in '%s'" % ofile.name)
-        pickle.dump(configdict, ofile)
+        serializer.dump(configdict, ofile)
         return ofile.name
 
     def loadConfigFile(self, ifile=None):
@@ -448,7 +454,7 @@ class BaseConfigurableClass:
 
         :return: (str) file name used
         """
-        import cPickle as pickle
+        from taurus.qt.qtcore.configuration import serializer
         if ifile is None:
             from taurus.external.qt import Qt
             ifile = unicode(Qt.QFileDialog.getOpenFileName(
@@ -456,7 +462,7 @@ class BaseConfigurableClass:
             if not ifile:
                 return
         if not isinstance(ifile, file):
-            ifile = open(ifile, 'r')
-        configdict = pickle.load(ifile)
+            ifile = open(ifile, 'rb')
+        configdict = serializer.load(ifile)
         self.applyConfig(configdict)
         return ifile.name
@@ -0,0 +1,574 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""This module provides a compact, versioned binary format for the
+configuration dictionaries created by
+:meth:`BaseConfigurableClass.createConfig`, which avoids pickling them.
+
+The format is a header (:data:`MAGIC` and :data:`FORMAT_VERSION`) followed by
+a single tagged value. Values are encoded in a msgpack-like way (a one byte
+tag followed by the binary payload) and numpy arrays are stored as their raw
+data. The configdicts are stored with their item configurations as
+length-prefixed blocks, so that they can be decoded lazily: the
+`__itemConfigurations__` of a decoded configdict is a
+:class:`LazyItemConfigurations` which only decodes the configuration of an
+item when it is accessed (i.e., when :meth:`applyConfig` reaches a
+registered item).
+
+Example::
+
+    >>> from taurus.qt.qtcore.configuration.serializer import dumps, loads
+    >>> data = dumps(widget.createConfig())
+    >>> widget.applyConfig(loads(data))
+
+Values of types not supported by the format (other than those registered
+with :meth:`ConfigSerializer.registerType`) are embedded as pickles, unless
+the `CONFIG_ALLOW_PICKLE` option of
+:mod:`taurus.tauruscustomsettings` is set to False (in which case they are
+rejected, as are the configurations stored in the old pickle format).
+"""
+
+__all__ = ["ConfigSerializer", "LazyItemConfigurations",
+           "getConfigSerializer"]
+
+__docformat__ = 'restructuredtext'
+
+import struct
+import functools
+import collections
+
+#: first bytes of a serialized configuration (a pickle never starts with them)
+MAGIC = '\x89TCF'
+#: version of the format written by :class:`ConfigSerializer`
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<4sB')
+_U8 = struct.Struct('<B')
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+_U64 = struct.Struct('<Q')
+_F64 = struct.Struct('<d')
+_C128 = struct.Struct('<dd')
+
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+_ITEMS_KEY = '__itemConfigurations__'
+
+
+class LazyItemConfigurations(collections.Mapping):
+    '''A read-only mapping of item names to item configurations which only
+    decodes each configuration when it is first accessed.
+
+    .. warning:: this class is intended for internal use by the configuration
+                 package. It is created by :meth:`ConfigSerializer.loads`
+    '''
+
+    def __init__(self, serializer, data, index):
+        self._serializer = serializer
+        self._data = data
+        self._index = index  # ordered list of (name, offset) tuples
+        self._offsets = dict(index)
+        self._decoded = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._decoded[key]
+        except KeyError:
+            pos = self._offsets[key]
+        value = self._serializer._decode(self._data, pos)[0]
+        self._decoded[key] = value
+        return value
+
+    def __iter__(self):
+        return (name for name, _ in self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._offsets
+
+    def isDecoded(self, key):
+        '''returns True if the configuration of the given item has already
+        been decoded'''
+        return key in self._decoded
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, [n for n, _ in self._index])
+
+
+class ConfigSerializer(object):
+    '''Encoder/decoder of configuration dictionaries in a compact binary
+    format.
+
+    Supported values are None, bool, int, long, float, complex, str, unicode,
+    list, tuple, dict, numpy arrays and scalars and any type registered with
+    :meth:`registerType`. Other values are pickled if `allowPickle` is True
+    and raise a TypeError otherwise.
+
+    :param allowPickle: (bool or None) whether pickles can be written and
+                        read (for unsupported values or for configurations
+                        stored in the old format). If None, the
+                        `CONFIG_ALLOW_PICKLE` option of
+                        :mod:`taurus.tauruscustomsettings` is used
+    '''
+
+    def __init__(self, allowPickle=None):
+        if allowPickle is None:
+            from taurus import tauruscustomsettings
+            allowPickle = getattr(tauruscustomsettings,
+                                  'CONFIG_ALLOW_PICKLE', True)
+        self.allowPickle = allowPickle
+        self._extTypes = []  # list of (klass, name, encode)
+        self._extDecoders = {}
+        self._encoders = {type(None): self._encodeNone,
+                          bool: self._encodeBool,
+                          int: self._encodeInt,
+                          long: self._encodeLong,
+                          float: self._encodeFloat,
+                          complex: self._encodeComplex,
+                          str: self._encodeStr,
+                          unicode: self._encodeUnicode,
+                          list: self._encodeList,
+                          tuple: self._encodeTuple,
+                          dict: self._encodeDict}
+        self._decoders = {'N': self._decodeNone, 'T': self._decodeTrue,
+                          'F': self._decodeFalse, 'i': self._decodeInt,
+                          's': self._decodeShortStr,
+                          'L': self._decodeLong, 'd': self._decodeFloat,
+                          'j': self._decodeComplex, 'b': self._decodeStr,
+                          'u': self._decodeUnicode, 'l': self._decodeList,
+                          't': self._decodeTuple, 'm': self._decodeDict,
+                          'c': self._decodeConfigDict, 'a': self._decodeArray,
+                          'x': self._decodeExt, 'P': self._decodePickle}
+        # same decoders, but configdicts are not decoded lazily
+        self._eagerDecoders = dict(self._decoders)
+        self._eagerDecoders['c'] = functools.partial(self._decodeConfigDict,
+                                                     lazy=False)
+
+    def registerType(self, name, klass, encode, decode):
+        '''Registers a type which is not natively supported by the format.
+
+        :param name: (str) name stored to identify the type in the data
+        :param klass: (class) the type (instances of subclasses are also
+                      encoded with it)
+        :param encode: (callable) returns an encodable value from an instance
+        :param decode: (callable) returns an instance from the value returned
+                       by encode
+        '''
+        self._extTypes.append((klass, name, encode))
+        self._extDecoders[name] = decode
+
+    @staticmethod
+    def isSerialized(data):
+        '''returns True if data (str) starts with the header of this format'''
+        return data[:len(MAGIC)] == MAGIC
+
+    # ------------------------------------------------------------------
+    # encoding
+    # ------------------------------------------------------------------
+
+    def dump(self, obj, ofile):
+        '''Writes obj to a file. Each item configuration of a configdict is
+        written as soon as it is encoded, so the whole data is never held
+        in memory
+
+        :param obj: (object) object to write (usually a configdict)
+        :param ofile: (file) a file object opened for writing in binary mode
+        '''
+        write = ofile.write
+        write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+        self._encode(obj, write)
+
+    def dumps(self, obj):
+        '''returns obj encoded as a str
+
+        :param obj: (object) object to encode (usually a configdict)
+
+        :return: (str)
+        '''
+        chunks = [_HEADER.pack(MAGIC, FORMAT_VERSION)]
+        self._encode(obj, chunks.append)
+        return ''.join(chunks)
+
+    def _encode(self, obj, write):
+        encoder = self._encoders.get(type(obj))
+        if encoder is None:
+            encoder = self._findEncoder(obj)
+        encoder(obj, write)
+
+    def _findEncoder(self, obj):
+        for klass, name, encode in self._extTypes:
+            if isinstance(obj, klass):
+                return lambda o, w: self._encodeExt(name, encode(o), w)
+        for klass, encoder in self._encoders.items():
+            if klass is not bool and isinstance(obj, klass):
+                return encoder
+        numpy = _numpy()
+        if numpy is not None and isinstance(obj, (numpy.ndarray,
+                                                  numpy.generic)):
+            return self._encodeArray
+        if self.allowPickle:
+            return self._encodePickle
+        raise TypeError('Cannot serialize %r (pickling is disabled)' % obj)
+
+    def _encodeNone(self, obj, write):
+        write('N')
+
+    def _encodeBool(self, obj, write):
+        write(obj and 'T' or 'F')
+
+    def _encodeInt(self, obj, write):
+        if _INT64_MIN <= obj <= _INT64_MAX:
+            write('i' + _I64.pack(obj))
+        else:
+            self._encodeLong(obj, write)
+
+    def _encodeLong(self, obj, write):
+        s = str(int(obj)).rstrip('L')
+        write('L' + _U32.pack(len(s)) + s)
+
+    def _encodeFloat(self, obj, write):
+        write('d' + _F64.pack(obj))
+
+    def _encodeComplex(self, obj, write):
+        write('j' + _C128.pack(obj.real, obj.imag))
+
+    def _encodeStr(self, obj, write):
+        n = len(obj)
+        if n < 256:
+            write('s' + chr(n) + obj)
+        else:
+            write('b' + _U32.pack(n))
+            write(obj)
+
+    def _encodeUnicode(self, obj, write):
+        s = obj.encode('utf-8')
+        write('u' + _U32.pack(len(s)))
+        write(s)
+
+    def _encodeList(self, obj, write, tag='l'):
+        write(tag + _U32.pack(len(obj)))
+        for v in obj:
+            self._encode(v, write)
+
+    def _encodeTuple(self, obj, write):
+        self._encodeList(obj, write, tag='t')
+
+    def _encodeDict(self, obj, write):
+        items = obj.get(_ITEMS_KEY)
+        if isinstance(items, collections.Mapping):
+            return self._encodeConfigDict(obj, items, write)
+        write('m' + _U32.pack(len(obj)))
+        for k, v in obj.iteritems():
+            self._encode(k, write)
+            self._encode(v, write)
+
+    def _encodeConfigDict(self, obj, items, write):
+        # the keys other than __itemConfigurations__ are stored first...
+        write('c' + _U32.pack(len(obj) - 1))
+        for k, v in obj.iteritems():
+            if k != _ITEMS_KEY:
+                self._encode(k, write)
+                self._encode(v, write)
+        # ...followed by the item configurations as length-prefixed blocks
+        write(_U32.pack(len(items)))
+        for k, v in items.iteritems():
+            self._encode(k, write)
+            chunks = []
+            self._encode(v, chunks.append)
+            block = ''.join(chunks)
+            write(_U32.pack(len(block)))
+            write(block)
+
+    def _encodeArray(self, obj, write):
+        numpy = _numpy()
+        scalar = not isinstance(obj, numpy.ndarray)
+        obj = numpy.ascontiguousarray(obj) if obj.ndim else numpy.asarray(obj)
+        if obj.dtype.hasobject:
+            return self._encodePickle(obj, write)
+        dtype = obj.dtype.str
+        write('a' + _U8.pack(len(dtype)) + dtype)
+        write(_U8.pack(obj.ndim) + _U8.pack(scalar))
+        for n in obj.shape:
+            write(_U64.pack(n))
+        data = obj.tostring()
+        write(_U64.pack(len(data)))
+        write(data)
+
+    def _encodeExt(self, name, value, write):
+        write('x' + _U8.pack(len(name)) + name)
+        self._encode(value, write)
+
+    def _encodePickle(self, obj, write):
+        import cPickle as pickle
+        s = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        write('P' + _U32.pack(len(s)))
+        write(s)
+
+    # ------------------------------------------------------------------
+    # decoding
+    # ------------------------------------------------------------------
+
+    def load(self, ifile, lazy=True):
+        '''reads an object written by :meth:`dump` (or a legacy pickle) from
+        a file
+
+        :param ifile: (file) a file object opened for reading in binary mode
+        :param lazy: (bool) see :meth:`loads`
+
+        :return: (object)
+        '''
+        return self.loads(ifile.read(), lazy=lazy)
+
+    def loads(self, data, lazy=True):
+        '''returns the object encoded in data (or pickled, if
+        pickles are allowed and data is not in this format)
+
+        :param data: (str) data generated by :meth:`dumps`
+        :param lazy: (bool) if True (default), the item configurations of the
+                     configdicts are only decoded when accessed (see
+                     :class:`LazyItemConfigurations`). If False, plain dicts
+                     are returned
+
+        :return: (object)
+        '''
+        data = str(data)
+        if not self.isSerialized(data):
+            if not self.allowPickle:
+                raise ValueError('Data is not a serialized configuration')
+            import cPickle as pickle
+            return pickle.loads(data)
+        if len(data) < _HEADER.size:
+            raise ValueError('Truncated configuration data')
+        version = _HEADER.unpack_from(data)[1]
+        if version > FORMAT_VERSION:
+            raise ValueError('Unsupported configuration format version %d'
+                             % version)
+        decoders = lazy and self._decoders or self._eagerDecoders
+        obj, pos = self._decode(data, _HEADER.size, decoders)
+        if pos != len(data):
+            raise ValueError('Trailing bytes in configuration data')
+        return obj
+
+    def _decode(self, data, pos, decoders=None):
+        if decoders is None:
+            decoders = self._decoders
+        try:
+            return decoders[data[pos]](data, pos + 1, decoders)
+        except (struct.error, KeyError, IndexError), e:
+            raise ValueError('Corrupt configuration data (%r)' % e)
+
+    # the decoders below get the position after the tag and return the
+    # decoded value and the position after it. The decoders of containers
+    # dispatch directly on the decoders dict (it is faster than _decode)
+
+    def _decodeNone(self, data, pos, decoders):
+        return None, pos
+
+    def _decodeTrue(self, data, pos, decoders):
+        return True, pos
+
+    def _decodeFalse(self, data, pos, decoders):
+        return False, pos
+
+    def _decodeInt(self, data, pos, decoders):
+        return _I64.unpack_from(data, pos)[0], pos + 8
+
+    def _decodeLong(self, data, pos, decoders):
+        s, pos = self._decodeStr(data, pos, decoders)
+        return long(s), pos
+
+    def _decodeFloat(self, data, pos, decoders):
+        return _F64.unpack_from(data, pos)[0], pos + 8
+
+    def _decodeComplex(self, data, pos, decoders):
+        return complex(*_C128.unpack_from(data, pos)), pos + 16
+
+    def _decodeStr(self, data, pos, decoders):
+        end = pos + 4 + _U32.unpack_from(data, pos)[0]
+        if end > len(data):
+            raise ValueError('Truncated configuration data')
+        return data[pos + 4:end], end
+
+    def _decodeShortStr(self, data, pos, decoders):
+        end = pos + 1 + ord(data[pos])
+        return data[pos + 1:end], end
+
+    def _decodeUnicode(self, data, pos, decoders):
+        s, pos = self._decodeStr(data, pos, decoders)
+        return s.decode('utf-8'), pos
+
+    def _decodeList(self, data, pos, decoders):
+        n = _U32.unpack_from(data, pos)[0]
+        pos += 4
+        result = [None] * n
+        for i in xrange(n):
+            result[i], pos = decoders[data[pos]](data, pos + 1, decoders)
+        return result, pos
+
+    def _decodeTuple(self, data, pos, decoders):
+        result, pos = self._decodeList(data, pos, decoders)
+        return tuple(result), pos
+
+    def _decodeDict(self, data, pos, decoders):
+        n = _U32.unpack_from(data, pos)[0]
+        pos += 4
+        result = {}
+        for _ in xrange(n):
+            if data[pos] == 's':  # inlined, since most keys are short str
+                end = pos + 2 + ord(data[pos + 1])
+                k, pos = data[pos + 2:end], end
+            else:
+                k, pos = decoders[data[pos]](data, pos + 1, decoders)
+            result[k], pos = decoders[data[pos]](data, pos + 1, decoders)
+        return result, pos
+
+    def _decodeConfigDict(self, data, pos, decoders, lazy=True):
+        result, pos = self._decodeDict(data, pos, decoders)
+        n = _U32.unpack_from(data, pos)[0]
+        pos += 4
+        index = []
+        for _ in xrange(n):
+            k, pos = decoders[data[pos]](data, pos + 1, decoders)
+            size = _U32.unpack_from(data, pos)[0]
+            pos += 4
+            index.append((k, pos))
+            pos += size
+        if pos > len(data):
+            raise ValueError('Truncated configuration data')
+        if lazy:
+            items = LazyItemConfigurations(self, data, index)
+        else:
+            items = {}
+            for k, p in index:
+                items[k] = decoders[data[p]](data, p + 1, decoders)[0]
+        result[_ITEMS_KEY] = items
+        return result, pos
+
+    def _decodeArray(self, data, pos, decoders):
+        numpy = _numpy()
+        if numpy is None:
+            raise ValueError('numpy is required to decode this configuration')
+        n = _U8.unpack_from(data, pos)[0]
+        pos += 1
+        dtype = numpy.dtype(data[pos:pos + n])
+        pos += n
+        ndim, scalar = _U8.unpack_from(data, pos)[0], data[pos + 1] != '\0'
+        pos += 2
+        shape = []
+        for _ in xrange(ndim):
+            shape.append(_U64.unpack_from(data, pos)[0])
+            pos += 8
+        size = _U64.unpack_from(data, pos)[0]
+        pos += 8
+        if pos + size > len(data):
+            raise ValueError('Truncated configuration data')
+        if size:
+            array = numpy.frombuffer(data, dtype=dtype, offset=pos,
+                                     count=size // dtype.itemsize).copy()
+            array = array.reshape(shape)
+        else:
+            array = numpy.empty(shape, dtype=dtype)
+        if scalar:
+            array = array[()]
+        return array, pos + size
+
+    def _decodeExt(self, data, pos, decoders):
+        n = _U8.unpack_from(data, pos)[0]
+        name = data[pos + 1:pos + 1 + n]
+        pos += 1 + n
+        value, pos = decoders[data[pos]](data, pos + 1, decoders)
+        try:
+            decode = self._extDecoders[name]
+        except KeyError:
+            raise ValueError('Unknown type "%s" in configuration data' % name)
+        return decode(value), pos
+
+    def _decodePickle(self, data, pos, decoders):
+        if not self.allowPickle:
+            raise ValueError('Pickled value found in configuration data '
+                             '(pickling is disabled)')
+        import cPickle as pickle
+        s, pos = self._decodeStr(data, pos, decoders)
+        return pickle.loads(s), pos
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+    return numpy
+
+
+def _registerQtTypes(serializer):
+    '''registers the Qt types commonly found in configurations (e.g., those
+    returned by saveGeometry or saveState)'''
+    try:
+        from taurus.external.qt import Qt
+    except ImportError:
+        return
+    serializer.registerType('QByteArray', Qt.QByteArray,
+                            lambda o: str(o.data()), Qt.QByteArray)
+    serializer.registerType('QColor', Qt.QColor,
+                            lambda o: o.rgba(),
+                            lambda v: Qt.QColor.fromRgba(v))
+
+
+_serializer = None
+
+
+def getConfigSerializer():
+    '''returns the :class:`ConfigSerializer` used by
+    :class:`BaseConfigurableClass` (with the Qt types already registered)
+
+    :return: (ConfigSerializer)
+    '''
+    global _serializer
+    if _serializer is None:
+        _serializer = ConfigSerializer()
+        _registerQtTypes(_serializer)
+    return _serializer
+
+
+def dump(obj, ofile):
+    '''writes obj to ofile (see :meth:`ConfigSerializer.dump`)'''
+    getConfigSerializer().dump(obj, ofile)
+
+
+def dumps(obj):
+    '''returns obj serialized (see :meth:`ConfigSerializer.dumps`)'''
+    return getConfigSerializer().dumps(obj)
+
+
+def load(ifile, lazy=True):
+    '''reads an object from ifile (see :meth:`ConfigSerializer.load`)'''
+    return getConfigSerializer().load(ifile, lazy=lazy)
+
+
+def loads(data, lazy=True):
+    '''returns the object serialized in data (see
+    :meth:`ConfigSerializer.loads`)'''
+    return getConfigSerializer().loads(data, lazy=lazy)
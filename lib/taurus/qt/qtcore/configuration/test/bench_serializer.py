@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Benchmark of the serialization of configdicts with
+:mod:`taurus.qt.qtcore.configuration.serializer` against the pickle format
+previously used by :meth:`BaseConfigurableClass.createQConfig`: it compares
+the size of the data and the time needed to encode it, to decode it and to
+decode only the configuration of a few items (as when applying it to a
+perspective in which most of the panels are not registered).
+
+Run it with::
+
+    python -m taurus.qt.qtcore.configuration.test.bench_serializer [panels [repeat]]
+"""
+
+__all__ = ['perspective_config', 'benchmark', 'main']
+
+__docformat__ = 'restructuredtext'
+
+import sys
+import time
+import cPickle as pickle
+
+import numpy
+
+from taurus.qt.qtcore.configuration.serializer import ConfigSerializer
+
+
+def _configdict(items):
+    return {'ConfigVersion': '__UNVERSIONED__', '__pickable__': True,
+            '__orderedConfigNames__': list(items),
+            '__itemConfigurations__': items}
+
+
+def perspective_config(panels=50, values=20, points=1000):
+    '''returns a configdict similar to the one of a TaurusGui with the
+    given number of panels, each containing a form and a plot
+
+    :param panels: (int) number of panels
+    :param values: (int) number of values of the form of each panel
+    :param points: (int) number of points of the curve of each plot
+
+    :return: (dict) configdict
+    '''
+    items = {}
+    for i in range(panels):
+        form = _configdict(dict(
+            ('value%d' % j,
+             _configdict({'model': u'sys/tg_test/%d/attr%d' % (i, j),
+                          'compact': False, 'modifiableByUser': True}))
+            for j in range(values)))
+        plot = _configdict({'xdata': numpy.linspace(0, 1, points),
+                            'ydata': numpy.random.random(points),
+                            'title': u'Plot %d' % i, 'axes': (0., 1., -1, 1)})
+        items['panel%d' % i] = _configdict({'form': form, 'plot': plot})
+    return _configdict(items)
+
+
+def _best(func, repeat):
+    results = []
+    for _ in range(repeat):
+        t0 = time.time()
+        func()
+        results.append(time.time() - t0)
+    return min(results)
+
+
+def benchmark(config, subset=2, repeat=5):
+    '''Measures the encoding and decoding of config with pickle (protocols 0
+    and 2) and with the :class:`ConfigSerializer`
+
+    :param config: (dict) configdict to measure
+    :param subset: (int) number of items accessed in the partial decoding
+    :param repeat: (int) number of measurements (the best one is used)
+
+    :return: (list<tuple>) (name, size in bytes, dump s, load s,
+             partial load s) for each format
+    '''
+    names = list(config['__itemConfigurations__'])[:subset]
+    serializer = ConfigSerializer(allowPickle=False)
+    formats = [('pickle-0', lambda c: pickle.dumps(c), pickle.loads, False),
+               ('pickle-2', lambda c: pickle.dumps(c, 2), pickle.loads, False),
+               ('tcf', serializer.dumps,
+                lambda d: serializer.loads(d, lazy=False), True)]
+    results = []
+    for name, dumps, loads, lazy in formats:
+        data = dumps(config)
+        t_dump = _best(lambda: dumps(config), repeat)
+        t_load = _best(lambda: loads(data), repeat)
+
+        def partial():
+            d = serializer.loads(data) if lazy else loads(data)
+            for n in names:
+                d['__itemConfigurations__'][n]
+        t_partial = _best(partial, repeat)
+        results.append((name, len(data), t_dump, t_load, t_partial))
+    return results
+
+
+def main():
+    panels = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    print 'Configuration of a perspective with %d panels' % panels
+    print '%-10s %10s %10s %10s %12s' % ('format', 'kB', 'dump ms',
+                                         'load ms', 'partial ms')
+    for name, size, t_dump, t_load, t_partial in benchmark(
+            perspective_config(panels), repeat=repeat):
+        print '%-10s %10.1f %10.1f %10.1f %12.1f' % (
+            name, size / 1024., t_dump * 1e3, t_load * 1e3, t_partial * 1e3)
+
+
+if __name__ == '__main__':
+    main()
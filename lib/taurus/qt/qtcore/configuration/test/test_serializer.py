@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for taurus.qt.qtcore.configuration.serializer"""
+
+import cPickle as pickle
+import StringIO
+
+import numpy
+
+from taurus.external import unittest
+from taurus.qt.qtcore.configuration.serializer import (ConfigSerializer,
+                                                       LazyItemConfigurations,
+                                                       MAGIC)
+
+
+def _configdict(items, version='__UNVERSIONED__'):
+    return {'ConfigVersion': version, '__pickable__': True,
+            '__orderedConfigNames__': sorted(items),
+            '__itemConfigurations__': items}
+
+
+class _Unsupported(object):
+
+    def __eq__(self, other):
+        return isinstance(other, _Unsupported)
+
+
+class ConfigSerializerTestCase(unittest.TestCase):
+    """Test cases for the ConfigSerializer"""
+
+    def setUp(self):
+        self.serializer = ConfigSerializer(allowPickle=True)
+        child = _configdict({'model': u'sys/tg_test/1/double_scalar',
+                             'compact': False})
+        self.config = _configdict({'child': child,
+                                   'values': [1, -2 ** 63, 2 ** 80, 1.5, 2j,
+                                              None, True, ('a', u'\xe9')],
+                                   'map': {1: 'one', (2, 3): {}}})
+
+    def test_roundtrip(self):
+        """Check that the decoded configdict is equal to the encoded one"""
+        data = self.serializer.dumps(self.config)
+        self.assertTrue(data.startswith(MAGIC))
+        self.assertEqual(self.serializer.loads(data, lazy=False), self.config)
+
+    def test_eager(self):
+        """Check that lazy=False decodes all the nested configdicts"""
+        data = self.serializer.dumps(self.config)
+        items = self.serializer.loads(data, lazy=False)['__itemConfigurations__']
+        self.assertTrue(type(items) is dict)
+        self.assertTrue(type(items['child']['__itemConfigurations__']) is dict)
+        # the lazy decoding is not affected
+        items = self.serializer.loads(data)['__itemConfigurations__']
+        self.assertTrue(isinstance(items['child']['__itemConfigurations__'],
+                                   LazyItemConfigurations))
+
+    def test_dump(self):
+        """Check that dump writes the same data as dumps"""
+        f = StringIO.StringIO()
+        self.serializer.dump(self.config, f)
+        self.assertEqual(f.getvalue(), self.serializer.dumps(self.config))
+        f.seek(0)
+        self.assertEqual(self.serializer.load(f, lazy=False), self.config)
+
+    def test_lazy(self):
+        """Check that item configurations are decoded when accessed"""
+        decoded = self.serializer.loads(self.serializer.dumps(self.config))
+        items = decoded['__itemConfigurations__']
+        self.assertTrue(isinstance(items, LazyItemConfigurations))
+        self.assertEqual(list(items), list(self.config['__itemConfigurations__']))
+        self.assertFalse(items.isDecoded('child'))
+        child = items['child']
+        self.assertTrue(items.isDecoded('child'))
+        self.assertFalse(items.isDecoded('values'))
+        self.assertEqual(child['__itemConfigurations__']['model'],
+                         u'sys/tg_test/1/double_scalar')
+        # a lazily decoded configdict can be encoded again
+        self.assertEqual(self.serializer.dumps(decoded),
+                         self.serializer.dumps(self.config))
+
+    def test_numpy(self):
+        """Check that numpy arrays and scalars are preserved"""
+        config = _configdict({'a': numpy.arange(12, dtype='>i2').reshape(3, 4),
+                              'e': numpy.zeros((0, 3)),
+                              's': numpy.float32(1.5)})
+        items = self.serializer.loads(
+            self.serializer.dumps(config))['__itemConfigurations__']
+        self.assertEqual(items['a'].dtype, numpy.dtype('>i2'))
+        self.assertTrue((items['a'] == config['__itemConfigurations__']['a']).all())
+        self.assertEqual(items['e'].shape, (0, 3))
+        self.assertEqual(type(items['s']), numpy.float32)
+
+    def test_registered_type(self):
+        """Check the encoding of registered types"""
+        self.serializer.registerType('set', set, sorted, set)
+        data = self.serializer.dumps({'s': set([3, 1])})
+        self.assertEqual(self.serializer.loads(data), {'s': set([1, 3])})
+        self.assertRaises(ValueError, ConfigSerializer().loads, data)
+
+    def test_pickle_fallback(self):
+        """Check that unsupported values are pickled only if allowed"""
+        data = self.serializer.dumps([_Unsupported()])
+        self.assertEqual(self.serializer.loads(data), [_Unsupported()])
+        nopickle = ConfigSerializer(allowPickle=False)
+        self.assertRaises(TypeError, nopickle.dumps, [_Unsupported()])
+        self.assertRaises(ValueError, nopickle.loads, data)
+
+    def test_legacy_pickle(self):
+        """Check that configurations pickled by older versions are loaded"""
+        data = pickle.dumps(self.config)
+        self.assertEqual(self.serializer.loads(data), self.config)
+        nopickle = ConfigSerializer(allowPickle=False)
+        self.assertRaises(ValueError, nopickle.loads, data)
+
+    def test_corrupt(self):
+        """Check that truncated or unknown data raises ValueError"""
+        data = self.serializer.dumps(self.config)
+        self.assertRaises(ValueError, self.serializer.loads, data[:-5])
+        self.assertRaises(ValueError, self.serializer.loads, data + 'N')
+        newer = MAGIC + chr(255) + data[len(MAGIC) + 1:]
+        self.assertRaises(ValueError, self.serializer.loads, newer)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -33,11 +33,13 @@ __all__ = ["TaurusTreeDevicePartItem", "TaurusTreeDeviceDomainItem",
            "TaurusDbSimpleDeviceAliasModel",
            "TaurusDbPlainServerModel", "TaurusDbServerModel",
            "TaurusDbDeviceClassModel",
-           "TaurusDbBaseProxyModel",
+           "TaurusDbBaseProxyModel", "TrigramIndex",
            "TaurusDbDeviceProxyModel", "TaurusDbServerProxyModel", "TaurusDbDeviceClassProxyModel"]
 
 __docformat__ = 'restructuredtext'
 
+import re
+
 from taurus.external.qt import Qt
 from taurus.core.taurusbasetypes import TaurusElementType, TaurusDevState
 import taurus.qt.qtcore.mimetypes
@@ -662,8 +664,154 @@ class TaurusDbDeviceClassModel(TaurusDbBaseModel):
             rootItem.appendChild(klassItem)
 
 
+class TrigramIndex(object):
+    """An index of the three character substrings (trigrams) of the search
+    keys of a set of items. It gives the items that may contain a given
+    literal string without looking at all of them"""
+
+    def __init__(self):
+        self._index = {}
+
+    def __len__(self):
+        return len(self._index)
+
+    def add(self, key, texts):
+        """Adds the item identified by key with the given (lowercase) texts"""
+        index = self._index
+        for text in texts:
+            for i in xrange(len(text) - 2):
+                trigram = text[i:i + 3]
+                keys = index.get(trigram)
+                if keys is None:
+                    keys = index[trigram] = set()
+                keys.add(key)
+
+    def candidates(self, literal):
+        """Returns the set of keys of the items containing all the trigrams
+        of literal (a superset of the items containing literal) or None if
+        literal is too short to use the index"""
+        literal = literal.lower()
+        if len(literal) < 3:
+            return None
+        sets = []
+        for i in xrange(len(literal) - 2):
+            keys = self._index.get(literal[i:i + 3])
+            if not keys:
+                return set()
+            sets.append(keys)
+        sets.sort(key=len)
+        result = set(sets[0])
+        for keys in sets[1:]:
+            result.intersection_update(keys)
+            if not result:
+                break
+        return result
+
+
+def required_literal(regexp):
+    """Returns the longest string that any text matching the given QRegExp
+    must contain (empty string if it cannot be determined)"""
+    pattern = unicode(regexp.pattern())
+    syntax = regexp.patternSyntax()
+    if syntax == Qt.QRegExp.FixedString:
+        return pattern
+    if syntax not in (Qt.QRegExp.RegExp, Qt.QRegExp.RegExp2):
+        return ''
+    # alternatives, groups and character classes are not analyzed
+    if any(c in pattern for c in '|()['):
+        return ''
+    best, current, i = '', '', 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\':
+            escaped = pattern[i + 1:i + 2]
+            if escaped and not escaped.isalnum():
+                current += escaped
+            else:
+                best, current = max(best, current, key=len), ''
+            i += 2
+            continue
+        if c in '*?{':  # the previous character is optional
+            current = current[:-1]
+        if c in '.^$*?{+':
+            best, current = max(best, current, key=len), ''
+            if c == '{':  # skip the repetition count
+                i = pattern.find('}', i)
+                if i < 0:
+                    break
+        else:
+            current += c
+        i += 1
+    return max(best, current, key=len)
+
+
 class TaurusDbBaseProxyModel(TaurusBaseProxyModel):
-    pass
+    """Base class for the database filter & sort models. The search keys of
+    all the filtered items are precomputed when the filter is first used and
+    if there are at least TrigramIndexMinItems a :class:`TrigramIndex` is
+    built so that only the items containing the literal part of the filter
+    are matched"""
+
+    #: minimum number of items for which the trigram index is built (None
+    #: disables the index)
+    TrigramIndexMinItems = 10000
+
+    def __init__(self, parent=None):
+        self._trigrams = None
+        self._candidates = None
+        TaurusBaseProxyModel.__init__(self, parent)
+
+    def clearSearchKeys(self):
+        TaurusBaseProxyModel.clearSearchKeys(self)
+        self._trigrams = None
+        self._candidates = None
+
+    def searchItems(self):
+        """Returns a sequence of (key, texts) for all the items filtered by
+        this model (see :meth:`TaurusBaseProxyModel.searchKeys`). Default
+        implementation returns an empty sequence (no index is built)"""
+        return ()
+
+    def trigramIndex(self):
+        """Returns the trigram index of the search keys or None if it is
+        not used"""
+        if self._trigrams is None:
+            self._trigrams = False
+            minItems = self.TrigramIndexMinItems
+            items = minItems is not None and self.searchItems()
+            if items and len(items) >= minItems:
+                self._trigrams = index = TrigramIndex()
+                for key, texts in items:
+                    index.add(key, self.searchKeys(key, texts)[1])
+        return self._trigrams or None
+
+    def updateFilter(self):
+        changed = TaurusBaseProxyModel.updateFilter(self)
+        if changed:
+            self._candidates = None
+            literal = required_literal(self.filterRegExp())
+            # the index is only built when it can be used
+            index = len(literal) >= 3 and self.trigramIndex()
+            if index:
+                self._candidates = index.candidates(literal)
+        return changed
+
+    def matches(self, key, texts):
+        self.updateFilter()
+        if self._candidates is not None and key not in self._candidates:
+            return False
+        return TaurusBaseProxyModel.matches(self, key, texts)
+
+    def anyMatches(self, key, items):
+        """Tells if any of the items (a sequence of (key, texts) like the one
+        returned by :meth:`searchItems`) matches the filter. The result is
+        stored with the given key"""
+        self.updateFilter()
+        result = self._matches.get(key)
+        if result is None:
+            result = self._matches[key] = any(
+                self.matches(k, texts) for k, texts in items)
+        return result
 
 
 class TaurusDbDeviceProxyModel(TaurusDbBaseProxyModel):
@@ -673,49 +821,49 @@ class TaurusDbDeviceProxyModel(TaurusDbBaseProxyModel):
            - TaurusDbSimpleDeviceModel
            - TaurusDbPlainDeviceModel"""
 
+    @staticmethod
+    def _deviceItems(devices):
+        return [(d.name(), lambda d=d: (d.name(), d.alias()))
+                for d in devices or ()]
+
+    def searchItems(self):
+        data = self.sourceModel().dataSource()
+        if data is None:
+            return ()
+        if isinstance(data, TangoDatabase):
+            data = data.cache()
+        return self._deviceItems(data.devices().values())
+
     def filterAcceptsRow(self, sourceRow, sourceParent):
         sourceModel = self.sourceModel()
         idx = sourceModel.index(sourceRow, 0, sourceParent)
         treeItem = idx.internalPointer()
-        regexp = self.filterRegExp()
 
         # if domain node, check if it will potentially have any children
         if isinstance(treeItem, TaurusTreeDeviceDomainItem):
             domain = treeItem.display()
-            devices = sourceModel.getDomainDevices(domain)
-            for device in devices:
-                if self.deviceMatches(device, regexp):
-                    return True
-            return False
+            return self.anyMatches(('domain', domain), self._deviceItems(
+                sourceModel.getDomainDevices(domain)))
 
         # if family node, check if it will potentially have any children
         if isinstance(treeItem, TaurusTreeDeviceFamilyItem):
             domain = treeItem.parent().display()
             family = treeItem.display()
-            devices = sourceModel.getFamilyDevices(domain, family)
-            for device in devices:
-                if self.deviceMatches(device, regexp):
-                    return True
-            return False
+            return self.anyMatches(('family', domain, family), self._deviceItems(
+                sourceModel.getFamilyDevices(domain, family)))
 
         if isinstance(treeItem, TaurusTreeDeviceItem) or \
            isinstance(treeItem, TaurusTreeSimpleDeviceItem) or \
            isinstance(treeItem, TaurusTreeDeviceMemberItem):
             device = treeItem.itemData()
-            return self.deviceMatches(device, regexp)
+            return self.deviceMatches(device)
         return True
 
-    def deviceMatches(self, device, regexp):
-        name = device.name()
-
-        # if Qt.QString(name).contains(regexp):
-        if regexp.indexIn(name) != -1:
-            return True
-        name = device.alias()
-        if name is None:
-            return False
-        # return Qt.QString(name).contains(regexp)
-        return regexp.indexIn(name) != -1
+    def deviceMatches(self, device, regexp=None):
+        """Tells if the name or the alias of the device match the filter
+        (regexp is ignored: the current filter is always used)"""
+        return self.matches(device.name(),
+                            lambda: (device.name(), device.alias()))
 
 
 class TaurusDbServerProxyModel(TaurusDbBaseProxyModel):
@@ -725,21 +873,18 @@ class TaurusDbServerProxyModel(TaurusDbBaseProxyModel):
         sourceModel = self.sourceModel()
         idx = sourceModel.index(sourceRow, 0, sourceParent)
         treeItem = idx.internalPointer()
-        regexp = self.filterRegExp()
 
         # if server name node, check if it will potentially have any children
         if isinstance(treeItem, TaurusTreeServerNameItem):
             serverName = treeItem.display()
             serverInstances = sourceModel.getServerNameInstances(serverName)
-            for serverInstance in serverInstances:
-                # if Qt.QString(serverInstance.name()).contains(regexp):
-                if regexp.indexIn(serverInstance.name()) != -1:
-                    return True
-            return False
+            return self.anyMatches(('server', serverName),
+                                   [(s.name(), lambda s=s: (s.name(),))
+                                    for s in serverInstances])
 
         if isinstance(treeItem, TaurusTreeServerItem):
-            # return treeItem.qdisplay().contains(regexp)
-            return regexp.indexIn(treeItem.qdisplay()) != -1
+            return self.matches(treeItem.display(),
+                                lambda: (treeItem.qdisplay(),))
 
         return True
 
@@ -755,7 +900,4 @@ class TaurusDbDeviceClassProxyModel(TaurusDbBaseProxyModel):
         if not isinstance(treeItem, TaurusTreeDeviceClassItem):
             return True
 
-        regexp = self.filterRegExp()
-
-        # return treeItem.qdisplay().contains(regexp)
-        return regexp.indexIn(treeItem.qdisplay()) != -1
+        return self.matches(treeItem.display(), lambda: (treeItem.qdisplay(),))
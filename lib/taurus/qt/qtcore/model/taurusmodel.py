@@ -29,6 +29,8 @@ __all__ = ["TaurusBaseTreeItem", "TaurusBaseModel", "TaurusBaseProxyModel"]
 
 __docformat__ = 'restructuredtext'
 
+import re
+
 from taurus.external.qt import Qt
 from taurus.core.taurusbasetypes import TaurusElementType
 from taurus.core.util.log import Logger
@@ -394,5 +396,92 @@ class TaurusBaseProxyModel(Qt.QSortFilterProxyModel):
         # general configuration
         self.setDynamicSortFilter(True)
 
+        # {item key: (texts, lowercase texts)} (see searchKeys)
+        self._searchKeys = {}
+        # {item key: bool} results of the current filter
+        self._matches = {}
+        self._filterKey = None
+        self._matcher = None
+
     def __getattr__(self, name):
         return getattr(self.sourceModel(), name)
+
+    def setSourceModel(self, model):
+        old = self.sourceModel()
+        if old is not None:
+            try:
+                old.modelReset.disconnect(self.clearSearchKeys)
+            except TypeError:
+                pass
+        self.clearSearchKeys()
+        Qt.QSortFilterProxyModel.setSourceModel(self, model)
+        if model is not None:
+            model.modelReset.connect(self.clearSearchKeys)
+
+    def clearSearchKeys(self):
+        """Forgets the search keys of the items (called when the source model
+        is reset)"""
+        self._searchKeys = {}
+        self._matches = {}
+
+    def searchKeys(self, key, texts):
+        """Returns the (cached) search keys of an item as a tuple
+        (texts, lowercase texts).
+
+        :param key: (object) hashable that identifies the item
+        :param texts: (callable) returns the sequence of strings to be
+                      matched against the filter (only called the first
+                      time the item is seen)"""
+        keys = self._searchKeys.get(key)
+        if keys is None:
+            orig = tuple(unicode(t) for t in texts() if t is not None)
+            keys = self._searchKeys[key] = orig, tuple(t.lower() for t in orig)
+        return keys
+
+    def _compileFilter(self, regexp):
+        """returns a function that tells if any of the search keys of an item
+        matches the given QRegExp"""
+        syntax = regexp.patternSyntax()
+        pattern = unicode(regexp.pattern())
+        insensitive = regexp.caseSensitivity() == QtQt.CaseInsensitive
+        idx = int(insensitive)
+        if not pattern:
+            return lambda keys: True
+        if syntax == Qt.QRegExp.FixedString:
+            if insensitive:
+                pattern = pattern.lower()
+            return lambda keys: any(pattern in t for t in keys[idx])
+        if syntax in (Qt.QRegExp.RegExp, Qt.QRegExp.RegExp2):
+            try:
+                search = re.compile(pattern,
+                                    re.UNICODE | (re.I if insensitive else 0)).search
+                return lambda keys: any(search(t) for t in keys[idx])
+            except re.error:
+                pass
+        # wildcards and expressions python cannot compile are matched by Qt
+        regexp = Qt.QRegExp(regexp)
+        return lambda keys: any(regexp.indexIn(t) != -1 for t in keys[0])
+
+    def updateFilter(self):
+        """Returns True (and forgets the previous results) if the filter
+        changed since the last call"""
+        regexp = self.filterRegExp()
+        key = (unicode(regexp.pattern()), regexp.patternSyntax(),
+               regexp.caseSensitivity())
+        if key == self._filterKey:
+            return False
+        self._filterKey = key
+        self._matcher = self._compileFilter(regexp)
+        self._matches = {}
+        return True
+
+    def matches(self, key, texts):
+        """Tells if the item identified by key matches the current filter.
+        The search keys of the item (see :meth:`searchKeys`) are computed only
+        once and the result is kept until the filter changes"""
+        self.updateFilter()
+        result = self._matches.get(key)
+        if result is None:
+            result = self._matches[key] = bool(
+                self._matcher(self.searchKeys(key, texts)))
+        return result
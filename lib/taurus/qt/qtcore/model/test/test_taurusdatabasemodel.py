@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for the filter index of taurus.qt.qtcore.model.taurusdatabasemodel"""
+
+from taurus.external import unittest
+from taurus.external.qt import Qt
+from taurus.qt.qtcore.model.taurusdatabasemodel import (TrigramIndex,
+                                                        required_literal)
+
+
+class TrigramIndexTestCase(unittest.TestCase):
+    """Test cases for the TrigramIndex"""
+
+    def setUp(self):
+        self.texts = {1: ['sys/tg_test/1', 'tangotest'],
+                      2: ['sys/database/2', 'databaseds'],
+                      3: ['lt01/vc/ip-01'],
+                      4: ['ab']}
+        self.index = TrigramIndex()
+        for key, texts in self.texts.items():
+            self.index.add(key, texts)
+
+    def _scan(self, literal):
+        literal = literal.lower()
+        return set(k for k, texts in self.texts.items()
+                   if any(literal in t for t in texts))
+
+    def test_candidates(self):
+        '''Check that the candidates contain all the items with the literal'''
+        for literal in ('sys/', 'test', 'tangotest', 'BASE', 'ip-01',
+                        'database/2', 'lt01/vc/ip-01', 'xyz', 'ts/t'):
+            candidates = self.index.candidates(literal)
+            self.assertTrue(candidates is not None, literal)
+            self.assertTrue(candidates >= self._scan(literal), literal)
+
+    def test_exact(self):
+        '''Check that items without some trigram are discarded'''
+        self.assertEqual(self.index.candidates('tg_test'), set([1]))
+        self.assertEqual(self.index.candidates('sys/'), set([1, 2]))
+        self.assertEqual(self.index.candidates('xyz'), set())
+        self.assertEqual(self.index.candidates('lt01/database'), set())
+        # all the trigrams exist but not together in any item
+        self.index.add(5, ['abc'])
+        self.index.add(6, ['bcd'])
+        self.assertEqual(self.index.candidates('abcd'), set())
+
+    def test_short(self):
+        '''Check that literals under 3 characters do not use the index'''
+        for literal in ('', 'a', 'ab', '/1'):
+            self.assertEqual(self.index.candidates(literal), None)
+        # texts under 3 characters are not indexed
+        self.assertEqual(self.index.candidates('abc'), set())
+
+    def test_add(self):
+        '''Check that adding texts to an existing key extends its trigrams'''
+        self.index.add(4, ['abcd'])
+        self.assertEqual(self.index.candidates('bcd'), set([4]))
+        self.assertEqual(self.index.candidates('sys'), set([1, 2]))
+
+
+class RequiredLiteralTestCase(unittest.TestCase):
+    """Test cases for required_literal"""
+
+    def _literal(self, pattern, syntax=Qt.QRegExp.RegExp):
+        return required_literal(Qt.QRegExp(pattern, Qt.Qt.CaseInsensitive,
+                                           syntax))
+
+    def test_plain(self):
+        '''Check the literal of patterns without special characters'''
+        self.assertEqual(self._literal('sys/tg_test'), 'sys/tg_test')
+        self.assertEqual(self._literal(''), '')
+
+    def test_wildcards(self):
+        '''Check that "." and optional characters split the literal'''
+        self.assertEqual(self._literal('sys/.*/double'), '/double')
+        self.assertEqual(self._literal('^sys/tg.test$'), 'sys/tg')
+        self.assertEqual(self._literal('tango*test'), 'tang')
+        self.assertEqual(self._literal('tangos?test'), 'tango')
+        self.assertEqual(self._literal('ab?cdef'), 'cdef')
+        self.assertEqual(self._literal('*'), '')
+        self.assertEqual(self._literal('?'), '')
+
+    def test_repetitions(self):
+        '''Check that "+" keeps the character and "{m,n}" drops it'''
+        self.assertEqual(self._literal('tangos+test'), 'tangos')
+        self.assertEqual(self._literal('ab{0,2}cdef'), 'cdef')
+        self.assertEqual(self._literal('abcd{2}ef'), 'abc')
+        self.assertEqual(self._literal('ab{2,'), 'a')
+
+    def test_escapes(self):
+        '''Check that escaped characters are literal unless they are
+        character classes'''
+        self.assertEqual(self._literal(r'sys\/tg\.test'), 'sys/tg.test')
+        self.assertEqual(self._literal(r'a\.*bc'), 'bc')
+        self.assertEqual(self._literal(r'dbl\d+scalar'), 'scalar')
+        self.assertEqual(self._literal('abc\\'), 'abc')
+
+    def test_not_analyzed(self):
+        '''Check that alternations, groups and classes give no literal'''
+        for pattern in ('double|float', 'sys/(tg_test)', 'sys/[a-z]+test'):
+            self.assertEqual(self._literal(pattern), '')
+
+    def test_syntax(self):
+        '''Check the FixedString and Wildcard syntaxes'''
+        self.assertEqual(self._literal('a.b*c', Qt.QRegExp.FixedString),
+                         'a.b*c')
+        self.assertEqual(self._literal('sys/*', Qt.QRegExp.Wildcard), '')
+        self.assertEqual(self._literal('sys/+test', Qt.QRegExp.RegExp2),
+                         'sys/')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,4 +28,5 @@ class."""
 
 __docformat__ = 'restructuredtext'
 
-from .taurusapplication import *
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['taurusapplication'])
@@ -40,7 +40,7 @@ import threading
 
 from taurus.external.qt import Qt
 
-from taurus.core.util.log import LogExceptHook, Logger
+from taurus.core.util.log import LogExceptHook, Logger, QueueLogHandler
 import taurus.core.util.argparse
 
 
@@ -329,6 +329,10 @@ class TaurusApplication(Qt.QApplication, Logger):
                 log_file_name = self.__buildLogFileName()
             f_h = logging.handlers.RotatingFileHandler(log_file_name,
                                                        maxBytes=maxBytes, backupCount=backupCount)
+            # write the file from a background thread (see ASYNC_LOG_HANDLERS)
+            from taurus import tauruscustomsettings
+            if getattr(tauruscustomsettings, 'ASYNC_LOG_HANDLERS', True):
+                f_h = QueueLogHandler(f_h)
             Logger.addRootLogHandler(f_h)
             if self._out is not None:
                 self._out.std = sys.__stdout__
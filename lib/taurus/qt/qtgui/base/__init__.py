@@ -28,5 +28,5 @@ should inherit to be considered valid taurus widgets."""
 
 __docformat__ = 'restructuredtext'
 
-from .taurusbase import *
-from .tauruscontroller import *
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['taurusbase', 'tauruscontroller'])
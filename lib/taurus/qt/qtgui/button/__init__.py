@@ -27,5 +27,5 @@
 
 __docformat__ = 'restructuredtext'
 
-from .qbuttonbox import *
-from .taurusbutton import *
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['qbuttonbox', 'taurusbutton'])
@@ -28,5 +28,5 @@ to provide several functionalities in a reduced space"""
 
 __docformat__ = 'restructuredtext'
 
-from .abstractswitcher import *
-from .basicswitcher import *
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['abstractswitcher', 'basicswitcher'])
@@ -27,11 +27,8 @@
 
 __docformat__ = 'restructuredtext'
 
-from .qcontainer import *
-from .taurusbasecontainer import *
-from .taurusframe import *
-from .tauruswidget import *
-from .taurusgroupbox import *
-from .taurusgroupwidget import *
-from .taurusscrollarea import *
-from .taurusmainwindow import *
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['qcontainer', 'taurusbasecontainer',
+                               'taurusframe', 'tauruswidget',
+                               'taurusgroupbox', 'taurusgroupwidget',
+                               'taurusscrollarea', 'taurusmainwindow'])
@@ -28,5 +28,5 @@ panels like forms or panels to be inserted in dialogs"""
 
 __docformat__ = 'restructuredtext'
 
-from .taurusmessagebox import *
-from .taurusinputdialog import *
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['taurusmessagebox', 'taurusinputdialog'])
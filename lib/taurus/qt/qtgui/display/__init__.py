@@ -29,11 +29,7 @@ Examples of widgets that suite this rule are labels, leds and LCDs"""
 
 __docformat__ = 'restructuredtext'
 
-from .qfallback import *
-from .qpixmapwidget import *
-from .qled import *
-from .qlogo import *
-from .qsevensegment import *
-from .tauruslabel import *
-from .taurusled import *
-from .tauruslcd import *
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['qfallback', 'qpixmapwidget', 'qled', 'qlogo',
+                               'qsevensegment', 'tauruslabel', 'taurusled',
+                               'tauruslcd'])
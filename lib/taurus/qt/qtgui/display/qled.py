@@ -33,7 +33,7 @@ import sys
 
 from taurus.external.qt import Qt
 from taurus.core.util.enumeration import Enumeration
-from taurus.qt.qtgui.icon import getCachedPixmap
+from taurus.qt.qtgui.icon import getCachedPixmap, preloadPixmaps
 from taurus.qt.qtgui.display.qpixmapwidget import QPixmapWidget
 
 LedColor = Enumeration("LedColor",  [
@@ -102,11 +102,54 @@ class QLed(QPixmapWidget):
 
     def _refresh(self):
         """internal usage only"""
-        self._ledName = self.toLedName()
+        ledName = self.toLedName()
+        if ledName == self._ledName and not self.getPixmap().isNull():
+            return
+        self._ledName = ledName
         pixmap = getCachedPixmap(self._ledName)
         self.setPixmap(pixmap)
         return self.update()
 
+    @classmethod
+    def preloadLedPixmaps(cls, sizes=(24,), colors=None, pattern=None,
+                          threaded=False):
+        """Renders in advance the led images of the given sizes, so that
+        the leds do not need to scale them when they change. Call it from the
+        GUI thread (e.g. when the application starts).
+
+        :param sizes: the sizes (in pixels) of the leds
+        :type  sizes: seq<int>
+        :param colors: the led colors (default: all the :obj:`LedColor`)
+        :type  colors: seq<str>
+        :param pattern: the led pattern name (default: DefaultLedPattern)
+        :type  pattern: str
+        :param threaded: if True, the images are rendered in a background
+                         thread (see :func:`taurus.qt.qtgui.icon.preloadPixmaps`)
+        :type  threaded: bool"""
+        if colors is None:
+            colors = [c.lower() for c in LedColor.keys()]
+        if pattern is None:
+            pattern = cls.DefaultLedPattern
+        names = [pattern.format(color=c, status=s)
+                 for c in colors for s in ('on', 'off')]
+        sizes = list(sizes)
+        if not threaded:
+            for name in names:
+                pixmap = getCachedPixmap(name)
+                for size in sizes:
+                    cls.getScaledPixmap(pixmap, Qt.QSize(size, size))
+            return
+
+        originals = {}
+
+        def insert(name, size, pixmap):
+            if size is None:
+                originals[name] = pixmap
+            elif name in originals and not pixmap.isNull():
+                cls.insertScaledPixmap(originals[name], pixmap)
+
+        preloadPixmaps(names, [None] + sizes, threaded=True, callback=insert)
+
     @classmethod
     def getQtDesignerPluginInfo(cls):
         return {
@@ -30,6 +30,7 @@ __all__ = ["QPixmapWidget"]
 __docformat__ = 'restructuredtext'
 
 from taurus.external.qt import Qt
+from taurus.qt.qtgui.icon import getPixmapCache
 
 
 class QPixmapWidget(Qt.QWidget):
@@ -60,8 +61,55 @@ class QPixmapWidget(Qt.QWidget):
         origPixmap = self._pixmap
         if origPixmap.isNull():
             return origPixmap
-        return origPixmap.scaled(self.size(), self._pixmapAspectRatioMode,
-                                 self._pixmapTransformationMode)
+        return self.getScaledPixmap(origPixmap, self.size(),
+                                    self._pixmapAspectRatioMode,
+                                    self._pixmapTransformationMode)
+
+    @staticmethod
+    def _scaledPixmapKey(pixmap, size, transformationMode):
+        return "QPixmapWidget_%d_%dx%d_%d" % (pixmap.cacheKey(), size.width(),
+                                              size.height(),
+                                              int(transformationMode))
+
+    @classmethod
+    def getScaledPixmap(cls, pixmap, size,
+                        aspectRatioMode=DefaultAspectRatioMode,
+                        transformationMode=DefaultTransformationMode):
+        """Returns the given pixmap scaled to the given size. The scaled
+        pixmaps are kept in the :func:`~taurus.qt.qtgui.icon.getPixmapCache`,
+        so that the widgets showing the same pixmap with the same size share
+        them.
+
+        :param pixmap: the pixmap
+        :type  pixmap: PyQt4.Qt.QPixmap
+        :param size: the size
+        :type  size: PyQt4.Qt.QSize
+        :return: the scaled pixmap
+        :rtype: PyQt4.Qt.QPixmap"""
+        target = pixmap.size().scaled(size, aspectRatioMode)
+        if target == pixmap.size():
+            return pixmap
+        cache = getPixmapCache()
+        key = cls._scaledPixmapKey(pixmap, target, transformationMode)
+        scaled = cache.find(key)
+        if scaled is None:
+            scaled = pixmap.scaled(target, Qt.Qt.IgnoreAspectRatio,
+                                   transformationMode)
+            cache.insert(key, scaled)
+        return scaled
+
+    @classmethod
+    def insertScaledPixmap(cls, pixmap, scaled,
+                           transformationMode=DefaultTransformationMode):
+        """Caches a scaled version of the given pixmap (e.g. rendered in
+        advance), to be returned by :meth:`getScaledPixmap`
+
+        :param pixmap: the original pixmap
+        :type  pixmap: PyQt4.Qt.QPixmap
+        :param scaled: the scaled pixmap
+        :type  scaled: PyQt4.Qt.QPixmap"""
+        key = cls._scaledPixmapKey(pixmap, scaled.size(), transformationMode)
+        getPixmapCache().insert(key, scaled)
 
     def _setDirty(self):
         self._pixmapDrawn = None
@@ -27,7 +27,8 @@
 
 __docformat__ = 'restructuredtext'
 
-from .tauruseditor import *
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['tauruseditor'])
 
 # try:
 #    from .tauruseditor import *
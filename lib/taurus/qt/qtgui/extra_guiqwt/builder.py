@@ -88,6 +88,11 @@ class TaurusPlotItemBuilder(guiqwt.builder.PlotItemBuilder):
         """
         Extension to meth:`guiqwt.builder.PlotItemBuilder.image` to support passing a
         'taurusmodel' as a keyword argument instead passing 'data' or 'filename'.
+        When a 'taurusmodel' is passed, the 'max_display_fps' keyword argument
+        can be used to limit the rate at which new frames are displayed, and
+        the 'clip_to_view' and 'auto_downsample' keyword arguments can be used
+        to display only the visible region of the image, binned to the screen
+        resolution.
         """
         if taurusmodel is None:
             image = guiqwt.builder.PlotItemBuilder.image(self, **kwargs)
@@ -108,6 +113,9 @@ class TaurusPlotItemBuilder(guiqwt.builder.PlotItemBuilder):
             yformat = kwargs.get('yformat', '%.1f')
             zformat = kwargs.get('zformat', '%.1f')
             forceRGB = kwargs.get('force_rgb', False)
+            max_display_fps = kwargs.get('max_display_fps', 0)
+            clip_to_view = kwargs.get('clip_to_view', False)
+            auto_downsample = kwargs.get('auto_downsample', False)
 
             assert isinstance(xdata, (tuple, list)) and len(xdata) == 2
             assert isinstance(ydata, (tuple, list)) and len(ydata) == 2
@@ -148,6 +156,9 @@ class TaurusPlotItemBuilder(guiqwt.builder.PlotItemBuilder):
                     image = TaurusEncodedImageItem(param)
                 else:
                     image = TaurusImageItem(param)
+            image.setMaxDisplayFps(max_display_fps)
+            image.setClipToView(clip_to_view)
+            image.setAutoDownsample(auto_downsample)
             image.setModel(taurusmodel)
             if eliminate_outliers is not None:
                 image.set_lut_range(lut_range_threshold(image, 256,
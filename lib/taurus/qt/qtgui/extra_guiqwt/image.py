@@ -35,34 +35,195 @@ from taurus.external.qt import Qt
 from taurus.qt.qtgui.base import TaurusBaseComponent
 from taurus.qt.qtcore.util.signal import baseSignal
 import taurus.core
-from taurus.core.util.containers import ArrayBuffer
+from taurus.core.util.containers import ArrayBuffer, LatestValueMailbox
+from taurus.core.util.eventfilters import filterEvent
 
 from guiqwt.image import ImageItem, RGBImageItem, XYImageItem
 from guiqwt.image import INTERP_NEAREST, INTERP_LINEAR
 
+import time
 import numpy
 
 
+def _visibleRegion(shape, extent, view, margin=None, canvasSize=None):
+    '''Returns the region of an image which is within a view and the factors
+    for binning it to the resolution of the screen.
+
+    :param shape: (tuple<int>) shape of the image (ny, nx, ...)
+    :param extent: (tuple<float>) (xmin, xmax, ymin, ymax) plot coordinates
+                   of the image
+    :param view: (tuple<float>) (vx0, vx1, vy0, vy1) limits of the view in
+                 plot coordinates
+    :param margin: (float or None) fraction of the view size added on each
+                   side of the view. If None, the image is not clipped
+    :param canvasSize: (tuple<int> or None) (width, height) in pixels of the
+                       canvas. If None, the image is not binned
+
+    :return: (tuple) (x0, x1, y0, y1) data indices of the region and the
+             (fx, fy) binning factors
+    '''
+    ny, nx = shape[:2]
+    xmin, xmax, ymin, ymax = extent
+    dx = (xmax - xmin) / float(nx)
+    dy = (ymax - ymin) / float(ny)
+    x0, x1, y0, y1 = 0, nx, 0, ny
+    fx = fy = 1
+    if dx == 0 or dy == 0:
+        return (x0, x1, y0, y1), (fx, fy)
+    vx0, vx1, vy0, vy1 = view
+    # view limits in (fractional) data indices
+    ix0, ix1 = sorted(((vx0 - xmin) / dx, (vx1 - xmin) / dx))
+    iy0, iy1 = sorted(((vy0 - ymin) / dy, (vy1 - ymin) / dy))
+    if margin is not None:
+        mx = (ix1 - ix0) * margin
+        my = (iy1 - iy0) * margin
+        x0 = int(min(max(numpy.floor(ix0 - mx), 0), nx))
+        x1 = int(min(max(numpy.ceil(ix1 + mx), 0), nx))
+        y0 = int(min(max(numpy.floor(iy0 - my), 0), ny))
+        y1 = int(min(max(numpy.ceil(iy1 + my), 0), ny))
+        if x1 <= x0 or y1 <= y0:
+            # the image is not visible. Show it all
+            x0, x1, y0, y1 = 0, nx, 0, ny
+    if canvasSize is not None:
+        width, height = max(canvasSize[0], 1), max(canvasSize[1], 1)
+        fx = max(1, int((min(ix1, nx) - max(ix0, 0)) / width))
+        fy = max(1, int((min(iy1, ny) - max(iy0, 0)) / height))
+        fx = min(fx, x1 - x0)
+        fy = min(fy, y1 - y0)
+    return (x0, x1, y0, y1), (fx, fy)
+
+
+def _binRegion(data, region, factors, keepDtype=False):
+    '''Returns a region of an image binned by the given factors (averaging
+    blocks of fy x fx pixels). The last rows and columns of the region are
+    discarded if its size is not a multiple of the factors.
+
+    :param data: (numpy.ndarray) the image (ny, nx, ...)
+    :param region: (tuple<int>) (x0, x1, y0, y1) data indices of the region
+    :param factors: (tuple<int>) (fx, fy) binning factors
+    :param keepDtype: (bool) whether the result must have the dtype of data
+                      (otherwise, a float array is returned if binning)
+
+    :return: (numpy.ndarray)
+    '''
+    x0, x1, y0, y1 = region
+    fx, fy = factors
+    x1 = x0 + (x1 - x0) // fx * fx
+    y1 = y0 + (y1 - y0) // fy * fy
+    region = data[y0:y1, x0:x1]
+    if fx > 1 or fy > 1:
+        ny, nx = region.shape[:2]
+        shape = (ny // fy, fy, nx // fx, fx) + region.shape[2:]
+        binned = region.reshape(shape).mean(axis=(1, 3))
+        if keepDtype:
+            binned = binned.astype(data.dtype)
+        region = binned
+    return region
+
+
 class TaurusBaseImageItem(TaurusBaseComponent):
-    '''A ImageItem that gets its data from a taurus attribute'''
+    '''A ImageItem that gets its data from a taurus attribute.
+
+    Frames are pre-processed (see :meth:`filterData`) in the thread that
+    receives the taurus event and are passed to the GUI thread through a
+    :class:`taurus.core.util.containers.LatestValueMailbox`, so that frames
+    arriving faster than they can be displayed are dropped instead of queued.
+    The display rate can be further limited with :meth:`setMaxDisplayFps`.
+
+    Optionally, only the part of the image within the current view can be
+    passed to guiqwt (see :meth:`setClipToView`) and it can be binned so that
+    its resolution does not exceed that of the screen (see
+    :meth:`setAutoDownsample`). Note that, in this case, the data of the item
+    (e.g. the one used by the cross sections) is the clipped/binned one.
+    '''
 
     dataChanged = baseSignal('dataChanged')
 
+    #: whether the lut range (min/max of the data) should be pre-computed
+    #: out of the GUI thread
+    _precomputeLutRange = True
+
+    #: seconds after which the GUI thread is notified again of a pending
+    #: frame if no maximum display rate is set (see :meth:`eventReceived`)
+    _renotifyPeriod = 1.
+
+    #: whether the item supports clipping to the view and downsampling
+    _supportsResampling = True
+
+    #: fraction of the view size added on each side when clipping to view
+    _clipMargin = 0.1
+
+    def __init__(self, name, parent=None, designMode=False):
+        TaurusBaseComponent.__init__(self, name, parent=parent,
+                                     designMode=designMode)
+        self._frameMailbox = LatestValueMailbox()
+        self._maxDisplayFps = 0
+        self._lastDisplayTime = 0
+        self._displayScheduled = False
+        self._notifyTime = 0
+        self._framesDisplayed = 0
+        self._clipToView = False
+        self._autoDownsample = False
+        self._fullFrame = None
+        self._fullExtent = None
+        self._resampleKey = None
+        self._viewSignalsPlot = None
+
     def setModel(self, model):
+        # discard any frame pending from the previous model
+        self._frameMailbox.take()
         # do the standard stuff
         TaurusBaseComponent.setModel(self, model)
-        #... and fire a fake event for initialization
+        #... and process a fake event for initialization
         try:
             value = self.getModelObj().read()
-            self.fireEvent(
+            self.eventReceived(
                 self, taurus.core.taurusbasetypes.TaurusEventType.Change, value)
         except:
             pass
 
-    def handleEvent(self, evt_src, evt_type, evt_value):
-        if evt_value is None or getattr(evt_value, 'rvalue', None) is None:
-            self.debug('Ignoring event from %s' % repr(evt_src))
+    def eventReceived(self, evt_src, evt_type, evt_value):
+        '''Reimplemented to prepare the frame (see :meth:`prepareFrame`) in
+        the thread that receives the event and to store it in the frame
+        mailbox. The GUI thread is only notified if it is not already
+        pending to display a previous frame (which will be dropped), unless
+        that notification was sent more than one display period ago (in
+        which case it is assumed to be lost and it is sent again)
+        '''
+        evt = filterEvent(evt_src, evt_type, evt_value,
+                          filters=self._preFilters)
+        if evt is None:
+            return
+        frame = self.prepareFrame(evt[2])
+        if frame is None:
             return
+        if self._frameMailbox.put(frame) or self._isNotificationLost():
+            self._notifyTime = time.time()
+            self.fireEvent(*evt)
+
+    def _isNotificationLost(self):
+        '''whether the GUI thread was notified of the pending frame longer
+        than one display period ago'''
+        if self._maxDisplayFps > 0:
+            period = 1. / self._maxDisplayFps
+        else:
+            period = self._renotifyPeriod
+        return time.time() - self._notifyTime > period
+
+    def prepareFrame(self, evt_value):
+        '''Extracts the image from the event value and pre-processes it.
+        This is called in the thread that received the event, so it must not
+        access the plot or any other GUI object.
+
+        :param evt_value: (TaurusAttrValue) event value
+
+        :return: (tuple<object, tuple or None>) the data to be passed to
+                 set_data and the (min, max) of the data (or None if it was
+                 not computed). None is returned if the event is to be ignored
+        '''
+        if evt_value is None or getattr(evt_value, 'rvalue', None) is None:
+            self.debug('Ignoring event with value %s' % repr(evt_value))
+            return None
         v = evt_value.rvalue
         if isinstance(v, Quantity):
             v = v.magnitude
@@ -71,13 +232,67 @@ class TaurusBaseImageItem(TaurusBaseComponent):
             v = self.filterData(v)
         except Exception, e:
             self.info('Ignoring event. Reason: %s', e.message)
+            return None
+        data_range = None
+        if self._precomputeLutRange:
+            try:
+                data_range = numpy.nanmin(v), numpy.nanmax(v)
+            except Exception:
+                pass  # let guiqwt compute it
+        return v, data_range
+
+    def filterEvent(self, evt_src=-1, evt_type=-1, evt_value=-1):
+        '''Reimplemented to discard the pending frame if the event filters
+        discard its event (otherwise the mailbox would never be emptied)'''
+        if (evt_src, evt_type, evt_value) == (-1, -1, -1):
+            # see TaurusBaseComponent.filterEvent. The frame is discarded
+            # since this notification is the only one it would get
+            self._frameMailbox.take()
+            return
+        evt = filterEvent(evt_src, evt_type, evt_value,
+                          filters=self._eventFilters)
+        if evt is None:
+            self._frameMailbox.take()
+        else:
+            self.handleEvent(*evt)
+
+    def handleEvent(self, evt_src, evt_type, evt_value):
+        '''Displays the latest frame from the mailbox (if any), respecting the
+        maximum display rate'''
+        if self._frameMailbox.isEmpty():
+            return
+        if self._maxDisplayFps > 0:
+            wait = self._lastDisplayTime + 1. / self._maxDisplayFps - time.time()
+            if wait > 0:
+                if not self._displayScheduled:
+                    self._displayScheduled = True
+                    Qt.QTimer.singleShot(int(wait * 1000) + 1,
+                                         self._displayScheduledFrame)
+                return
+        self._displayFrame()
+
+    def _displayScheduledFrame(self):
+        self._displayScheduled = False
+        self._displayFrame()
+
+    def _displayFrame(self):
+        frame = self._frameMailbox.take()
+        if frame is None:
             return
+        v, data_range = frame
         # this is the range of the z axis (color scale)
         lut_range = self.get_lut_range()
-        # if the range was not set, make it None (autoscale z axis)
+        # if the range was not set, use the range of the data (autoscale)
         if lut_range[0] == lut_range[1]:
-            lut_range = None
-        self.set_data(v, lut_range=lut_range)
+            lut_range = data_range
+        self._lastDisplayTime = time.time()
+        self._framesDisplayed += 1
+        if self._isResampling():
+            self._fullFrame = v
+            self._resampleKey = None
+            self._updateResampledData(lut_range=lut_range)
+        else:
+            self.set_data(v, lut_range=lut_range)
         self.dataChanged.emit()
         p = self.plot()
 
@@ -85,6 +300,204 @@ class TaurusBaseImageItem(TaurusBaseComponent):
             p.update_colormap_axis(self)
             p.replot()
 
+    def _isResampling(self):
+        return self._supportsResampling and (self._clipToView or
+                                             self._autoDownsample)
+
+    def setClipToView(self, enable):
+        '''Enables/disables passing to guiqwt only the part of the image
+        which is within the current view of the plot (plus a margin). The
+        clipped region is recomputed on each new frame and on each change of
+        the plot axes (zoom, pan)
+
+        :param enable: (bool)
+        '''
+        self._clipToView = bool(enable)
+        self._resamplingChanged()
+
+    def getClipToView(self):
+        '''Whether the image is clipped to the current view
+
+        :return: (bool)
+        '''
+        return self._clipToView
+
+    def resetClipToView(self):
+        '''Disables clipping to the current view'''
+        self.setClipToView(False)
+
+    def setAutoDownsample(self, enable):
+        '''Enables/disables binning the image (averaging blocks of NxM
+        pixels) so that the number of displayed image pixels does not exceed
+        the number of screen pixels used by the plot canvas. The binning
+        factors are recomputed on each new frame and on each change of the
+        plot axes (zoom, pan)
+
+        :param enable: (bool)
+        '''
+        self._autoDownsample = bool(enable)
+        self._resamplingChanged()
+
+    def getAutoDownsample(self):
+        '''Whether the image is binned according to the screen resolution
+
+        :return: (bool)
+        '''
+        return self._autoDownsample
+
+    def resetAutoDownsample(self):
+        '''Disables the automatic binning of the image'''
+        self.setAutoDownsample(False)
+
+    def _resamplingChanged(self):
+        if not self._supportsResampling:
+            return
+        if self._isResampling():
+            self._connectViewSignals(self.plot())
+            if self._fullFrame is None and self.data is not None:
+                self._fullFrame = self.data
+        elif self._fullFrame is not None:
+            # restore the full frame and the original extent
+            data, self._fullFrame = self._fullFrame, None
+            if self._fullExtent is not None:
+                xmin, xmax, ymin, ymax = self._fullExtent
+                self.set_xdata(xmin, xmax)
+                self.set_ydata(ymin, ymax)
+                self._fullExtent = None
+            self.set_data(data, lut_range=self.get_lut_range())
+            self._resampleKey = None
+            return
+        self._resampleKey = None
+        self._onViewChanged()
+
+    def _connectViewSignals(self, plot):
+        '''connects the axis changes of the plot to :meth:`_onViewChanged`'''
+        if plot is None or plot is self._viewSignalsPlot:
+            return
+        # TODO: drop support for guiqwt2 once we support guiqwt3
+        import guiqwt
+        _guiqwt_major_version = int(guiqwt.__version__.split('.')[0])
+        if _guiqwt_major_version < 3:
+            from guiqwt.signals import SIG_PLOT_AXIS_CHANGED
+            plot.connect(plot, SIG_PLOT_AXIS_CHANGED, self._onViewChanged)
+        else:
+            plot.SIG_PLOT_AXIS_CHANGED.connect(self._onViewChanged)
+        self._viewSignalsPlot = plot
+
+    def _onViewChanged(self, *args):
+        '''recomputes the displayed data when the plot axes change'''
+        if self._fullFrame is None or not self._isResampling():
+            return
+        if self._updateResampledData(lut_range=self.get_lut_range()):
+            self.dataChanged.emit()
+            p = self.plot()
+            if p is not None:
+                p.replot()
+
+    def fullBoundingRect(self):
+        '''Returns the bounding rectangle of the full image (i.e., not only
+        of the clipped region, if clipping to view)
+
+        :return: (QRectF)
+        '''
+        if getattr(self, '_fullFrame', None) is None:
+            return self.bounds
+        xmin, xmax, ymin, ymax = self._getFullExtent(self._fullFrame)
+        return Qt.QRectF(Qt.QPointF(xmin, ymin), Qt.QPointF(xmax, ymax))
+
+    def _getFullExtent(self, data):
+        '''returns the (xmin, xmax, ymin, ymax) plot coordinates of the full
+        image'''
+        if self._fullExtent is None:
+            self._fullExtent = self.xmin, self.xmax, self.ymin, self.ymax
+        xmin, xmax, ymin, ymax = self._fullExtent
+        ny, nx = data.shape[:2]
+        if xmin is None:
+            xmin = 0.
+        if xmax is None:
+            xmax = float(nx)
+        if ymin is None:
+            ymin = 0.
+        if ymax is None:
+            ymax = float(ny)
+        return xmin, xmax, ymin, ymax
+
+    def _getVisibleRegion(self, data, extent):
+        '''returns the (x0, x1, y0, y1) data indices of the region to be
+        displayed and the binning factors (fx, fy)'''
+        ny, nx = data.shape[:2]
+        plot = self.plot()
+        if plot is None:
+            return (0, nx, 0, ny), (1, 1)
+        view = (tuple(plot.get_axis_limits(self.xAxis())) +
+                tuple(plot.get_axis_limits(self.yAxis())))
+        canvasSize = None
+        if self._autoDownsample:
+            canvas = plot.canvas()
+            canvasSize = canvas.width(), canvas.height()
+        margin = self._clipMargin if self._clipToView else None
+        return _visibleRegion(data.shape, extent, view, margin=margin,
+                             canvasSize=canvasSize)
+
+    def _updateResampledData(self, lut_range=None):
+        '''sets as the item data the clipped and binned version of the last
+        full frame. Returns True if the data was updated (it is not updated
+        if neither the frame nor the region to display changed)'''
+        data = self._fullFrame
+        extent = self._getFullExtent(data)
+        (x0, x1, y0, y1), (fx, fy) = self._getVisibleRegion(data, extent)
+        # trim the region to a multiple of the binning factors
+        x1 = x0 + (x1 - x0) // fx * fx
+        y1 = y0 + (y1 - y0) // fy * fy
+        key = x0, x1, y0, y1, fx, fy
+        if key == self._resampleKey:
+            return False
+        self._resampleKey = key
+        # (RGB) images must keep their dtype
+        region = _binRegion(data, (x0, x1, y0, y1), (fx, fy),
+                           keepDtype=not self._precomputeLutRange)
+        xmin, xmax, ymin, ymax = extent
+        dx = (xmax - xmin) / data.shape[1]
+        dy = (ymax - ymin) / data.shape[0]
+        self.set_xdata(xmin + x0 * dx, xmin + x1 * dx)
+        self.set_ydata(ymin + y0 * dy, ymin + y1 * dy)
+        self.set_data(region, lut_range=lut_range)
+        return True
+
+    def setMaxDisplayFps(self, fps):
+        '''Sets the maximum rate at which new frames are displayed. Frames
+        received at a higher rate are dropped (only the latest one is shown)
+
+        :param fps: (float) maximum frames per second. 0 means no limit
+        '''
+        self._maxDisplayFps = max(0, fps or 0)
+
+    def getMaxDisplayFps(self):
+        '''Returns the maximum display rate
+
+        :return: (float) maximum frames per second (0 means no limit)
+        '''
+        return self._maxDisplayFps
+
+    def resetMaxDisplayFps(self):
+        '''Removes the limit on the display rate'''
+        self.setMaxDisplayFps(0)
+
+    def getFrameCounters(self):
+        '''Returns the number of frames received, displayed and dropped since
+        the item was created (or since :meth:`resetFrameCounters` was called)
+
+        :return: (dict) with "received", "displayed" and "dropped" keys
+        '''
+        c = self._frameMailbox.counters()
+        return dict(received=c['received'], displayed=self._framesDisplayed,
+                    dropped=c['dropped'])
+
+    def resetFrameCounters(self):
+        '''Resets the received/displayed/dropped frame counters'''
+        self._frameMailbox.resetCounters()
+        self._framesDisplayed = 0
+
     def filterData(self, data):
         '''Reimplement this method if you want to pre-process
         the data that will be passed to set_data.
@@ -92,6 +505,9 @@ class TaurusBaseImageItem(TaurusBaseComponent):
         It should return something acceptable by :meth:`setData`
         and raise an exception if the data cannot be processed.
 
+        Note that this method is called from the thread that received the
+        event (not necessarily the GUI thread).
+
         This default implementation casts array types not
         supported by guiqwt to numpy.int32
 
@@ -124,17 +540,6 @@ class TaurusBaseImageItem(TaurusBaseComponent):
 class TaurusEncodedBaseImageItem(TaurusBaseImageItem):
     '''A ImageItem that gets its data from a taurus DevEncoded attribute'''
 
-    def setModel(self, model):
-        # do the standard stuff
-        TaurusBaseComponent.setModel(self, model)
-        #... and fire a fake event for initialization
-        try:
-            fmt, value = self.codec.decode(self.getModelObj().read())
-            self.fireEvent(
-                self, taurus.core.taurusbasetypes.TaurusEventType.Change, value)
-        except:
-            pass
-
     def filterData(self, data):
         '''reimplementation to decode data using the DevEncoded codecs'''
         if type(data) == tuple:
@@ -147,26 +552,7 @@ class TaurusEncodedBaseImageItem(TaurusBaseImageItem):
                 self.info('Decoder error: %s', e.message)
                 raise e
 
-            try:
-                dtype = decoded_data.dtype
-                v = decoded_data
-            except:
-                # note that this is potentially expensive
-                v = numpy.array(decoded_data)
-                dtype = v.dtype
-
-            if dtype not in (float, numpy.double, numpy.int32, numpy.uint16,
-                             numpy.int16, numpy.uint8, numpy.int8, bool):
-                # note: numpy.uint32 was not included because of
-                # https://sourceforge.net/p/tauruslib/tickets/33/
-                try:
-                    self.debug('casting to numpy.int32')
-                    v = numpy.int32(v)
-                except OverflowError:
-                    raise OverflowError(
-                        "type %s not supported by guiqwt and cannot be casted to int32" % repr(v.dtype))
-
-            return v
+            return TaurusBaseImageItem.filterData(self, decoded_data)
         else:
             raise ValueError(
                 'Unexpected data type (%s) for DevEncoded attribute (tuple expected)' % type(data))
@@ -179,6 +565,16 @@ class TaurusImageItem(ImageItem, TaurusBaseImageItem):
         ImageItem.__init__(self, numpy.zeros((1, 1)), param=param)
         TaurusBaseImageItem.__init__(self, self.__class__.__name__)
 
+    def attach(self, plot):
+        '''reimplemented to follow the view changes of the plot'''
+        ImageItem.attach(self, plot)
+        if self._isResampling():
+            self._connectViewSignals(plot)
+
+    def boundingRect(self):
+        '''reimplemented to return the bounds of the full image'''
+        return self.fullBoundingRect()
+
 
 class TaurusEncodedImageItem(ImageItem, TaurusEncodedBaseImageItem):
     '''A ImageItem that gets its data from a DevEncoded attribute'''
@@ -187,10 +583,22 @@ class TaurusEncodedImageItem(ImageItem, TaurusEncodedBaseImageItem):
         ImageItem.__init__(self, numpy.zeros((1, 1)), param=param)
         TaurusEncodedBaseImageItem.__init__(self, self.__class__.__name__)
 
+    def attach(self, plot):
+        '''reimplemented to follow the view changes of the plot'''
+        ImageItem.attach(self, plot)
+        if self._isResampling():
+            self._connectViewSignals(plot)
+
+    def boundingRect(self):
+        '''reimplemented to return the bounds of the full image'''
+        return self.fullBoundingRect()
+
 
 class TaurusXYImageItem(XYImageItem, TaurusBaseImageItem):
     '''A XYImageItem that gets its data from a taurus attribute'''
 
+    _supportsResampling = False
+
     def __init__(self, param=None):
         XYImageItem.__init__(self, numpy.arange(2), numpy.arange(
             2), numpy.zeros((2, 2)), param=param)
@@ -200,10 +608,23 @@ class TaurusXYImageItem(XYImageItem, TaurusBaseImageItem):
 class TaurusRGBImageItem(RGBImageItem, TaurusBaseImageItem):
     '''A RGBImageItem that gets its data from a taurus attribute'''
 
+    # set_data ignores the lut range for RGB images
+    _precomputeLutRange = False
+
     def __init__(self, param=None):
         RGBImageItem.__init__(self, numpy.zeros((1, 1, 3)), param=param)
         TaurusBaseImageItem.__init__(self, self.__class__.__name__)
 
+    def attach(self, plot):
+        '''reimplemented to follow the view changes of the plot'''
+        RGBImageItem.attach(self, plot)
+        if self._isResampling():
+            self._connectViewSignals(plot)
+
+    def boundingRect(self):
+        '''reimplemented to return the bounds of the full image'''
+        return self.fullBoundingRect()
+
     def set_data(self, data, lut_range=None, **kwargs):
         '''dummy reimplementation to accept the lut_range kwarg (just ignoring it)'''
         return RGBImageItem.set_data(self, data, **kwargs)
@@ -212,10 +633,23 @@ class TaurusRGBImageItem(RGBImageItem, TaurusBaseImageItem):
 class TaurusEncodedRGBImageItem(RGBImageItem, TaurusEncodedBaseImageItem):
     '''A RGBImageItem that gets its data from a DevEncoded attribute'''
 
+    # set_data ignores the lut range for RGB images
+    _precomputeLutRange = False
+
     def __init__(self, param=None):
         RGBImageItem.__init__(self, numpy.zeros((1, 1, 3)), param=param)
         TaurusEncodedBaseImageItem.__init__(self, self.__class__.__name__)
 
+    def attach(self, plot):
+        '''reimplemented to follow the view changes of the plot'''
+        RGBImageItem.attach(self, plot)
+        if self._isResampling():
+            self._connectViewSignals(plot)
+
+    def boundingRect(self):
+        '''reimplemented to return the bounds of the full image'''
+        return self.fullBoundingRect()
+
     def set_data(self, data, lut_range=None, **kwargs):
         '''dummy reimplementation to accept the lut_range kwarg (just ignoring it)'''
         return RGBImageItem.set_data(self, data, **kwargs)
@@ -537,9 +971,16 @@ def taurusImageMain():
     parser = taurus.core.util.argparse.get_taurus_parser()
     parser.set_usage("%prog [options] [<model1> [<model2>] ...]")
     parser.set_description("a taurus application for plotting 2D data sets")
+    parser.add_option("--max-fps", dest="max_fps", type="float", default=0,
+                      help="maximum display rate for the images (0=no limit)")
+    parser.add_option("--resample", dest="resample", action="store_true",
+                      default=False,
+                      help="display only the visible region of the images, "
+                           "binned to the screen resolution")
     app = TaurusApplication(
         cmd_line_parser=parser, app_name="taurusimage", app_version=taurus.Release.version)
     args = app.get_command_line_args()
+    options = app.get_command_line_options()
 
     # create a dialog with a plot and add the images
     win = ImageDialog(edit=False, toolbar=True, wintitle="Taurus Image",
@@ -558,7 +999,9 @@ def taurusImageMain():
     # add images from given models
     plot = win.get_plot()
     for m in args:
-        img = make.image(taurusmodel=m)
+        img = make.image(taurusmodel=m, max_display_fps=options.max_fps,
+                         clip_to_view=options.resample,
+                         auto_downsample=options.resample)
         plot.add_item(img)
         # IMPORTANT: connect the cross section plots to the taurusimage so that
         # they are updated when the taurus data changes
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for the taurus guiqwt image items"""
+
+import time
+
+import numpy
+
+from taurus.external import unittest
+from taurus.core.taurusbasetypes import TaurusEventType
+from taurus.qt.qtgui.test import BaseWidgetTestCase
+from taurus.qt.qtgui.extra_guiqwt.image import (TaurusImageItem,
+                                                _visibleRegion, _binRegion)
+
+
+class _Value(object):
+
+    '''a minimal attribute value (only the rvalue member is used)'''
+
+    def __init__(self, rvalue):
+        self.rvalue = rvalue
+
+
+class TaurusImageItemFramesTest(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Tests for the frame dropping of the taurus image items
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = TaurusImageItem
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self._notifications = []
+        # record the notifications to the GUI thread instead of emitting them
+        self._widget.fireEvent = lambda *evt: self._notifications.append(evt)
+
+    def _send(self, value):
+        data = numpy.ones((4, 4)) * value
+        self._widget.eventReceived(None, TaurusEventType.Change, _Value(data))
+
+    def _deliver(self):
+        '''processes the last notification as the GUI thread would do'''
+        self._widget.filterEvent(*self._notifications[-1])
+
+    def test_drop(self):
+        '''Check that only the latest of the pending frames is displayed'''
+        for i in range(3):
+            self._send(i)
+        self.assertEqual(len(self._notifications), 1)
+        self._deliver()
+        self.assertEqual(self._widget.data[0, 0], 2)
+        self.assertEqual(self._widget.getFrameCounters(),
+                         dict(received=3, displayed=1, dropped=2))
+
+    def test_counters(self):
+        '''Check the frame counters and their reset'''
+        for i in range(2):
+            self._send(i)
+            self._deliver()
+        self.assertEqual(self._widget.getFrameCounters(),
+                         dict(received=2, displayed=2, dropped=0))
+        self._widget.resetFrameCounters()
+        self.assertEqual(self._widget.getFrameCounters(),
+                         dict(received=0, displayed=0, dropped=0))
+
+    def test_max_display_fps(self):
+        '''Check that frames are not displayed faster than the max rate'''
+        self._widget.setMaxDisplayFps(1)
+        self.assertEqual(self._widget.getMaxDisplayFps(), 1)
+        self._send(1)
+        self._deliver()
+        self._send(2)
+        self._deliver()
+        self.assertEqual(self._widget.data[0, 0], 1)
+        self.assertEqual(self._widget.getFrameCounters()['displayed'], 1)
+        # the second frame waits for the scheduled display
+        self._widget._lastDisplayTime = time.time() - 1
+        self._widget._displayScheduledFrame()
+        self.assertEqual(self._widget.data[0, 0], 2)
+        self._widget.resetMaxDisplayFps()
+        self.assertEqual(self._widget.getMaxDisplayFps(), 0)
+
+    def test_lost_notification(self):
+        '''Check that the GUI thread is notified again if the notification
+        of a pending frame was lost'''
+        self._send(1)
+        self._send(2)
+        self.assertEqual(len(self._notifications), 1)
+        self._widget._notifyTime -= self._widget._renotifyPeriod + 1
+        self._send(3)
+        self.assertEqual(len(self._notifications), 2)
+        self._deliver()
+        self.assertEqual(self._widget.data[0, 0], 3)
+
+    def test_disconnected_notification(self):
+        '''Check that a notification received without arguments (PyQt bug)
+        does not block the next frames'''
+        self._send(1)
+        self._widget.filterEvent()
+        self._send(2)
+        self.assertEqual(len(self._notifications), 2)
+
+    def test_setModel(self):
+        '''Check that setModel discards the frame of the previous model'''
+        self._send(1)
+        self._widget.setModel('')
+        self.assertTrue(self._widget._frameMailbox.isEmpty())
+        self._send(2)
+        self.assertEqual(len(self._notifications), 2)
+
+
+class ResamplingTest(unittest.TestCase):
+
+    '''
+    Tests for the clipping and binning of the images to the view
+    '''
+    # a 200x100 image whose pixels are one plot unit wide
+    shape = (100, 200)
+    extent = (0., 200., 0., 100.)
+
+    def test_no_resampling(self):
+        '''Check that the full image is shown without clipping nor binning'''
+        r = _visibleRegion(self.shape, self.extent, (50, 100, 20, 40))
+        self.assertEqual(r, ((0, 200, 0, 100), (1, 1)))
+
+    def test_clip(self):
+        '''Check the clipping of the image to the view plus the margin'''
+        r = _visibleRegion(self.shape, self.extent, (50, 100, 20, 40),
+                           margin=0.1)
+        self.assertEqual(r, ((45, 105, 18, 42), (1, 1)))
+
+    def test_clip_inverted_axis(self):
+        '''Check the clipping with the limits of an inverted axis'''
+        r = _visibleRegion(self.shape, self.extent, (50, 100, 40, 20),
+                           margin=0.1)
+        self.assertEqual(r, ((45, 105, 18, 42), (1, 1)))
+
+    def test_clip_edge(self):
+        '''Check the clipping of a view partially out of the image'''
+        r = _visibleRegion(self.shape, self.extent, (190, 250, -10, 10),
+                           margin=0)
+        self.assertEqual(r, ((190, 200, 0, 10), (1, 1)))
+
+    def test_clip_out_of_view(self):
+        '''Check that the full image is shown if it is out of view'''
+        r = _visibleRegion(self.shape, self.extent, (500, 600, 500, 600),
+                           margin=0.1)
+        self.assertEqual(r, ((0, 200, 0, 100), (1, 1)))
+
+    def test_zoom_out(self):
+        '''Check a view beyond the image bounds: the image is not clipped
+        and it is binned according to its visible part'''
+        r = _visibleRegion(self.shape, self.extent, (-100, 300, -50, 150),
+                           margin=0.1, canvasSize=(100, 50))
+        self.assertEqual(r, ((0, 200, 0, 100), (2, 2)))
+
+    def test_bin_limited_by_region(self):
+        '''Check that the binning factors do not exceed the region size'''
+        r = _visibleRegion(self.shape, self.extent, (10, 13, 10, 12),
+                           margin=0, canvasSize=(0, 0))
+        self.assertEqual(r, ((10, 13, 10, 12), (3, 2)))
+
+    def test_empty_extent(self):
+        '''Check that an image with an empty extent is not resampled'''
+        r = _visibleRegion(self.shape, (0., 0., 0., 100.), (50, 100, 20, 40),
+                           margin=0.1, canvasSize=(10, 10))
+        self.assertEqual(r, ((0, 200, 0, 100), (1, 1)))
+
+    def test_bin_odd_size(self):
+        '''Check the binning of a region whose size is not a multiple of
+        the factors'''
+        data = numpy.arange(35.).reshape(7, 5)
+        binned = _binRegion(data, (0, 5, 0, 7), (2, 3))
+        self.assertEqual(binned.shape, (2, 2))
+        self.assertEqual(binned[0, 0], data[0:3, 0:2].mean())
+        self.assertEqual(binned[1, 1], data[3:6, 2:4].mean())
+
+    def test_bin_edge_tile(self):
+        '''Check the binning of a region at the edge of the image'''
+        data = numpy.arange(35.).reshape(7, 5)
+        binned = _binRegion(data, (3, 5, 4, 7), (2, 2))
+        self.assertEqual(binned.shape, (1, 1))
+        self.assertEqual(binned[0, 0], data[4:6, 3:5].mean())
+
+    def test_bin_rgb(self):
+        '''Check that binned RGB images keep their dtype'''
+        data = numpy.zeros((4, 6, 3), dtype=numpy.uint8)
+        data[:2, :2] = 255
+        binned = _binRegion(data, (0, 6, 0, 4), (2, 2), keepDtype=True)
+        self.assertEqual(binned.shape, (2, 3, 3))
+        self.assertEqual(binned.dtype, numpy.uint8)
+        self.assertEqual(binned[0, 0].tolist(), [255, 255, 255])
+
+    def test_no_bin(self):
+        '''Check that a region with unit factors is just sliced'''
+        data = numpy.arange(35.).reshape(7, 5)
+        region = _binRegion(data, (1, 4, 2, 5), (1, 1))
+        self.assertEqual(region.tolist(), data[2:5, 1:4].tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -27,13 +27,6 @@
 
 __docformat__ = 'restructuredtext'
 
-from .taurusgraphic import *
-from .taurusgraphicview import *
-
-try:
-    from .jdraw import *
-except:
-    import taurus.core.util.log
-    _logger = taurus.core.util.log.Logger(__name__)
-    _logger.debug("jdraw widgets could not be initialized")
-    _logger.traceback()
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['taurusgraphic', 'taurusgraphicview', 'jdraw'],
+                    optional=['jdraw'])
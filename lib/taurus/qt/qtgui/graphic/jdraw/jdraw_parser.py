@@ -27,11 +27,15 @@
 
 from __future__ import absolute_import
 
-__all__ = ["new_parser", "parse"]
+__all__ = ["new_parser", "parse", "clear_cache"]
 
 import os
 import re
 import imp
+import sys
+import marshal
+import hashlib
+import threading
 
 from ply import lex
 from ply import yacc
@@ -343,22 +347,189 @@ def new_parser(optimize=None, debug=0, outputdir=None):
     return l, p
 
 
-def parse(filename=None, factory=None):
+#: version of the parse cache file format. It must be increased whenever the
+#: grammar actions change what is passed to the factory
+CACHE_VERSION = 1
 
-    if filename is None or factory is None:
+_CACHE_MAGIC = 'TAURUS-JDRAW-CACHE'
+
+_parser = None
+_parserLock = threading.Lock()
+
+
+def _get_parser():
+    """Returns the (lexer, parser) shared by all calls to :func:`parse`.
+    Note that the parser is not reentrant: use it while holding _parserLock
+    """
+    global _parser
+    if _parser is None:
+        l, p = new_parser()
+        # the grammar actions log through the lexer and the parser
+        l.log = p.log = Logger('JDraw Parser')
+        _parser = l, p
+    return _parser
+
+
+class _RecordingFactory(object):
+    """A factory that, instead of creating the graphics items, returns the
+    calls that the parser does. The result of a parse using this factory is a
+    tree of (name, params) tuples (name is None for the scene) that can be
+    cached and replayed on the real factory with :func:`_replay`"""
+
+    def getSceneObj(self, items):
+        return (None, items)
+
+    def getObj(self, name, params):
+        return (name, params)
+
+
+def _is_element_list(value):
+    return isinstance(value, list) and bool(value) and \
+        isinstance(value[0], tuple)
+
+
+def _replay(node, factory):
+    """Calls the factory methods recorded in node (in the same order in which
+    the parser would call them) and returns the created object"""
+    name, params = node
+    if name is None:
+        return factory.getSceneObj(_replay_elements(params, factory))
+    params = dict(params)
+    for k, v in params.items():
+        if _is_element_list(v):
+            params[k] = _replay_elements(v, factory)
+    return factory.getObj(name, params)
+
+
+def _replay_elements(elements, factory):
+    ret = [_replay(e, factory) for e in elements]
+    # the parser discards the elements that could not be created (except the
+    # first of each list)
+    return ret[:1] + [e for e in ret[1:] if e is not None]
+
+
+def _parse_tree(text):
+    """parses a jdraw text into a tree of factory calls (see
+    :class:`_RecordingFactory`)"""
+    with _parserLock:
+        l, p = _get_parser()
+        p.factory = _RecordingFactory()
+        p.modelStack = []
+        p.modelStack2 = []
+        l.lineno = 1
+        try:
+            return p.parse(text, lexer=l)
+        finally:
+            p.factory = None
+
+
+def _get_cache_dir():
+    return os.path.join(os.path.expanduser('~'), '.taurus', 'jdraw_cache')
+
+
+def _get_cache_filename(filename):
+    key = hashlib.sha1(os.path.realpath(filename)).hexdigest()
+    return os.path.join(_get_cache_dir(), key + '.jdc')
+
+
+def _cache_header():
+    return '%s %d %d.%d\n' % ((_CACHE_MAGIC, CACHE_VERSION) +
+                              tuple(sys.version_info[:2]))
+
+
+def _load_cached_tree(filename, mtime, digest):
+    """returns the cached tree for the given file or None if there is no
+    valid cache for it"""
+    cachename = _get_cache_filename(filename)
+    if not os.path.exists(cachename):
+        return None
+    log = Logger('JDraw Parser')
+    try:
+        with open(cachename, 'rb') as f:
+            if f.readline() != _cache_header():
+                log.debug('Ignoring cache for %s (other version)', filename)
+                return None
+            data = marshal.load(f)
+    except Exception:
+        log.debug('Cannot read cache for %s', filename, exc_info=1)
+        return None
+    if (data.get('source') != filename or data.get('mtime') != mtime or
+            data.get('sha1') != digest):
+        log.debug('Ignoring cache for %s (source changed)', filename)
+        return None
+    return data['tree']
+
+
+def _save_cached_tree(filename, mtime, digest, tree):
+    cachename = _get_cache_filename(filename)
+    data = dict(source=filename, mtime=mtime, sha1=digest, tree=tree)
+    tmpname = '%s.%d.tmp' % (cachename, os.getpid())
+    try:
+        if not os.path.exists(os.path.dirname(cachename)):
+            os.makedirs(os.path.dirname(cachename))
+        with open(tmpname, 'wb') as f:
+            f.write(_cache_header())
+            marshal.dump(data, f)
+        os.rename(tmpname, cachename)
+    except Exception:
+        Logger('JDraw Parser').debug('Cannot write cache for %s', filename,
+                                     exc_info=1)
+        if os.path.exists(tmpname):
+            os.remove(tmpname)
+
+
+def clear_cache():
+    """Removes all the cached parse results"""
+    cachedir = _get_cache_dir()
+    if not os.path.isdir(cachedir):
         return
+    for name in os.listdir(cachedir):
+        if name.endswith('.jdc'):
+            os.remove(os.path.join(cachedir, name))
 
-    _, p = new_parser()
 
-    p.factory = factory
-    p.modelStack = []
-    p.modelStack2 = []
+def parse(filename=None, factory=None, cache=None):
+    """Parses a jdraw file and builds the scene using the given factory.
+
+    The result of parsing the file is cached (in ~/.taurus/jdraw_cache) so
+    that the next time the same, unchanged file (same path, modification
+    time and contents hash) is loaded, the factory is directly fed from the
+    cache.
+
+    :param filename: (str) path of the jdraw file
+    :param factory: (TaurusBaseGraphicsFactory) factory used to create the
+                    scene and its items
+    :param cache: (bool or None) whether to use the cache. If None, the
+                  JDRAW_PARSE_CACHE setting from
+                  :mod:`taurus.tauruscustomsettings` is used (default: True)
+
+    :return: (object) the scene created by the factory (or None if the file
+             cannot be parsed)
+    """
+
+    if filename is None or factory is None:
+        return
+
+    if cache is None:
+        from taurus import tauruscustomsettings
+        cache = getattr(tauruscustomsettings, 'JDRAW_PARSE_CACHE', True)
 
     res = None
     try:
         filename = os.path.realpath(filename)
-        f = open(filename)
-        res = yacc.parse(f.read())
+        with open(filename) as f:
+            text = f.read()
+        tree = None
+        if cache:
+            mtime = os.path.getmtime(filename)
+            digest = hashlib.sha1(text).hexdigest()
+            tree = _load_cached_tree(filename, mtime, digest)
+        if tree is None:
+            tree = _parse_tree(text)
+            if cache and tree is not None:
+                _save_cached_tree(filename, mtime, digest, tree)
+        if tree is not None:
+            res = _replay(tree, factory)
     except:
         log = Logger('JDraw Parser')
         log.warning("Failed to parse %s" % filename)
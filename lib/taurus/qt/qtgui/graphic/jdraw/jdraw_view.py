@@ -95,6 +95,7 @@ class TaurusJDrawSynopticsView(Qt.QGraphicsView, TaurusBaseWidget):
         self.setAlias(alias)
         self.setDragEnabled(True)
         self.setPanelClass(panelClass)
+        self._lazyAttach = False
 
         # By default the items will update the view when necessary.
         # This default value is much more efficient then the QQraphicsView default
@@ -228,9 +229,27 @@ class TaurusJDrawSynopticsView(Qt.QGraphicsView, TaurusBaseWidget):
 
         self.debug(
             'Done: size(%s,%s),hint(%s,%s),srect(%s,%s),parent(%s,%s)\n\n' % self.get_sizes())
+        self._visibleRegionChanged()
+
+    def _visibleRegionChanged(self):
+        if self.scene() is not None:
+            self.scene().scheduleLazyUpdate()
+
+    def scrollContentsBy(self, dx, dy):
+        Qt.QGraphicsView.scrollContentsBy(self, dx, dy)
+        self._visibleRegionChanged()
+
+    def showEvent(self, event):
+        Qt.QGraphicsView.showEvent(self, event)
+        self._visibleRegionChanged()
+
+    def hideEvent(self, event):
+        Qt.QGraphicsView.hideEvent(self, event)
+        self._visibleRegionChanged()
 
     def resizeEvent(self, event):
         """ It has been needed to reimplent size policies """
+        self._visibleRegionChanged()
         if not self.resizable() or not self.scene() or isinstance(self.parent(), Qt.QScrollArea) or not self.isVisible():
             self.debug('In TaurusJDrawSynopticsView(' +
                        self._fileName + ').resizeEvent(): Disabled')
@@ -378,7 +397,8 @@ class TaurusJDrawSynopticsView(Qt.QGraphicsView, TaurusBaseWidget):
             if os.path.isfile(filename):
                 self.debug("Starting to parse %s" % filename)
                 self.path = os.path.dirname(filename)
-                factory = self.getGraphicsFactory(delayed=delayed)
+                factory = self.getGraphicsFactory(
+                    delayed=delayed or self._lazyAttach)
                 scene = jdraw_parser.parse(filename, factory)
                 scene.setSelectionStyle(self._selectionStyle)
                 self.debug("Obtained %s(%s)", type(scene).__name__, filename)
@@ -401,6 +421,8 @@ class TaurusJDrawSynopticsView(Qt.QGraphicsView, TaurusBaseWidget):
                 # with the name of items and its color
                 self.emitColors()  # get_item_colors(emit=True)
                 self.fitting(True)
+                if self._lazyAttach:
+                    scene.setLazyAttach(True)
             else:
                 self.setScene(None)
         #self.debug('out of setModel()')
@@ -422,6 +444,23 @@ class TaurusJDrawSynopticsView(Qt.QGraphicsView, TaurusBaseWidget):
     def getModel(self):
         return self._currF
 
+    def setLazyAttach(self, lazy):
+        """Sets whether the items are attached to their models only while
+        they are (close to being) visible. It applies to the current and the
+        next loaded synoptics (see :meth:`TaurusGraphicsScene.setLazyAttach`)
+
+        :param lazy: (bool)
+        """
+        self._lazyAttach = bool(lazy)
+        if self.scene() is not None:
+            self.scene().setLazyAttach(self._lazyAttach)
+
+    def getLazyAttach(self):
+        return self._lazyAttach
+
+    def resetLazyAttach(self):
+        self.setLazyAttach(False)
+
     @classmethod
     def getQtDesignerPluginInfo(cls):
         ret = TaurusBaseWidget.getQtDesignerPluginInfo()
@@ -432,6 +471,9 @@ class TaurusJDrawSynopticsView(Qt.QGraphicsView, TaurusBaseWidget):
 
     model = Qt.pyqtProperty("QString", getModel, setModel)
 
+    lazyAttach = Qt.pyqtProperty("bool", getLazyAttach, setLazyAttach,
+                                 resetLazyAttach)
+
     def setSelectionStyle(self, selectionStyle):
         if isinstance(selectionStyle, (Qt.QString, basestring)):
             selectionStyle = str(selectionStyle).upper()
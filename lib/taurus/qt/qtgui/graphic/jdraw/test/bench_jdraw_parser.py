@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Benchmark of the loading of large jdraw files (with and without the parse
+cache). It does not create any graphics item (a null factory is used), so it
+only measures the parser.
+
+Usage::
+
+    python -m taurus.qt.qtgui.graphic.jdraw.test.bench_jdraw_parser [nobjects [repeat]]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from taurus.qt.qtgui.graphic.jdraw import jdraw_parser
+
+__all__ = ['make_jdw', 'benchmark_parse', 'main']
+
+_RECTANGLE = '''    JDRectangle {
+      summit:%(x)d,%(y)d,%(x2)d,%(y2)d
+      origin:%(x)d,%(y)d
+      background:204,255,255
+      fillStyle:1
+      name:"sys/tg_test/%(dev)d/state"
+    }
+'''
+
+_LABEL = '''    JDLabel {
+      summit:%(x)d,%(y)d,%(x2)d,%(y2)d
+      origin:%(x)d,%(y)d
+      name:"sys/tg_test/%(dev)d/double_scalar"
+      text:"Label %(i)d"
+      extensions:{
+        ignoreRepaint:"true"
+      }
+    }
+'''
+
+_GROUP = '''  JDGroup {
+    summit:%(x)d,%(y)d,%(x2)d,%(y2)d
+    origin:%(x)d,%(y)d
+    name:"sys/tg_test/%(dev)d"
+    children:{
+%(children)s    }
+  }
+'''
+
+
+def make_jdw(fname, nobjects=20000, groupsize=4):
+    '''Writes a synthetic jdraw file with (about) nobjects objects: groups of
+    groupsize-1 rectangles and labels'''
+    groups = []
+    for g in xrange(max(1, nobjects // groupsize)):
+        x, y = 20 * (g % 200), 20 * (g // 200)
+        children = []
+        for i in xrange(groupsize - 1):
+            tpl = (_RECTANGLE, _LABEL)[i % 2]
+            children.append(tpl % dict(x=x, y=y, x2=x + 15, y2=y + 15,
+                                       dev=g, i=i))
+        groups.append(_GROUP % dict(x=x, y=y, x2=x + 15, y2=y + 15, dev=g,
+                                    children=''.join(children)))
+    with open(fname, 'w') as f:
+        f.write('JDFile v11 {\n  Global {\n  }\n%s}\n' % ''.join(groups))
+
+
+class _NullFactory(object):
+
+    def __init__(self):
+        self.count = 0
+
+    def getSceneObj(self, items):
+        return items
+
+    def getObj(self, name, params):
+        self.count += 1
+        return name
+
+
+def _timeit(func, repeat):
+    best = None
+    for _ in xrange(repeat):
+        t0 = time.time()
+        ret = func()
+        dt = time.time() - t0
+        best = dt if best is None else min(best, dt)
+    return best, ret
+
+
+def benchmark_parse(nobjects=20000, repeat=3):
+    '''Returns a dict with the best times (in s) of:
+
+        - new_parser: building a new lexer/parser
+        - uncached: parsing the file with the shared parser
+        - cached: loading the file from the parse cache
+    '''
+    tmpdir = tempfile.mkdtemp()
+    get_cache_dir = jdraw_parser._get_cache_dir
+    jdraw_parser._get_cache_dir = lambda: os.path.join(tmpdir, 'cache')
+    try:
+        fname = os.path.join(tmpdir, 'bench.jdw')
+        make_jdw(fname, nobjects)
+        factory = _NullFactory()
+        results = dict(objects=0, size=os.path.getsize(fname))
+        results['new_parser'], _ = _timeit(jdraw_parser.new_parser, repeat)
+        jdraw_parser.parse(fname, factory, cache=False)  # warm up
+        results['objects'] = factory.count
+        results['uncached'], _ = _timeit(
+            lambda: jdraw_parser.parse(fname, _NullFactory(), cache=False),
+            repeat)
+        jdraw_parser.parse(fname, _NullFactory(), cache=True)  # fill cache
+        results['cached'], _ = _timeit(
+            lambda: jdraw_parser.parse(fname, _NullFactory(), cache=True),
+            repeat)
+    finally:
+        jdraw_parser._get_cache_dir = get_cache_dir
+        shutil.rmtree(tmpdir)
+    return results
+
+
+def main():
+    args = sys.argv[1:]
+    nobjects = int(args[0]) if args else 20000
+    repeat = int(args[1]) if len(args) > 1 else 3
+    r = benchmark_parse(nobjects, repeat)
+    print '%(objects)d objects (%(size)d bytes)' % r
+    print '  new parser      : %8.1f ms' % (1e3 * r['new_parser'])
+    print '  parse (no cache): %8.1f ms' % (1e3 * r['uncached'])
+    print '  parse (cached)  : %8.1f ms' % (1e3 * r['cached'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.qt.qtgui.graphic.jdraw.jdraw_parser"""
+
+import os
+import shutil
+import tempfile
+
+from taurus.external import unittest
+from taurus.qt.qtgui.graphic.jdraw import jdraw_parser
+from taurus.qt.qtgui.graphic.jdraw.test import res
+
+__all__ = ['JDrawParserCacheTest']
+
+_RES_DIR = os.path.dirname(os.path.abspath(res.__file__))
+
+
+class _ListFactory(object):
+    '''A graphics factory that records the calls done by the parser'''
+
+    def __init__(self, skip=()):
+        self.calls = []
+        self.skip = skip
+
+    def getSceneObj(self, items):
+        self.calls.append(('scene', items))
+        return items
+
+    def getObj(self, name, params):
+        self.calls.append((name, params))
+        if name in self.skip:
+            return None
+        return '%s_%d' % (name, len(self.calls))
+
+
+class JDrawParserCacheTest(unittest.TestCase):
+    '''Tests for the cached parsing of jdraw files'''
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self._get_cache_dir = jdraw_parser._get_cache_dir
+        jdraw_parser._get_cache_dir = lambda: os.path.join(self.tmpdir,
+                                                           'cache')
+        self.fname = os.path.join(self.tmpdir, 'styles.jdw')
+        shutil.copy(os.path.join(_RES_DIR, 'styles.jdw'), self.fname)
+
+    def tearDown(self):
+        jdraw_parser._get_cache_dir = self._get_cache_dir
+        shutil.rmtree(self.tmpdir)
+
+    def _parse(self, cache=True, skip=()):
+        factory = _ListFactory(skip=skip)
+        scene = jdraw_parser.parse(self.fname, factory, cache=cache)
+        return scene, factory.calls
+
+    def test_cached_equals_uncached(self):
+        '''check that the factory calls are the same with and without cache'''
+        scene, calls = self._parse(cache=False)
+        self.assertTrue(len(calls) > 1)
+        self.assertEqual(calls[-1][0], 'scene')
+        self.assertFalse(os.path.exists(
+            jdraw_parser._get_cache_filename(self.fname)))
+        # the first parse creates the cache, the second one uses it
+        self.assertEqual(self._parse(), (scene, calls))
+        self.assertTrue(os.path.exists(
+            jdraw_parser._get_cache_filename(self.fname)))
+        self.assertEqual(self._parse(), (scene, calls))
+
+    def test_cache_used(self):
+        '''check that an unchanged file is not parsed again'''
+        self._parse()
+        orig_parse_tree = jdraw_parser._parse_tree
+        jdraw_parser._parse_tree = None  # it would fail if called
+        try:
+            scene, calls = self._parse()
+        finally:
+            jdraw_parser._parse_tree = orig_parse_tree
+        self.assertTrue(len(scene) > 0)
+
+    def test_cache_invalidated(self):
+        '''check that a modified file is parsed again'''
+        scene, calls = self._parse()
+        with open(self.fname) as f:
+            text = f.read()
+        text = text.replace('"lineWidth=0"', '"modified"')
+        with open(self.fname, 'w') as f:
+            f.write(text)
+        scene2, calls2 = self._parse()
+        self.assertEqual(len(scene), len(scene2))
+        self.assertNotEqual(calls, calls2)
+        self.assertEqual(calls2, self._parse(cache=False)[1])
+
+    def test_cache_version(self):
+        '''check that caches from other versions are ignored'''
+        scene, calls = self._parse()
+        cachename = jdraw_parser._get_cache_filename(self.fname)
+        with open(cachename, 'rb') as f:
+            data = f.read()
+        with open(cachename, 'wb') as f:
+            f.write(data.replace(jdraw_parser._CACHE_MAGIC, 'OTHER', 1))
+        self.assertEqual(self._parse(), (scene, calls))
+
+    def test_failed_objects(self):
+        '''check that the objects not created by the factory are discarded
+        in the same way with and without cache'''
+        ref = self._parse(cache=False, skip=('JDLabel',))
+        self._parse()
+        self.assertEqual(self._parse(skip=('JDLabel',)), ref)
+        self.assertFalse(any(i is None for i in ref[0][1:]))
+
+    def test_clear_cache(self):
+        '''check clear_cache'''
+        self._parse()
+        jdraw_parser.clear_cache()
+        self.assertFalse(os.path.exists(
+            jdraw_parser._get_cache_filename(self.fname)))
+
+
+if __name__ == '__main__':
+    unittest.main()
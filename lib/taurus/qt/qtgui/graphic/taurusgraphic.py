@@ -59,6 +59,8 @@ import subprocess
 import traceback
 import operator
 import types
+import time
+import threading
 
 import Queue
 
@@ -104,6 +106,14 @@ class QEmitter(Qt.QObject):
 
 
 class TaurusGraphicsUpdateThread(Qt.QThread):
+    """Forwards the items put in the queue of a :class:`TaurusGraphicsScene`
+    (see :meth:`TaurusGraphicsScene.getQueue`) to
+    :meth:`TaurusGraphicsScene.updateSceneItems`.
+
+    .. note:: the scene batches and throttles the repaints by itself, so this
+              thread is only started if some code still feeds the queue
+              directly.
+    """
 
     def __init__(self, parent=None, period=3):
         """Parent most not be None and must be a TaurusGraphicsScene!"""
@@ -113,28 +123,8 @@ class TaurusGraphicsUpdateThread(Qt.QThread):
         self.period = period
         self.log = Logger('TaurusGraphicsUpdateThread')
 
-    def _updateView(self, v):
-        # The first one is the prefered one because it improves performance
-        # since updates don't come very often in comparison to with the refresh
-        # rate of the monitor (~70Hz)
-        if v.viewportUpdateMode() == Qt.QGraphicsView.NoViewportUpdate:
-            # We call the update to the viewport instead of the view
-            # itself because apparently there is a bug in QT 4.3 that
-            # prevents a proper update when the view is inside a QTab
-            v.viewport().update()
-        else:
-            # @todo This is probably a bug (item_rects is not defined). But it is defined in .run(), see "todo" below...
-            v.updateScene(item_rects)
-            # v.invalidateScene(item.boundingRect())
-        return
-
     def run(self):
         self.log.debug("run... - TaurusGraphicsUpdateThread")
-        emitter = QEmitter()
-        emitter.moveToThread(Qt.QApplication.instance().thread())
-        emitter.setParent(Qt.QApplication.instance())
-        emitter.updateView.connect(self._updateView)
-
         p = self.parent()
         while True:
             item = p.getQueue().get(True)
@@ -145,15 +135,7 @@ class TaurusGraphicsUpdateThread(Qt.QThread):
                     continue
             if not operator.isSequenceType(item):
                 item = (item,)
-            # @todo: Unless the call to boundingRect() has a side effect, this line is useless..  probably related to todo in _updateView()
-            item_rects = [i.boundingRect() for i in item]
-
-            for v in p.views():
-                # p.debug("emit('updateView')")
-                # emitter.updateView.emit(v)
-                self.emitter.updateView.emit(v)
-            # This sleep is needed to reduce CPU usage of the application!
-            self.sleep(self.period)
+            p.updateSceneItems(item)
             # End of while
         # End of Thread
 
@@ -177,13 +159,43 @@ class TaurusGraphicsScene(Qt.QGraphicsScene):
      TaurusGraphicsItem.setContextMenu([(ActionName,ActionMethod(device_name))]
      allows to configure custom context menus for graphic items using a list
      of tuples. Empty tuples will insert separators in the menu.
+
+    Repaints::
+
+     Taurus events received by the items (in any thread) are not applied
+     immediately: the items are marked as pending and, at most
+     :meth:`getMaxDisplayFps` times per second, their styles are updated in
+     the Qt thread and only the regions of the views covered by the changed
+     items are repainted (with a single update per view).
+
+    Lazy attach::
+
+     If :meth:`setLazyAttach` is enabled, only the named items within the
+     visible region of the views (plus a margin of LAZY_ATTACH_MARGIN times
+     the view size) are attached to their taurus models. The items that are
+     out of view for more than LAZY_DETACH_DELAY seconds are detached.
+     Views must call :meth:`scheduleLazyUpdate` when they are scrolled,
+     zoomed, resized, shown or hidden.
     '''
     ANY_ATTRIBUTE_SELECTS_DEVICE = True
     TRACE_ALL = False
+    DEFAULT_MAX_DISPLAY_FPS = 10
+    #: above this number of damaged items, their bounding rect is repainted
+    #: instead of the region covered by each of them
+    MAX_DAMAGE_RECTS = 256
+    LAZY_ATTACH_MARGIN = 0.5
+    LAZY_DETACH_DELAY = 10.
+    LAZY_UPDATE_DELAY = 0.1
 
     refreshTree2 = Qt.pyqtSignal()
     graphicItemSelected = Qt.pyqtSignal('QString')
     graphicSceneClicked = Qt.pyqtSignal('QPoint')
+    _flushRequested = Qt.pyqtSignal()
+
+    # characters that make getItemByName fall back to regexp matching
+    _wildcardRe = re.compile(r'[*+?\[\](){}|^$\\]')
+    # last part of the names indexed as children of a device name
+    _childNameRe = re.compile(r'[a-z0-9_*-]+$')
 
     def __init__(self, parent=None, strt=True):
         name = self.__class__.__name__
@@ -192,7 +204,22 @@ class TaurusGraphicsScene(Qt.QGraphicsScene):
         Qt.QGraphicsScene.__init__(self, parent)
         self.updateQueue = None
         self.updateThread = None
+        self._flushTimer = None
+        self._flushLock = threading.Lock()
+        self._flushScheduled = False
+        self._lastFlushTime = 0
+        self._pendingStyleItems = set()
+        self._dirtyItems = set()
+        self._maxDisplayFps = self.DEFAULT_MAX_DISPLAY_FPS
+        self._lazyAttach = False
+        self._lazyAttached = set()
+        self._lazyOffSince = {}
+        self._lazyTimer = Qt.QTimer(self)
+        self._lazyTimer.setSingleShot(True)
+        self._lazyTimer.timeout.connect(self.updateLazyModels)
         self._itemnames = CaselessDefaultDict(lambda k: set())
+        self._itemchildren = CaselessDefaultDict(lambda k: set())
+        self._nameditems = set()
         self._selection = []
         self._selectedItems = []
         self._selectionStyle = SynopticSelectionStyle.OUTLINE
@@ -320,10 +347,7 @@ class TaurusGraphicsScene(Qt.QGraphicsScene):
     def addItem(self, item):
         # self.debug('addItem(%s)'%item)
         def expand(i):
-            name = str(getattr(i, '_name', '')).lower()
-            if name:
-                self._itemnames[name].add(i)
-                #self.debug('addItem(%s): %s'%(name,i))
+            self._indexItem(i)
             if isinstance(i, Qt.QGraphicsItemGroup):
                 for j in i.childItems():
                     expand(j)
@@ -332,67 +356,119 @@ class TaurusGraphicsScene(Qt.QGraphicsScene):
 
     def addWidget(self, item, flags=None):
         self.debug('addWidget(%s)' % item)
-        name = str(getattr(item, '_name', '')).lower()
-        if name:
-            self._itemnames[name].add(item)
+        self._indexItem(item)
         if flags is None:
             Qt.QGraphicsScene.addWidget(self, item)
         else:
             Qt.QGraphicsScene.addWidget(self, item, flags)
 
+    def removeItem(self, item):
+        def expand(i):
+            self._unindexItem(i)
+            if isinstance(i, Qt.QGraphicsItemGroup):
+                for j in i.childItems():
+                    expand(j)
+        expand(item)
+        Qt.QGraphicsScene.removeItem(self, item)
+
+    def _indexItem(self, item):
+        """adds a named item to the name indexes: _itemnames (name->items)
+        and _itemchildren (device name->names of its attributes)"""
+        name = str(getattr(item, '_name', '')).lower()
+        if not name:
+            return
+        self._itemnames[name].add(item)
+        self._nameditems.add(item)
+        parent, _, child = name.rpartition('/')
+        if parent and self._childNameRe.match(child):
+            self._itemchildren[parent].add(name)
+
+    def _unindexItem(self, item):
+        name = str(getattr(item, '_name', '')).lower()
+        items = self._itemnames.get(name)
+        if not items or item not in items:
+            return
+        items.discard(item)
+        self._nameditems.discard(item)
+        self._lazyAttached.discard(item)
+        self._lazyOffSince.pop(item, None)
+        if not items:
+            del self._itemnames[name]
+            parent = name.rpartition('/')[0]
+            children = self._itemchildren.get(parent)
+            if children is not None:
+                children.discard(name)
+                if not children:
+                    del self._itemchildren[parent]
+
     def getItemByName(self, item_name, strict=None):
         """
         Returns a list with all items matching a given name.
 
+        Plain names are looked up in the name indexes. Names containing
+        regular expression wildcards are matched against all the names.
+
         :param strict: (bool or None) controls whether full_name (strict=True) or only device name (False) must match
 
         :return: (list) items
         """
         strict = (
             not self.ANY_ATTRIBUTE_SELECTS_DEVICE) if strict is None else strict
-        alnum = '(?:[a-zA-Z0-9-_\*]|(?:\.\*))(?:[a-zA-Z0-9-_\*]|(?:\.\*))*'
         target = str(item_name).strip().split()[0].lower().replace(
             '/state', '')  # If it has spaces only the first word is used
         # Device names should match also its attributes or only state?
         if not strict and TangoAttributeNameValidator().getUriGroups(target):
             target = target.rsplit('/', 1)[0]
-        if TangoDeviceNameValidator().getUriGroups(target):
+        isDevice = bool(TangoDeviceNameValidator().getUriGroups(target))
+        if self._wildcardRe.search(target.rstrip('$')):
+            return self._getItemByNameRe(target, isDevice, strict)
+        target = target.rstrip('$')
+        names = [target]
+        if isDevice:
+            if strict:
+                names.append(target + '/state')
+            else:
+                names.extend(self._itemchildren.get(target, ()))
+        result = []
+        for k in names:
+            result.extend(self._itemnames.get(k, ()))
+        return result
+
+    def _getItemByNameRe(self, target, isDevice, strict):
+        """getItemByName implementation for names containing wildcards"""
+        alnum = '(?:[a-zA-Z0-9-_\*]|(?:\.\*))(?:[a-zA-Z0-9-_\*]|(?:\.\*))*'
+        if isDevice:
             if strict:
                 target += '(/state)?'
             else:
                 target += '(/' + alnum + ')?'
         if not target.endswith('$'):
             target += '$'
+        target = re.compile(target.lower())
         result = []
-        for k in self._itemnames.keys():
-            if re.match(target.lower(), k.lower()):
-                #self.debug('getItemByName(%s): _itemnames[%s]: %s'%(target,k,self._itemnames[k]))
-                result.extend(self._itemnames[k])
+        for k, v in self._itemnames.items():
+            if target.match(k.lower()):
+                result.extend(v)
         return result
 
     def getItemByPosition(self, x, y):
-        """ This method will try first with named objects; if failed then with itemAt """
+        """Returns the top-most named item at the given scene position (or its
+        top-most taurus parent), ignoring the items with the "noSelect"
+        extension. The lookup uses the scene item index.
+        """
         pos = Qt.QPointF(x, y)
-        itemsAtPos = []
-        for z, o in sorted((i.zValue(), i) for v in self._itemnames.values() for i in v if i.contains(pos) or i.isUnderMouse()):
-            if not hasattr(o, 'getExtensions'):
-                self.debug(
-                    'getItemByPosition(%d,%d): adding Qt primitive %s' % (x, y, o))
-                itemsAtPos.append(o)
-            elif not o.getExtensions().get('noSelect'):
-                self.debug(
-                    'getItemByPosition(%d,%d): adding GraphicsItem %s' % (x, y, o))
-                itemsAtPos.append(o)
-            else:
+        # items() are sorted in descending stacking order
+        for o in self.items(pos):
+            if o not in self._nameditems:
+                continue
+            if hasattr(o, 'getExtensions') and o.getExtensions().get('noSelect'):
                 self.debug(
                     'getItemByPosition(%d,%d): object ignored, %s' % (x, y, o))
-        if itemsAtPos:
-            obj = itemsAtPos[-1]
-            return self.getTaurusParentItem(obj) or obj
-        else:
-            # return self.itemAt(x,y)
-            self.debug('getItemByPosition(%d,%d): no items found!' % (x, y))
-            return None
+                continue
+            self.debug('getItemByPosition(%d,%d): found %s' % (x, y, o))
+            return self.getTaurusParentItem(o) or o
+        self.debug('getItemByPosition(%d,%d): no items found!' % (x, y))
+        return None
 
     def getItemClicked(self, mouseEvent):
         pos = mouseEvent.scenePos()
@@ -523,8 +599,9 @@ class TaurusGraphicsScene(Qt.QGraphicsScene):
                     'In TauGraphicsScene.selectGraphicItem(%s): item name not found or name is a reserved keyword.' % item_name)
                 return False
             items = self.getItemByName(item_name) or []
-            items = [i for i in items if self.getTaurusParentItem(
-                i) not in (items + self._selectedItems)]
+            excluded = set(items).union(self._selectedItems)
+            items = [i for i in items
+                     if self.getTaurusParentItem(i) not in excluded]
             self.debug('In TaurusGraphicsScene.selectGraphicItem(%s)): matched %d items' % (
                 item_name, len(items)))
 
@@ -820,24 +897,230 @@ class TaurusGraphicsScene(Qt.QGraphicsScene):
         return result
 
     def start(self):
-        if self.updateThread:
+        if self._flushTimer is not None:
             return
-        self.updateQueue = Queue.Queue()
-        self.updateThread = TaurusGraphicsUpdateThread(self)
-        self.updateThread.start()  # Qt.QThread.HighPriority)
+        self._flushTimer = Qt.QTimer(self)
+        self._flushTimer.setSingleShot(True)
+        self._flushTimer.timeout.connect(self._flush)
+        self._flushRequested.connect(self._scheduleFlush)
+        # in case items were marked before starting
+        with self._flushLock:
+            pending = self._pendingStyleItems or self._dirtyItems
+        if pending:
+            self._scheduleFlush()
 
     def getQueue(self):
+        """Returns a queue in which items (or sequences of items) to be
+        repainted can be put from any thread.
+
+        .. note:: it is kept for backwards compatibility. Use
+                  :meth:`updateSceneItem` instead.
+        """
+        if self.updateThread is None:
+            self.updateQueue = Queue.Queue()
+            self.updateThread = TaurusGraphicsUpdateThread(self)
+            self.updateThread.start()
         return self.updateQueue
 
+    def setMaxDisplayFps(self, fps):
+        """Sets the maximum rate at which the changed items are repainted.
+        All the changes received in between are repainted at once.
+
+        :param fps: (float) maximum repaints per second. 0 means no limit
+        """
+        self._maxDisplayFps = max(0, fps or 0)
+
+    def getMaxDisplayFps(self):
+        """Returns the maximum repaint rate
+
+        :return: (float) maximum repaints per second (0 means no limit)
+        """
+        return self._maxDisplayFps
+
+    def resetMaxDisplayFps(self):
+        """Sets the maximum repaint rate to :attr:`DEFAULT_MAX_DISPLAY_FPS`"""
+        self.setMaxDisplayFps(self.DEFAULT_MAX_DISPLAY_FPS)
+
+    def updateSceneItemStyle(self, item):
+        """Marks the style of the given item as outdated. It can be called
+        from any thread: :meth:`TaurusGraphicsItem.updateStyle` will be called
+        from the Qt thread on the next repaint.
+
+        :param item: (TaurusGraphicsItem) item which received an event
+        """
+        self._markItems(self._pendingStyleItems, (item,))
+
     def updateSceneItem(self, item):
-        self.updateQueue.put(item)
+        """Marks the region covered by the given item to be repainted in the
+        next repaint (it can be called from any thread)
+
+        :param item: (QGraphicsItem) item to be repainted
+        """
+        self._markItems(self._dirtyItems, (item,))
 
     def updateSceneItems(self, items):
-        self.updateQueue.put(items)
+        """Marks the regions covered by the given items to be repainted in
+        the next repaint (it can be called from any thread)
+
+        :param items: (seq<QGraphicsItem>) items to be repainted
+        """
+        self._markItems(self._dirtyItems, items)
+
+    def _markItems(self, itemset, items):
+        with self._flushLock:
+            itemset.update(items)
+            if self._flushScheduled:
+                return
+            self._flushScheduled = True
+        # queued if called from outside the Qt thread
+        self._flushRequested.emit()
+
+    def _scheduleFlush(self):
+        if self._flushTimer is None:
+            return
+        wait = 0
+        if self._maxDisplayFps > 0:
+            wait = self._lastFlushTime + 1. / self._maxDisplayFps - time.time()
+        if not self._flushTimer.isActive():
+            self._flushTimer.start(max(0, int(wait * 1000)))
+
+    def _flush(self):
+        """Applies the pending style changes and repaints the damaged regions
+        of all views at once. Called from the Qt thread"""
+        self._lastFlushTime = time.time()
+        with self._flushLock:
+            pending, self._pendingStyleItems = self._pendingStyleItems, set()
+        for item in pending:
+            try:
+                # it calls updateSceneItem which adds item to _dirtyItems
+                item.updateStyle()
+            except Exception:
+                # the item may have been deleted in the meantime
+                self.debug('%s.updateStyle() failed: %s' %
+                           (item, traceback.format_exc()))
+        with self._flushLock:
+            dirty, self._dirtyItems = self._dirtyItems, set()
+            # events received while updating the styles go to the next flush
+            self._flushScheduled = bool(self._pendingStyleItems)
+        if self._flushScheduled:
+            self._scheduleFlush()
+        rects = []
+        for item in dirty:
+            try:
+                if item.scene() is self:
+                    rects.append(item.sceneBoundingRect())
+            except RuntimeError:
+                pass  # underlying C++ object deleted
+        if rects:
+            self.updateSceneRects(rects)
+
+    def updateSceneRects(self, rects):
+        """Repaints the given regions of the scene in all views
+
+        :param rects: (seq<QRectF>) regions (in scene coordinates)
+        """
+        if len(rects) > self.MAX_DAMAGE_RECTS:
+            rects = [reduce(Qt.QRectF.united, rects)]
+        for v in self.views():
+            if v.viewportUpdateMode() == Qt.QGraphicsView.NoViewportUpdate:
+                # The view does not track the changes by itself, so the
+                # viewport is updated (instead of the view itself because
+                # apparently there is a bug in QT 4.3 that prevents a proper
+                # update when the view is inside a QTab)
+                region = Qt.QRegion()
+                for r in rects:
+                    # margin for antialiased pens
+                    r = v.mapFromScene(r).boundingRect().adjusted(-2, -2, 2, 2)
+                    region = region.united(Qt.QRegion(r))
+                v.viewport().update(region)
+            else:
+                v.updateScene(rects)
 
     def updateScene(self):
         self.update()
 
+    def setLazyAttach(self, lazy):
+        """Enables/disables the lazy attachment of the items to their models
+        (see the class documentation). When it is disabled, all the named
+        items which are not attached yet get attached.
+
+        :param lazy: (bool)
+        """
+        wasLazy, self._lazyAttach = self._lazyAttach, bool(lazy)
+        self._lazyAttached = set(i for i in self._getLazyItems()
+                                 if i.getModelName())
+        self._lazyOffSince = {}
+        if self._lazyAttach:
+            self.scheduleLazyUpdate()
+        elif wasLazy:
+            self._lazyTimer.stop()
+            for item in self._getLazyItems():
+                if not item.getModelName():
+                    item.setModel(item._name)
+
+    def getLazyAttach(self):
+        """Returns whether the items are lazily attached to their models
+
+        :return: (bool)
+        """
+        return self._lazyAttach
+
+    def resetLazyAttach(self):
+        self.setLazyAttach(False)
+
+    def _getLazyItems(self):
+        return (i for i in self._nameditems if isinstance(i, TaurusGraphicsItem))
+
+    def scheduleLazyUpdate(self):
+        """Schedules a call to :meth:`updateLazyModels`. It should be called
+        whenever the visible region of any view changes"""
+        if self._lazyAttach:
+            self._lazyTimer.start(int(self.LAZY_UPDATE_DELAY * 1000))
+
+    def updateLazyModels(self):
+        """Attaches the items in the visible region of the views and detaches
+        those that have been out of view for more than LAZY_DETACH_DELAY"""
+        if not self._lazyAttach:
+            return
+        rects = []
+        for v in self.views():
+            if not v.isVisible():
+                continue
+            r = v.mapToScene(v.viewport().rect()).boundingRect()
+            mw = self.LAZY_ATTACH_MARGIN * r.width()
+            mh = self.LAZY_ATTACH_MARGIN * r.height()
+            r.adjust(-mw, -mh, mw, mh)
+            rects.append(r)
+        # the geometry is checked instead of using self.items(rect), which
+        # skips the hidden items: those hidden by a visibility mapper need
+        # their model for being shown again
+        visible = set()
+        for item in self._getLazyItems():
+            br = item.sceneBoundingRect()
+            if any(br.intersects(r) for r in rects):
+                visible.add(item)
+        for item in visible:
+            self._lazyOffSince.pop(item, None)
+            if item not in self._lazyAttached:
+                self._lazyAttached.add(item)
+                if not item.getModelName():
+                    item.setModel(item._name)
+        now = time.time()
+        for item in self._lazyAttached - visible:
+            since = self._lazyOffSince.setdefault(item, now)
+            if now - since >= self.LAZY_DETACH_DELAY:
+                del self._lazyOffSince[item]
+                self._lazyAttached.discard(item)
+                # keeps the item name, unlike TaurusGraphicsItem.setModel
+                TaurusBaseComponent.setModel(item, '')
+        if self._lazyOffSince:
+            # check again when the oldest item expires
+            wait = min(self._lazyOffSince.values()) + \
+                self.LAZY_DETACH_DELAY - now
+            self._lazyTimer.start(max(0, int(wait * 1000)) + 1)
+        self.debug('updateLazyModels(): %d attached, %d pending detach' %
+                   (len(self._lazyAttached), len(self._lazyOffSince)))
+
     def updateSceneViews(self):
         for v in self.views():
             v.viewport().update()
@@ -1069,9 +1352,19 @@ class TaurusGraphicsItem(TaurusBaseComponent):
             p = self.parentItem()
         return p
 
-    # def fireEvent(self, type):
     def fireEvent(self, evt_src=None, evt_type=None, evt_value=None):
-        """fires a value changed event to all listeners"""
+        """fires a value changed event to all listeners.
+
+        The style is not updated here (this is called from a python thread)
+        but by the scene in the Qt thread (see
+        :meth:`TaurusGraphicsScene.updateSceneItemStyle`)"""
+        scene = self.scene()
+        if scene is not None:
+            scene.updateSceneItemStyle(self)
+        else:
+            TaurusBaseComponent.fireEvent(self, evt_src, evt_type, evt_value)
+
+    def handleEvent(self, evt_src, evt_type, evt_value):
         self.updateStyle()
 
     def updateStyle(self):
@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for the taurus graphics scene"""
+
+import re
+import time
+
+from taurus.external import unittest
+from taurus.external.qt import Qt
+from taurus.qt.qtgui.test import BaseWidgetTestCase
+from taurus.qt.qtgui.graphic import (TaurusGraphicsScene,
+                                     TaurusEllipseStateItem,
+                                     TaurusRectStateItem)
+from taurus.core.tango.tangovalidator import (TangoDeviceNameValidator,
+                                              TangoAttributeNameValidator)
+
+
+class _StyledItem(Qt.QGraphicsRectItem):
+
+    '''a graphics item which counts the updates of its style'''
+
+    def __init__(self, *args):
+        Qt.QGraphicsRectItem.__init__(self, *args)
+        self.styleUpdates = 0
+
+    def updateStyle(self):
+        self.styleUpdates += 1
+        self.scene().updateSceneItem(self)
+
+
+class DamageTest(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Tests for the batched repaints of TaurusGraphicsScene
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = TaurusGraphicsScene
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        scene = self._widget
+        self._items = [_StyledItem(10 * i, 0, 5, 5) for i in range(3)]
+        for item in self._items:
+            scene.addItem(item)
+        self._repaints = []
+        scene.updateSceneRects = self._repaints.append
+
+    def test_batch(self):
+        '''Check that the events received between repaints are applied once
+        per item and repainted at once'''
+        scene = self._widget
+        for i in range(5):
+            for item in self._items[:2]:
+                scene.updateSceneItemStyle(item)
+        scene._flush()
+        self.assertEqual([i.styleUpdates for i in self._items], [1, 1, 0])
+        self.assertEqual(len(self._repaints), 1)
+        rects = sorted(self._repaints[0], key=lambda r: r.x())
+        self.assertEqual(rects, [i.sceneBoundingRect()
+                                 for i in self._items[:2]])
+        # nothing pending
+        scene._flush()
+        self.assertEqual(len(self._repaints), 1)
+
+    def test_max_display_fps(self):
+        '''Check that the repaints are delayed to respect the max rate'''
+        scene = self._widget
+        self.assertEqual(scene.getMaxDisplayFps(),
+                         TaurusGraphicsScene.DEFAULT_MAX_DISPLAY_FPS)
+        scene.setMaxDisplayFps(1)
+        scene._lastFlushTime = time.time()
+        scene.updateSceneItemStyle(self._items[0])
+        self.assertTrue(scene._flushTimer.isActive())
+        self.assertTrue(scene._flushTimer.interval() > 900)
+        scene._flushTimer.stop()
+        scene._flush()
+        self.assertEqual(self._items[0].styleUpdates, 1)
+        scene.resetMaxDisplayFps()
+        self.assertEqual(scene.getMaxDisplayFps(),
+                         TaurusGraphicsScene.DEFAULT_MAX_DISPLAY_FPS)
+
+    def test_max_damage_rects(self):
+        '''Check that too many damaged rects are repainted as their union'''
+        scene = self._widget
+        del scene.updateSceneRects
+        view = Qt.QGraphicsView(scene)
+        view.setViewportUpdateMode(Qt.QGraphicsView.MinimalViewportUpdate)
+        updates = []
+        view.updateScene = updates.append
+        n = TaurusGraphicsScene.MAX_DAMAGE_RECTS + 1
+        scene.updateSceneRects([Qt.QRectF(i, 0, 1, 1) for i in range(n)])
+        self.assertEqual(updates, [[Qt.QRectF(0, 0, n, 1)]])
+        scene.updateSceneRects([Qt.QRectF(0, 0, 1, 1)])
+        self.assertEqual(updates[-1], [Qt.QRectF(0, 0, 1, 1)])
+
+
+def _linearGetItemByName(scene, item_name, strict):
+    '''reference getItemByName: matches the name against the names of all
+    the items of the scene'''
+    alnum = r'(?:[a-zA-Z0-9-_\*]|(?:\.\*))(?:[a-zA-Z0-9-_\*]|(?:\.\*))*'
+    target = str(item_name).strip().split()[0].lower().replace('/state', '')
+    if not strict and TangoAttributeNameValidator().getUriGroups(target):
+        target = target.rsplit('/', 1)[0]
+    if TangoDeviceNameValidator().getUriGroups(target):
+        if strict:
+            target += '(/state)?'
+        else:
+            target += '(/' + alnum + ')?'
+    if not target.endswith('$'):
+        target += '$'
+    return [i for i in scene.items()
+            if getattr(i, '_name', '') and
+            re.match(target, str(i._name).lower())]
+
+
+def _linearGetItemByPosition(scene, x, y):
+    '''reference getItemByPosition: tests all the named items of the scene
+    and returns the top-most one'''
+    pos = Qt.QPointF(x, y)
+    found = [(i.zValue(), i) for i in scene.items()
+             if getattr(i, '_name', '') and
+             i.contains(i.mapFromScene(pos)) and
+             not i.getExtensions().get('noSelect')]
+    if not found:
+        return None
+    obj = max(found)[1]
+    return scene.getTaurusParentItem(obj) or obj
+
+
+class IndexTest(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Tests for the name and position lookups of TaurusGraphicsScene, which
+    must match the linear scans of all the items
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = TaurusGraphicsScene
+
+    names = ['sys/tg_test/1', 'sys/tg_test/1/state',
+             'sys/tg_test/1/double_scalar', 'sys/tg_test/1/long_scalar',
+             'sys/tg_test/2', 'sys/tg_test/2/double_scalar',
+             'sys/tg_test/10/state', 'eval:1']
+    queries = ['sys/tg_test/1', 'SYS/TG_TEST/1', 'sys/tg_test/1/state',
+               'sys/tg_test/1/double_scalar', 'sys/tg_test/2',
+               'sys/tg_test/10', 'sys/tg_test/3', 'eval:1',
+               'sys/tg_test/.*', 'sys/tg_test/1.*/state']
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self._items = []
+        for i, name in enumerate(self.names):
+            item = TaurusRectStateItem(name)
+            # overlapping items with different stacking order
+            item.setRect(10 * i, 0, 15, 15)
+            item.setZValue(i % 3)
+            self._widget.addItem(item)
+            self._items.append(item)
+
+    def assertLookupsMatch(self):
+        scene = self._widget
+        for q in self.queries:
+            for strict in (True, False):
+                self.assertEqual(set(scene.getItemByName(q, strict=strict)),
+                                 set(_linearGetItemByName(scene, q, strict)),
+                                 'getItemByName(%r, strict=%s)' % (q, strict))
+        # (points off the item edges, where both tests could differ)
+        for x in range(-5, 10 * len(self.names) + 20, 3):
+            for y in (-1, 7, 30):
+                x, y = x + .5, y + .5
+                self.assertTrue(scene.getItemByPosition(x, y) is
+                                _linearGetItemByPosition(scene, x, y),
+                                'getItemByPosition(%g, %g)' % (x, y))
+
+    def test_lookups(self):
+        '''Check the lookups after adding the items'''
+        self.assertLookupsMatch()
+
+    def test_move(self):
+        '''Check the lookups after moving items'''
+        self._items[0].setPos(40, 3)
+        self._items[5].setPos(-30, 0)
+        self.assertLookupsMatch()
+
+    def test_remove(self):
+        '''Check the lookups after removing items'''
+        for i in (2, 4, 6):
+            self._widget.removeItem(self._items[i])
+        self.assertLookupsMatch()
+        self.assertEqual(
+            self._widget.getItemByName('sys/tg_test/2', strict=True), [])
+
+    def test_readd(self):
+        '''Check the lookups after removing an item and adding it again'''
+        self._widget.removeItem(self._items[1])
+        self._widget.addItem(self._items[1])
+        self.assertLookupsMatch()
+
+
+class LazyAttachTest(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Tests for the lazy attach mode of TaurusGraphicsScene
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = TaurusGraphicsScene
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        scene = self._widget
+        scene.LAZY_DETACH_DELAY = 0
+        self._view = Qt.QGraphicsView(scene)
+        self._view.resize(200, 200)
+        self._view.show()
+        self._inview = self._addItem('eval:1', 0, 0)
+        self._outview = self._addItem('eval:2', 10000, 10000)
+        self._view.centerOn(self._inview)
+        scene.setLazyAttach(True)
+        scene.updateLazyModels()
+
+    def tearDown(self):
+        self._widget.setLazyAttach(False)
+        self._view.close()
+
+    def _addItem(self, name, x, y):
+        item = TaurusEllipseStateItem(name)
+        item.setRect(x, y, 10, 10)
+        self._widget.addItem(item)
+        return item
+
+    def test_attach(self):
+        '''Check that only the items in view are attached'''
+        self.assertTrue(self._inview.getModelName())
+        self.assertFalse(self._outview.getModelName())
+
+    def test_hidden_item_stays_attached(self):
+        '''Check that an item hidden (e.g. by its visibility mapper) while
+        in view is not detached'''
+        self._inview.setVisible(False)
+        self._widget.updateLazyModels()
+        self.assertTrue(self._inview in self._widget._lazyAttached)
+        self.assertTrue(self._inview.getModelName())
+
+    def test_detach(self):
+        '''Check that the items scrolled out of view are detached'''
+        self._view.centerOn(self._outview)
+        self._widget.updateLazyModels()
+        self.assertFalse(self._inview.getModelName())
+        self.assertEqual(self._inview.getName(), 'eval:1')
+        self.assertTrue(self._outview.getModelName())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,6 +28,5 @@ provide a way to browse through the application help system"""
 
 __docformat__ = 'restructuredtext'
 
-from .assistant import *
-from .aboutdialog import *
-from .helppanel import *
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['assistant', 'aboutdialog', 'helppanel'])
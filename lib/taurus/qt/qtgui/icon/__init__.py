@@ -29,4 +29,5 @@ sources of icons.
 """
 
 from icon import *
+from pixmapcache import *
 from catalog import QIconCatalog
@@ -39,6 +39,7 @@ __all__ = [
     'getDevStateToolTip',
     'getDevStateIcon',
     'getDevStatePixmap',
+    'preloadDevStateIcons',
     'REGISTERED_PREFIXES',
 ]
 
@@ -53,6 +54,8 @@ from taurus.external.qt import Qt
 
 from taurus.core.taurusbasetypes import TaurusElementType, TaurusDevState
 from taurus.core.util.log import Logger
+from taurus.qt.qtgui.icon.pixmapcache import getPixmapCache, \
+    pixmapCacheKey, renderImage, preloadPixmaps
 
 __LOGGER = Logger(__name__)
 
@@ -111,6 +114,9 @@ _STATE_MAP = {
                                "Element state undefined")
 }
 
+# the icons of the states, shared so that each one renders its pixmaps once
+_STATE_ICONS = {}
+
 # set of registered prefixes (updated by registerPathFiles() )
 REGISTERED_PREFIXES = set()
 
@@ -166,7 +172,8 @@ def registerTheme(name='Tango', path='', force=False):
 def getCachedPixmap(key, size=None):
     """Returns a PyQt4.QtGui.QPixmap object for the given key and size.
     The key argument supports QDir's searchPath prefixes (see
-    :meth:`QDir.setSearchPaths`).
+    :meth:`QDir.setSearchPaths`). The pixmaps are kept in the
+    :func:`getPixmapCache` (see also :func:`preloadPixmaps`).
 
     :param key: (str) the pixmap key., e.g.: 'status:folder-open.svg'
     :param size: (int) the pixmap size in pixels (will get a square pixmap).
@@ -174,16 +181,15 @@ def getCachedPixmap(key, size=None):
 
     :return: (PyQt4.QtGui.QPixmap)"""
 
-    name = key
-    if size is not None:
-        key += "_%sx%s" % (size, size)
-    pm = Qt.QPixmapCache.find(key)
+    name, key = key, pixmapCacheKey(key, size)
+    cache = getPixmapCache()
+    pm = cache.find(key)
     if pm is None:
-        pm = Qt.QPixmap(name)
-        if size is not None:
-            pm = pm.scaled(size, size, Qt.Qt.KeepAspectRatio,
-                           Qt.Qt.SmoothTransformation)
-        Qt.QPixmapCache.insert(key, pm)
+        if size is None:
+            pm = Qt.QPixmap(name)
+        else:
+            pm = Qt.QPixmap.fromImage(renderImage(name, size))
+        cache.insert(key, pm)
     return Qt.QPixmap(pm)
 
 
@@ -298,14 +304,19 @@ def getDevStateIcon(state, fallback=None):
     data = _STATE_MAP.get(state)
     if data is None:
         return
-    name = data[__IDX_STATE_ICON]
-
-    icon = Qt.QIcon(name)
+    icon = _getStateIcon(data[__IDX_STATE_ICON])
     if icon.isNull() and fallback is not None:
         icon = fallback
     return icon
 
 
+def _getStateIcon(name):
+    icon = _STATE_ICONS.get(name)
+    if icon is None:
+        icon = _STATE_ICONS[name] = Qt.QIcon(name)
+    return icon
+
+
 def getDevStatePixmap(state, size=None):
     """Gets a PyQt4.QtGui.QPixmap object for the given
     :class:`taurus.core.taurusbasetypes.TaurusDevState`.
@@ -324,6 +335,25 @@ def getDevStatePixmap(state, size=None):
     name = data[__IDX_STATE_ICON]
     return getCachedPixmap(name, size)
 
+
+def preloadDevStateIcons(sizes=(16,), threaded=False):
+    """Renders in advance the pixmaps of the given sizes of the
+    :class:`taurus.core.taurusbasetypes.TaurusDevState` icons and pixmaps
+    (see :func:`getDevStateIcon` and :func:`getDevStatePixmap`), so that the
+    views showing many of them do not render them while they are painted.
+
+    :param sizes: (seq<int>) the pixmap sizes in pixels
+    :param threaded: (bool) if True, the images are rendered in a background
+                     thread (see :func:`preloadPixmaps`)
+    """
+    def addToIcon(name, size, pixmap):
+        if not pixmap.isNull():
+            _getStateIcon(name).addPixmap(pixmap)
+
+    names = set(data[__IDX_STATE_ICON] for data in _STATE_MAP.values())
+    preloadPixmaps(sorted(names), sizes, threaded=threaded,
+                   callback=addToIcon)
+
 if __name__ == '__main__':
     from taurus.qt.qtgui.application import TaurusApplication
 
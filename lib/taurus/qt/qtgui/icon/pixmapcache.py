@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""This module provides the cache of the pixmaps used by the taurus widgets
+and the functions for rendering them in advance"""
+
+__all__ = [
+    'PixmapCache',
+    'getPixmapCache',
+    'pixmapCacheKey',
+    'renderImage',
+    'preloadPixmaps',
+]
+
+__docformat__ = 'restructuredtext'
+
+import threading
+import collections
+
+from taurus.external.qt import Qt
+
+# the preloaders whose images are not yet in the cache
+_PRELOADERS = set()
+
+
+class PixmapCache(object):
+    """A cache of pixmaps bounded by the memory that they use: when the limit
+    is exceeded, the least recently used pixmaps are discarded. It keeps
+    statistics of its usage (see :meth:`getStats`).
+
+    It must only be used from the GUI thread (as the pixmaps themselves)"""
+
+    #: default limit (in KB)
+    DefaultCacheLimit = 10240
+
+    def __init__(self, limit=None):
+        if limit is None:
+            limit = self.DefaultCacheLimit
+        self._limit = limit
+        self._cost = 0
+        self._pixmaps = collections.OrderedDict()
+        self.resetStats()
+
+    def __contains__(self, key):
+        return key in self._pixmaps
+
+    def __len__(self):
+        return len(self._pixmaps)
+
+    @staticmethod
+    def pixmapCost(pixmap):
+        """Returns the memory (in KB) used by the given pixmap"""
+        return max(1, pixmap.width() * pixmap.height() * pixmap.depth() // 8192)
+
+    def cacheLimit(self):
+        """Returns the limit of the cache (in KB)"""
+        return self._limit
+
+    def setCacheLimit(self, limit):
+        """Sets the limit of the cache (in KB), discarding the least recently
+        used pixmaps if needed"""
+        self._limit = limit
+        self._shrink()
+
+    def find(self, key):
+        """Returns the pixmap cached with the given key or None"""
+        item = self._pixmaps.pop(key, None)
+        if item is None:
+            self.misses += 1
+            return None
+        self._pixmaps[key] = item
+        self.hits += 1
+        return item[0]
+
+    def insert(self, key, pixmap):
+        """Caches the given pixmap with the given key. Returns False if the
+        pixmap is larger than the cache limit (and it is not cached)"""
+        self.remove(key)
+        cost = self.pixmapCost(pixmap)
+        if cost > self._limit:
+            return False
+        self._pixmaps[key] = pixmap, cost
+        self._cost += cost
+        self._shrink()
+        return True
+
+    def remove(self, key):
+        """Removes the pixmap cached with the given key (if any)"""
+        item = self._pixmaps.pop(key, None)
+        if item is not None:
+            self._cost -= item[1]
+
+    def clear(self):
+        """Removes all the pixmaps"""
+        self._pixmaps.clear()
+        self._cost = 0
+
+    def _shrink(self):
+        pixmaps = self._pixmaps
+        while self._cost > self._limit and pixmaps:
+            _, (_, cost) = pixmaps.popitem(last=False)
+            self._cost -= cost
+            self.evictions += 1
+
+    def getStats(self):
+        """Returns a dict with the number of hits, misses and evictions
+        (pixmaps discarded to respect the limit) since the last
+        :meth:`resetStats` and the number of pixmaps, the memory that they
+        use and the limit (both in KB)"""
+        return dict(hits=self.hits, misses=self.misses,
+                    evictions=self.evictions, count=len(self._pixmaps),
+                    cost=self._cost, limit=self._limit)
+
+    def resetStats(self):
+        """Resets the hits, misses and evictions counters"""
+        self.hits = self.misses = self.evictions = 0
+
+
+_PIXMAP_CACHE = None
+
+
+def getPixmapCache():
+    """Returns the :class:`PixmapCache` shared by the taurus widgets. Its
+    limit is given by the PIXMAP_CACHE_LIMIT option of
+    :mod:`taurus.tauruscustomsettings`
+
+    :return: (PixmapCache)"""
+    global _PIXMAP_CACHE
+    if _PIXMAP_CACHE is None:
+        from taurus import tauruscustomsettings
+        _PIXMAP_CACHE = PixmapCache(getattr(tauruscustomsettings,
+                                            'PIXMAP_CACHE_LIMIT', None))
+    return _PIXMAP_CACHE
+
+
+def pixmapCacheKey(name, size=None):
+    """Returns the key of the pixmap of the given name and size in the
+    :func:`getPixmapCache` (see :func:`getCachedPixmap`)"""
+    if size is None:
+        return name
+    return "%s_%sx%s" % (name, size, size)
+
+
+def renderImage(name, size=None):
+    """Returns a Qt.QImage with the image of the given name (which supports
+    QDir's searchPath prefixes) scaled (keeping its aspect ratio) to fit in
+    a square of the given size. Vector images are directly rendered at that
+    size. Unlike the pixmaps, it can be called from any thread.
+
+    :param name: (str) the image name, e.g.: 'status:available.svg'
+    :param size: (int) the size in pixels. If None is passed, the image
+                 keeps its original size
+
+    :return: (Qt.QImage) the image (null if it cannot be read)"""
+    reader = Qt.QImageReader(name)
+    if size is not None:
+        originalSize = reader.size()
+        if originalSize.isValid():
+            reader.setScaledSize(originalSize.scaled(size, size,
+                                                     Qt.Qt.KeepAspectRatio))
+            size = None
+    image = reader.read()
+    if size is not None and not image.isNull():
+        image = image.scaled(size, size, Qt.Qt.KeepAspectRatio,
+                             Qt.Qt.SmoothTransformation)
+    return image
+
+
+def _insertPixmaps(images, callback=None):
+    cache = getPixmapCache()
+    for name, size, image in images:
+        key = pixmapCacheKey(name, size)
+        # keep the pixmap of the widgets which already use it
+        pixmap = cache.find(key) if key in cache else None
+        if pixmap is None:
+            pixmap = Qt.QPixmap.fromImage(image)
+            cache.insert(key, pixmap)
+        if callback is not None:
+            callback(name, size, pixmap)
+
+
+class _PixmapPreloader(Qt.QObject):
+    """Renders images in a background thread and caches them as pixmaps in
+    the thread of the preloader (the GUI thread)"""
+
+    imagesRendered = Qt.pyqtSignal(object)
+
+    def __init__(self, names, sizes, callback=None):
+        Qt.QObject.__init__(self)
+        self._names = names
+        self._sizes = sizes
+        self._callback = callback
+        self.imagesRendered.connect(self._onImagesRendered)
+
+    def start(self):
+        _PRELOADERS.add(self)
+        thread = threading.Thread(target=self._render,
+                                  name='TaurusPixmapPreloader')
+        thread.daemon = True
+        thread.start()
+
+    def _render(self):
+        # the images of each name are cached together, so that they are
+        # available as soon as possible
+        for name in self._names:
+            self.imagesRendered.emit([(name, size, renderImage(name, size))
+                                      for size in self._sizes])
+        self.imagesRendered.emit(None)
+
+    def _onImagesRendered(self, images):
+        if images is None:
+            _PRELOADERS.discard(self)
+        else:
+            _insertPixmaps(images, self._callback)
+
+
+def preloadPixmaps(names, sizes=(None,), threaded=False, callback=None):
+    """Renders the pixmaps of the given names and sizes and adds them to the
+    :func:`getPixmapCache`, so that :func:`getCachedPixmap` does not need to
+    render them when they are first used. Call it from the GUI thread (e.g.
+    when the application starts).
+
+    :param names: (seq<str>) the pixmap names, e.g.: 'status:available.svg'
+    :param sizes: (seq<int>) the pixmap sizes (None for the original size)
+    :param threaded: (bool) if True, the images are rendered in a background
+                     thread and the pixmaps are cached as they are rendered
+                     (by the Qt event loop) after this function returns
+    :param callback: (callable) if given, it is called with the name, the
+                     size and the pixmap of each cached pixmap
+    """
+    names, sizes = list(names), list(sizes)
+    if threaded:
+        _PixmapPreloader(names, sizes, callback).start()
+        return
+    for name in names:
+        _insertPixmaps([(name, size, renderImage(name, size))
+                        for size in sizes], callback)
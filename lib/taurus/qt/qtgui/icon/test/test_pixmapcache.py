@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for taurus.qt.qtgui.icon.pixmapcache"""
+
+from taurus.external import unittest
+from taurus.external.qt import Qt
+from taurus.core.taurusbasetypes import TaurusDevState
+from taurus.qt.qtgui.icon import (PixmapCache, getPixmapCache,
+                                  pixmapCacheKey, renderImage,
+                                  preloadPixmaps, getCachedPixmap,
+                                  getDevStateIcon, preloadDevStateIcons)
+
+_STATE_ICON = 'status:available.svg'
+
+
+def _pixmap(size):
+    pixmap = Qt.QPixmap(size, size)
+    pixmap.fill(Qt.Qt.red)
+    return pixmap
+
+
+class PixmapCacheTestCase(unittest.TestCase):
+    """Test cases for the PixmapCache"""
+
+    def setUp(self):
+        if Qt.QApplication.instance() is None:
+            self.app = Qt.QApplication([])
+
+    def test_limit(self):
+        """Check that the least recently used pixmaps are discarded"""
+        cache = PixmapCache(limit=3 * PixmapCache.pixmapCost(_pixmap(32)))
+        for key in 'abc':
+            self.assertTrue(cache.insert(key, _pixmap(32)))
+        self.assertFalse(cache.find('a') is None)
+        cache.insert('d', _pixmap(32))
+        self.assertEqual(sorted(k for k in 'abcd' if k in cache),
+                         ['a', 'c', 'd'])
+        self.assertFalse(cache.insert('e', _pixmap(256)))
+        self.assertFalse('e' in cache)
+        cache.setCacheLimit(PixmapCache.pixmapCost(_pixmap(32)))
+        self.assertEqual(len(cache), 1)
+        self.assertTrue('d' in cache)
+
+    def test_stats(self):
+        """Check the hit/miss statistics"""
+        cache = PixmapCache(limit=PixmapCache.pixmapCost(_pixmap(32)))
+        self.assertTrue(cache.find('a') is None)
+        cache.insert('a', _pixmap(32))
+        cache.find('a')
+        cache.find('a')
+        cache.insert('b', _pixmap(32))
+        stats = cache.getStats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions'],
+                          stats['count']), (2, 1, 1, 1))
+        self.assertEqual(stats['cost'], stats['limit'])
+        cache.resetStats()
+        self.assertEqual(cache.getStats()['hits'], 0)
+
+    def test_cached_pixmap(self):
+        """Check that getCachedPixmap renders each size once"""
+        cache = getPixmapCache()
+        cache.remove(pixmapCacheKey(_STATE_ICON, 20))
+        hits = cache.getStats()['hits']
+        pixmap = getCachedPixmap(_STATE_ICON, 20)
+        self.assertEqual(max(pixmap.width(), pixmap.height()), 20)
+        self.assertEqual(getCachedPixmap(_STATE_ICON, 20).cacheKey(),
+                         pixmap.cacheKey())
+        self.assertEqual(cache.getStats()['hits'], hits + 1)
+
+    def test_render_image(self):
+        """Check that the images are rendered with the given size"""
+        image = renderImage(_STATE_ICON, 40)
+        self.assertEqual(max(image.width(), image.height()), 40)
+        self.assertTrue(renderImage('NONEXISTENT/PATH', 40).isNull())
+
+    def test_preload(self):
+        """Check that the preloaded pixmaps are cached"""
+        cache = getPixmapCache()
+        preloaded = []
+        preloadPixmaps([_STATE_ICON], [12, 14],
+                       callback=lambda *args: preloaded.append(args[:2]))
+        self.assertEqual(preloaded, [(_STATE_ICON, 12), (_STATE_ICON, 14)])
+        for size in 12, 14:
+            self.assertTrue(pixmapCacheKey(_STATE_ICON, size) in cache)
+
+    def test_state_icons(self):
+        """Check that the state icons are shared and preloaded"""
+        icon = getDevStateIcon(TaurusDevState.Ready)
+        self.assertTrue(icon is getDevStateIcon(TaurusDevState.Ready))
+        preloadDevStateIcons(sizes=(18,))
+        self.assertTrue(pixmapCacheKey(_STATE_ICON, 18) in getPixmapCache())
+        self.assertFalse(icon.pixmap(18).isNull())
+
+
+if __name__ == '__main__':
+    unittest.main()
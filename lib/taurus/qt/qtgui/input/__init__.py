@@ -28,10 +28,7 @@ with the user. Examples are line edits, comboboxes and checkboxes"""
 
 __docformat__ = 'restructuredtext'
 
-from .qwheel import *
-from .tauruscheckbox import *
-from .tauruscombobox import *
-from .tauruslineedit import *
-from .taurusspinbox import *
-from .tauruswheel import *
-from .choicedlg import *
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['qwheel', 'tauruscheckbox', 'tauruscombobox',
+                               'tauruslineedit', 'taurusspinbox',
+                               'tauruswheel', 'choicedlg'])
@@ -27,4 +27,5 @@
 
 __docformat__ = 'restructuredtext'
 
-from .qbasemodel import *
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['qbasemodel'])
@@ -54,7 +54,12 @@ class BaseToolBar(Qt.QToolBar):
 
 
 class FilterToolBar(BaseToolBar):
-    """Internal widget providing quick filter to be placed in a _QToolArea"""
+    """Internal widget providing quick filter to be placed in a _QToolArea.
+    While the user types, filterChanged is only emitted once the text did
+    not change for FilterDelay milliseconds"""
+
+    #: default delay (ms) before applying a typed filter (0 means no delay)
+    FilterDelay = 200
 
     filterEdited = Qt.pyqtSignal('const QString &')
     filterChanged = Qt.pyqtSignal('const QString &')
@@ -71,6 +76,11 @@ class FilterToolBar(BaseToolBar):
         filterLineEdit.textEdited.connect(self.onFilterEdited)
         self.addWidget(filterLineEdit)
 
+        self._filterDelay = self.FilterDelay
+        self._filterTimer = Qt.QTimer(self)
+        self._filterTimer.setSingleShot(True)
+        self._filterTimer.timeout.connect(self._emitFilterChanged)
+
         af = ActionFactory()
         self._clearFilterAction = af.createAction(self, "Clear",
                                                   icon=Qt.QIcon.fromTheme(
@@ -82,13 +92,32 @@ class FilterToolBar(BaseToolBar):
     def getFilterLineEdit(self):
         return self._filterLineEdit
 
+    def setFilterDelay(self, delay):
+        """Sets the time (ms) the text must be unchanged before the filter
+        is applied"""
+        self._filterDelay = delay
+
+    def getFilterDelay(self):
+        return self._filterDelay
+
+    def resetFilterDelay(self):
+        self.setFilterDelay(self.FilterDelay)
+
     def onClearFilter(self):
         self.getFilterLineEdit().setText("")
+        self._emitFilterChanged()
         self.clearFilterTriggered.emit()
 
     def onFilterChanged(self, text=None):
-        text = text or self.getFilterLineEdit().text()
-        self.filterChanged.emit(text)
+        if self._filterDelay > 0:
+            self._filterTimer.start(self._filterDelay)
+        else:
+            text = text or self.getFilterLineEdit().text()
+            self.filterChanged.emit(text)
+
+    def _emitFilterChanged(self):
+        self._filterTimer.stop()
+        self.filterChanged.emit(self.getFilterLineEdit().text())
 
     def onFilterEdited(self, text=None):
         text = text or self.getFilterLineEdit().text()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for the toolbars of taurus.qt.qtgui.model.qbasemodel"""
+
+import time
+
+from taurus.external import unittest
+from taurus.qt.qtgui.test import BaseWidgetTestCase
+from taurus.qt.qtgui.model.qbasemodel import FilterToolBar
+
+
+class FilterToolBarTest(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Tests for the delayed filterChanged signal of FilterToolBar
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = FilterToolBar
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self._filters = []
+        self._widget.filterChanged.connect(
+            lambda text: self._filters.append(str(text)))
+
+    def _wait(self, timeout=1.):
+        t0 = time.time()
+        while not self._filters and time.time() - t0 < timeout:
+            self._app.processEvents()
+            time.sleep(.01)
+
+    def _type(self, *texts):
+        for text in texts:
+            self._widget.getFilterLineEdit().setText(text)
+
+    def test_delay(self):
+        '''Check that filterChanged is emitted once for the last text'''
+        self._widget.setFilterDelay(50)
+        self._type('s', 'sy', 'sys')
+        self.assertEqual(self._filters, [])
+        self._wait()
+        self.assertEqual(self._filters, ['sys'])
+        # nothing else is pending
+        time.sleep(.1)
+        self._app.processEvents()
+        self.assertEqual(self._filters, ['sys'])
+
+    def test_no_delay(self):
+        '''Check that filterChanged is emitted for every text with no delay'''
+        self._widget.setFilterDelay(0)
+        self._type('s', 'sy', 'sys')
+        self.assertEqual(self._filters, ['s', 'sy', 'sys'])
+
+    def test_clear(self):
+        '''Check that clearing the filter is applied immediately and cancels
+        the pending filter'''
+        self._widget.setFilterDelay(50)
+        self._type('sys')
+        self._widget.onClearFilter()
+        self.assertEqual(self._filters, [''])
+        time.sleep(.1)
+        self._app.processEvents()
+        self.assertEqual(self._filters, [''])
+
+    def test_reset_delay(self):
+        '''Check the FilterDelay property'''
+        self.assertEqual(self._widget.getFilterDelay(),
+                         FilterToolBar.FilterDelay)
+        self._widget.setFilterDelay(10)
+        self.assertEqual(self._widget.getFilterDelay(), 10)
+        self._widget.resetFilterDelay()
+        self.assertEqual(self._widget.getFilterDelay(),
+                         FilterToolBar.FilterDelay)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,15 +28,11 @@ panels like forms or panels to be inserted in dialogs"""
 
 __docformat__ = 'restructuredtext'
 
-from .qrawdatachooser import *
-from .qdataexportdialog import *
-from .taurusmessagepanel import *
-from .taurusinputpanel import *
-from .taurusmodelchooser import *
-from .taurusvalue import *
-from .taurusform import *
-from .taurusmodellist import *
-from .taurusconfigeditor import *
-from .qdoublelist import *
-from .taurusdevicepanel import *
-from .taurusconfigurationpanel import *
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['qrawdatachooser', 'qdataexportdialog',
+                               'taurusmessagepanel', 'taurusinputpanel',
+                               'taurusmodelchooser', 'taurusvalue',
+                               'taurusform', 'taurusmodellist',
+                               'taurusconfigeditor', 'qdoublelist',
+                               'taurusdevicepanel',
+                               'taurusconfigurationpanel'])
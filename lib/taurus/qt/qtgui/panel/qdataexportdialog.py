@@ -31,7 +31,10 @@ __all__ = ["QDataExportDialog"]
 import os.path
 from datetime import datetime
 
+import numpy
+
 from taurus.external.qt import Qt
+from taurus.core.util.dataexport import exportDataSets, getExportFormat
 from taurus.qt.qtgui.util.ui import UILoadable
 
 
@@ -46,16 +49,26 @@ class QDataExportDialog(Qt.QDialog):
     where name is the curve name and
     x,y are iterable containers (e.g., lists, tuple, arrays...) of data to be exported
 
+    The data is written using :func:`taurus.core.util.dataexport.exportDataSets`
+    (except when exporting the edited text of the preview), so it can also be
+    exported to NPZ or HDF5 files by choosing the corresponding extension.
+
     @TODO: It would be nice if the textedit scrolled to the start ***also for the first set loaded***"""
 
     # constants
     allInSingleFile = "All sets in a single file (table like)"
     allInMultipleFiles = "All set in multiple files"
+    #: maximum number of rows shown in the preview. If the data is larger,
+    #: the preview is read-only and the data is streamed directly to the file
+    maxPreviewRows = 10000
+    fileFilters = ('All Files (*);;ASCII (*.dat *.txt *.csv);;'
+                   'NumPy (*.npz);;HDF5 (*.h5 *.hdf5)')
 
     def __init__(self, parent=None, datadict=None, sortedNames=None):
         super(QDataExportDialog, self).__init__(parent)
         self.loadUi()
         self._xIsTime = False
+        self._previewTruncated = False
 
         # connections
         self.exportBT.clicked.connect(self.exportData)
@@ -104,38 +117,42 @@ class QDataExportDialog(Qt.QDialog):
                 #**lazy** sanitising of the set to *suggest* it as a filename
                 name = set.replace('*', '').replace('/', '_').replace('\\', '_')
                 name += ".dat"
-            ofile = Qt.QFileDialog.getSaveFileName( self, 'Export File Name',
-                                                    name, 'All Files (*)')
+            ofile = Qt.QFileDialog.getSaveFileName(self, 'Export File Name',
+                                                   name, self.fileFilters)
             if not ofile:
                 return False
+        if isinstance(ofile, file):
+            fname = ofile.name
+        else:
+            fname = str(ofile)
+        fmt = getExportFormat(fname)
         try:
-            if not isinstance(ofile, file):
-                ofile = open(str(ofile), "w")
-            if self.dataSetCB.currentText() == self.allInMultipleFiles:
-                # 1  file per curve
-                text = "# DATASET= %s" % set
-                text += "\n# SNAPSHOT_TIME= %s\n" % self.datatime.isoformat('_')
-                xdata, ydata = self.datadict[set]
-                if self.xIsTime():
-                    for x,y in zip(xdata, ydata):
-                        t = datetime.fromtimestamp(x)
-                        text += "%s\t%r\n" % (t.isoformat('_'), y)
+            if (fmt != 'ascii' or self._previewTruncated or
+                    self.dataSetCB.currentText() == self.allInMultipleFiles):
+                # the data is streamed to the file (not taken from the text)
+                if isinstance(ofile, file):
+                    ofile.close()
+                if set == self.allInSingleFile:
+                    names = self.sortedNames
                 else:
-                    for x,y in zip(xdata, ydata):
-                        text+="%r\t%r\n" % (x, y)
-                print >> ofile, str(text)
+                    names = [set]
+                exportDataSets(fname, self.datadict, sortedNames=names,
+                               fmt=fmt, xIsTime=self.xIsTime())
             else:
-                print >> ofile, str(self.dataTE.toPlainText())
+                if not isinstance(ofile, file):
+                    ofile = open(fname, "w")
+                try:
+                    print >> ofile, str(self.dataTE.toPlainText())
+                finally:
+                    ofile.close()
         except:
             Qt.QMessageBox.warning(self,
                                    "File saving failed",
-                                   "Failed to save file '%s'" % str(ofile.name),
+                                   "Failed to save file '%s'" % fname,
                                    Qt.QMessageBox.Ok)
             raise
-        finally:
-            ofile.close()
         if verbose:
-            msg = "Set saved to '%s'" % str(ofile.name)
+            msg = "Set saved to '%s'" % fname
             Qt.QMessageBox.information(self, "Set exported", msg,
                                        Qt.QMessageBox.Ok)
         if AllowCloseAfter and self.closeAfterCB.isChecked(): 
@@ -185,7 +202,7 @@ class QDataExportDialog(Qt.QDialog):
                 if previous is None:
                     previous = xdata
                     header += ' "abscissa"'
-                elif previous != xdata:
+                elif not numpy.array_equal(previous, xdata):
                     if (key == self.allInSingleFile):
                         self.dataTE.clear()
                         Qt.QMessageBox.critical(self,
@@ -208,7 +225,8 @@ class QDataExportDialog(Qt.QDialog):
             header += "\n# SNAPSHOT_TIME= %s\n" % self.datatime.isoformat('_')
             # if we reached this point x axes are equal, so fill the editor
             # with the data
-            for i, x in enumerate(previous):
+            nrows = len(previous)
+            for i, x in enumerate(previous[:self.maxPreviewRows]):
                 if self.xIsTime():
                     t = datetime.fromtimestamp(x)
                     body += "%s" % t.isoformat('_')
@@ -218,17 +236,19 @@ class QDataExportDialog(Qt.QDialog):
                     xdata, ydata = self.datadict[curve_name]
                     body += ("\t%r" % ydata[i])
                 body += "\n"
+            body += self._truncationNote(nrows)
             # fill text editor
             self.dataTE.clear()
             self.dataTE.insertPlainText(header + body)
             self.dataTE.moveCursor(Qt.QTextCursor.Start)
-            if key == self.allInMultipleFiles:
+            if key == self.allInMultipleFiles or self._previewTruncated:
                 self.dataTE.setReadOnly(True)
             else:
                 self.dataTE.setReadOnly(False)
         else:
-            self.dataTE.setReadOnly(False)
             xdata, ydata = self.datadict[key]
+            nrows = len(xdata)
+            xdata = xdata[:self.maxPreviewRows]
             text = '# DATASET= "%s"\n' % key
             text += "# SNAPSHOT_TIME= %s\n" % self.datatime.isoformat('_')
             if self.xIsTime():
@@ -238,10 +258,21 @@ class QDataExportDialog(Qt.QDialog):
             else:
                 for x, y in zip(xdata, ydata):
                     text += "%r\t%r\n" %(x, y)
+            text += self._truncationNote(nrows)
+            self.dataTE.setReadOnly(self._previewTruncated)
             self.dataTE.clear()
             self.dataTE.insertPlainText(text)
             self.dataTE.moveCursor(Qt.QTextCursor.Start)
 
+    def _truncationNote(self, nrows):
+        '''returns a note for the preview if it does not show all the rows
+        (and sets the preview as truncated)'''
+        self._previewTruncated = nrows > self.maxPreviewRows
+        if not self._previewTruncated:
+            return ""
+        return ("# ... (%i more rows not shown in this preview but they will "
+                "be exported)\n" % (nrows - self.maxPreviewRows))
+
     def setXIsTime(self, xIsTime):
         self._xIsTime = xIsTime
         self.updateText()
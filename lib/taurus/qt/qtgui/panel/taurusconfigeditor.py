@@ -32,10 +32,9 @@ __all__ = ["QConfigEditor"]
 __docformat__ = 'restructuredtext'
 
 from taurus.external.qt import Qt
-import cPickle as pickle
 import os
 import tempfile
-from taurus.qt.qtcore.configuration import BaseConfigurableClass
+from taurus.qt.qtcore.configuration import BaseConfigurableClass, serializer
 from taurus.qt.qtgui.container import TaurusWidget
 import shutil
 
@@ -335,7 +334,7 @@ class QConfigEditorModel(Qt.QStandardItemModel):
     def getTaurusConfigFromSettings(self, key='TaurusConfig'):
         '''
         Loads and returns the configuration dictionary from the settings file
-        using pickle module.
+        using the :mod:`taurus.qt.qtcore.configuration.serializer` module.
 
         :param key: (str)
 
@@ -345,7 +344,7 @@ class QConfigEditorModel(Qt.QStandardItemModel):
         qstate = Qt.from_qvariant(self._settings.value(key), 'toByteArray')
         if qstate is not None and not qstate.isNull():
             try:
-                result = pickle.loads(qstate.data())
+                result = serializer.loads(qstate.data(), lazy=False)
             except Exception, e:
                 msg = 'problems loading TaurusConfig: \n%s' % repr(e)
                 Qt.QMessageBox.critical(None, 'Error loading settings', msg)
@@ -378,7 +377,7 @@ class QConfigEditorModel(Qt.QStandardItemModel):
 
         # store the config dict
         self._settings.setValue("TaurusConfig", Qt.QVariant(
-            Qt.QByteArray(pickle.dumps(self._configurationDictionaries[group]))))
+            Qt.QByteArray(serializer.dumps(self._configurationDictionaries[group]))))
         if group is not None:
             self._settings.endGroup()
         #self.info('MainWindow settings saved in "%s"'%self._settings.fileName())
@@ -29,6 +29,8 @@ __all__ = ["TaurusAttrForm", "TaurusCommandsForm", "TaurusForm"]
 
 __docformat__ = 'restructuredtext'
 
+import bisect
+import threading
 from datetime import datetime
 
 from taurus.external.qt import Qt
@@ -42,6 +44,7 @@ from taurus.qt.qtcore.mimetypes import (TAURUS_ATTR_MIME_TYPE, TAURUS_DEV_MIME_T
 from taurus.qt.qtgui.container import TaurusWidget, TaurusScrollArea
 from taurus.qt.qtgui.button import QButtonBox, TaurusCommandButton
 from taurusmodelchooser import TaurusModelChooser
+from taurusvalue import getDeviceClassName, importWidgetClass
 
 
 class ParameterCB(Qt.QComboBox):
@@ -84,6 +87,12 @@ class TaurusForm(TaurusWidget):
     You can also see some code that exemplifies the use of TaurusForm in :ref:`Taurus
     coding examples <examples>` '''
 
+    #: forms with at least this number of items are built progressively
+    #: (see :meth:`setProgressive`)
+    ProgressiveMinItems = 40
+    #: number of items created per event loop iteration in progressive mode
+    ProgressiveChunkSize = 5
+
     def __init__(self, parent=None,
                  formWidget=None,
                  buttons=None,
@@ -97,6 +106,12 @@ class TaurusForm(TaurusWidget):
         self._customWidgetMap = {}
         self._model = []
         self._children = []
+        self._childIndexes = []
+        self._pendingItems = []
+        self._prefetchCancel = None
+        self._buildFrame = None
+        self._buildTimer = Qt.QTimer(self)
+        self._buildTimer.timeout.connect(self._buildPendingItems)
         self.setFormWidget(formWidget)
 
         self.setLayout(Qt.QVBoxLayout())
@@ -142,6 +157,7 @@ class TaurusForm(TaurusWidget):
                                     TAURUS_ATTR_MIME_TYPE, TAURUS_MODEL_MIME_TYPE, 'text/plain'])
 
         self.resetCompact()
+        self.resetProgressive()
 
         # properties
         self.registerConfigProperty(
@@ -309,7 +325,7 @@ class TaurusForm(TaurusWidget):
                     'Cannot handle model "%s". Using default widget.' % (model))
                 return self._defaultFormWidget, (), {}
             try:
-                key = obj.getDeviceProxy().info().dev_class  # TODO: Tango-centric
+                key = getDeviceClassName(obj)
             except:
                 return self._defaultFormWidget, (), {}
             #value = self._formWidgetsMap.get(key, self._defaultFormWidget)
@@ -323,10 +339,8 @@ class TaurusForm(TaurusWidget):
             # we expect a tuple of str,list,dict -->
             # (classname_including_full_module, args, kwargs)
             name, args, kwargs = value
-            pkgname, klassname = name.rsplit('.', 1)
             try:
-                pkg = __import__(pkgname, fromlist=[klassname])
-                klass = getattr(pkg, klassname)
+                klass = importWidgetClass(name)
             except:
                 self.warning(
                     'Cannot import "%s". Using default widget for "%s".' % (name, model))
@@ -364,7 +378,8 @@ class TaurusForm(TaurusWidget):
 
     def setCompact(self, compact):
         self._compact = compact
-        for item in self.getItems():
+        # the pending items get it when created (see _addChild)
+        for item in self._children:
             item.setCompact(compact)
         self.compactModeAction.setChecked(compact)
 
@@ -375,6 +390,27 @@ class TaurusForm(TaurusWidget):
         from taurus import tauruscustomsettings
         self.setCompact(getattr(tauruscustomsettings, 'T_FORM_COMPACT', {}))
 
+    def setProgressive(self, progressive):
+        '''sets whether forms with many items (see ProgressiveMinItems) are
+        built progressively: the taurus objects of the models are created in
+        a background thread and the items are created in chunks (the
+        visible ones first) from the event loop, showing a placeholder row
+        until each item is created. It applies from the next setModel.
+        Accessing the items (e.g. with :meth:`getItems` or ``form[i]``)
+        creates the pending ones first.
+
+        :param progressive: (bool)
+        '''
+        self._progressive = progressive
+
+    def isProgressive(self):
+        return self._progressive
+
+    def resetProgressive(self):
+        from taurus import tauruscustomsettings
+        self.setProgressive(
+            getattr(tauruscustomsettings, 'T_FORM_PROGRESSIVE', True))
+
     def dropEvent(self, event):
         '''reimplemented to support dropping of modelnames in forms'''
         mtype = self.handleMimeData(event.mimeData(), self.addModels)
@@ -398,7 +434,8 @@ class TaurusForm(TaurusWidget):
         self.showButtonsAction.setEnabled(modifiable)
         self.changeLabelsAction.setEnabled(modifiable)
         self.compactModeAction.setEnabled(modifiable)
-        for item in self.getItems():
+        # the pending items get it when created (see _addChild)
+        for item in self._children:
             try:
                 item.setModifiableByUser(modifiable)
             except:
@@ -411,12 +448,14 @@ class TaurusForm(TaurusWidget):
         pass
 
     def destroyChildren(self):
+        self._cancelProgressiveBuild()
         for child in self._children:
             self.unregisterConfigurableItem(child)
             # child.destroy()
             child.setModel(None)
             child.deleteLater()
         self._children = []
+        self._childIndexes = []
 
     def fillWithChildren(self):
         frame = TaurusWidget()
@@ -430,33 +469,31 @@ class TaurusForm(TaurusWidget):
             if parent_model:
                 parent_name = parent_model.getFullName()
 
+        items = []
         for i, model in enumerate(self.getModel()):
             if not model:
                 continue
             if parent_name:
                 # @todo: Change this (it assumes tango model naming!)
                 model = "%s/%s" % (parent_name, model)
-            klass, args, kwargs = self.getFormWidget(model=model)
-            widget = klass(frame, *args, **kwargs)
-            # @todo UGLY... See if this can be done in other ways... (this causes trouble with widget that need more vertical space , like PoolMotorTV)
-            widget.setMinimumHeight(20)
-
-            try:
-                widget.setCompact(self.isCompact())
-                widget.setModel(model)
-                widget.setParent(frame)
-            except:
-                # raise
-                self.warning(
-                    'an error occurred while adding the child "%s". Skipping' % model)
-                self.traceback(level=taurus.Debug)
-            try:
-                widget.setModifiableByUser(self.isModifiableByUser())
-            except:
-                pass
-            widget.setObjectName("__item%i" % i)
-            self.registerConfigDelegate(widget)
-            self._children.append(widget)
+            items.append((i, model))
+
+        progressive = (self.isProgressive() and
+                       len(items) >= self.ProgressiveMinItems and
+                       hasattr(self._defaultFormWidget, 'setPreferredRow'))
+        if progressive:
+            self._prefetchModels([model for i, model in items])
+            for i, model in items:
+                row = frame.layout().rowCount()
+                placeholder = Qt.QLabel('%s ...' % model, frame)
+                placeholder.setEnabled(False)
+                frame.layout().addWidget(placeholder, row, 1, 1, 4)
+                self._pendingItems.append((i, model, row, placeholder))
+            self._buildFrame = frame
+            self._buildTimer.start(0)
+        else:
+            for i, model in items:
+                self._addChild(frame, i, model)
 
         frame.layout().addItem(Qt.QSpacerItem(
             0, 0, Qt.QSizePolicy.Minimum, Qt.QSizePolicy.MinimumExpanding))
@@ -464,10 +501,129 @@ class TaurusForm(TaurusWidget):
 #        self.scrollArea.setWidgetResizable(True)
         self.scrollArea.setMinimumWidth(frame.layout().sizeHint().width() + 20)
 
+    def _addChild(self, frame, i, model, row=None):
+        '''creates the item for the i-th model (in the given row of the
+        frame if row is not None)'''
+        klass, args, kwargs = self.getFormWidget(model=model)
+        if row is None:
+            widget = klass(frame, *args, **kwargs)
+        else:
+            widget = klass(None, *args, **kwargs)
+            widget.setPreferredRow(row)
+            widget.setParent(frame)
+        # @todo UGLY... See if this can be done in other ways... (this causes trouble with widget that need more vertical space , like PoolMotorTV)
+        widget.setMinimumHeight(20)
+
+        try:
+            widget.setCompact(self.isCompact())
+            widget.setModel(model)
+            widget.setParent(frame)
+        except:
+            # raise
+            self.warning(
+                'an error occurred while adding the child "%s". Skipping' % model)
+            self.traceback(level=taurus.Debug)
+        try:
+            widget.setModifiableByUser(self.isModifiableByUser())
+        except:
+            pass
+        widget.setObjectName("__item%i" % i)
+        self.registerConfigDelegate(widget)
+        # keep the items in model order, whatever the creation order
+        pos = bisect.bisect(self._childIndexes, i)
+        self._childIndexes.insert(pos, i)
+        self._children.insert(pos, widget)
+        return widget
+
+    def _prefetchModels(self, models):
+        '''creates the taurus objects of the given models in a background
+        thread, so that the items find them already created'''
+        self._prefetchCancel = cancel = threading.Event()
+        manager = taurus.Manager()
+
+        def prefetch():
+            for model in models:
+                if cancel.is_set():
+                    return
+                try:
+                    klass = manager.findObjectClass(model)
+                    if klass is not None:
+                        manager.getObject(klass, model)
+                except:
+                    pass  # the item will report it
+        thread = threading.Thread(target=prefetch, name='TaurusFormPrefetch')
+        thread.daemon = True
+        thread.start()
+
+    def _visibleRows(self):
+        '''returns the rows of the pending placeholders currently visible'''
+        viewport = self.scrollArea.viewport()
+        top = self.scrollArea.verticalScrollBar().value()
+        bottom = top + viewport.height()
+        rows = set()
+        for i, model, row, placeholder in self._pendingItems:
+            geometry = placeholder.geometry()
+            if geometry.isValid() and geometry.bottom() >= top and \
+                    geometry.top() <= bottom:
+                rows.add(row)
+        return rows
+
+    def _buildPendingItems(self):
+        '''creates the next chunk of items (the visible ones first)'''
+        pending = self._pendingItems
+        if not pending:
+            self._buildTimer.stop()
+            return
+        n = self.ProgressiveChunkSize
+        visible = self._visibleRows()
+        chunk = [p for p in pending if p[2] in visible][:n] or pending[:n]
+        frame = self._buildFrame
+        for item in chunk:
+            pending.remove(item)
+            i, model, row, placeholder = item
+            frame.layout().removeWidget(placeholder)
+            placeholder.deleteLater()
+            self._addChild(frame, i, model, row)
+        if not pending:
+            self._buildTimer.stop()
+            self._buildFrame = None
+            self.scrollArea.setMinimumWidth(
+                frame.layout().sizeHint().width() + 20)
+
+    def _cancelProgressiveBuild(self):
+        self._buildTimer.stop()
+        self._pendingItems = []
+        self._buildFrame = None
+        if self._prefetchCancel is not None:
+            self._prefetchCancel.set()
+            self._prefetchCancel = None
+
+    def isBuilding(self):
+        '''returns True while there are items pending to be created'''
+        return bool(self._pendingItems)
+
+    def finishBuild(self):
+        '''creates all the items still pending in progressive mode'''
+        while self._pendingItems:
+            self._buildPendingItems()
+
+    def createConfig(self, *args, **kwargs):
+        '''Reimplemented from :meth:`TaurusWidget.createConfig` to create the
+        pending items (whose configuration would be lost) first'''
+        self.finishBuild()
+        return TaurusWidget.createConfig(self, *args, **kwargs)
+
+    def applyConfig(self, configdict, **kwargs):
+        '''Reimplemented from :meth:`TaurusWidget.applyConfig` to create the
+        pending items (whose configuration would be lost) first'''
+        self.finishBuild()
+        return TaurusWidget.applyConfig(self, configdict, **kwargs)
+
     def getItemByModel(self, model, index=0):
         '''returns the child item with given model. If there is more than one item
         with the same model, the index parameter can be used to distinguish among them
         Please note that his index is only relative to same-model items!'''
+        self.finishBuild()
         for child in self._children:
             if child.getModel().lower() == model.lower():
                 if index <= 0:
@@ -480,7 +636,10 @@ class TaurusForm(TaurusWidget):
         return self.getItems()[index]
 
     def getItems(self):
-        '''returns a list of the objects that have been created as childs of the form'''
+        '''returns a list of the objects that have been created as childs of
+        the form (the items still pending in progressive mode are created
+        first)'''
+        self.finishBuild()
         return self._children
 
 #    def _manageButtonBox(self):
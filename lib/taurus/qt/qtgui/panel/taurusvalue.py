@@ -52,6 +52,73 @@ from taurus.qt.qtgui.button import TaurusLauncherButton
 from taurus.qt.qtgui.util import TaurusWidgetFactory, ConfigurationMenu
 from taurus.qt.qtgui.compact import TaurusReadWriteSwitcher
 
+# The widget classes resolved for each kind of attribute are shared by all
+# the TaurusValue objects (see getDefaultReadWidgetClass and
+# getDefaultWriteWidgetClass)
+_readWidgetClasses = {}
+_writeWidgetClasses = {}
+# {device full name: device class name}
+_deviceClassNames = {}
+# {full class name: class} (see importWidgetClass)
+_widgetClasses = {}
+# whether TaurusImageDialog can be imported (see _isImageDialogAvailable)
+_imageDialogAvailable = None
+
+
+def getDeviceClassName(devobj):
+    '''Returns the class name of a device (the device is queried only the
+    first time)
+
+    :param devobj: (TaurusDevice) the device
+
+    :return: (str) the class name of the device
+    '''
+    name = devobj.getFullName()
+    try:
+        return _deviceClassNames[name]
+    except KeyError:
+        # TODO: Tango-centric
+        klass = _deviceClassNames[
+            name] = devobj.getDeviceProxy().info().dev_class
+        return klass
+
+
+def importWidgetClass(name):
+    '''Returns the class given its full name (e.g.
+    "taurus.qt.qtgui.display.TaurusLabel"), importing its module only the
+    first time it is requested
+
+    :param name: (str) module and class name separated by a dot
+
+    :return: (type) the class
+    '''
+    klass = _widgetClasses.get(name)
+    if klass is None:
+        pkgname, klassname = name.rsplit('.', 1)
+        try:
+            pkg = __import__(pkgname, fromlist=[klassname])
+            klass = getattr(pkg, klassname)
+        except Exception, e:
+            klass = e  # do not retry the import for every widget
+        _widgetClasses[name] = klass
+    if isinstance(klass, Exception):
+        raise klass
+    return klass
+
+
+def _isImageDialogAvailable():
+    '''whether TaurusImageButton can be used (it is only checked once)'''
+    global _imageDialogAvailable
+    if _imageDialogAvailable is None:
+        try:
+            # unused import but useful to determine if TaurusImageButton
+            # should be added
+            from taurus.qt.qtgui.extra_guiqwt import TaurusImageDialog
+            _imageDialogAvailable = True
+        except ImportError:
+            _imageDialogAvailable = False
+    return _imageDialogAvailable
+
 
 class DefaultTaurusValueCheckBox(TaurusValueCheckBox):
 
@@ -488,17 +555,18 @@ class TaurusValue(Qt.QWidget, TaurusBaseWidget):
         if modeltype == TaurusElementType.Attribute:
             # The model is an attribute
             # print "---------ATTRIBUTE OBJECT:----------\n",modelobj.read()
-            try:
-                if modelobj.isBoolean():
-                    result = [CenteredLed, DefaultReadWidgetLabel]
-            except:
-                pass
+            # @todo: tango-centric!!
+            isStatus = str(self.getModel()).lower().endswith('/status')
+            key = modelobj.type, modelobj.data_format, isStatus
+            result = _readWidgetClasses.get(key)
+            if result is not None:
+                return list(result) if returnAll else result[0]
             if modelobj.data_format == DataFormat._0D:
                 if modelobj.type == DataType.Boolean:
                     result = [CenteredLed, DefaultReadWidgetLabel]
                 elif modelobj.type == DataType.DevState:
                     result = [CenteredLed, DefaultReadWidgetLabel]
-                elif str(self.getModel()).lower().endswith('/status'):  # @todo: tango-centric!!
+                elif isStatus:
                     result = [TaurusStatusLabel, DefaultReadWidgetLabel]
                 else:
                     result = [DefaultReadWidgetLabel]
@@ -510,13 +578,10 @@ class TaurusValue(Qt.QWidget, TaurusBaseWidget):
                     result = [TaurusValuesTableButton, DefaultReadWidgetLabel]
             elif modelobj.data_format == DataFormat._2D:
                 if modelobj.type in (DataType.Float, DataType.Integer):
-                    try:
-                        # unused import but useful to determine if
-                        # TaurusImageButton should be added
-                        from taurus.qt.qtgui.extra_guiqwt import TaurusImageDialog
+                    if _isImageDialogAvailable():
                         result = [TaurusImageButton,
                                   TaurusValuesTableButton, DefaultReadWidgetLabel]
-                    except ImportError:
+                    else:
                         result = [TaurusValuesTableButton,
                                   DefaultReadWidgetLabel]
                 else:
@@ -524,6 +589,9 @@ class TaurusValue(Qt.QWidget, TaurusBaseWidget):
             else:
                 self.warning('Unsupported attribute type %s' % modelobj.type)
                 result = None
+            if result is not None:
+                _readWidgetClasses[key] = result
+                result = list(result)
 
         elif modeltype == TaurusElementType.Device:
             result = [TaurusDevButton]
@@ -564,6 +632,10 @@ class TaurusValue(Qt.QWidget, TaurusBaseWidget):
             else:
                 return TaurusValueLineEdit
         modelType = modelobj.getType()
+        key = modelType, modelobj.data_format
+        result = _writeWidgetClasses.get(key)
+        if result is not None:
+            return list(result) if returnAll else result[0]
         if modelobj.data_format == DataFormat._0D:
             if modelType == DataType.Boolean:
                 result = [DefaultTaurusValueCheckBox, TaurusValueLineEdit]
@@ -582,9 +654,10 @@ class TaurusValue(Qt.QWidget, TaurusBaseWidget):
             self.debug('Unsupported attribute type for writing: %s' %
                        str(DataType.whatis(modelType)))
             result = [None]
+        _writeWidgetClasses[key] = result
 
         if returnAll:
-            return result
+            return list(result)
         else:
             return result[0]
 
@@ -598,7 +671,7 @@ class TaurusValue(Qt.QWidget, TaurusBaseWidget):
         if modelclass and modelclass.getTaurusElementType() != TaurusElementType.Device:
             return None
         try:
-            key = self.getModelObj().getDeviceProxy().info().dev_class  # TODO: Tango-centric
+            key = getDeviceClassName(self.getModelObj())
         except:
             return None
         return self.getCustomWidgetMap().get(key, None)
@@ -25,7 +25,7 @@
 """Unit tests for Taurus Forms"""
 
 from taurus.external import unittest
-from taurus.qt.qtgui.test import GenericWidgetTestCase
+from taurus.qt.qtgui.test import GenericWidgetTestCase, BaseWidgetTestCase
 from taurus.qt.qtgui.panel import TaurusForm, TaurusAttrForm
 
 
@@ -54,6 +54,37 @@ class TaurusFormTest(GenericWidgetTestCase, unittest.TestCase):
                   ]
 
 
+class TaurusFormProgressiveTest(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Tests for the progressive construction of TaurusForm.
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = TaurusForm
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self._widget.setProgressive(True)
+        self._models = ['eval:%d' % i
+                        for i in range(TaurusForm.ProgressiveMinItems + 10)]
+        self._widget.setModel(self._models)
+
+    def test_len(self):
+        '''Check that len() counts the items pending to be created'''
+        self.assertEqual(len(self._widget), len(self._models))
+        self.assertFalse(self._widget.isBuilding())
+
+    def test_getitem(self):
+        '''Check that the last items can be accessed right after setModel'''
+        self.assertEqual(self._widget[-1].getModel(), self._models[-1])
+
+    def test_getItemByModel(self):
+        '''Check that the pending items can be found by their model'''
+        model = self._models[-1]
+        self.assertEqual(self._widget.getItemByModel(model).getModel(), model)
+
+
 class TaurusAttrFormTest(GenericWidgetTestCase, unittest.TestCase):
 
     '''
@@ -31,13 +31,15 @@ This module is part of Taurus Widgets. It contains specialized widgets for 2D pl
 in Taurus. It depends on the `PyQwt module <http://pyqwt.sourceforge.net/>`_
 """
 
-from .qwtdialog import TaurusPlotConfigDialog
-from .scales import *
-from .taurusplot import *
-from .taurustrend import *
-from .arrayedit import ArrayEditor
-from .taurusarrayedit import TaurusArrayEditor
-from .curvesAppearanceChooserDlg import CurveAppearanceProperties, CurvesAppearanceChooser
-from .curveprops import CurvePropertiesView
-from .monitor import TaurusMonitorTiny
-from .curveStatsDlg import CurveStatsDialog
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['scales', 'taurusplot', 'taurustrend'],
+                    names={'TaurusPlotConfigDialog': 'qwtdialog',
+                           'ArrayEditor': 'arrayedit',
+                           'TaurusArrayEditor': 'taurusarrayedit',
+                           'CurveAppearanceProperties':
+                               'curvesAppearanceChooserDlg',
+                           'CurvesAppearanceChooser':
+                               'curvesAppearanceChooserDlg',
+                           'CurvePropertiesView': 'curveprops',
+                           'TaurusMonitorTiny': 'monitor',
+                           'CurveStatsDialog': 'curveStatsDlg'})
@@ -1025,6 +1025,8 @@ class TaurusPlot(Qwt5.QwtPlot, TaurusBaseWidget):
 
     dataChanged = Qt.pyqtSignal('QString')
     CurvesYAxisChanged = Qt.pyqtSignal('QStringList', int)
+    dataExportProgress = Qt.pyqtSignal(int, int)
+    dataExportFinished = Qt.pyqtSignal(object)
 
     def __init__(self, parent=None, designMode=False):
         name = "TaurusPlot"
@@ -2688,22 +2690,103 @@ class TaurusPlot(Qwt5.QwtPlot, TaurusBaseWidget):
                                   | Qwt5.QwtPlotPrintFilter.PrintFrameWithScales)
             self.print_(printer, filter)
 
-    def exportAscii(self, curves=None):
-        '''Opens a dialog for exporting curves to ASCII files.
+    def getCurvesDataSnapshot(self, curves=None):
+        '''Returns a copy of the data of the given curves as numpy arrays.
+        This is faster than calling :meth:`getCurveData` for each curve and
+        the result can be safely used from other threads.
 
-        :param curves:  (sequence<str>) the curves curves that will be
-                        exportable. if None given, all curves are offered for
-                        export.
+        :param curves: (sequence<str>) names of the curves. If None given,
+                       all curves are used
+
+        :return: (dict<str,tuple>) dictionary of {name:(x,y)}
         '''
         self.curves_lock.acquire()
         try:
             if curves is None:
                 curves = self.getCurveNamesSorted()
-            frozendata = {}
-            for k in curves:
-                frozendata[k] = self.getCurveData(k)
+            snapshot = {}
+            for name in curves:
+                c = self.curves[name]
+                x = getattr(c, '_xValues', None)
+                y = getattr(c, '_yValues', None)
+                if (x is None or y is None or numpy.ndim(y) != 1 or
+                        len(x) != len(y)):
+                    x, y = self.getCurveData(name)
+                snapshot[name] = numpy.array(x), numpy.array(y)
         finally:
             self.curves_lock.release()
+        return snapshot
+
+    def exportData(self, fileName, curves=None, fmt=None, block=True):
+        '''Exports the data of the curves to a file without using any dialog.
+        The data is written in chunks (see :mod:`taurus.core.util.dataexport`)
+        in ASCII (a table if all curves share the same abscissas, or one
+        table per curve otherwise), NPZ or HDF5 (if h5py is installed) format.
+
+        If block is False, the file is written in a worker thread. The
+        progress is reported with the `dataExportProgress(done, total)` signal
+        and the end of the export with the `dataExportFinished(error)` signal
+        (error is None if the export succeeded). A running export can be
+        aborted with :meth:`abortDataExport`.
+
+        :param fileName: (str) name of the output file
+        :param curves: (sequence<str>) names of the curves to export. If None
+                       given, all curves are exported
+        :param fmt: (str) "ascii", "npz" or "hdf5". If None given, it is
+                    guessed from the file name extension
+        :param block: (bool) if False, the export runs in a worker thread
+
+        :return: (threading.Thread or None) the worker thread (if block is
+                 False)
+        '''
+        import threading
+        from taurus.core.util.dataexport import exportDataSets
+        if curves is None:
+            curves = self.getCurveNamesSorted()
+        datadict = self.getCurvesDataSnapshot(curves)
+        kwargs = dict(sortedNames=curves, fmt=fmt, xIsTime=self.getXIsTime())
+        if block:
+            exportDataSets(str(fileName), datadict, **kwargs)
+            return None
+
+        self._dataExportAborted = threading.Event()
+
+        def progress(done, total):
+            self.dataExportProgress.emit(done, total)
+            return self._dataExportAborted.is_set()
+
+        def run():
+            try:
+                exportDataSets(str(fileName), datadict, progress=progress,
+                               **kwargs)
+                error = None
+            except Exception, e:
+                self.warning('Data export to "%s" failed: %r', fileName, e)
+                error = e
+            self.dataExportFinished.emit(error)
+
+        worker = threading.Thread(target=run, name='TaurusPlotExport')
+        worker.daemon = True
+        worker.start()
+        return worker
+
+    def abortDataExport(self):
+        '''Aborts a data export started with :meth:`exportData` in non
+        blocking mode'''
+        aborted = getattr(self, '_dataExportAborted', None)
+        if aborted is not None:
+            aborted.set()
+
+    def exportAscii(self, curves=None):
+        '''Opens a dialog for exporting curves to ASCII files.
+
+        :param curves:  (sequence<str>) the curves curves that will be
+                        exportable. if None given, all curves are offered for
+                        export.
+        '''
+        if curves is None:
+            curves = self.getCurveNamesSorted()
+        frozendata = self.getCurvesDataSnapshot(curves)
         klass = getattr(self, 'exportDlgClass', None)
         if klass is None:
             from taurus.qt.qtgui.panel import QDataExportDialog
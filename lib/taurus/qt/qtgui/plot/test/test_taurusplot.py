@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for TaurusPlot"""
+
+import os
+import shutil
+import tempfile
+
+import numpy
+
+from taurus.external import unittest
+from taurus.qt.qtgui.test import BaseWidgetTestCase
+from taurus.qt.qtgui.plot import TaurusPlot
+
+
+class TaurusPlotExportTest(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Tests for the data export of TaurusPlot
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = TaurusPlot
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self._widget.attachRawData({'x': [1, 2, 3], 'y': [4, 5, 6]},
+                                   id='c1')
+        self._tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._tmpdir)
+
+    def test_snapshot(self):
+        '''Check the snapshot of a curve with cached values'''
+        x, y = self._widget.getCurvesDataSnapshot()['c1']
+        self.assertEqual(x.tolist(), [1, 2, 3])
+        self.assertEqual(y.tolist(), [4, 5, 6])
+
+    def test_snapshot_without_values(self):
+        '''Check the snapshot of a curve without cached values (e.g. a model
+        curve which did not receive data yet)'''
+        self._widget.curves['c1']._xValues = None
+        x, y = self._widget.getCurvesDataSnapshot(['c1'])['c1']
+        self.assertTrue(isinstance(x, numpy.ndarray))
+        self.assertEqual(x.tolist(), [1, 2, 3])
+        self.assertEqual(y.tolist(), [4, 5, 6])
+
+    def test_export_without_values(self):
+        '''Check that a curve without cached values can be exported'''
+        self._widget.curves['c1']._xValues = None
+        fname = os.path.join(self._tmpdir, 'data.dat')
+        self._widget.exportData(fname, fmt='ascii')
+        self.assertTrue(os.path.getsize(fname) > 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -27,11 +27,8 @@
 
 __docformat__ = 'restructuredtext'
 
-from .qtable import *
-from .qlogtable import *
-from .taurustable import *
-from .taurusdbtable import *
-from .taurusvaluestable import *
-from .taurusdevicepropertytable import *
-from .taurusgrid import *
-from .qdictionary import *
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['qtable', 'qlogtable', 'taurustable',
+                               'taurusdbtable', 'taurusvaluestable',
+                               'taurusdevicepropertytable',
+                               'taurusgridmodel', 'taurusgrid', 'qdictionary'])
@@ -36,6 +36,9 @@ import logging.handlers
 import datetime
 import threading
 import socket
+import bisect
+import itertools
+import collections
 
 import taurus
 from taurus.core.util.log import Logger
@@ -76,18 +79,14 @@ def getBrushForLevel(level):
         elevel = taurus.Error
     elif level <= taurus.Critical:
         elevel = taurus.Critical
-    f, g = map(Qt.QBrush, __LEVEL_BRUSH[elevel])
-    return f, g
+    brushes = _LEVEL_BRUSH_CACHE.get(elevel)
+    if brushes is None:
+        brushes = _LEVEL_BRUSH_CACHE[elevel] = \
+            tuple(map(Qt.QBrush, __LEVEL_BRUSH[elevel]))
+    return brushes
 
+_LEVEL_BRUSH_CACHE = {}
 
-def _origin_cmp(rec1, rec2):
-    c1 = cmp(rec1.process, rec2.process)
-    if c1 == 0:
-        c2 = cmp(rec1.thread, rec2.thread)
-        if c2 == 0:
-            return cmp(rec1.name, rec2.name)
-        return c2
-    return c1
 
 gethostname = memoized(socket.gethostname)
 
@@ -144,17 +143,87 @@ def _get_record_origin_tooltip(rec):
            lineno=lineno)
 
 
+class _LogEntry(object):
+    """The display columns of a log record (computed once, when the record
+    is received)"""
+
+    __slots__ = ('record', 'seq', 'columns')
+
+    def __init__(self, record, seq):
+        # merge the arguments into the message so that the record does not
+        # keep references to objects which may change
+        message = record.getMessage()
+        record.msg, record.args = message, None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exc_formatter.formatException(
+                    record.exc_info)
+            record.exc_info = None
+        self.record = record
+        self.seq = seq
+        self.columns = (record.levelname,
+                        str(datetime.datetime.fromtimestamp(record.created)),
+                        message, record.name, _get_record_origin_str(record))
+
+_exc_formatter = logging.Formatter()
+
+#: column -> function returning the sort key of a _LogEntry (the sequence
+#: number makes the keys unique, so that entries can be found by bisection)
+_SORT_KEYS = {
+    LEVEL: lambda e: (e.record.levelno, e.seq),
+    TIME: lambda e: (e.record.created, e.seq),
+    MSG: lambda e: (e.columns[MSG], e.seq),
+    NAME: lambda e: (e.record.name, e.seq),
+    ORIGIN: lambda e: (e.record.process, e.record.thread, e.record.name,
+                       e.seq),
+}
+
+
+def _contiguous_runs(positions):
+    """groups sorted positions in (first, count) runs"""
+    runs = []
+    for pos in positions:
+        if runs and runs[-1][0] + runs[-1][1] == pos:
+            runs[-1][1] += 1
+        else:
+            runs.append([pos, 1])
+    return runs
+
+
 class QLoggingTableModel(Qt.QAbstractTableModel, logging.Handler):
+    """A Qt table model that displays the taurus logging messages.
+
+    The records received by the handler are stored (with their display
+    columns already computed) in a ring buffer of the given capacity, in
+    which the oldest records are discarded. They are added to the model in
+    batches, once every `freq` seconds, and inserted in their sorted
+    positions. The model also keeps the number of records of each level and
+    logger name (see :meth:`getLevelCounts` and :meth:`getLoggerNames`).
+
+    :param capacity: (int) maximum number of records
+    :param freq: (float) period (in s) of the updates of the model
+    """
 
     DftFont = Qt.QFont("Mono", 8)
     DftColSize = Qt.QSize(80, 20), Qt.QSize(200, 20), \
         Qt.QSize(300, 20), Qt.QSize(180, 20), Qt.QSize(240, 20),
 
+    #: maximum number of separate blocks of rows inserted (or removed) in a
+    #: model update (above it, the model is reset)
+    MaxUpdateBlocks = 32
+
     def __init__(self, capacity=500000, freq=0.25):
         super(Qt.QAbstractTableModel, self).__init__()
         logging.Handler.__init__(self)
         self._capacity = capacity
-        self._records = []
+        self._entries = collections.deque()  # in order of arrival
+        self._rows = []  # in ascending sort order
+        self._keys = []  # the sort keys of _rows
+        self._sortKey = _SORT_KEYS[TIME]
+        self._descending = False
+        self._levelCounts = collections.defaultdict(int)
+        self._nameCounts = collections.defaultdict(int)
+        self._seq = itertools.count()
         self._accumulated_records = []
         Logger.addRootLogHandler(self)
         self.startTimer(freq * 1000)
@@ -164,46 +233,49 @@ class QLoggingTableModel(Qt.QAbstractTableModel, logging.Handler):
     # ---------------------------------
 
     def sort(self, column, order=Qt.Qt.AscendingOrder):
-        if column == LEVEL:
-            f = lambda a, b: cmp(a.levelno, b.levelno)
-        elif column == TIME:
-            f = lambda a, b: cmp(a.created, b.created)
-        elif column == MSG:
-            f = lambda a, b: cmp(a.msg, b.msg)
-        elif column == NAME:
-            f = lambda a, b: cmp(a.name, b.name)
-        elif column == ORIGIN:
-            f = _origin_cmp
-        self._records = sorted(self._records, cmp=f,
-                               reverse=order == Qt.Qt.DescendingOrder)
+        self.beginResetModel()
+        self._sortKey = key = _SORT_KEYS[column]
+        self._descending = order == Qt.Qt.DescendingOrder
+        self._rows.sort(key=key)
+        self._keys = map(key, self._rows)
+        self.endResetModel()
 
     def rowCount(self, index=Qt.QModelIndex()):
-        return len(self._records)
+        return len(self._rows)
 
     def columnCount(self, index=Qt.QModelIndex()):
         return len(HORIZ_HEADER)
 
+    def _entryAt(self, row):
+        if self._descending:
+            row = len(self._rows) - 1 - row
+        return self._rows[row]
+
     def getRecord(self, index):
-        return self._records[index.row()]
+        return self._entryAt(index.row()).record
+
+    def getLevelCounts(self):
+        """Returns the number of records of each level in the model
+
+        :return: (dict<int,int>) level -> number of records
+        """
+        return dict(self._levelCounts)
+
+    def getLoggerNames(self):
+        """Returns the names of the loggers of the records in the model
+
+        :return: (sequence<str>) logger names
+        """
+        return sorted(self._nameCounts)
 
     def data(self, index, role=Qt.Qt.DisplayRole):
-        if not index.isValid() or not (0 <= index.row() < len(self._records)):
+        if not index.isValid() or not (0 <= index.row() < len(self._rows)):
             return Qt.QVariant()
-        record = self.getRecord(index)
+        entry = self._entryAt(index.row())
+        record = entry.record
         column = index.column()
         if role == Qt.Qt.DisplayRole:
-            if column == LEVEL:
-                return Qt.QVariant(record.levelname)
-            elif column == TIME:
-                dt = datetime.datetime.fromtimestamp(record.created)
-                return Qt.QVariant(str(dt))
-                # return Qt.QVariant(dt.strftime("%Y-%m-%d %H:%m:%S.%f"))
-            elif column == MSG:
-                return Qt.QVariant(record.getMessage())
-            elif column == NAME:
-                return Qt.QVariant(record.name)
-            elif column == ORIGIN:
-                return Qt.QVariant(_get_record_origin_str(record))
+            return Qt.QVariant(entry.columns[column])
         elif role == Qt.Qt.TextAlignmentRole:
             if column in (LEVEL, MSG):
                 return Qt.QVariant(Qt.Qt.AlignLeft | Qt.Qt.AlignVCenter)
@@ -285,27 +357,105 @@ class QLoggingTableModel(Qt.QAbstractTableModel, logging.Handler):
         self.updatePendingRecords()
 
     def updatePendingRecords(self):
+        """Adds the records received since the last update to the model
+        (discarding the oldest ones if the capacity is exceeded)"""
         if not self._accumulated_records:
             return
-        row_nb = self.rowCount()
-        records = self._accumulated_records
+        entries = self._accumulated_records
         self._accumulated_records = []
-        self._records.extend(records)
-        self.insertRows(row_nb, len(records))
-        if len(self._records) > self._capacity:
-            start = len(self._records) - self._capacity
-            self._records = self._records[start:]
-            self.removeRows(0, start)
+        entries = entries[-self._capacity:]
+        overflow = len(self._entries) + len(entries) - self._capacity
+        if overflow > 0:
+            self._removeEntries(
+                [self._entries.popleft() for _ in xrange(overflow)])
+        self._entries.extend(entries)
+        self._insertEntries(entries)
+
+    def _viewRows(self, pos, count, size):
+        """returns the first view row of count entries at position pos of
+        the (ascending) list of rows of the given size"""
+        if self._descending:
+            return size - pos - count
+        return pos
+
+    def _insertEntries(self, entries):
+        key = self._sortKey
+        new = sorted((key(e), e) for e in entries)
+        keys, rows = self._keys, self._rows
+        # group the new entries by their insertion position in the
+        # current rows (usually they all go after the last row)
+        blocks = []
+        for k, e in new:
+            pos = len(keys) if not keys or k > keys[-1] \
+                else bisect.bisect_left(keys, k)
+            if blocks and blocks[-1][0] == pos:
+                blocks[-1][1].append((k, e))
+            else:
+                blocks.append((pos, [(k, e)]))
+        if len(blocks) > self.MaxUpdateBlocks:
+            self.beginResetModel()
+            self._addCounts(entries, 1)
+            keys.extend(k for k, _ in new)
+            rows.extend(e for _, e in new)
+            order = sorted(xrange(len(keys)), key=keys.__getitem__)
+            self._keys = [keys[i] for i in order]
+            self._rows = [rows[i] for i in order]
+            self.endResetModel()
+            return
+        # insert from the last block, so that the positions remain valid
+        for pos, block in reversed(blocks):
+            first = self._viewRows(pos, 0, len(rows))
+            self.beginInsertRows(Qt.QModelIndex(), first,
+                                 first + len(block) - 1)
+            keys[pos:pos] = [k for k, _ in block]
+            rows[pos:pos] = [e for _, e in block]
+            self._addCounts([e for _, e in block], 1)
+            self.endInsertRows()
+
+    def _removeEntries(self, entries):
+        key = self._sortKey
+        keys = self._keys
+        positions = sorted(bisect.bisect_left(keys, key(e)) for e in entries)
+        runs = _contiguous_runs(positions)
+        if len(runs) > self.MaxUpdateBlocks:
+            self.beginResetModel()
+            removed = set(positions)
+            self._keys = [k for i, k in enumerate(keys) if i not in removed]
+            self._rows = [e for i, e in enumerate(self._rows)
+                          if i not in removed]
+            self._addCounts(entries, -1)
+            self.endResetModel()
+            return
+        for pos, count in reversed(runs):
+            first = self._viewRows(pos, count, len(keys))
+            self.beginRemoveRows(Qt.QModelIndex(), first, first + count - 1)
+            del keys[pos:pos + count]
+            del self._rows[pos:pos + count]
+            self.endRemoveRows()
+        self._addCounts(entries, -1)
+
+    def _addCounts(self, entries, inc):
+        levels, names = self._levelCounts, self._nameCounts
+        for e in entries:
+            for counts, k in ((levels, e.record.levelno),
+                              (names, e.record.name)):
+                counts[k] += inc
+                if not counts[k]:
+                    del counts[k]
 
     def emit(self, record):
-        self._accumulated_records.append(record)
+        self._accumulated_records.append(_LogEntry(record, self._seq.next()))
 
     def flush(self):
         pass
 
     def close(self):
         self.flush()
-        del self._records[:]
+        self._entries.clear()
+        del self._rows[:]
+        del self._keys[:]
+        self._levelCounts.clear()
+        self._nameCounts.clear()
         logging.Handler.close(self)
 
 
@@ -314,6 +464,11 @@ class _LogRecordStreamHandler(LogRecordStreamHandler):
     def handleLogRecord(self, record):
         self.server.data.get('model').emit(record)
 
+    def handleLogRecords(self, records):
+        emit = self.server.data.get('model').emit
+        for record in records:
+            emit(record)
+
 
 class QRemoteLoggingTableModel(QLoggingTableModel):
     """A remote Qt table that displays the taurus logging messages"""
@@ -341,12 +496,18 @@ class QLoggingTable(Qt.QTableView):
 
     scrollLock = False
 
+    #: maximum number of rows inserted at once which are resized to their
+    #: contents
+    MaxResizedRows = 100
+
     def rowsInserted(self, index, start, end):
         """Overwrite of slot rows inserted to do proper resize and scroll to
         bottom if desired"""
         Qt.QTableView.rowsInserted(self, index, start, end)
-        for i in xrange(start, end + 1):
-            self.resizeRowToContents(i)
+        # resizing is expensive: large batches keep the default row height
+        if end - start < self.MaxResizedRows:
+            for i in xrange(start, end + 1):
+                self.resizeRowToContents(i)
         if start == 0:
             self.resizeColumnsToContents()
         if not self.scrollLock:
@@ -398,7 +559,7 @@ class LoggingToolBar(FilterToolBar):
         self.scrollLockToggled.emit(yesno)
 
     def onLogLevelChanged(self, index):
-        self.onFilterChanged()
+        self._emitFilterChanged()
 
     def getLogLevelComboBox(self):
         return self._logLevelComboBox
@@ -421,6 +582,8 @@ class QLoggingFilterProxyModel(Qt.QSortFilterProxyModel):
     def __init__(self, parent=None):
         Qt.QSortFilterProxyModel.__init__(self, parent)
         self._logLevel = taurus.Trace
+        self._nameFilterKey = None
+        self._nameFilterCache = {}
 
         # filter configuration
         self.setFilterCaseSensitivity(Qt.Qt.CaseInsensitive)
@@ -434,22 +597,38 @@ class QLoggingFilterProxyModel(Qt.QSortFilterProxyModel):
         # general configuration
 
     def setFilterLogLevel(self, level):
-        self._logLevel = level
+        if level != self._logLevel:
+            self._logLevel = level
+            self.invalidateFilter()
 
     def __getattr__(self, name):
         return getattr(self.sourceModel(), name)
 
     def filterAcceptsRow(self, sourceRow, sourceParent):
-        sourceModel = self.sourceModel()
-        idx = sourceModel.index(sourceRow, NAME, sourceParent)
-        record = self.getRecord(idx)
-        if record.levelno < self._logLevel:
+        entry = self.sourceModel()._entryAt(sourceRow)
+        if entry.record.levelno < self._logLevel:
             return False
-        name = str(sourceModel.data(idx))
+        # the regexp is matched only once for each logger name
         regexp = self.filterRegExp()
-        if regexp.indexIn(name) != -1:
-            return True
-        return False
+        cache_key = regexp.pattern(), regexp.caseSensitivity(), \
+            regexp.patternSyntax()
+        if cache_key != self._nameFilterKey:
+            self._nameFilterKey = cache_key
+            self._nameFilterCache = {}
+        name = entry.record.name
+        try:
+            return self._nameFilterCache[name]
+        except KeyError:
+            accepted = regexp.indexIn(name) != -1
+            self._nameFilterCache[name] = accepted
+            return accepted
+
+    def lessThan(self, left, right):
+        # compare the sort keys instead of the displayed strings
+        model = self.sourceModel()
+        key = _SORT_KEYS[left.column()]
+        return key(model._entryAt(left.row())) < \
+            key(model._entryAt(right.row()))
 
 
 _W = "Warning: Switching log perspective will erase previous log messages " \
@@ -33,15 +33,18 @@ alba, 2009
 # This module needs a total cleanup. Both re. code conventions and algorithms.
 #   --cpascual 20140827
 
-__all__ = ["TaurusGrid"]
+__all__ = ["TaurusGrid", "TaurusGridModelsResolver"]
 
 __docformat__ = 'restructuredtext'
 
 import re
+import time
 import operator
+import threading
 import traceback
 import Queue
 from functools import partial
+from multiprocessing.pool import ThreadPool
 
 from taurus.external.qt import Qt, QtGui, QtCore
 
@@ -51,6 +54,8 @@ from taurus.core.taurusmanager import TaurusManager
 from taurus.core.util.log import Logger
 from taurus.qt.qtgui.base import TaurusBaseWidget
 from taurus.qt.qtgui.panel import TaurusValue
+from taurus.qt.qtgui.table.taurusgridmodel import TaurusGridModel, \
+    TaurusGridView
 
 metachars = re.compile('([.][*])|([.][^*])|([$^+\-?{}\[\]|()])')
 
@@ -63,77 +68,157 @@ def re_match_low(regexp, target):
     return re.match(regexp.lower(), target.lower())
 
 
-def get_all_models(expressions, limit=1000):
-    '''
-    All devices matching expressions must be obtained.
-    For each device only the good attributes are read.
+#: seconds during which the models resolved from an expression are reused
+MODELS_CACHE_TTL = 600
+#: number of threads used to list the attributes of the devices
+MODELS_RESOLUTION_WORKERS = 8
 
-    It practically equals to fandango.get_matching_attributes; check which is better!
-    Move this method to taurus.core.tango.search
-    '''
-    #print( 'In TaurusGrid.get_all_models(%s:"%s") ...' % (type(expressions),expressions))
-    if isinstance(expressions, str):
-        # if any(re.match(s,expressions) for s in ('\{.*\}','\(.*\)','\[.*\]')):
-            ##self.debug( 'evaluating expressions ....')
-            #expressions = list(eval(expressions))
-        # else:
-            ##self.debug( 'expressions as string separated by commas ...')
-        expressions = expressions.split(',')
+_models_cache = {}
+_models_cache_lock = threading.Lock()
 
+
+def _parse_expressions(expressions, evaluate=False):
+    if isinstance(expressions, str):
+        if evaluate and any(re.match(s, expressions)
+                            for s in ('\{.*\}', '\(.*\)', '\[.*\]')):
+            expressions = list(eval(expressions))
+        else:
+            expressions = expressions.split(',')
     elif any(isinstance(expressions, klass) for klass in (QtCore.QStringList, list, tuple, dict)):
-        #self.debug( 'expressions converted from list ...')
         expressions = list(str(e) for e in expressions)
+    return expressions
+
+
+def _get_device_attributes(dev, attribute, readonly=False):
+    '''returns the names of the attributes of dev matching the attribute
+    regexp (only the read only ones if readonly is True)'''
+    try:
+        taurus_dp = taurus.core.taurusmanager.TaurusManager().getFactory()().getDevice(dev)
+        attrs = [att.name for att in taurus_dp.attribute_list_query()
+                 if re_match_low(attribute, att.name) and
+                 (not readonly or att.isReadOnly())]
+        return [dev + '/' + att for att in attrs]
+    except Exception, e:
+        return []
+
+
+def clear_models_cache():
+    '''Forgets the models resolved by :func:`resolve_models`'''
+    with _models_cache_lock:
+        _models_cache.clear()
+
+
+def get_cached_models(expressions, limit=1000, readonly=False):
+    '''Returns the models of a previous :func:`resolve_models` call with the
+    same arguments (if not older than MODELS_CACHE_TTL) or None'''
+    key = (tuple(_parse_expressions(expressions, evaluate=readonly)), limit,
+           readonly)
+    with _models_cache_lock:
+        t, models = _models_cache.get(key, (0, None))
+    if time.time() - t > MODELS_CACHE_TTL:
+        return None
+    return list(models)
+
+
+def resolve_models(expressions, limit=1000, readonly=False, callback=None,
+                   cancelled=None, workers=None):
+    '''
+    All devices matching expressions must be obtained.
+    For each device only the good attributes are read.
 
-    #self.debug( 'In TaurusGrid.get_all_models(%s:"%s") ...' % (type(expressions),expressions))
+    The attributes of the devices are listed concurrently (using `workers`
+    threads) and the result is cached (see :func:`get_cached_models`).
+
+    :param expressions: (str or seq<str>) device/attribute expressions
+    :param limit: (int) maximum number of models returned
+    :param readonly: (bool) if True, only the read only attributes are taken
+                     (and string expressions like "[...]" are evaluated)
+    :param callback: (callable) if given, it is called with each list of
+                     models as they are found
+    :param cancelled: (threading.Event) if it is set, the resolution is
+                      aborted and None is returned
+    :param workers: (int) number of threads (default:
+                    MODELS_RESOLUTION_WORKERS)
+
+    :return: (list<str>) the attribute names (or None if cancelled)
+    '''
+    expressions = _parse_expressions(expressions, evaluate=readonly)
+    key = (tuple(expressions), limit, readonly)
+    is_cancelled = cancelled.is_set if cancelled is not None else lambda: False
     taurus_db = taurus.Authority()
-    #taurus_db = taurus.Authority(os.environ['TANGO_HOST'])
     # WHAAAAAAT????? Someone should get beaten for this line
     if 'SimulationAuthority' in str(type(taurus_db)):
-        #self.trace( 'Using a simulated database ...')
-        models = expressions
+        models = expressions[:limit]
+        if callback is not None:
+            callback(models)
+        return models
+    all_devs = taurus_db.get_device_exported('*')
+    # (device, attribute regexp) pairs that need the attribute list and
+    # models that are known without any query, in expression order
+    tasks = []
+    for exp in expressions:
+        exp = str(exp)
+        if exp.count('/') == 3:
+            device, attribute = exp.rsplit('/', 1)
+        else:
+            device, attribute = exp, 'State'
+
+        if any(c in device for c in '.*[]()+?'):
+            if '*' in device and '.*' not in device:
+                device = device.replace('*', '.*')
+            devs = [s for s in all_devs if re_match_low(device, s)]
+        else:
+            devs = [device]
+
+        if any(c in attribute for c in '.*[]()+?'):
+            if '*' in attribute and '.*' not in attribute:
+                attribute = attribute.replace('*', '.*')
+            tasks.extend((dev, attribute) for dev in devs)
+        else:
+            tasks.extend([dev + '/' + attribute] for dev in devs)
+
+    def run(task):
+        if is_cancelled() or isinstance(task, list):
+            return task
+        return _get_device_attributes(task[0], task[1], readonly)
+
+    models = []
+    pool = None
+    if any(isinstance(t, tuple) for t in tasks):
+        pool = ThreadPool(workers or MODELS_RESOLUTION_WORKERS)
+        results = pool.imap(run, tasks)
     else:
-        all_devs = taurus_db.get_device_exported('*')
-        models = []
-        for exp in expressions:
-            #self.trace( 'evaluating exp = "%s"' % exp)
-            exp = str(exp)
-            devs = []
-            targets = []
-            if exp.count('/') == 3:
-                device, attribute = exp.rsplit('/', 1)
-            else:
-                device, attribute = exp, 'State'
+        results = tasks
+    try:
+        for targets in results:
+            if is_cancelled():
+                return None
+            targets = targets[:limit - len(models)]
+            if targets:
+                models.extend(targets)
+                if callback is not None:
+                    callback(targets)
+            if len(models) >= limit:
+                break
+    finally:
+        if pool is not None:
+            pool.terminate()
+    with _models_cache_lock:
+        _models_cache[key] = time.time(), list(models)
+    return models
 
-            if any(c in device for c in '.*[]()+?'):
-                if '*' in device and '.*' not in device:
-                    device = device.replace('*', '.*')
-                devs = [s for s in all_devs if re_match_low(device, s)]
-            else:
-                devs = [device]
-
-            #self.trace( 'TaurusGrid.get_all_models(): devices matched by %s / %s are %d:' % (device,attribute,len(devs)))
-            #self.debug( '%s' % (devs))
-            for dev in devs:
-                if any(c in attribute for c in '.*[]()+?'):
-                    if '*' in attribute and '.*' not in attribute:
-                        attribute = attribute.replace('*', '.*')
-                    try:
-                        #taurus_dp = taurus.core.taurusdevice.TaurusDevice(dev)
-                        taurus_dp = taurus.core.taurusmanager.TaurusManager().getFactory()().getDevice(dev)
-                        #self.debug( "taurus_dp = %s"%taurus_dp.getFullName())
-                        attrs = [att.name for att in taurus_dp.attribute_list_query(
-                        ) if re_match_low(attribute, att.name)]
-                        targets.extend(dev + '/' + att for att in attrs)
-                    except Exception, e:
-                        #self.warning( 'ERROR! TaurusGrid.get_all_models(): Unable to get attributes for device %s: %s' % (dev,str(e)))
-                        pass
-                else:
-                    targets.append(dev + '/' + attribute)
-            # print 'TaurusGrid.get_all_models(): targets added by %s are: %s'
-            # % (exp,targets)
-            models.extend(targets)
-    models = models[:limit]
-    #print( 'Out of TaurusGrid.get_all_models(...)')
+
+def get_all_models(expressions, limit=1000):
+    '''
+    All devices matching expressions must be obtained.
+    For each device only the good attributes are read.
+
+    It practically equals to fandango.get_matching_attributes; check which is better!
+    Move this method to taurus.core.tango.search
+    '''
+    models = get_cached_models(expressions, limit)
+    if models is None:
+        models = resolve_models(expressions, limit)
     return models
 
 
@@ -142,57 +227,64 @@ def get_readwrite_models(expressions, limit=1000):
     All devices matching expressions must be obtained.
     For each device only the good attributes are read.
     '''
-    #self.debug( 'In TaurusGrid.get_all_models(%s:"%s") ...' % (type(expressions),expressions))
-    if isinstance(expressions, str):
-        if any(re.match(s, expressions) for s in ('\{.*\}', '\(.*\)', '\[.*\]')):
-            #self.trace( 'evaluating expressions ....')
-            expressions = list(eval(expressions))
-        else:
-            #self.trace( 'expressions as string separated by commas ...')
-            expressions = expressions.split(',')
-
-    elif any(isinstance(expressions, klass) for klass in (QtCore.QStringList, list, tuple, dict)):
-        expressions = list(str(e) for e in expressions)
+    models = get_cached_models(expressions, limit, readonly=True)
+    if models is None:
+        models = resolve_models(expressions, limit, readonly=True)
+    return models
 
-    taurus_db = taurus.Authority()
-    # WHAAAT???? At least check instances...
-    if 'SimulationAuthority' in str(type(taurus_db)):
-        models = expressions
-    else:
-        all_devs = taurus_db.get_device_exported('*')
-        models = []
-        for exp in expressions:
-            exp = str(exp)
-            devs = []
-            targets = []
-            if exp.count('/') == 3:
-                device, attribute = exp.rsplit('/', 1)
-            else:
-                device, attribute = exp, 'State'
 
-            if any(c in device for c in '.*[]()+?'):
-                if '*' in device and '.*' not in device:
-                    device = device.replace('*', '.*')
-                devs = [s for s in all_devs if re_match_low(device, s)]
-            else:
-                devs = [device]
-
-            for dev in devs:
-                if any(c in attribute for c in '.*[]()+?'):
-                    if '*' in attribute and '.*' not in attribute:
-                        attribute = attribute.replace('*', '.*')
-                    try:
-                        taurus_dp = taurus.core.taurusmanager.TaurusManager().getFactory()().getDevice(dev)
-                        attrs = [att.name for att in taurus_dp.attribute_list_query(
-                        ) if re_match_low(attribute, att.name) and att.isReadOnly()]
-                        targets.extend(dev + '/' + att for att in attrs)
-                    except Exception, e:
-                        pass
-                else:
-                    targets.append(dev + '/' + attribute)
-            models.extend(targets)
-    models = models[:limit]
-    return models
+class TaurusGridModelsResolver(Qt.QObject):
+    '''Resolves model expressions (see :func:`resolve_models`) in a
+    background thread. The models are notified with `modelsFound` as they
+    are found (at most every `progressPeriod` seconds) and `finished` is
+    emitted with the complete list unless :meth:`cancel` is called.'''
+
+    modelsFound = Qt.pyqtSignal(object)
+    finished = Qt.pyqtSignal(object)
+
+    def __init__(self, parent=None, progressPeriod=0.5):
+        Qt.QObject.__init__(self, parent)
+        self.progressPeriod = progressPeriod
+        self._cancelled = None
+
+    def start(self, expressions, limit=1000, readonly=False):
+        '''Cancels any running resolution and starts resolving expressions'''
+        self.cancel()
+        self._cancelled = cancelled = threading.Event()
+        thread = threading.Thread(target=self._run, name='TaurusGridResolver',
+                                  args=(expressions, limit, readonly,
+                                        cancelled))
+        thread.daemon = True
+        thread.start()
+
+    def cancel(self):
+        if self._cancelled is not None:
+            self._cancelled.set()
+            self._cancelled = None
+
+    def isRunning(self):
+        return self._cancelled is not None and not self._cancelled.is_set()
+
+    def _run(self, expressions, limit, readonly, cancelled):
+        found = []
+        state = dict(last=time.time())
+
+        def callback(models):
+            found.extend(models)
+            now = time.time()
+            if now - state['last'] >= self.progressPeriod:
+                state['last'] = now
+                self.modelsFound.emit(list(found))
+        try:
+            models = resolve_models(expressions, limit, readonly,
+                                    callback=callback, cancelled=cancelled)
+        except Exception:
+            Logger('TaurusGridModelsResolver').warning(
+                'Cannot resolve %s', expressions, exc_info=1)
+            models = list(found)
+        if not cancelled.is_set():
+            cancelled.set()  # the worker is done
+            self.finished.emit(models)
 
 
 class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
@@ -202,6 +294,9 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
     An example of execution:<pre>
     /usr/bin/python taurusgrid.py "model=lt.*/VC.*/.*/((C*)|(P*)|(I*))" cols=IP,CCG,PNV rows=LT01,LT02
     </pre>
+    In virtual mode (see setVirtualMode) no widget is created per attribute: the
+    values are kept in a TaurusGridModel fed by a single subscriber and only the
+    visible cells are painted, which scales to thousands of attributes.
     @author originally developed by gcuni, extended by srubio and sblanch
     @todo Future releases should allow a list of filters as argument
     @todo names/widgets should be accessible as a caselessdict dictionary (e.g. for adding custom context menus)
@@ -246,6 +341,11 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
         self._show_attr_labels = True
         self._show_attr_units = True
         self.hideLabels = False
+        self._virtual = False
+        self._gridModel = None
+        self._asyncResolution = True
+        self._resolver = None
+        self._resolution = {}
 
         self.defineStyle()
         self.modelsQueue = Queue.Queue()
@@ -269,7 +369,8 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
             'model': self.filter,
             'row_labels': self.row_labels, 'column_labels': self.column_labels,
             'frames': self._show_row_frame or self._show_column_frame, 'labels': self._show_attr_labels,
-            'units': self._show_attr_units, 'others': self._show_others
+            'units': self._show_attr_units, 'others': self._show_others,
+            'virtual': self._virtual
         }
         f = open(filename, 'w')
         pickle.dump(d, f)
@@ -292,6 +393,7 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
         self.showAttributeUnits(d.get('units', True))
         self.showOthers(d.get('others', True))
         self.showRowFrame(d.get('frames', True))
+        self.setVirtualMode(d.get('virtual', self._virtual))
         if manual:
             self.showColumnFrame(d.get('frames', True))
         self.setModel(d['model'], delayed=d.get('delayed', delayed))
@@ -411,63 +513,125 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
 
             self.delayed = delayed
             self.filter = model
+            self.cancelModelResolution()
             if any('*' in m for m in model):
-                model = get_all_models(model)
+                models = get_cached_models(model)
+                if models is None and self._asyncResolution:
+                    self._resolveModels(model, devsInRows, append, load)
+                    return
+                model = get_all_models(model) if models is None else models
                 self.debug(
                     'model was a RegExp, done the query and converted to an attr list')
+            self._applyModels(model, devsInRows, append, load)
+        return
 
-            if not self._modelNames == []:  # clean to start from scratch
-                for widget in self._widgets_list:
-                    del widget
+    def _resolveModels(self, expressions, devsInRows, append, load):
+        '''resolves the expressions in background, rebuilding the grid as
+        the models are found (only in virtual mode, which is cheap to
+        rebuild) and once all of them are known'''
+        self.debug('resolving %s in background' % str(expressions)[:100])
+        resolver = TaurusGridModelsResolver()
+        self._resolver = resolver
+        self._resolution = dict(labels=(list(self.row_labels),
+                                        list(self.column_labels)),
+                                previous=list(self._modelNames) if append else [],
+                                devsInRows=devsInRows, load=load)
+        if self._virtual:
+            resolver.modelsFound.connect(self._onModelsFound,
+                                         Qt.Qt.QueuedConnection)
+        resolver.finished.connect(self._onModelsResolved,
+                                  Qt.Qt.QueuedConnection)
+        resolver.start(expressions)
+
+    def _onModelsFound(self, models):
+        if self.sender() is not self._resolver:
+            return  # notification of a cancelled resolution
+        r = self._resolution
+        self.row_labels, self.column_labels = map(list, r['labels'])
+        self._applyModels(r['previous'] + models, r['devsInRows'], False,
+                          r['load'])
+
+    def _onModelsResolved(self, models):
+        self._onModelsFound(models)
+        if self.sender() is self._resolver:
+            self._resolver = None
+
+    def cancelModelResolution(self):
+        '''Stops the background resolution of the model expressions (if
+        any). Models already found are kept in the grid.'''
+        if self._resolver is not None:
+            self._resolver.cancel()
+            self._resolver = None
+
+    def isResolvingModels(self):
+        return self._resolver is not None and self._resolver.isRunning()
+
+    def setAsyncModelResolution(self, enabled):
+        '''Sets whether wildcard model expressions are resolved in a
+        background thread (True, default) or synchronously in setModel'''
+        self._asyncResolution = bool(enabled)
+
+    def getAsyncModelResolution(self):
+        return self._asyncResolution
+
+    def resetAsyncModelResolution(self):
+        self.setAsyncModelResolution(True)
+
+    def _applyModels(self, model, devsInRows=False, append=False, load=True):
+        if not self._modelNames == []:  # clean to start from scratch
+            for widget in self._widgets_list:
+                del widget
+            if self._gridModel is not None:
+                self._gridModel.unsubscribe()
+                self._gridModel = None
+
+        # here we always have the reals model list, even if it comes from a
+        # regexp
+        if append:
+            self._modelNames = self._modelNames + model
+        else:
+            self._modelNames = model
+
+        self.debug(('In TaurusGrid.setModel(...): modelNames are %s' %
+                    (self._modelNames))[:100] + '...')
+
+        if load:
+            self.trace('In TaurusGrid.setModel(%s,load=True): modelNames are %d' % (
+                str(model)[:100] + '...', len(self._modelNames)))  # ,self._modelNames))
+            if devsInRows:
+                self.setRowLabels(
+                    ','.join(set(d.rsplit('/', 1)[0] for d in self._modelNames)))
+            self.create_widgets_table(self._modelNames)
+            self.modelsQueue.put(
+                (MethodModel(self.showRowFrame), self._show_row_frame))
+            self.modelsQueue.put(
+                (MethodModel(self.showColumnFrame), self._show_column_frame))
+            self.modelsQueue.put(
+                (MethodModel(self.showOthers), self._show_others))
+            self.modelsQueue.put(
+                (MethodModel(self.showAttributeLabels), self._show_attr_labels))
+            self.modelsQueue.put(
+                (MethodModel(self.showAttributeUnits), self._show_attr_units))
+            self.updateStyle()
 
-            # here we always have the reals model list, even if it comes from a
-            # regexp
-            if append:
-                self._modelNames = self._modelNames + model
-            else:
-                self._modelNames = model
-
-            self.debug(('In TaurusGrid.setModel(...): modelNames are %s' %
-                        (self._modelNames))[:100] + '...')
-
-            if load:
-                self.trace('In TaurusGrid.setModel(%s,load=True): modelNames are %d' % (
-                    str(model)[:100] + '...', len(self._modelNames)))  # ,self._modelNames))
-                if devsInRows:
-                    self.setRowLabels(
-                        ','.join(set(d.rsplit('/', 1)[0] for d in self._modelNames)))
-                self.create_widgets_table(self._modelNames)
-                self.modelsQueue.put(
-                    (MethodModel(self.showRowFrame), self._show_row_frame))
-                self.modelsQueue.put(
-                    (MethodModel(self.showColumnFrame), self._show_column_frame))
-                self.modelsQueue.put(
-                    (MethodModel(self.showOthers), self._show_others))
-                self.modelsQueue.put(
-                    (MethodModel(self.showAttributeLabels), self._show_attr_labels))
-                self.modelsQueue.put(
-                    (MethodModel(self.showAttributeUnits), self._show_attr_units))
-                self.updateStyle()
-
-                if not self.delayed:
-                    self.trace('In setModel(): not delayed loading of models')
-                    if not self.modelsThread.isRunning():
-                        # print 'In setModel(): Starting Thread! (%d objs in
-                        # queue)'%(self.modelsThread.queue.qsize())
-                        self.trace('<' * 80)
-                        # self.modelsThread.IdlePriority)
-                        self.modelsThread.start()
-                    else:
-                        # print 'In setModel(): Thread already started! (%d
-                        # objs in queue)'%(self.modelsThread.queue.qsize())
-                        self.modelsThread.next()
+            if not self.delayed:
+                self.trace('In setModel(): not delayed loading of models')
+                if not self.modelsThread.isRunning():
+                    # print 'In setModel(): Starting Thread! (%d objs in
+                    # queue)'%(self.modelsThread.queue.qsize())
+                    self.trace('<' * 80)
+                    # self.modelsThread.IdlePriority)
+                    self.modelsThread.start()
                 else:
-                    self.trace('In setModel(): models loading delayed!')
-                    pass
+                    # print 'In setModel(): Thread already started! (%d
+                    # objs in queue)'%(self.modelsThread.queue.qsize())
+                    self.modelsThread.next()
+            else:
+                self.trace('In setModel(): models loading delayed!')
+                pass
 
-            self.trace('Out of TaurusGrid.setModel(%s)' % str(model)[:100])
-            self.updateStyle()
-        return
+        self.trace('Out of TaurusGrid.setModel(%s)' % str(model)[:100])
+        self.updateStyle()
 
     def getModel(self):
         return self._modelNames
@@ -477,6 +641,18 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
         self.updateFromList(self._modelNames)
         return
 
+    def setVirtualMode(self, virtual):
+        '''Sets whether the grid is rendered with a table model and a delegate
+        (True) or with one TaurusValue widget per attribute (False, default).
+        It applies from the next call to setModel'''
+        self._virtual = bool(virtual)
+
+    def getVirtualMode(self):
+        return self._virtual
+
+    def resetVirtualMode(self):
+        self.setVirtualMode(False)
+
     def setTitle(self, title):
         self.title = str(title)
         if hasattr(self, 'title_widget'):
@@ -564,6 +740,8 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
     def showAttributeLabels(self, boolean):
         self.trace('In showAttributeLabels(%s)' % boolean)
         self._show_attr_labels = boolean
+        if self._gridModel is not None:
+            self._gridModel.setShowLabels(boolean)
         for tv in self._widgets_list:
             try:
                 if tv and tv.labelWidget:
@@ -578,6 +756,8 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
     def showAttributeUnits(self, boolean):
         self.trace('In showAttributeUnits(%s)' % boolean)
         self._show_attr_units = boolean
+        if self._gridModel is not None:
+            self._gridModel.setShowUnits(boolean)
         for tv in self._widgets_list:
             try:
                 if tv and tv.unitsWidget:
@@ -605,6 +785,15 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
                                        setColumnLabels,
                                        resetColumnLabels)
 
+    virtualMode = QtCore.pyqtProperty("bool", getVirtualMode,
+                                      setVirtualMode,
+                                      resetVirtualMode)
+
+    asyncModelResolution = QtCore.pyqtProperty("bool",
+                                               getAsyncModelResolution,
+                                               setAsyncModelResolution,
+                                               resetAsyncModelResolution)
+
     useParentModel = QtCore.pyqtProperty("bool",
                                          TaurusBaseWidget.getUseParentModel,
                                          TaurusBaseWidget.setUseParentModel,
@@ -677,6 +866,14 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
 
     def create_widgets_table(self, models):
 
+        # Remove the widgets of any previous table
+        for name in ('title_widget', 'table', 'checkboxes_frame'):
+            widget = getattr(self, name, None)
+            if widget is not None:
+                self.layout().removeWidget(widget)
+                widget.hide()
+                widget.deleteLater()
+
         # Added a title to the panel
         self.title_widget = QtGui.QLabel()
         self.layout().addWidget(self.title_widget, 0, 0)
@@ -701,7 +898,10 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
             values.append(line)
 
         # Here is where the table is created!
-        self.table = self.build_table(values)
+        if self._virtual:
+            self.table = self.build_virtual_table(values)
+        else:
+            self.table = self.build_table(values)
 
         # SET COLUMN HEADERS (self.columns)
         for i in range(len(self.columns)):
@@ -869,6 +1069,27 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
 
         return table
 
+    def build_virtual_table(self, values):
+        """
+        Builds a TaurusGridView showing a TaurusGridModel with the attributes
+        of the values matrix (no widget is created per attribute).
+        """
+        self.trace('In TaurusGrid.build_virtual_table(%s)' % values)
+        self._gridModel = TaurusGridModel(self)
+        self._gridModel.setCells(values, self.rows, self.columns)
+        self._gridModel.setShowLabels(self._show_attr_labels)
+        self._gridModel.setShowUnits(self._show_attr_units)
+        table = TaurusGridView()
+        table.setModel(self._gridModel)
+        palette = Qt.QPalette()
+        palette.setBrush(palette.Active, palette.Highlight,
+                         Qt.QBrush(Qt.Qt.white))
+        table.setPalette(palette)
+        table.horizontalHeader().setResizeMode(QtGui.QHeaderView.Stretch)
+        table.itemClicked.connect(self.itemClicked)
+        self._gridModel.subscribe()
+        return table
+
     def build_widgets(self, values, show_labels=False, width=240, height=20, value_width=120):
         widgets_matrix = []
         for row in values:
@@ -917,6 +1138,10 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
 
     def setItemSelected(self, item_name='', selected=True):
         """ it adds a blue frame around a clicked item. """
+        if self._gridModel is not None:
+            self._gridModel.setSelectedModel(
+                str(item_name) if item_name and selected else None)
+            return None
         if isinstance(item_name, TaurusValue):
             self.trace('In TaurusGrid.setItemSelected(%s,%s)' %
                        (str(item_name.getModel()), selected))
@@ -1007,6 +1232,7 @@ if __name__ == '__main__':
         args = sysargs_to_dict(
             ['model', 'rows', 'cols', 'others', 'rowframe', 'colframe'])
         print "args = %s" % args
+        gui.setVirtualMode(args.get('virtual', False))
         if args.get('rows'):
             gui.setRowLabels(args['rows'])
         if args.get('cols'):
@@ -0,0 +1,424 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""This module provides the model, delegate and view used by
+:class:`TaurusGrid` in virtual mode. Instead of creating a TaurusValue widget
+per attribute, the values are kept in a :class:`TaurusGridModel` (fed by a
+single :class:`TaurusGridSubscriber`) and only the visible cells are painted
+by a :class:`TaurusGridDelegate`."""
+
+__all__ = ["TaurusGridSubscriber", "TaurusGridModel", "TaurusGridDelegate",
+           "TaurusGridView"]
+
+__docformat__ = 'restructuredtext'
+
+import threading
+
+import taurus
+from taurus.core import DataType
+from taurus.core.taurusbasetypes import TaurusEventType
+from taurus.core.util.log import Logger
+from taurus.external.qt import Qt
+from taurus.qt.qtgui.util import (QT_ATTRIBUTE_QUALITY_PALETTE,
+                                  QT_DEVICE_STATE_PALETTE)
+
+
+class TaurusGridSubscriber(Logger):
+    """Subscribes to a set of attributes with a single listener (itself) and
+    keeps their latest values. The attributes are created and subscribed in
+    a background thread. The names of the attributes whose value changed are
+    collected until :meth:`takeChanged` is called."""
+
+    def __init__(self, name='TaurusGridSubscriber', parent=None):
+        self.call__init__(Logger, name, parent)
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._thread = None
+        self._attrs = {}  # model name -> attribute
+        self._names = {}  # attribute -> model names
+        self._values = {}  # model name -> value
+        self._changed = set()
+
+    def subscribe(self, models):
+        """Starts subscribing (in a background thread) to the given models
+
+        :param models: (seq<str>) attribute names
+        """
+        self._cancelled = cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._subscribe,
+                                        args=(list(models), cancelled),
+                                        name='TaurusGridSubscriber')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _subscribe(self, models, cancelled):
+        for model in models:
+            if cancelled.is_set():
+                return
+            try:
+                attr = taurus.Attribute(model)
+            except Exception:
+                self.debug('Cannot get attribute %s', model, exc_info=1)
+                with self._lock:
+                    self._changed.add(model)
+                continue
+            with self._lock:
+                if cancelled.is_set():
+                    return
+                self._attrs[model] = attr
+                self._names.setdefault(attr, set()).add(model)
+                self._changed.add(model)
+            attr.addListener(self)
+            if cancelled.is_set():
+                # unsubscribe() may have run before addListener
+                attr.removeListener(self)
+                return
+
+    def unsubscribe(self):
+        """Stops the subscription thread and removes the listener from all
+        the subscribed attributes"""
+        self._cancelled.set()
+        with self._lock:
+            attrs = self._names.keys()
+            self._attrs, self._names, self._values = {}, {}, {}
+            self._changed = set()
+        for attr in attrs:
+            try:
+                attr.removeListener(self)
+            except Exception:
+                self.debug('Cannot unsubscribe from %s', attr, exc_info=1)
+
+    def eventReceived(self, evt_src, evt_type, evt_value):
+        with self._lock:
+            names = self._names.get(evt_src)
+            if not names:
+                return
+            if evt_type == TaurusEventType.Error:
+                for n in names:
+                    self._values[n] = None
+            elif evt_type != TaurusEventType.Config:
+                for n in names:
+                    self._values[n] = evt_value
+            self._changed.update(names)
+
+    def takeChanged(self):
+        """Returns the names of the models that changed since the last call
+
+        :return: (set<str>)
+        """
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        return changed
+
+    def getAttribute(self, model):
+        return self._attrs.get(model)
+
+    def getValue(self, model):
+        return self._values.get(model)
+
+
+class TaurusGridModel(Qt.QAbstractTableModel):
+    """A table model in which each cell contains a list of attribute names.
+    The values are provided by a :class:`TaurusGridSubscriber` and the
+    changes are notified with a single dataChanged signal (covering all the
+    changed cells) every refresh period."""
+
+    DftRefreshPeriod = 250
+
+    def __init__(self, parent=None, refreshPeriod=None):
+        Qt.QAbstractTableModel.__init__(self, parent)
+        self._cells = []
+        self._cellsByModel = {}
+        self._rowLabels = []
+        self._columnLabels = []
+        self._showLabels = True
+        self._showUnits = True
+        self._selected = None
+        self._subscriber = TaurusGridSubscriber(parent=None)
+        if refreshPeriod is None:
+            refreshPeriod = self.DftRefreshPeriod
+        self._refreshTimer = Qt.QTimer(self)
+        self._refreshTimer.setInterval(refreshPeriod)
+        self._refreshTimer.timeout.connect(self.refresh)
+
+    def setCells(self, cells, rowLabels=(), columnLabels=()):
+        """Sets the contents of the table
+
+        :param cells: (seq<seq<seq<str>>>) for each row, for each column, the
+                      attribute names displayed in the cell
+        :param rowLabels: (seq<str>) vertical header labels
+        :param columnLabels: (seq<str>) horizontal header labels
+        """
+        self.beginResetModel()
+        self._cells = [[sorted(c) for c in row] for row in cells]
+        self._cellsByModel = {}
+        for r, row in enumerate(self._cells):
+            for c, cell in enumerate(row):
+                for m in cell:
+                    self._cellsByModel.setdefault(m, []).append((r, c))
+        self._rowLabels = list(rowLabels)
+        self._columnLabels = list(columnLabels)
+        self.endResetModel()
+
+    def getModels(self):
+        return self._cellsByModel.keys()
+
+    def subscribe(self):
+        """Subscribes to all the models in the cells and starts refreshing"""
+        self._subscriber.unsubscribe()
+        self._subscriber.subscribe(self.getModels())
+        self._refreshTimer.start()
+
+    def unsubscribe(self):
+        self._refreshTimer.stop()
+        self._subscriber.unsubscribe()
+
+    def refresh(self):
+        """Emits dataChanged for the range of cells containing the models
+        that changed since the last refresh"""
+        changed = self._subscriber.takeChanged()
+        cells = [rc for m in changed for rc in self._cellsByModel.get(m, ())]
+        if not cells:
+            return
+        rows, cols = zip(*cells)
+        self.dataChanged.emit(self.index(min(rows), min(cols)),
+                              self.index(max(rows), max(cols)))
+
+    def rowCount(self, index=Qt.QModelIndex()):
+        return len(self._cells)
+
+    def columnCount(self, index=Qt.QModelIndex()):
+        return len(self._cells[0]) if self._cells else 0
+
+    def getCellModels(self, row, column):
+        """Returns the attribute names displayed in the given cell"""
+        try:
+            return self._cells[row][column]
+        except IndexError:
+            return []
+
+    def getCellEntries(self, row, column):
+        """Returns, for each attribute in the cell, a tuple with: name, label,
+        value text, unit and background and foreground brushes (or None)"""
+        return [self._getEntry(m) for m in self.getCellModels(row, column)]
+
+    def _getEntry(self, model):
+        attr = self._subscriber.getAttribute(model)
+        value = self._subscriber.getValue(model)
+        label, unit, text, bg, fg = model.rsplit('/', 1)[-1], '', '-----', \
+            None, None
+        isState = False
+        if attr is not None:
+            try:
+                label = attr.getLabel()
+                isState = attr.getType() == DataType.DevState
+                if not isState and hasattr(attr, 'getUnit'):
+                    unit = attr.getUnit() or ''
+            except Exception:
+                pass
+        if value is not None:
+            rvalue = getattr(value, 'rvalue', None)
+            rvalue = getattr(rvalue, 'magnitude', rvalue)
+            try:
+                if isState:
+                    bg, fg = QT_DEVICE_STATE_PALETTE.qbrush(rvalue)
+                else:
+                    bg, fg = QT_ATTRIBUTE_QUALITY_PALETTE.qbrush(
+                        value.quality)
+            except Exception:
+                pass
+            text = getattr(rvalue, 'name', None) or str(rvalue)
+        return model, label, text, unit, bg, fg
+
+    def setShowLabels(self, show):
+        self._showLabels = bool(show)
+        self._allChanged()
+
+    def getShowLabels(self):
+        return self._showLabels
+
+    def setShowUnits(self, show):
+        self._showUnits = bool(show)
+        self._allChanged()
+
+    def getShowUnits(self):
+        return self._showUnits
+
+    def setSelectedModel(self, model):
+        """Sets the model to be highlighted (or None)"""
+        previous, self._selected = self._selected, model
+        for m in (previous, model):
+            for r, c in self._cellsByModel.get(m, ()):
+                idx = self.index(r, c)
+                self.dataChanged.emit(idx, idx)
+
+    def getSelectedModel(self):
+        return self._selected
+
+    def _allChanged(self):
+        if self._cells:
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(self.rowCount() - 1,
+                                             self.columnCount() - 1))
+
+    def data(self, index, role=Qt.Qt.DisplayRole):
+        if not index.isValid():
+            return Qt.QVariant()
+        if role == Qt.Qt.DisplayRole:
+            entries = self.getCellEntries(index.row(), index.column())
+            return Qt.QVariant('\n'.join('%s %s %s' % e[1:4]
+                                         for e in entries))
+        elif role == Qt.Qt.ToolTipRole:
+            return Qt.QVariant('\n'.join(self.getCellModels(index.row(),
+                                                            index.column())))
+        return Qt.QVariant()
+
+    def headerData(self, section, orientation, role=Qt.Qt.DisplayRole):
+        if role != Qt.Qt.DisplayRole:
+            return Qt.QVariant()
+        labels = (self._columnLabels if orientation == Qt.Qt.Horizontal
+                  else self._rowLabels)
+        try:
+            return Qt.QVariant(labels[section])
+        except IndexError:
+            return Qt.QVariant()
+
+    def setHeaderData(self, section, orientation, value,
+                      role=Qt.Qt.EditRole):
+        labels = (self._columnLabels if orientation == Qt.Qt.Horizontal
+                  else self._rowLabels)
+        if not 0 <= section < len(labels):
+            return False
+        labels[section] = str(Qt.from_qvariant(value, str))
+        self.headerDataChanged.emit(orientation, section, section)
+        return True
+
+
+class TaurusGridDelegate(Qt.QStyledItemDelegate):
+    """Paints the cells of a :class:`TaurusGridModel`: one line per attribute
+    with its label, value (colored by state or quality) and unit"""
+
+    LineMargin = 2
+    LabelRatio = 0.45
+    UnitRatio = 0.15
+
+    def lineHeight(self, option):
+        return option.fontMetrics.height() + 2 * self.LineMargin
+
+    def sizeHint(self, option, index):
+        n = len(index.model().getCellModels(index.row(), index.column()))
+        return Qt.QSize(240, max(1, n) * self.lineHeight(option))
+
+    def paint(self, painter, option, index):
+        model = index.model()
+        entries = model.getCellEntries(index.row(), index.column())
+        if not entries:
+            return
+        h = self.lineHeight(option)
+        rect = option.rect
+        wlabel = int(rect.width() * self.LabelRatio) if model.getShowLabels() else 0
+        wunit = int(rect.width() * self.UnitRatio) if model.getShowUnits() else 0
+        wvalue = rect.width() - wlabel - wunit
+        m = self.LineMargin
+        painter.save()
+        try:
+            for i, (name, label, text, unit, bg, fg) in enumerate(entries):
+                y = rect.top() + i * h
+                if wlabel:
+                    r = Qt.QRect(rect.left() + m, y, wlabel - 2 * m, h)
+                    painter.setPen(option.palette.color(Qt.QPalette.Text))
+                    painter.drawText(r, Qt.Qt.AlignLeft | Qt.Qt.AlignVCenter,
+                                     label)
+                r = Qt.QRect(rect.left() + wlabel + m, y + m, wvalue - 2 * m,
+                             h - 2 * m)
+                if bg is not None:
+                    painter.fillRect(r, bg)
+                if name == model.getSelectedModel():
+                    painter.setPen(Qt.QPen(Qt.Qt.blue))
+                    painter.drawRect(r.adjusted(0, 0, -1, -1))
+                painter.setPen(fg.color() if fg is not None else
+                               option.palette.color(Qt.QPalette.Text))
+                painter.drawText(r, Qt.Qt.AlignCenter, text)
+                if wunit:
+                    r = Qt.QRect(rect.right() - wunit + m, y, wunit - 2 * m, h)
+                    painter.setPen(option.palette.color(Qt.QPalette.Text))
+                    painter.drawText(r, Qt.Qt.AlignLeft | Qt.Qt.AlignVCenter,
+                                     unit)
+        finally:
+            painter.restore()
+
+
+class TaurusGridView(Qt.QTableView):
+    """A table view for :class:`TaurusGridModel`. It provides the header item
+    API of QTableWidget used by :class:`TaurusGrid`"""
+
+    itemClicked = Qt.pyqtSignal('QString')
+
+    def __init__(self, parent=None):
+        Qt.QTableView.__init__(self, parent)
+        self.setItemDelegate(TaurusGridDelegate(self))
+        self.setSelectionMode(Qt.QAbstractItemView.NoSelection)
+
+    def setModel(self, model):
+        Qt.QTableView.setModel(self, model)
+        self.updateRowHeights()
+
+    def updateRowHeights(self):
+        """Sets the height of each row to fit its tallest cell"""
+        model = self.model()
+        if model is None:
+            return
+        h = self.itemDelegate().lineHeight(self.viewOptions())
+        for r in xrange(model.rowCount()):
+            n = max([len(model.getCellModels(r, c))
+                     for c in xrange(model.columnCount())] or [0])
+            self.setRowHeight(r, max(1, n) * h + 2)
+
+    def setHorizontalHeaderItem(self, column, item):
+        self.model().setHeaderData(column, Qt.Qt.Horizontal,
+                                   Qt.QVariant(item.text()))
+
+    def setVerticalHeaderItem(self, row, item):
+        self.model().setHeaderData(row, Qt.Qt.Vertical,
+                                   Qt.QVariant(item.text()))
+
+    def modelAt(self, pos):
+        """Returns the name of the attribute displayed at the given position
+        of the viewport (or None)"""
+        index = self.indexAt(pos)
+        if not index.isValid():
+            return None
+        models = self.model().getCellModels(index.row(), index.column())
+        h = self.itemDelegate().lineHeight(self.viewOptions())
+        i = (pos.y() - self.visualRect(index).top()) // h
+        if 0 <= i < len(models):
+            return models[i]
+        return None
+
+    def mousePressEvent(self, event):
+        Qt.QTableView.mousePressEvent(self, event)
+        model = self.modelAt(event.pos())
+        if model is not None:
+            self.itemClicked.emit(model)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for taurus.qt.qtgui.table.qlogtable"""
+
+import logging
+
+from taurus.external import unittest
+from taurus.external.qt import Qt
+from taurus.qt.qtgui.table.qlogtable import (QLoggingTableModel,
+                                             QLoggingFilterProxyModel,
+                                             LEVEL, TIME, MSG, NAME)
+
+
+def _record(i, level=logging.INFO, name='a'):
+    return logging.makeLogRecord(dict(msg='message %d', args=(i,),
+                                      levelno=level, name=name,
+                                      levelname=logging.getLevelName(level),
+                                      created=1000. + i))
+
+
+class QLoggingTableModelTestCase(unittest.TestCase):
+    """Test cases for the QLoggingTableModel"""
+
+    def setUp(self):
+        if Qt.QApplication.instance() is None:
+            self._app = Qt.QApplication([])
+        self.model = QLoggingTableModel(capacity=10)
+        logging.getLogger().removeHandler(self.model)
+        self.inserted = []
+        self.model.rowsInserted.connect(
+            lambda parent, first, last: self.inserted.append((first, last)))
+
+    def tearDown(self):
+        self.model.close()
+
+    def _column(self, column):
+        return [Qt.from_qvariant(self.model.data(self.model.index(r, column)),
+                                 str)
+                for r in range(self.model.rowCount())]
+
+    def test_batches(self):
+        """Check that the records are inserted in a batch per update"""
+        for i in range(5):
+            self.model.emit(_record(i))
+        self.assertEqual(self.model.rowCount(), 0)
+        self.model.updatePendingRecords()
+        self.assertEqual(self.inserted, [(0, 4)])
+        self.assertEqual(self._column(MSG)[-1], 'message 4')
+
+    def test_capacity(self):
+        """Check that the oldest records are discarded"""
+        for i in range(25):
+            self.model.emit(_record(i, name='abc'[i % 3]))
+            if i % 4 == 0:
+                self.model.updatePendingRecords()
+        self.model.updatePendingRecords()
+        self.assertEqual(self.model.rowCount(), 10)
+        self.assertEqual(self._column(MSG),
+                         ['message %d' % i for i in range(15, 25)])
+        self.assertEqual(self.model.getLevelCounts(), {logging.INFO: 10})
+        self.assertEqual(self.model.getLoggerNames(), ['a', 'b', 'c'])
+
+    def test_sorted_insertion(self):
+        """Check that new records are inserted in their sorted positions"""
+        levels = [logging.INFO, logging.ERROR, logging.DEBUG]
+        for i in range(6):
+            self.model.emit(_record(i, levels[i % 3]))
+        self.model.updatePendingRecords()
+        self.model.sort(LEVEL, Qt.Qt.DescendingOrder)
+        self.model.emit(_record(6, logging.WARNING))
+        self.model.updatePendingRecords()
+        self.assertEqual(self._column(LEVEL), ['ERROR', 'ERROR', 'WARNING',
+                                               'INFO', 'INFO', 'DEBUG',
+                                               'DEBUG'])
+        self.model.sort(TIME)
+        self.assertEqual(self._column(MSG),
+                         ['message %d' % i for i in range(7)])
+
+    def test_filter(self):
+        """Check the filter by level and logger name"""
+        proxy = QLoggingFilterProxyModel()
+        proxy.setSourceModel(self.model)
+        for i, (level, name) in enumerate([(logging.DEBUG, 'a'),
+                                           (logging.INFO, 'a'),
+                                           (logging.INFO, 'b'),
+                                           (logging.ERROR, 'b')]):
+            self.model.emit(_record(i, level, name))
+        self.model.updatePendingRecords()
+        proxy.setFilterLogLevel(logging.INFO)
+        self.assertEqual(proxy.rowCount(), 3)
+        proxy.setFilterRegExp('^b')
+        self.assertEqual(proxy.rowCount(), 2)
+        names = [Qt.from_qvariant(proxy.data(proxy.index(r, NAME)), str)
+                 for r in range(proxy.rowCount())]
+        self.assertEqual(names, ['b', 'b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
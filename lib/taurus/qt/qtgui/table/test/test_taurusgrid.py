@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for the model resolution of taurus.qt.qtgui.table.taurusgrid"""
+
+import threading
+import time
+
+import taurus
+import taurus.core.taurusmanager
+from taurus.external import unittest
+from taurus.external.qt import Qt
+from taurus.qt.qtgui.test import BaseWidgetTestCase
+from taurus.qt.qtgui.table import taurusgrid
+from taurus.qt.qtgui.table.taurusgrid import (resolve_models,
+                                              get_cached_models,
+                                              get_all_models,
+                                              clear_models_cache,
+                                              TaurusGridModelsResolver)
+
+
+class _AttrInfo(object):
+
+    def __init__(self, name, readonly):
+        self.name = name
+        self._readonly = readonly
+
+    def isReadOnly(self):
+        return self._readonly
+
+
+class _FakeDatabase(object):
+
+    '''A database with some exported devices, each of them with the same
+    attributes. It counts the attribute queries'''
+
+    devices = ['sys/tg_test/1', 'sys/tg_test/2', 'sys/other/1',
+               'lt01/vc/ip-01', 'lt01/vc/ccg-01']
+    attributes = [('State', True), ('double_scalar', False),
+                  ('double_scalar_rww', False), ('long_scalar', False),
+                  ('Status', True)]
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.queries = []
+        self._lock = threading.Lock()
+
+    # taurus.Authority() replacement
+    def __call__(self, *args):
+        return self
+
+    def get_device_exported(self, pattern):
+        return list(self.devices)
+
+    # TaurusManager().getFactory()() replacement
+    def getFactory(self, *args):
+        return lambda: self
+
+    def getDevice(self, name):
+        return _FakeDevice(self, name)
+
+
+class _FakeDevice(object):
+
+    def __init__(self, db, name):
+        self._db = db
+        self._name = name
+
+    def attribute_list_query(self):
+        with self._db._lock:
+            self._db.queries.append(self._name)
+        time.sleep(self._db.delay)
+        return [_AttrInfo(n, ro) for n, ro in self._db.attributes]
+
+
+class _MockedDatabaseMixin(object):
+
+    '''replaces the taurus authority and the device factory used by
+    resolve_models by a _FakeDatabase'''
+
+    delay = 0
+
+    def setUpDatabase(self):
+        clear_models_cache()
+        self._db = _FakeDatabase(self.delay)
+        self._authority = taurus.Authority
+        self._manager = taurus.core.taurusmanager.TaurusManager
+        taurus.Authority = self._db
+        taurus.core.taurusmanager.TaurusManager = lambda: self._db
+
+    def tearDownDatabase(self):
+        taurus.Authority = self._authority
+        taurus.core.taurusmanager.TaurusManager = self._manager
+        clear_models_cache()
+
+
+class ResolveModelsTest(_MockedDatabaseMixin, unittest.TestCase):
+
+    '''
+    Tests for resolve_models and its cache
+    '''
+
+    def setUp(self):
+        self.setUpDatabase()
+
+    def tearDown(self):
+        self.tearDownDatabase()
+
+    def test_plain(self):
+        '''Check that plain names are not queried'''
+        models = resolve_models(['sys/tg_test/1/double_scalar',
+                                 'sys/tg_test/2'])
+        self.assertEqual(models, ['sys/tg_test/1/double_scalar',
+                                  'sys/tg_test/2/State'])
+        self.assertEqual(self._db.queries, [])
+
+    def test_string(self):
+        '''Check comma separated expressions'''
+        models = resolve_models('sys/tg_test/1/long_scalar,sys/other/1')
+        self.assertEqual(models, ['sys/tg_test/1/long_scalar',
+                                  'sys/other/1/State'])
+
+    def test_device_wildcard(self):
+        '''Check the expansion of device wildcards'''
+        self.assertEqual(resolve_models('sys/tg_test/*'),
+                         ['sys/tg_test/1/State', 'sys/tg_test/2/State'])
+        self.assertEqual(resolve_models('LT01/VC/.*-01/State'),
+                         ['lt01/vc/ip-01/State', 'lt01/vc/ccg-01/State'])
+        self.assertEqual(self._db.queries, [])
+
+    def test_attribute_wildcard(self):
+        '''Check the expansion of attribute wildcards'''
+        models = resolve_models('sys/tg_test/1/double_.*')
+        self.assertEqual(models, ['sys/tg_test/1/double_scalar',
+                                  'sys/tg_test/1/double_scalar_rww'])
+        models = resolve_models('sys/tg_test/*/*scalar')
+        self.assertEqual(models, ['sys/tg_test/1/double_scalar',
+                                  'sys/tg_test/1/double_scalar_rww',
+                                  'sys/tg_test/1/long_scalar',
+                                  'sys/tg_test/2/double_scalar',
+                                  'sys/tg_test/2/double_scalar_rww',
+                                  'sys/tg_test/2/long_scalar'])
+
+    def test_readonly(self):
+        '''Check that only the read only attributes are taken if asked'''
+        models = resolve_models('sys/tg_test/1/.*', readonly=True)
+        self.assertEqual(models, ['sys/tg_test/1/State',
+                                  'sys/tg_test/1/Status'])
+
+    def test_order(self):
+        '''Check that the models keep the order of the expressions even if
+        the devices are queried concurrently'''
+        expressions = ['lt01/vc/*/s.*', 'sys/tg_test/2/long_scalar',
+                       'sys/tg_test/1/.*us']
+        models = resolve_models(expressions, workers=4)
+        self.assertEqual(models, ['lt01/vc/ip-01/State',
+                                  'lt01/vc/ip-01/Status',
+                                  'lt01/vc/ccg-01/State',
+                                  'lt01/vc/ccg-01/Status',
+                                  'sys/tg_test/2/long_scalar',
+                                  'sys/tg_test/1/Status'])
+
+    def test_limit(self):
+        '''Check that no more than limit models are returned'''
+        models = resolve_models('sys/tg_test/*/.*', limit=7)
+        self.assertEqual(len(models), 7)
+        self.assertEqual(models[5:], ['sys/tg_test/2/State',
+                                      'sys/tg_test/2/double_scalar'])
+
+    def test_callback(self):
+        '''Check that the callback receives all the models'''
+        found = []
+        models = resolve_models('sys/*/*/.*_scalar', callback=found.extend)
+        self.assertEqual(found, models)
+        self.assertEqual(len(models), 9)
+
+    def test_cancelled(self):
+        '''Check that a cancelled resolution returns None'''
+        cancelled = threading.Event()
+        cancelled.set()
+        self.assertEqual(resolve_models('sys/*/*/.*', cancelled=cancelled),
+                         None)
+        self.assertEqual(get_cached_models('sys/*/*/.*'), None)
+
+    def test_cache(self):
+        '''Check the hits and misses of the models cache'''
+        exp = 'sys/tg_test/*/long_.*'
+        self.assertEqual(get_cached_models(exp), None)
+        models = get_all_models(exp)
+        self.assertEqual(len(self._db.queries), 2)
+        # hit
+        self.assertEqual(get_cached_models(exp), models)
+        self.assertEqual(get_all_models(exp), models)
+        self.assertEqual(len(self._db.queries), 2)
+        # misses: other arguments
+        self.assertEqual(get_cached_models(exp, limit=1), None)
+        self.assertEqual(get_cached_models(exp, readonly=True), None)
+        self.assertEqual(get_cached_models('sys/tg_test/*/long.*'), None)
+        # miss: expired
+        ttl = taurusgrid.MODELS_CACHE_TTL
+        taurusgrid.MODELS_CACHE_TTL = -1
+        try:
+            self.assertEqual(get_cached_models(exp), None)
+        finally:
+            taurusgrid.MODELS_CACHE_TTL = ttl
+        # miss: cleared
+        clear_models_cache()
+        self.assertEqual(get_cached_models(exp), None)
+        self.assertEqual(get_all_models(exp), models)
+        self.assertEqual(len(self._db.queries), 4)
+
+    def test_cached_copy(self):
+        '''Check that modifying the returned models does not alter the
+        cache'''
+        models = get_all_models('sys/tg_test/1/long_.*')
+        models.append('foo')
+        self.assertEqual(get_cached_models('sys/tg_test/1/long_.*'),
+                         ['sys/tg_test/1/long_scalar'])
+
+
+class TaurusGridModelsResolverTest(_MockedDatabaseMixin, BaseWidgetTestCase,
+                                   unittest.TestCase):
+
+    '''
+    Tests for the background resolution of the grid models
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = TaurusGridModelsResolver
+    initkwargs = dict(progressPeriod=0)
+    delay = 0.05
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self.setUpDatabase()
+        self._found = []
+        self._finished = []
+        self._widget.modelsFound.connect(self._found.append)
+        self._widget.finished.connect(self._finished.append)
+
+    def tearDown(self):
+        self._widget.cancel()
+        self.tearDownDatabase()
+
+    def _wait(self, timeout=5):
+        '''processes the Qt events until the finished signal is received'''
+        t0 = time.time()
+        while not self._finished and time.time() - t0 < timeout:
+            self._app.processEvents()
+            time.sleep(.01)
+
+    def test_finished(self):
+        '''Check that the models are notified as they are found and when
+        the resolution finishes'''
+        self._widget.start('sys/tg_test/*/.*_scalar')
+        self.assertTrue(self._widget.isRunning())
+        self._wait()
+        self.assertFalse(self._widget.isRunning())
+        expected = resolve_models('sys/tg_test/*/.*_scalar')
+        self.assertEqual(self._finished, [expected])
+        self.assertTrue(self._found)
+        self.assertEqual(self._found[-1], expected[:len(self._found[-1])])
+
+    def test_cancel(self):
+        '''Check that a cancelled resolution is not notified'''
+        self._widget.start('sys/*/*/.*')
+        self._widget.cancel()
+        self.assertFalse(self._widget.isRunning())
+        time.sleep(10 * self.delay)
+        self._app.processEvents()
+        self.assertEqual(self._finished, [])
+
+    def test_restart(self):
+        '''Check that only the last of several resolutions is notified'''
+        self._widget.start('sys/other/1/.*')
+        self._widget.start('sys/tg_test/1/long_.*')
+        self._wait()
+        time.sleep(10 * self.delay)
+        self._app.processEvents()
+        self.assertEqual(self._finished, [['sys/tg_test/1/long_scalar']])
+
+
+if __name__ == "__main__":
+    unittest.main()
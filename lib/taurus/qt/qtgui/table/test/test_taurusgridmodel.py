@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for taurus.qt.qtgui.table.taurusgridmodel"""
+
+import time
+
+from taurus.external import unittest
+from taurus.external.qt import Qt
+from taurus.core.taurusbasetypes import TaurusEventType
+from taurus.qt.qtgui.test import BaseWidgetTestCase
+from taurus.qt.qtgui.table.taurusgridmodel import (TaurusGridModel,
+                                                   TaurusGridView)
+
+# for each row, for each column, the models in the cell
+CELLS = [[['eval:2', 'eval:1'], ['eval:3']],
+         [[], ['eval:1', 'eval:4', 'eval:5']]]
+
+
+def _waitFor(condition, timeout=5):
+    '''processes the Qt events until condition() is True (or timeout)'''
+    t0 = time.time()
+    while not condition() and time.time() - t0 < timeout:
+        Qt.QApplication.instance().processEvents()
+        time.sleep(.01)
+    return condition()
+
+
+class TaurusGridModelTest(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Tests for the cells and the refresh of TaurusGridModel
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = TaurusGridModel
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self._widget.setCells(CELLS, rowLabels=['r0', 'r1'],
+                              columnLabels=['c0', 'c1'])
+        self._changes = []
+        self._widget.dataChanged.connect(self._onDataChanged)
+
+    def tearDown(self):
+        self._widget.unsubscribe()
+
+    def _onDataChanged(self, topLeft, bottomRight):
+        self._changes.append((topLeft.row(), topLeft.column(),
+                              bottomRight.row(), bottomRight.column()))
+
+    def _subscribe(self):
+        '''subscribes the model and waits for the attributes'''
+        subscriber = self._widget._subscriber
+        self._widget.subscribe()
+        # the refreshes and the events are triggered by the tests
+        self._widget._refreshTimer.stop()
+        models = self._widget.getModels()
+        self.assertTrue(_waitFor(lambda: all(subscriber.getAttribute(m)
+                                             for m in models)))
+        for m in models:
+            subscriber.getAttribute(m).disablePolling()
+        return subscriber
+
+    def _push(self, model):
+        '''makes the attribute of model notify its value'''
+        subscriber = self._widget._subscriber
+        attr = subscriber.getAttribute(model)
+        subscriber.eventReceived(attr, TaurusEventType.Change, attr.read())
+
+    def test_cells(self):
+        '''Check the mapping of the cells to rows and columns'''
+        model = self._widget
+        self.assertEqual(model.rowCount(), 2)
+        self.assertEqual(model.columnCount(), 2)
+        self.assertEqual(model.getCellModels(0, 0), ['eval:1', 'eval:2'])
+        self.assertEqual(model.getCellModels(1, 0), [])
+        self.assertEqual(model.getCellModels(1, 1),
+                         ['eval:1', 'eval:4', 'eval:5'])
+        self.assertEqual(model.getCellModels(5, 0), [])
+        self.assertEqual(sorted(model.getModels()),
+                         ['eval:%d' % i for i in range(1, 6)])
+
+    def test_headers(self):
+        '''Check the header labels'''
+        model = self._widget
+        label = lambda s, o: Qt.from_qvariant(model.headerData(s, o), str)
+        self.assertEqual(label(1, Qt.Qt.Horizontal), 'c1')
+        self.assertEqual(label(0, Qt.Qt.Vertical), 'r0')
+        self.assertTrue(model.setHeaderData(0, Qt.Qt.Vertical,
+                                            Qt.QVariant('row')))
+        self.assertEqual(label(0, Qt.Qt.Vertical), 'row')
+        self.assertFalse(model.setHeaderData(2, Qt.Qt.Vertical,
+                                             Qt.QVariant('row')))
+
+    def test_empty(self):
+        '''Check a model without cells'''
+        model = TaurusGridModel()
+        self.assertEqual(model.rowCount(), 0)
+        self.assertEqual(model.columnCount(), 0)
+        self.assertEqual(model.getCellEntries(0, 0), [])
+
+    def test_subscribe(self):
+        '''Check that the attributes are created in background and that
+        their values are shown once received'''
+        subscriber = self._subscribe()
+        self.assertEqual(self._widget.getCellEntries(0, 1)[0][2], '-----')
+        self._push('eval:3')
+        self.assertEqual(subscriber.getValue('eval:3').rvalue, 3)
+        entries = self._widget.getCellEntries(0, 1)
+        self.assertEqual([e[0] for e in entries], ['eval:3'])
+        self.assertEqual(entries[0][2], '3')
+        self._widget.unsubscribe()
+        self.assertEqual(subscriber.getAttribute('eval:3'), None)
+        self.assertEqual(subscriber.getValue('eval:3'), None)
+
+    def test_refresh(self):
+        '''Check that a refresh emits a single dataChanged covering all the
+        cells of the changed models'''
+        self._subscribe()
+        self._widget.refresh()
+        # all the cells changed when subscribed
+        self.assertEqual(self._changes, [(0, 0, 1, 1)])
+        self._widget.refresh()
+        self.assertEqual(len(self._changes), 1)
+        self._push('eval:3')
+        self._widget.refresh()
+        self.assertEqual(self._changes[-1], (0, 1, 0, 1))
+        # eval:1 is displayed in two cells
+        self._push('eval:1')
+        self._widget.refresh()
+        self.assertEqual(self._changes[-1], (0, 0, 1, 1))
+
+    def test_selected(self):
+        '''Check that selecting a model updates its cells'''
+        self._widget.setSelectedModel('eval:4')
+        self.assertEqual(self._widget.getSelectedModel(), 'eval:4')
+        self.assertEqual(self._changes, [(1, 1, 1, 1)])
+        self._widget.setSelectedModel(None)
+        self.assertEqual(self._changes[-1], (1, 1, 1, 1))
+
+
+class TaurusGridViewTest(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Tests for the virtualized rendering of TaurusGridView
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = TaurusGridView
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self._model = TaurusGridModel()
+        self._model.setCells(CELLS)
+        self._widget.setModel(self._model)
+        self._widget.resize(600, 400)
+        self._lineHeight = self._widget.itemDelegate().lineHeight(
+            self._widget.viewOptions())
+
+    def test_row_heights(self):
+        '''Check that the rows fit their tallest cell'''
+        h = self._lineHeight
+        self.assertEqual(self._widget.rowHeight(0), 2 * h + 2)
+        self.assertEqual(self._widget.rowHeight(1), 3 * h + 2)
+
+    def test_modelAt(self):
+        '''Check the model displayed at each line of a cell'''
+        view = self._widget
+        rect = view.visualRect(self._model.index(1, 1))
+        for i, model in enumerate(['eval:1', 'eval:4', 'eval:5']):
+            pos = Qt.QPoint(rect.center().x(),
+                            rect.top() + i * self._lineHeight + 1)
+            self.assertEqual(view.modelAt(pos), model)
+        rect = view.visualRect(self._model.index(1, 0))
+        self.assertEqual(view.modelAt(rect.center()), None)
+
+    def test_render(self):
+        '''Check that painting the cells does not fail'''
+        self._model.setShowUnits(False)
+        pixmap = Qt.QPixmap(self._widget.size())
+        self._widget.render(pixmap)
+        self._model.setShowLabels(False)
+        self._widget.render(pixmap)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -72,6 +72,12 @@ SYNOPTIC = ['images/example01.jdw', 'images/syn2.jdw']
 #=========================================================================
 INSTRUMENTS_FROM_POOL = False
 
+#=========================================================================
+# Set DEFERRED_PANELS to False for creating the widgets of all the panels at
+# startup (by default, they are created when each panel is first shown)
+#=========================================================================
+DEFERRED_PANELS = True
+
 #=========================================================================
 # Define panels to be shown.
 # To define a panel, instantiate a PanelDescription object (see documentation
@@ -33,8 +33,10 @@ __docformat__ = 'restructuredtext'
 import os
 import sys
 import copy
+import time
 import weakref
 import inspect
+import functools
 
 from lxml import etree
 
@@ -117,6 +119,10 @@ class DockWidgetPanel(Qt.QDockWidget, TaurusBaseWidget):
     This is an extended QDockWidget which provides some methods for being used
     as a "panel" of a TaurusGui application. Widgets of TaurusGui are inserted
     in the application by adding them to a DockWidgetPanel.
+
+    The creation of the widget can be deferred until the panel is first
+    shown (or its widget is requested) by giving a factory for it (see
+    :meth:`setWidgetFactory`).
     '''
 
     def __init__(self, parent, widget, name, mainwindow):
@@ -125,6 +131,11 @@ class DockWidgetPanel(Qt.QDockWidget, TaurusBaseWidget):
 
         self.setAllowedAreas(Qt.Qt.TopDockWidgetArea)
 
+        self._widgetFactory = None
+        self._pendingWidgetClass = None
+        self._pendingWidgetConfig = None
+        self._pendingWidgetModel = None
+        self._creationTime = None
         self.setWidget(widget)
         # self._widget = self.widget()  #keep a pointer that may change if the
         # widget changes
@@ -136,6 +147,108 @@ class DockWidgetPanel(Qt.QDockWidget, TaurusBaseWidget):
         # store a weakref of the main window
         self._mainwindow = weakref.proxy(mainwindow)
 
+        self.visibilityChanged.connect(self._onVisibilityChanged)
+
+    def setWidgetFactory(self, factory, classname=None, modulename=None,
+                         model=None):
+        '''Defers the creation of the panel widget: a placeholder is shown
+        until the panel becomes visible or :meth:`widget` is called, and then
+        the widget is created by calling the given factory.
+
+        :param factory: (callable) function returning the widget
+        :param classname: (str) class name of the widget that will be created
+                          (used for the configuration of the panel)
+        :param modulename: (str) module name of that class
+        :param model: (str or None) model that the factory gives to the
+                      widget (see :meth:`getWidgetModel`)
+        '''
+        previous = None
+        if self._widgetFactory is not None:
+            previous = Qt.QDockWidget.widget(self)  # a placeholder
+        self._widgetFactory = factory
+        self._pendingWidgetClass = classname, modulename
+        self._pendingWidgetModel = model
+        placeholder = Qt.QLabel('Loading %s...' % self.windowTitle())
+        placeholder.setAlignment(Qt.Qt.AlignCenter)
+        Qt.QDockWidget.setWidget(self, placeholder)
+        if previous is not None:
+            previous.deleteLater()
+
+    def isWidgetCreated(self):
+        '''Returns whether the widget of the panel was already created (it is
+        False for deferred panels that have not been shown yet)
+
+        :return: (bool)
+        '''
+        return self._widgetFactory is None
+
+    def createWidget(self):
+        '''Creates the widget of a deferred panel (see
+        :meth:`setWidgetFactory`). It does nothing if it was already created
+
+        :return: (QWidget) the panel widget
+        '''
+        factory, self._widgetFactory = self._widgetFactory, None
+        if factory is None:
+            return Qt.QDockWidget.widget(self)
+        t0 = time.time()
+        w = factory()
+        placeholder = Qt.QDockWidget.widget(self)
+        self.setWidget(w)
+        if placeholder is not None:
+            placeholder.deleteLater()
+        config = self._pendingWidgetConfig
+        self._pendingWidgetConfig = None
+        self._pendingWidgetModel = None
+        if config is not None and isinstance(w, BaseConfigurableClass):
+            w.applyConfig(config)
+        self._creationTime = time.time() - t0
+        self.debug('Widget created in %.3f s', self._creationTime)
+        return w
+
+    def getCreationTime(self):
+        '''Returns the time that it took to create the widget of the panel
+        (if it was created by the panel)
+
+        :return: (float or None) time in seconds
+        '''
+        return self._creationTime
+
+    def _onVisibilityChanged(self, visible):
+        if visible and self._widgetFactory is not None:
+            # let the dock area be laid out (and painted) before
+            Qt.QTimer.singleShot(0, self._createDeferredWidget)
+
+    def _createDeferredWidget(self):
+        try:
+            self.createWidget()
+        except Exception, e:
+            self.error('Cannot create the widget of panel %s', self.objectName())
+            self.traceback(level=taurus.Info)
+            Qt.QDockWidget.widget(self).setText(
+                'Cannot create panel %s:\n%s' % (self.objectName(), repr(e)))
+
+    def widget(self):
+        '''reimplemented from :class:`QDockWidget` to create the widget of a
+        deferred panel when it is requested'''
+        if self._widgetFactory is not None:
+            return self.createWidget()
+        return Qt.QDockWidget.widget(self)
+
+    def getWidgetModel(self):
+        '''Returns the model of the panel widget. For a deferred panel that
+        has not been shown yet, the widget is not created: the model it will
+        have (from the pending configuration or the one given to
+        :meth:`setWidgetFactory`) is returned instead
+
+        :return: (object) the model or None
+        '''
+        if self._widgetFactory is None:
+            return getattr(Qt.QDockWidget.widget(self), 'model', None)
+        items = (self._pendingWidgetConfig or {}).get(
+            '__itemConfigurations__', {})
+        return items.get('model', self._pendingWidgetModel)
+
     def isCustom(self):
         return self._custom
 
@@ -150,36 +263,48 @@ class DockWidgetPanel(Qt.QDockWidget, TaurusBaseWidget):
 
     def setWidgetFromClassName(self, classname, modulename=None):
         if self.getWidgetClassName() != classname:
+            w = self._createWidgetFromClassName(classname, modulename)
+            if not self.isWidgetCreated():
+                # discard the deferred widget (and its placeholder)
+                self._widgetFactory = None
+                Qt.QDockWidget.widget(self).deleteLater()
+            self.setWidget(w)
+
+    def _createWidgetFromClassName(self, classname, modulename=None):
+        try:
+            klass = TaurusWidgetFactory().getWidgetClass(classname)
+            w = klass()
+        except:
             try:
-                klass = TaurusWidgetFactory().getWidgetClass(classname)
+                if classname is not None and '.' in classname:
+                    mn, classname = classname.rsplit('.', 1)
+                    modulename = ("%s.%s" %
+                                  (modulename or '', mn)).strip('. ')
+                module = __import__(modulename, fromlist=[''])
+                klass = getattr(module, classname)
                 w = klass()
-            except:
-                try:
-                    if classname is not None and '.' in classname:
-                        mn, classname = classname.rsplit('.', 1)
-                        modulename = ("%s.%s" %
-                                      (modulename or '', mn)).strip('. ')
-                    module = __import__(modulename, fromlist=[''])
-                    klass = getattr(module, classname)
-                    w = klass()
-                except Exception, e:
-                    raise RuntimeError(
-                        'Cannot create widget from classname "%s". Reason: %s' % (classname, repr(e)))
-            # set customwidgetmap if necessary
-            if hasattr(w, 'setCustomWidgetMap'):
-                w.setCustomWidgetMap(self._mainwindow.getCustomWidgetMap())
-            self.setWidget(w)
-            wname = "%s-%s" % (str(self.objectName()), str(classname))
-            w.setObjectName(wname)
+            except Exception, e:
+                raise RuntimeError(
+                    'Cannot create widget from classname "%s". Reason: %s' % (classname, repr(e)))
+        # set customwidgetmap if necessary
+        if hasattr(w, 'setCustomWidgetMap'):
+            w.setCustomWidgetMap(self._mainwindow.getCustomWidgetMap())
+        wname = "%s-%s" % (str(self.objectName()), str(classname))
+        w.setObjectName(wname)
+        return w
 
     def getWidgetModuleName(self):
-        w = self.widget()
+        if self._widgetFactory is not None:
+            return self._pendingWidgetClass[1] or ''
+        w = Qt.QDockWidget.widget(self)
         if w is None:
             return ''
         return w.__module__
 
     def getWidgetClassName(self):
-        w = self.widget()
+        if self._widgetFactory is not None:
+            return self._pendingWidgetClass[0] or ''
+        w = Qt.QDockWidget.widget(self)
         if w is None:
             return ''
         return w.__class__.__name__
@@ -187,10 +312,22 @@ class DockWidgetPanel(Qt.QDockWidget, TaurusBaseWidget):
     def applyConfig(self, configdict, depth=-1):
         # create the widget
         try:
-            self.setWidgetFromClassName(configdict.get(
-                'widgetClassName'), modulename=configdict.get('widgetModuleName', None))
-            if isinstance(self.widget(), BaseConfigurableClass):
-                self.widget().applyConfig(configdict['widget'])
+            classname = configdict.get('widgetClassName')
+            modulename = configdict.get('widgetModuleName', None)
+            if not self.isWidgetCreated() or \
+                    Qt.QDockWidget.widget(self) is None:
+                # (re)define the deferred widget and keep its configuration
+                # until it is created
+                if self.getWidgetClassName() != classname:
+                    self.setWidgetFactory(
+                        lambda: self._createWidgetFromClassName(classname,
+                                                                modulename),
+                        classname, modulename)
+                self._pendingWidgetConfig = configdict.get('widget')
+            else:
+                self.setWidgetFromClassName(classname, modulename=modulename)
+                if isinstance(self.widget(), BaseConfigurableClass):
+                    self.widget().applyConfig(configdict['widget'])
         except Exception, e:
             self.info(
                 'Failed to set the widget for this panel. Reason: %s' % repr(e))
@@ -202,7 +339,10 @@ class DockWidgetPanel(Qt.QDockWidget, TaurusBaseWidget):
         configdict = TaurusBaseWidget.createConfig(self, *args, **kwargs)
         configdict['widgetClassName'] = self.getWidgetClassName()
         configdict['widgetModuleName'] = self.getWidgetModuleName()
-        if isinstance(self.widget(), BaseConfigurableClass):
+        if not self.isWidgetCreated():
+            if self._pendingWidgetConfig is not None:
+                configdict['widget'] = self._pendingWidgetConfig
+        elif isinstance(self.widget(), BaseConfigurableClass):
             configdict['widget'] = self.widget().createConfig()
         return configdict
 
@@ -318,7 +458,11 @@ class TaurusGui(TaurusMainWindow):
         self.__initViewMenu()
         self.__initPanelsToolBar()
 
+        t0 = time.time()
         self.loadConfiguration(confname)
+        self._startupTime = time.time() - t0
+        self.info('Configuration loaded in %.2f s', self._startupTime)
+        self.debug('Startup report:\n%s', self.getStartupReport())
 
         # connect the main window itself as a reader/writer of "short messages"
         Qt.qApp.SDM.connectReader("shortMessage", self.onShortMessage)
@@ -344,7 +488,8 @@ class TaurusGui(TaurusMainWindow):
         TaurusMainWindow.closeEvent(self, event)
         for n, panel in self.__panels.items():
             panel.closeEvent(event)
-            panel.widget().closeEvent(event)
+            if panel.isWidgetCreated():
+                panel.widget().closeEvent(event)
             if not event.isAccepted():
                 result = Qt.QMessageBox.question(
                     self, 'Closing error',
@@ -583,7 +728,8 @@ class TaurusGui(TaurusMainWindow):
         try:
             # in case the widget is a Taurus one and does some cleaning when
             # setting model to None
-            panel.widget().setModel(None)
+            if panel.isWidgetCreated():
+                panel.widget().setModel(None)
         except:
             pass
 
@@ -669,6 +815,37 @@ class TaurusGui(TaurusMainWindow):
 
         return panel
 
+    def getPanelCreationTimes(self):
+        '''Returns the time that it took to create the widget of each panel.
+        The value is None for the panels whose widget was given already
+        created and for the deferred panels that have not been shown yet
+
+        :return: (dict<str,float>) panel names and times in seconds
+        '''
+        return dict((n, p.getCreationTime())
+                    for n, p in self.__panels.iteritems())
+
+    def getStartupReport(self):
+        '''Returns a report with the time spent loading the configuration
+        and creating each panel
+
+        :return: (str)
+        '''
+        lines = ['%-40s %10s' % ('Panel', 'Time (s)')]
+        times = sorted(self.getPanelCreationTimes().items(),
+                       key=lambda item: -(item[1] or 0))
+        for name, t in times:
+            if t is not None:
+                status = '%10.3f' % t
+            elif not self.__panels[name].isWidgetCreated():
+                status = '%10s' % 'deferred'
+            else:
+                status = '%10s' % '-'
+            lines.append('%-40s %s' % (name, status))
+        lines.append('%-40s %10.3f' % ('Total (configuration loading)',
+                                       getattr(self, '_startupTime', 0)))
+        return '\n'.join(lines)
+
     def getPanel(self, name):
         '''get a panel object by name
 
@@ -1141,6 +1318,13 @@ class TaurusGui(TaurusMainWindow):
         else:
             POOLINSTRUMENTS = []
 
+        # if required, create the panel widgets only when the panels are
+        # first shown
+        deferred = str(getattr(tauruscustomsettings, 'T_GUI_DEFERRED_PANELS',
+                               True))
+        DEFERRED_PANELS = getattr(conf, 'DEFERRED_PANELS', (self.__getVarFromXML(
+            xmlroot, "DEFERRED_PANELS", deferred).lower() == 'true'))
+
         CONSOLE = getattr(conf, 'CONSOLE', self.__getVarFromXML(
             xmlroot, "CONSOLE", ['ipython']))
         if CONSOLE:
@@ -1166,19 +1350,28 @@ class TaurusGui(TaurusMainWindow):
                     self.splashScreen().showMessage("Creating panel %s" % p.name)
                 except AttributeError:
                     pass
-                w = p.getWidget(sdm=Qt.qApp.SDM, setModel=False)
-                if hasattr(w, 'setCustomWidgetMap'):
-                    w.setCustomWidgetMap(self.getCustomWidgetMap())
-                if p.model is not None:
-                    w.setModel(p.model)
+                if unicode(p.name) in self.__panels:
+                    self.info('Panel with name "%s" already exists' % p.name)
+                    continue
                 if p.instrumentkey is None:
                     instrumentkey = self.IMPLICIT_ASSOCIATION
                 # the pool instruments may change when the pool config changes,
                 # so we do not store their config
                 registerconfig = p not in POOLINSTRUMENTS
                 # create a panel
-                self.createPanel(w, p.name, floating=p.floating, registerconfig=registerconfig,
-                                 instrumentkey=instrumentkey, permanent=True)
+                panel = self.createPanel(None, p.name, floating=p.floating, registerconfig=registerconfig,
+                                         instrumentkey=instrumentkey, permanent=True)
+                panel.setWidgetFactory(
+                    functools.partial(self._createPanelWidget, p),
+                    p.classname, p.modulename, p.model)
+                # panels which write shared data (or whose widget is given
+                # as an object) are always created
+                if not DEFERRED_PANELS or p.sharedDataWrite or \
+                        p.widgetname is not None:
+                    panel.createWidget()
+                else:
+                    # errors in the panel class are still reported now
+                    p.getWidgetClass()
             except Exception, e:
                 msg = 'Cannot create panel %s' % getattr(
                     p, 'name', '__Unknown__')
@@ -1312,6 +1505,15 @@ class TaurusGui(TaurusMainWindow):
             pass
         self.loadSettings(factorySettingsFileName=iniFileName)
 
+    def _createPanelWidget(self, paneldesc):
+        '''creates the widget of a panel from its description'''
+        w = paneldesc.getWidget(sdm=Qt.qApp.SDM, setModel=False)
+        if hasattr(w, 'setCustomWidgetMap'):
+            w.setCustomWidgetMap(self.getCustomWidgetMap())
+        if paneldesc.model is not None:
+            w.setModel(paneldesc.model)
+        return w
+
     def setLockView(self, locked):
         self.setModifiableByUser(not locked)
 
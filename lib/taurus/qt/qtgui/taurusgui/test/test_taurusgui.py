@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for the deferred panels of taurus.qt.qtgui.taurusgui"""
+
+import time
+
+from taurus.external import unittest
+from taurus.external.qt import Qt
+from taurus.qt.qtcore.configuration import BaseConfigurableClass
+from taurus.qt.qtgui.test import BaseWidgetTestCase
+from taurus.qt.qtgui.taurusgui.taurusgui import DockWidgetPanel
+from taurus.qt.qtgui.taurusgui.utils import PanelDescription
+
+
+class _ConfigurableLabel(Qt.QLabel, BaseConfigurableClass):
+    '''A configurable widget which counts its instances'''
+
+    instances = 0
+
+    def __init__(self, parent=None):
+        Qt.QLabel.__init__(self, parent)
+        BaseConfigurableClass.__init__(self)
+        _ConfigurableLabel.instances += 1
+        self.model = None
+        self.registerConfigProperty(self.getText, self.setText, 'text')
+
+    def getText(self):
+        return str(self.text())
+
+
+class DeferredPanelTest(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Tests for the creation of the widget of a DockWidgetPanel when it is
+    first shown
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self._mainwindow = Qt.QMainWindow()
+        self._panel = DockWidgetPanel(None, None, 'panel', self._mainwindow)
+        self._calls = 0
+        _ConfigurableLabel.instances = 0
+        self._panel.setWidgetFactory(self._factory, '_ConfigurableLabel',
+                                     __name__, model='a/b/c')
+
+    def tearDown(self):
+        self._panel.close()
+        self._panel.deleteLater()
+        self._mainwindow.deleteLater()
+        self._app.processEvents()
+        unittest.TestCase.tearDown(self)
+
+    def _factory(self):
+        self._calls += 1
+        w = _ConfigurableLabel()
+        w.setText('created')
+        w.model = 'a/b/c'
+        return w
+
+    def _show(self):
+        self._panel.show()
+        t0 = time.time()
+        while time.time() - t0 < 1. and not self._panel.isWidgetCreated():
+            self._app.processEvents()
+            time.sleep(.01)
+
+    def test_deferred(self):
+        '''Check that the widget is not created until the panel is shown'''
+        panel = self._panel
+        self.assertFalse(panel.isWidgetCreated())
+        self.assertEqual(self._calls, 0)
+        self.assertEqual(panel.getWidgetClassName(), '_ConfigurableLabel')
+        self.assertEqual(panel.getWidgetModuleName(), __name__)
+        self.assertEqual(panel.getWidgetModel(), 'a/b/c')
+        self._show()
+        self.assertTrue(panel.isWidgetCreated())
+        self.assertEqual(self._calls, 1)
+        self.assertTrue(isinstance(panel.widget(), _ConfigurableLabel))
+        self.assertEqual(panel.getWidgetModel(), 'a/b/c')
+        self.assertTrue(panel.getCreationTime() is not None)
+        # showing it again does not create another widget
+        panel.hide()
+        self._show()
+        self.assertEqual(self._calls, 1)
+
+    def test_widget(self):
+        '''Check that widget() creates the widget of a deferred panel'''
+        w = self._panel.widget()
+        self.assertTrue(self._panel.isWidgetCreated())
+        self.assertEqual(str(w.text()), 'created')
+        self.assertTrue(self._panel.widget() is w)
+        self.assertEqual(self._calls, 1)
+
+    def test_config(self):
+        '''Check that the configuration of a panel which was not shown is
+        kept until its widget is created'''
+        panel = self._panel
+        config = panel.createConfig()
+        self.assertFalse(panel.isWidgetCreated())
+        self.assertEqual(config['widgetClassName'], '_ConfigurableLabel')
+        self.assertFalse('widget' in config)
+        # the configuration of a panel which was created
+        other = DockWidgetPanel(None, None, 'other', self._mainwindow)
+        other.setWidgetFactory(self._factory, '_ConfigurableLabel', __name__)
+        other.widget().setText('configured')
+        config = other.createConfig()
+        other.deleteLater()
+        self.assertEqual(self._calls, 1)
+        # applied to a panel which was not shown
+        panel.applyConfig(config)
+        self.assertFalse(panel.isWidgetCreated())
+        self.assertEqual(panel.createConfig()['widget'], config['widget'])
+        self._show()
+        self.assertEqual(str(panel.widget().text()), 'configured')
+        self.assertEqual(panel.createConfig()['widget'], config['widget'])
+
+    def test_config_class(self):
+        '''Check that applying a configuration with another widget class
+        replaces the deferred widget'''
+        config = self._panel.createConfig()
+        config['widgetClassName'] = 'QLabel'
+        config['widgetModuleName'] = 'taurus.external.qt.Qt'
+        self._panel.applyConfig(config)
+        self.assertFalse(self._panel.isWidgetCreated())
+        self.assertEqual(self._panel.getWidgetClassName(), 'QLabel')
+        self.assertEqual(self._panel.getWidgetModel(), None)
+        self.assertTrue(isinstance(self._panel.widget(), Qt.QLabel))
+        self.assertEqual(self._calls, 0)
+
+    def test_factory_error(self):
+        '''Check that a failing factory is reported in the panel'''
+        def factory():
+            raise RuntimeError('broken factory')
+        self._panel.setWidgetFactory(factory, 'Broken')
+        self._show()
+        self.assertTrue(self._panel.isWidgetCreated())
+        text = str(self._panel.widget().text())
+        self.assertTrue('Cannot create panel panel' in text, text)
+        self.assertTrue('broken factory' in text, text)
+
+    def test_description(self):
+        '''Check that the description of a deferred panel does not create
+        its widget'''
+        desc = PanelDescription.fromPanel(self._panel)
+        self.assertFalse(self._panel.isWidgetCreated())
+        self.assertEqual(desc.name, 'panel')
+        self.assertEqual(desc.classname, '_ConfigurableLabel')
+        self.assertEqual(desc.model, 'a/b/c')
+        # the model in the pending configuration is used if any
+        config = self._panel.createConfig()
+        config['widget'] = {'__itemConfigurations__': {'model': 'd/e/f'}}
+        self._panel.applyConfig(config)
+        self.assertEqual(PanelDescription.fromPanel(self._panel).model,
+                         'd/e/f')
+        self.assertEqual(self._calls, 0)
+
+
+class PanelDescriptionTest(unittest.TestCase):
+
+    '''Tests for the widget class of a PanelDescription, which is checked
+    at startup for the deferred panels'''
+
+    def test_class(self):
+        '''Check that the class is found without creating the widget'''
+        _ConfigurableLabel.instances = 0
+        desc = PanelDescription('p', classname='_ConfigurableLabel',
+                                modulename=__name__)
+        self.assertTrue(desc.getWidgetClass() is _ConfigurableLabel)
+        self.assertEqual(_ConfigurableLabel.instances, 0)
+
+    def test_errors(self):
+        '''Check that unknown classes and modules raise'''
+        desc = PanelDescription('p', classname='_NoSuchWidget',
+                                modulename=__name__)
+        self.assertRaises(AttributeError, desc.getWidgetClass)
+        desc = PanelDescription('p', classname='_ConfigurableLabel',
+                                modulename='taurus._no_such_module')
+        self.assertRaises(ImportError, desc.getWidgetClass)
+        desc = PanelDescription('p', classname='_NoSuchWidget')
+        self.assertRaises(KeyError, desc.getWidgetClass)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -198,6 +198,17 @@ class TaurusGuiComponentDescription(object):
     def setModel(self, model):
         self._model = model
 
+    def getWidgetClass(self):
+        ''' Returns the class of the widget to be inserted in the panel,
+        importing its module if needed but without instantiating it
+
+        :return: (class) the widget class
+        '''
+        if self.modulename is None:
+            return TaurusWidgetFactory().getWidgetClass(self.classname)
+        module = __import__(self.modulename, fromlist=[''])
+        return getattr(module, self.classname)
+
     def getWidget(self, sdm=None, setModel=True):
         ''' Returns the widget to be inserted in the panel
 
@@ -208,16 +219,11 @@ class TaurusGuiComponentDescription(object):
         :return: (QWidget) a new widget instance matching the description
         '''
         # instantiate the widget
-        if self.modulename is None:
-            klass = TaurusWidgetFactory().getWidgetClass(self.classname)
-            w = klass()
-        else:
+        if self.modulename is not None and self.classname is None:
             module = __import__(self.modulename, fromlist=[''])
-            if self.classname is None:
-                w = getattr(module, self.widgetname)
-            else:
-                klass = getattr(module, self.classname)
-                w = klass()
+            w = getattr(module, self.widgetname)
+        else:
+            w = self.getWidgetClass()()
         # set the model if setModel is True
         if self.model is not None and setModel:
             w.setModel(self.model)
@@ -380,7 +386,8 @@ class PanelDescription(TaurusGuiComponentDescription):
         floating = panel.isFloating()
         sharedDataWrite = None
         sharedDataRead = None
-        model = getattr(panel.widget(), 'model', None)
+        # the widget of a deferred panel is not created
+        model = panel.getWidgetModel()
         if model is None or isinstance(model, basestring):
             pass
         elif hasattr(model, '__iter__'):
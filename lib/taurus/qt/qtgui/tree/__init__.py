@@ -27,9 +27,8 @@
 
 __docformat__ = 'restructuredtext'
 
-from .qtree import *
-from .taurustree import *
-from .taurusdbtree import *
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['qtree', 'taurustree', 'taurusdbtree'])
 
 # taurusdevicetree should be removed from taurus or merged with taurusdbtree
 # from .taurusdevicetree import *
@@ -37,6 +37,8 @@ __all__ = ["TaurusDevTree", "TaurusSearchTree", "TaurusDevTreeOptions"]
 
 import time
 import os
+import re
+import threading
 import traceback
 from functools import partial
 import PyTango  # to change!!
@@ -114,7 +116,11 @@ class TaurusTreeNodeContainer(object):
                 f.setItalic(True)
             item.setFont(0, f)
         item.parentTree = self  # hook used to call external methods with item as single argument
-        self.item_index[value.strip().split()[0]] = item
+        key = value.strip().split()[0]
+        self.item_index[key] = item
+        if key.lower() not in self._search_index:
+            self._search_index[key.lower()] = None
+            self._last_search = None
         try:
             icon = self.getNodeIcon(item)
             if icon:
@@ -337,12 +343,16 @@ class TaurusDevTree(TaurusTreeNodeContainer, Qt.QTreeWidget, TaurusBaseWidget):
     )
 
     TRACE_ALL = False
+    #: If True, the children of a node are only created when it is expanded
+    LAZY_LOADING = True
 
     refreshTree = Qt.pyqtSignal()
     nodeFound = Qt.pyqtSignal()
     deviceSelected = Qt.pyqtSignal('QString')
     addAttrSelected = Qt.pyqtSignal('QStringList')
     removeAttrSelected = Qt.pyqtSignal('QStringList')
+    # (node, device, attributes dict, error) sent by the attribute queries
+    _attributesReceived = Qt.pyqtSignal(object, object, object, object)
 
     def __init__(self, parent=None, designMode=False):
         name = "TaurusDevTree"
@@ -367,6 +377,12 @@ class TaurusDevTree(TaurusTreeNodeContainer, Qt.QTreeWidget, TaurusBaseWidget):
         # NOTE: as several nodes may share the same name this list will be
         # different from item_index.values()!!!
         self.item_list = set()
+        # {lowercase node name: path of dictionary keys to the node or None
+        # if the node is already created}. It includes the nodes not yet
+        # created by LAZY_LOADING
+        self._search_index = {}
+        # (regexp, exclude, matching keys) of the last search
+        self._last_search = None
         self.setSelectionMode(self.ExtendedSelection)
 
         self.ContextMenu = []
@@ -387,6 +403,8 @@ class TaurusDevTree(TaurusTreeNodeContainer, Qt.QTreeWidget, TaurusBaseWidget):
         # Signal
         self.itemclicked.connect(self.deviceClicked)
         self.nodeFound.connect(self.expandNode)
+        self.itemExpanded.connect(self.fetchMore)
+        self._attributesReceived.connect(self._addAttrsToNode)
         self.setDragDropMode(Qt.QAbstractItemView.DragDrop)
         self.setModifiableByUser(True)
         self.setModelInConfig(False)  # We store Filters instead!
@@ -665,10 +683,11 @@ class TaurusDevTree(TaurusTreeNodeContainer, Qt.QTreeWidget, TaurusBaseWidget):
             self.clear()
         self.dictionary = diction
         if len(diction):
+            self.indexNodeTree(diction)
             self.setNodeTree(self, diction, alias=(
                 self.getShowAlias() or K < self.getMaxDevices() * 20))
             # Auto-Expand caused problems when loading filters from QSettings
-            if 0 < len(self.item_list) < self.getMaxDevices():
+            if 0 < len(self._search_index) < self.getMaxDevices():
                 self.expandAll(queue=False)
 
     def setNodeTree(self, parent, diction, alias=False):
@@ -687,14 +706,65 @@ class TaurusDevTree(TaurusTreeNodeContainer, Qt.QTreeWidget, TaurusBaseWidget):
             text = '%s (%s)' % (node, dev_alias) if dev_alias else node
             if diction[node] and any(diction[node]):
                 item = self.createItem(parent, node, text)
-                self.setNodeTree(item, diction[node], alias)
+                if self.LAZY_LOADING:
+                    item.pendingChildren = (diction[node], alias)
+                    item.setChildIndicatorPolicy(item.ShowIndicator)
+                else:
+                    self.setNodeTree(item, diction[node], alias)
             else:
                 item = self.createItem(parent, node, text)
 
+    def indexNodeTree(self, diction, path=()):
+        """
+        Adds the names in a dictionary like the ones passed to setNodeTree
+        to the search index, so that getMatchingNodes can find the nodes that
+        are not created yet
+        """
+        if not hasattr(diction, 'keys'):
+            diction = dict.fromkeys(diction)
+        self._last_search = None
+        for node, children in diction.iteritems():
+            key = str(node).strip().split()[0].lower()
+            if key not in self._search_index:
+                self._search_index[key] = path + (node,)
+            if children and any(children):
+                self.indexNodeTree(children, path + (node,))
+
+    def canFetchMore(self, node):
+        """ Returns True if the children of node have not been created yet """
+        return bool(getattr(node, 'pendingChildren', None))
+
+    def fetchMore(self, node):
+        """ Creates the children of a node loaded with LAZY_LOADING """
+        if not self.canFetchMore(node):
+            return
+        diction, alias = node.pendingChildren
+        node.pendingChildren = None
+        self.setNodeTree(node, diction, alias)
+        node.setChildIndicatorPolicy(node.DontShowIndicatorWhenChildless)
+
+    def fetchNode(self, key):
+        """ Returns the node named key, creating it (and its parents) if
+        it was not loaded yet """
+        node = self.item_index.get(key, None)
+        if node is not None:
+            return node
+        path = self._search_index.get(str(key).lower(), None)
+        if not path:
+            return None
+        for name in path[:-1]:
+            parent = self.item_index.get(str(name).strip().split()[0], None)
+            if parent is None:
+                return None
+            self.fetchMore(parent)
+        return self.item_index.get(key, None)
+
     def clear(self):
         while not self.Expander.getQueue().empty():
             self.Expander.getQueue().get()
         self.item_index.clear()
+        self._search_index.clear()
+        self._last_search = None
         while self.item_list:
             self.item_list.pop()
         Qt.QTreeWidget.clear(self)
@@ -725,8 +795,9 @@ class TaurusDevTree(TaurusTreeNodeContainer, Qt.QTreeWidget, TaurusBaseWidget):
                 t for t in targets if t.startswith('%s/%s/' % (d, f)))) for f in families)
         return result
 
-    def addAttrToDev(self, my_device, expert=False, allow_types=None):
-        """ This command returns the list of attributes of a given device applying display level and type filters.
+    def getDeviceAttributes(self, my_device, expert=False, allow_types=None):
+        """ Returns a dict with the attributes of a given device applying display level and type filters.
+        It does not interact with the GUI, so it can be called from any thread.
         @argin expert If False only PyTango.DispLevel.OPERATOR attributes are displayed
         @argin allow_types Only those types included in the list will be displayed (e.g. may be restricted to numeric types only)
         """
@@ -734,40 +805,70 @@ class TaurusDevTree(TaurusTreeNodeContainer, Qt.QTreeWidget, TaurusBaseWidget):
                          PyTango.DevULong, PyTango.DevShort, PyTango.DevUShort, PyTango.DevBoolean, PyTango.DevState]
         allow_types = allow_types or [PyTango.DevString] + numeric_types
         dct = {}
+        proxy = PyTango.DeviceProxy(my_device)
+        timeout = proxy.get_timeout_millis()
+        proxy.set_timeout_millis(50)
+        proxy.ping()
+        list_attr = proxy.attribute_list_query()
+        proxy.set_timeout_millis(timeout)
+
+        for aname, my_attr in sorted([(a.name, a) for a in list_attr]):
+            if allow_types and my_attr.data_type not in allow_types:
+                continue
+            if not expert and my_attr.disp_level == PyTango.DispLevel.EXPERT:
+                continue
+            label = aname == my_attr.label and aname.lower(
+            ) or "%s (%s)" % (aname.lower(), my_attr.label)
+            dct[str(my_device).lower() + '/' + label] = 0
+        return dct
+
+    def showDeviceError(self, my_device, error):
+        self.warning('addAttrToDev(%s): %s' % (my_device, str(error)))
+        if isinstance(error, PyTango.DevFailed):
+            msg = '%s not available' % my_device
+        else:
+            msg = str(error)
+        qmsg = Qt.QMessageBox(Qt.QMessageBox.Critical, '%s Error' %
+                              my_device, msg, Qt.QMessageBox.Ok, self)
+        qmsg.show()
+
+    def addAttrToDev(self, my_device, expert=False, allow_types=None):
+        """ This command returns the list of attributes of a given device applying display level and type filters.
+        @argin expert If False only PyTango.DispLevel.OPERATOR attributes are displayed
+        @argin allow_types Only those types included in the list will be displayed (e.g. may be restricted to numeric types only)
+        """
         self.trace('In addAttrToDev(%s)' % my_device)
         try:
-            proxy = PyTango.DeviceProxy(my_device)
-            timeout = proxy.get_timeout_millis()
-            proxy.set_timeout_millis(50)
-            proxy.ping()
-            list_attr = proxy.attribute_list_query()
-            proxy.set_timeout_millis(timeout)
-
-            for aname, my_attr in sorted([(a.name, a) for a in list_attr]):
-                if allow_types and my_attr.data_type not in allow_types:
-                    continue
-                if not expert and my_attr.disp_level == PyTango.DispLevel.EXPERT:
-                    continue
-                label = aname == my_attr.label and aname.lower(
-                ) or "%s (%s)" % (aname.lower(), my_attr.label)
-                dct[str(my_device).lower() + '/' + label] = 0
-        except PyTango.DevFailed, e:
-            self.warning('addAttrToDev(%s): %s' % (my_device, str(e)))
-            qmsg = Qt.QMessageBox(Qt.QMessageBox.Critical, '%s Error' %
-                                  my_device, '%s not available' % my_device, Qt.QMessageBox.Ok, self)
-            qmsg.show()
+            return self.getDeviceAttributes(my_device, expert, allow_types)
         except Exception, e:
-            self.warning('addAttrToDev(%s): %s' % (my_device, str(e)))
-            qmsg = Qt.QMessageBox(Qt.QMessageBox.Critical, '%s Error' %
-                                  my_device, str(e), Qt.QMessageBox.Ok, self)
-            qmsg.show()
-        return dct
+            self.showDeviceError(my_device, e)
+            return {}
 
     def addAttrToNode(self, node=None, full=False):
+        """ Adds the attributes of the device to its node. The attributes
+        are queried in a background thread and the node is updated when
+        they are received """
         node = node or self.currentItem()
         dev = self.getNodeDeviceName(node)
         self.trace('In addAttrToNode(%s)' % dev)
-        attrs = self.addAttrToDev(dev)
+
+        def query():
+            try:
+                attrs, error = self.getDeviceAttributes(dev), None
+            except Exception, e:
+                attrs, error = {}, e
+            self._attributesReceived.emit(node, (dev, full), attrs, error)
+
+        thread = threading.Thread(target=query, name='DevTreeAttrs')
+        thread.daemon = True
+        thread.start()
+
+    def _addAttrsToNode(self, node, args, attrs, error):
+        dev, full = args
+        if error is not None:
+            self.showDeviceError(dev, error)
+        if node not in self.item_list:
+            return  # the tree was cleared meanwhile
         children = [str(node.child(i).text(0)).lower()
                     for i in range(node.childCount())]
         for aname in sorted(attrs):
@@ -816,28 +917,42 @@ class TaurusDevTree(TaurusTreeNodeContainer, Qt.QTreeWidget, TaurusBaseWidget):
     def getNodeList(self):
         return self.item_index.keys()
 
-    def getMatchingNodes(self, regexp, limit=0, all=False, exclude=None):
-        """ It returns all nodes matching the given expression. """
+    def getMatchingKeys(self, regexp, limit=0, all=False, exclude=None):
+        """ It returns the names of all nodes matching the given expression,
+        including the ones not created yet. If the expression refines the
+        previous one only the previous results are checked again. """
         result, regexp = [], str(regexp).lower()
         exclude = exclude or []
-        self.trace('In TauDevTree.getMatchingNodes(%s,%s,%s,%s)' %
-                   (regexp, limit, all, exclude))
         if not all:
-            node = self.item_index.get(regexp, None)
-            if node is not None:
-                return [node]
-        regexp = re.compile(extend_regexp(regexp))
-        for k, node in self.item_index.iteritems():
-            nname = self.getNodeText(node, full=True).lower()
-            if (regexp.match(k) or regexp.match(nname)) and \
-                    (not exclude or not any(re.match(x.lower(), y) for x in exclude for y in (k.lower(), nname))):
-                result.append(node)
+            if regexp in self._search_index:
+                return [regexp]
+        candidates = self._search_index
+        if self._last_search and re.match('^[\w/\-]*$', regexp):
+            last, last_exclude, last_result = self._last_search
+            if regexp.startswith(last) and last_exclude == list(exclude):
+                candidates = last_result
+        cregexp = re.compile(extend_regexp(regexp))
+        for k in candidates:
+            node = self.item_index.get(k, None)
+            nname = self.getNodeText(node, full=True).lower() if node else k
+            if (cregexp.match(k) or cregexp.match(nname)) and \
+                    (not exclude or not any(re.match(x.lower(), y) for x in exclude for y in (k, nname))):
+                result.append(k)
                 if not all and len(result) == 1:
                     break
                 if limit and len(result) >= limit:
                     break
+        if all and not limit:
+            self._last_search = (regexp, list(exclude), result)
         return result
 
+    def getMatchingNodes(self, regexp, limit=0, all=False, exclude=None):
+        """ It returns all nodes matching the given expression. """
+        self.trace('In TauDevTree.getMatchingNodes(%s,%s,%s,%s)' %
+                   (regexp, limit, all, exclude))
+        keys = self.getMatchingKeys(regexp, limit, all, exclude)
+        return [n for n in map(self.fetchNode, keys) if n is not None]
+
     def getSelectedNodes(self):
         return self.selectedItems()
 
@@ -948,15 +1063,16 @@ class TaurusDevTree(TaurusTreeNodeContainer, Qt.QTreeWidget, TaurusBaseWidget):
             return
         try:
             t0 = time.time()
-            nodes = self.getMatchingNodes(regexp, all=True, exclude=exclude)
-            if len(nodes) > 150:
+            keys = self.getMatchingKeys(regexp, all=True, exclude=exclude)
+            if len(keys) > 150:
                 v = Qt.QMessageBox.warning(None, 'Device Tree Search',
                                            'Your search matches too many devices (%d) and may slow down the application.\nDo you want to continue?' % len(
-                                               nodes),
+                                               keys),
                                            Qt.QMessageBox.Ok | Qt.QMessageBox.Cancel)
                 if v == Qt.QMessageBox.Cancel:
                     self.debug('Search cancelled by user.')
                     return
+            nodes = [n for n in map(self.fetchNode, keys) if n is not None]
             if nodes:
                 # It's good to have first node matched to be selected fast
                 if select:
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for the lazy population of TaurusDevTree"""
+
+from taurus.external import unittest
+from taurus.qt.qtgui.test import BaseWidgetTestCase
+from taurus.qt.qtgui.tree.taurusdevicetree import TaurusDevTree
+
+TREE = {'sys': {'tg_test': {'sys/tg_test/1': None, 'sys/tg_test/2': None},
+                'database': {'sys/database/2': None}},
+        'lt01': {'vc': {'lt01/vc/ip-01': None, 'lt01/vc/ccg-01': None}}}
+
+
+class TaurusDevTreeLazyTest(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Tests for the lazy population and the search index of TaurusDevTree
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = TaurusDevTree
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        # neither device aliases nor auto-expansion
+        self._widget.setMaxDevices(1)
+        self._widget.setTree(TREE)
+
+    def _created(self):
+        return sorted(self._widget.item_index.keys())
+
+    def test_lazy(self):
+        '''Check that only the top level nodes are created'''
+        tree = self._widget
+        self.assertEqual(self._created(), ['lt01', 'sys'])
+        node = tree.item_index['sys']
+        self.assertTrue(tree.canFetchMore(node))
+        self.assertEqual(node.childCount(), 0)
+        self.assertEqual(node.childIndicatorPolicy(), node.ShowIndicator)
+
+    def test_expand(self):
+        '''Check that the children of a node are created when expanded'''
+        tree = self._widget
+        node = tree.item_index['sys']
+        node.setExpanded(True)
+        self.assertFalse(tree.canFetchMore(node))
+        self.assertEqual(node.childCount(), 2)
+        self.assertEqual(self._created(),
+                         ['database', 'lt01', 'sys', 'tg_test'])
+        # fetching again does nothing
+        tree.fetchMore(node)
+        self.assertEqual(node.childCount(), 2)
+        tree.item_index['tg_test'].setExpanded(True)
+        self.assertTrue('sys/tg_test/1' in tree.item_index)
+        self.assertFalse('lt01/vc/ip-01' in tree.item_index)
+
+    def test_eager(self):
+        '''Check that all the nodes are created without LAZY_LOADING'''
+        tree = self._widget
+        tree.LAZY_LOADING = False
+        tree.setTree(TREE, clear=True)
+        self.assertEqual(len(tree.item_index), 10)
+        self.assertFalse(tree.canFetchMore(tree.item_index['sys']))
+
+    def test_matching_keys(self):
+        '''Check that the search finds the nodes not created yet, without
+        creating them'''
+        tree = self._widget
+        self.assertEqual(tree.getMatchingKeys('sys/tg_test/2'),
+                         ['sys/tg_test/2'])
+        self.assertEqual(sorted(tree.getMatchingKeys('sys/*', all=True)),
+                         ['sys/database/2', 'sys/tg_test/1',
+                          'sys/tg_test/2'])
+        self.assertEqual(sorted(tree.getMatchingKeys('ip', all=True)),
+                         ['lt01/vc/ip-01'])
+        self.assertEqual(sorted(tree.getMatchingKeys(
+            'sys/*', all=True, exclude=['sys/database.*'])),
+            ['sys/tg_test/1', 'sys/tg_test/2'])
+        self.assertEqual(tree.getMatchingKeys('sys/*', limit=2, all=True),
+                         tree.getMatchingKeys('sys/*', all=True)[:2])
+        self.assertEqual(tree.getMatchingKeys('foo', all=True), [])
+        self.assertEqual(self._created(), ['lt01', 'sys'])
+
+    def test_refined_search(self):
+        '''Check that refining a search gives the same result as a new one'''
+        tree = self._widget
+        tree.getMatchingKeys('lt01', all=True)
+        refined = tree.getMatchingKeys('lt01/vc/c', all=True)
+        tree._last_search = None
+        self.assertEqual(refined, tree.getMatchingKeys('lt01/vc/c', all=True))
+        # a new node invalidates the previous search
+        tree.getMatchingKeys('sys/tg_test', all=True)
+        tree.indexNodeTree({'sys': {'tg_test': {'sys/tg_test/3': None}}})
+        self.assertTrue('sys/tg_test/3' in
+                        tree.getMatchingKeys('sys/tg_test/', all=True))
+
+    def test_matching_nodes(self):
+        '''Check that the nodes found (and their parents) are created'''
+        tree = self._widget
+        nodes = tree.getMatchingNodes('lt01/vc/ccg-01')
+        self.assertEqual([tree.getNodeText(n) for n in nodes],
+                         ['lt01/vc/ccg-01'])
+        self.assertEqual(tree.getNodeText(nodes[0].parent()), 'vc')
+        self.assertTrue('sys/tg_test/1' not in tree.item_index)
+
+    def test_find(self):
+        '''Check that findInTree selects a node not created yet'''
+        tree = self._widget
+        tree.findInTree('sys/tg_test/2', queue=False)
+        self.assertEqual(tree.getNodeText(tree.currentItem()),
+                         'sys/tg_test/2')
+        self.assertTrue(tree.item_index['tg_test'].isExpanded())
+
+    def test_clear(self):
+        '''Check that clearing the tree empties the search index'''
+        tree = self._widget
+        tree.clear()
+        self.assertEqual(tree.getMatchingKeys('sys/*', all=True), [])
+        self.assertEqual(tree.fetchNode('sys/tg_test/1'), None)
+
+
+if __name__ == "__main__":
+    unittest.main()
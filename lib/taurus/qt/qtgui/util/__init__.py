@@ -28,11 +28,8 @@ configuration, actions."""
 
 __docformat__ = 'restructuredtext'
 
-from .taurusactionfactory import *
-from .taurusaction import *
-from .tauruscolor import *
-from .tauruswidgetfactory import *
-from .taurusscreenshot import *
-from .qdraganddropdebug import *
-from .ui import *
-from .validator import *
+from taurus.core.util.lazymodule import LazyModule as _LazyModule
+_LazyModule.install(__name__, ['taurusactionfactory', 'taurusaction',
+                               'tauruscolor', 'tauruswidgetfactory',
+                               'taurusscreenshot', 'qdraganddropdebug', 'ui',
+                               'validator'])
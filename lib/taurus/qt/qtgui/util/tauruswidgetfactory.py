@@ -33,6 +33,10 @@ __docformat__ = 'restructuredtext'
 
 import imp
 import os.path
+import sys
+import json
+import hashlib
+import importlib
 
 from taurus.external.qt import Qt
 
@@ -67,6 +71,15 @@ def getWidgetsOfType(widget, class_or_type_or_tuple):
     return widgets
 
 
+#: version of the format of the widget catalogue cache
+CATALOGUE_VERSION = 1
+
+
+def _get_catalogue_filename():
+    return os.path.join(os.path.expanduser('~'), '.taurus',
+                        'widget_catalogue.json')
+
+
 class TaurusWidgetFactory(Singleton, Logger):
     """The TaurusWidgetFactory is a utility class that provides information
     about all Qt widgets (Taurus and non Taurus) that are found in the
@@ -78,7 +91,15 @@ class TaurusWidgetFactory(Singleton, Logger):
         from taurus.qt.qtgui.util import TaurusWidgetFactory
 
         wf = TaurusWidgetFactory()
-        print wf.getTaurusWidgetClassNames()"""
+        print wf.getTaurusWidgetClassNames()
+
+    Finding the widgets requires importing all the taurus widget modules, so
+    the resulting catalogue (class name, package and whether it is a taurus
+    widget) is cached in ~/.taurus/widget_catalogue.json and only rebuilt
+    when a module of the inspected packages (or of the TAURUSQTDESIGNERPATH
+    directories) changes. The widget classes are only imported when they are
+    requested (see the WIDGET_CATALOGUE_CACHE setting in
+    :mod:`taurus.tauruscustomsettings`)."""
 
     skip_modules = ('widget', 'util', 'qtdesigner', 'uic', 'resource')
 
@@ -90,11 +111,123 @@ class TaurusWidgetFactory(Singleton, Logger):
         name = self.__class__.__name__
         self.call__init__(Logger, name)
 
+        self._classes = {}
+        self._catalogue = self._loadCatalogue()
+
+    def _getPackagePath(self):
         path = os.path.dirname(os.path.abspath(__file__))
-        path, tail = os.path.split(path)
-        self._taurus_widgets, self._qt_widgets = self._buildWidgets(
-            'taurus.qt.qtgui', path)
-        self._addExtraTaurusWidgets(self._taurus_widgets, self._qt_widgets)
+        return os.path.dirname(path)
+
+    def _getDesignerPaths(self):
+        designer_path = os.environ.get('TAURUSQTDESIGNERPATH')
+        if designer_path is None:
+            return []
+        return [os.path.abspath(p)
+                for p in designer_path.split(os.path.pathsep)]
+
+    def _getSourcesKey(self):
+        """returns a hash of the names and modification times of the modules
+        from which the catalogue is built"""
+        from taurus.external.qt import getQtName
+        key = hashlib.sha1(repr((CATALOGUE_VERSION, sys.version_info[:2],
+                                 getQtName(), str(Qt.qVersion()))))
+
+        def add_dir(path, recursive):
+            try:
+                elems = sorted(os.listdir(path))
+            except OSError:
+                return
+            for elem in elems:
+                abs_elem = os.path.join(path, elem)
+                if elem.endswith('.py'):
+                    key.update('%s %r\n' % (abs_elem,
+                                            os.path.getmtime(abs_elem)))
+                elif recursive and not elem.startswith('.') and \
+                        elem not in self.skip_modules and \
+                        os.path.isdir(abs_elem):
+                    add_dir(abs_elem, True)
+
+        add_dir(self._getPackagePath(), True)
+        for path in self._getDesignerPaths():
+            add_dir(path, False)
+        return key.hexdigest()
+
+    def _loadCatalogue(self):
+        """returns the cached catalogue if it is up to date. Otherwise it
+        builds the catalogue and caches it"""
+        from taurus import tauruscustomsettings
+        cache = getattr(tauruscustomsettings, 'WIDGET_CATALOGUE_CACHE', True)
+        if not cache:
+            return self._buildCatalogue()
+        key = self._getSourcesKey()
+        catalogue = self._readCatalogue(key)
+        if catalogue is None:
+            catalogue = self._buildCatalogue()
+            self._writeCatalogue(key, catalogue)
+        return catalogue
+
+    def _readCatalogue(self, key):
+        filename = _get_catalogue_filename()
+        if not os.path.exists(filename):
+            return None
+        try:
+            with open(filename) as f:
+                data = json.load(f)
+            if data.get('version') != CATALOGUE_VERSION or \
+                    data.get('key') != key:
+                self.debug('Ignoring outdated widget catalogue %s', filename)
+                return None
+            catalogue = {}
+            for name, (package, is_taurus, source) in \
+                    data['widgets'].iteritems():
+                if source is not None:
+                    source = tuple(map(str, source))
+                catalogue[str(name)] = str(package), is_taurus, source
+            return catalogue
+        except Exception:
+            self.debug('Cannot read widget catalogue %s', filename,
+                       exc_info=1)
+            return None
+
+    def _writeCatalogue(self, key, catalogue):
+        filename = _get_catalogue_filename()
+        data = dict(version=CATALOGUE_VERSION, key=key, widgets=catalogue)
+        tmpname = '%s.%d.tmp' % (filename, os.getpid())
+        try:
+            if not os.path.exists(os.path.dirname(filename)):
+                os.makedirs(os.path.dirname(filename))
+            with open(tmpname, 'w') as f:
+                json.dump(data, f)
+            os.rename(tmpname, filename)
+        except Exception:
+            self.debug('Cannot write widget catalogue %s', filename,
+                       exc_info=1)
+            if os.path.exists(tmpname):
+                os.remove(tmpname)
+
+    def _buildCatalogue(self):
+        """imports all the widget modules and returns a dictionary of
+        class name -> (package, is taurus widget, source) where source is
+        None or the (directory, module name) of the TAURUSQTDESIGNERPATH
+        module providing the class"""
+        self.debug('Building widget catalogue')
+        taurus_ret, qt_ret = self._buildWidgets('taurus.qt.qtgui',
+                                                self._getPackagePath())
+        sources = {}
+        self._addExtraTaurusWidgets(taurus_ret, qt_ret, sources)
+        catalogue = {}
+        for name, (package, klass) in qt_ret.iteritems():
+            catalogue[name] = package, name in taurus_ret, sources.get(name)
+            self._classes[name] = klass
+        return catalogue
+
+    def refresh(self):
+        """Rebuilds the widget catalogue (and its cache)"""
+        self._classes = {}
+        self._catalogue = self._buildCatalogue()
+        from taurus import tauruscustomsettings
+        if getattr(tauruscustomsettings, 'WIDGET_CATALOGUE_CACHE', True):
+            self._writeCatalogue(self._getSourcesKey(), self._catalogue)
 
     def _buildWidgets(self, module_name, path, recursive=True):
         import taurus.qt.qtgui.base
@@ -116,7 +249,7 @@ class TaurusWidgetFactory(Singleton, Logger):
                 try:
                     attr = getattr(m, dir_name)
                     if issubclass(attr, Qt.QWidget):
-                        package = m.__package__
+                        package = m.__package__ or module_name
                         qt_ret[dir_name] = package, attr
                         if issubclass(attr, taurus.qt.qtgui.base.TaurusBaseWidget):
                             taurus_ret[dir_name] = package, attr
@@ -140,15 +273,13 @@ class TaurusWidgetFactory(Singleton, Logger):
                 qt_ret.update(new_qt_ret)
         return taurus_ret, qt_ret
 
-    def _addExtraTaurusWidgets(self, taurus_ret, qt_widgets):
-        designer_path = os.environ.get('TAURUSQTDESIGNERPATH')
-        if designer_path is None:
-            return taurus_ret
-        designer_path = designer_path.split(os.path.pathsep)
-        for path in designer_path:
-            self._addExtraTaurusWidgetsPath(taurus_ret, qt_widgets, path)
+    def _addExtraTaurusWidgets(self, taurus_ret, qt_widgets, sources=None):
+        for path in self._getDesignerPaths():
+            self._addExtraTaurusWidgetsPath(taurus_ret, qt_widgets, path,
+                                            sources)
 
-    def _addExtraTaurusWidgetsPath(self, taurus_ret, qt_widgets, path):
+    def _addExtraTaurusWidgetsPath(self, taurus_ret, qt_widgets, path,
+                                   sources=None):
         self.debug("Trying extra taurus widgets in %s", path)
         path = os.path.abspath(path)
         if not os.path.isdir(path):
@@ -183,30 +314,93 @@ class TaurusWidgetFactory(Singleton, Logger):
                             qt_info = attr.getQtDesignerPluginInfo()
                             taurus_ret[dir_name] = qt_info['module'], attr
                             qt_widgets[dir_name] = qt_info['module'], attr
+                            if sources is not None:
+                                sources[dir_name] = path, m_name
                             self.debug("registered taurus widget %s", dir_name)
                 except Exception, e:
                     pass
 
+    def _importWidgetClass(self, name):
+        package, _, source = self._catalogue[name]
+        if source is None:
+            module = importlib.import_module(package)
+        else:
+            path, m_name = source
+            module = sys.modules.get(m_name)
+            if module is None:
+                f, fname, data = imp.find_module(m_name, [path])
+                try:
+                    module = imp.load_module(m_name, f, fname, data)
+                finally:
+                    if f is not None:
+                        f.close()
+        return getattr(module, name)
+
+    def _getWidgets(self, taurus_only=False):
+        ret = {}
+        for name, (package, is_taurus, _) in self._catalogue.iteritems():
+            if taurus_only and not is_taurus:
+                continue
+            try:
+                ret[name] = package, self.getWidgetClass(name)
+            except KeyError:
+                pass
+        return ret
+
     def getWidgets(self):
-        return self._qt_widgets
+        return self._getWidgets()
 
     def getTaurusWidgets(self):
-        return self._taurus_widgets
+        return self._getWidgets(taurus_only=True)
 
     def getWidgetClassNames(self):
-        return self._qt_widgets.keys()
+        return self._catalogue.keys()
 
     def getWidgetClasses(self):
-        return [klass for mod_name, klass in self._qt_widgets.values()]
+        return [klass for mod_name, klass in self.getWidgets().values()]
 
     def getWidgetClass(self, name):
-        return self._qt_widgets[name][1]
+        """Returns the widget class with the given name, importing it if
+        needed.
+
+        :param name: (str) the class name
+
+        :return: (class) the widget class
+
+        :raises: KeyError if there is no widget with that name (or if it
+                 cannot be imported)
+        """
+        klass = self._classes.get(name)
+        if klass is None:
+            try:
+                klass = self._importWidgetClass(name)
+            except KeyError:
+                raise
+            except Exception:
+                self.debug('Cannot import widget %s', name, exc_info=1)
+                raise KeyError(name)
+            self._classes[name] = klass
+        return klass
 
     def getTaurusWidgetClassNames(self):
-        return self._taurus_widgets.keys()
+        return [name for name, (_, is_taurus, _) in
+                self._catalogue.iteritems() if is_taurus]
 
     def getTaurusWidgetClasses(self):
-        return [klass for mod_name, klass in self._taurus_widgets.values()]
+        return [klass for mod_name, klass in self.getTaurusWidgets().values()]
 
     def getTaurusWidgetClass(self, name):
-        return self._taurus_widgets.get(name)[1]
+        if not self.isTaurusWidget(name):
+            raise KeyError(name)
+        return self.getWidgetClass(name)
+
+    def isTaurusWidget(self, name):
+        """Returns True if the given class name corresponds to a taurus
+        widget (without importing it)
+
+        :param name: (str) the class name
+
+        :return: (bool)
+        """
+        entry = self._catalogue.get(name)
+        return entry is not None and entry[1]
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for taurus.qt.qtgui.util.tauruswidgetfactory"""
+
+import os
+import shutil
+import tempfile
+
+from taurus.external import unittest
+from taurus.external.qt import Qt
+from taurus.qt.qtgui.util import tauruswidgetfactory
+from taurus.qt.qtgui.util.tauruswidgetfactory import TaurusWidgetFactory
+
+
+class TaurusWidgetFactoryTestCase(unittest.TestCase):
+    """Test cases for the widget catalogue of the TaurusWidgetFactory"""
+
+    def setUp(self):
+        if Qt.QApplication.instance() is None:
+            self._app = Qt.QApplication([])
+        self.factory = TaurusWidgetFactory()
+        self.tmpdir = tempfile.mkdtemp()
+        self._get_catalogue_filename = \
+            tauruswidgetfactory._get_catalogue_filename
+        filename = os.path.join(self.tmpdir, 'catalogue.json')
+        tauruswidgetfactory._get_catalogue_filename = lambda: filename
+
+    def tearDown(self):
+        tauruswidgetfactory._get_catalogue_filename = \
+            self._get_catalogue_filename
+        shutil.rmtree(self.tmpdir)
+
+    def test_names(self):
+        """Check the names of the widgets in the catalogue"""
+        names = self.factory.getWidgetClassNames()
+        taurus_names = self.factory.getTaurusWidgetClassNames()
+        self.assertTrue('TaurusLabel' in names)
+        self.assertTrue('TaurusLabel' in taurus_names)
+        self.assertTrue('QLed' in names)
+        self.assertFalse('QLed' in taurus_names)
+        self.assertTrue(self.factory.isTaurusWidget('TaurusForm'))
+        self.assertFalse(self.factory.isTaurusWidget('QLed'))
+
+    def test_getWidgetClass(self):
+        """Check that the classes are imported when requested"""
+        from taurus.qt.qtgui.display import TaurusLabel, QLed
+        self.assertTrue(self.factory.getWidgetClass('TaurusLabel') is
+                        TaurusLabel)
+        self.assertTrue(self.factory.getTaurusWidgetClass('TaurusLabel') is
+                        TaurusLabel)
+        self.assertTrue(self.factory.getWidgetClass('QLed') is QLed)
+        self.assertRaises(KeyError, self.factory.getTaurusWidgetClass,
+                          'QLed')
+        self.assertRaises(KeyError, self.factory.getWidgetClass,
+                          'NotAWidget')
+
+    def test_cache(self):
+        """Check that the cached catalogue is only used with the same key"""
+        key = self.factory._getSourcesKey()
+        self.assertEqual(key, self.factory._getSourcesKey())
+        self.assertEqual(self.factory._readCatalogue(key), None)
+        self.factory._writeCatalogue(key, self.factory._catalogue)
+        self.assertEqual(self.factory._readCatalogue(key),
+                         self.factory._catalogue)
+        self.assertEqual(self.factory._readCatalogue('other key'), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -50,6 +50,17 @@ T_FORM_CUSTOM_WIDGET_MAP = \
 # True sets the preferred mode of TaurusForms to use "compact" widgets
 T_FORM_COMPACT = False
 
+# Progressive construction of forms
+# True makes TaurusForms with many items create them in small chunks (the
+# visible ones first) while the taurus model objects are created in background
+T_FORM_PROGRESSIVE = True
+
+# Deferred creation of TaurusGui panels
+# True makes TaurusGui create the widgets of the panels declared in its
+# configuration when each panel is first shown (it can be overridden with the
+# DEFERRED_PANELS option of the configuration file)
+T_GUI_DEFERRED_PANELS = True
+
 # Strict RFC3986 URI names in models
 # True makes Taurus only use the strict URI names
 # False enables a backwards-compatibility mode for pre-sep3 model names
@@ -61,6 +72,11 @@ STRICT_MODEL_NAMES = False
 # False (or commented out) for backwards compatibility
 LIGHTWEIGHT_IMPORTS = False
 
+# Lazy imports:
+# True makes the taurus packages import their submodules only when one of
+# their names is first used. False imports all of them with the package
+LAZY_IMPORTS = True
+
 # Set your default scheme (if not defined, "tango" is assumed)
 DEFAULT_SCHEME = "tango"
 
@@ -68,6 +84,10 @@ DEFAULT_SCHEME = "tango"
 # providing support to new schemes
 # EXTRA_SCHEME_MODULES = ['myownschememodule']
 
+# Extra Taurus schemes whose factory is only imported when the scheme is
+# first used: a dict of scheme -> "<factory module>:<factory class>"
+# EXTRA_SCHEME_PLUGINS = {'myscheme': 'myownschememodule:MySchemeFactory'}
+
 # ----------------------------------------------------------------------------
 # PLY (lex/yacc) optimization: 1=Active (default) , 0=disabled.
 # Set PLY_OPTIMIZE = 0 if you are getting yacc exceptions while loading
@@ -76,6 +96,60 @@ DEFAULT_SCHEME = "tango"
 
 PLY_OPTIMIZE = 1
 
+# ----------------------------------------------------------------------------
+# JDraw parse cache: True=Active (default), False=disabled.
+# When active, the parsed jdraw files are cached in ~/.taurus/jdraw_cache so
+# that synoptics open faster the next time (while the file is not modified)
+# ----------------------------------------------------------------------------
+
+JDRAW_PARSE_CACHE = True
+
+# ----------------------------------------------------------------------------
+# Widget catalogue cache: True=Active (default), False=disabled.
+# When active, the list of widgets found by the TaurusWidgetFactory is cached
+# in ~/.taurus/widget_catalogue.json and reused while the widget modules are
+# not modified, so that their modules are only imported when needed
+# ----------------------------------------------------------------------------
+
+WIDGET_CATALOGUE_CACHE = True
+
+# ----------------------------------------------------------------------------
+# Pickles in configurations: True=Allowed (default), False=disabled.
+# The configurations of the widgets (settings, perspectives and configuration
+# files) are stored in a binary format which only uses pickle for values of
+# unsupported types. Set it to False for rejecting those values as well as the
+# configurations pickled by older versions of Taurus
+# ----------------------------------------------------------------------------
+
+CONFIG_ALLOW_PICKLE = True
+
+# ----------------------------------------------------------------------------
+# Asynchronous log handlers: True=Active (default), False=disabled.
+# When active, the log file of the Taurus applications is written from a
+# background thread, so that logging never blocks the threads which log
+# ----------------------------------------------------------------------------
+
+ASYNC_LOG_HANDLERS = True
+
+# ----------------------------------------------------------------------------
+# Pickles in remote logging: True=Allowed (default), False=disabled.
+# The remote log monitor (taurusremotelogmonitor) accepts both the records in
+# the compact format of taurus.core.util.remotelogmonitor.CompactSocketHandler
+# and the ones pickled by the standard logging.handlers.SocketHandler. Set it
+# to False for rejecting the pickled records
+# ----------------------------------------------------------------------------
+
+REMOTE_LOG_ALLOW_PICKLE = True
+
+# ----------------------------------------------------------------------------
+# Pixmap cache limit (in KB).
+# Memory used by the pixmaps (icons, leds...) shared by the taurus widgets.
+# When exceeded, the least recently used pixmaps are discarded (see
+# taurus.qt.qtgui.icon.getPixmapCache)
+# ----------------------------------------------------------------------------
+
+PIXMAP_CACHE_LIMIT = 10240
+
 # ----------------------------------------------------------------------------
 # Taurus namespace
 # ----------------------------------------------------------------------------
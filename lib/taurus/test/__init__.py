@@ -41,6 +41,10 @@ should be used for integration and system tests as well.
 The taurus.test.testsuite module provides an autodiscovered suite for all
 tests implemented in Taurus.
 
+The taurus.test.bench package provides a suite of benchmarks of the hot paths
+of Taurus (run it with the taurusbenchmark script), whose JSON reports can be
+compared for detecting performance regressions.
+
 The following are some key points to keep in mind when using this framework:
 
 - The Taurus test framework is based on :mod:`unittest` which should be imported
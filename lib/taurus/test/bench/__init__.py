@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""
+Benchmark suite of the hot paths of taurus. The benchmarks only use the
+``eval`` and ``res`` schemes (and mock objects where a control system would
+be needed), so that they can be run anywhere and their results compared
+across commits.
+
+Run it with::
+
+    taurusbenchmark [-k PATTERN] [--quick] [--json FILE] [--compare FILE]
+
+New benchmarks are functions decorated with :func:`benchmark` in one of the
+modules listed in :obj:`BENCHMARK_MODULES`.
+"""
+
+from .base import *
+from .runner import *
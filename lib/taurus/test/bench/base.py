@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""This module provides the registry of the benchmarks and the utilities for
+writing them"""
+
+__all__ = ['SkipBenchmark', 'BENCHMARK_MODULES', 'benchmark', 'measure',
+           'getBenchmarks']
+
+__docformat__ = 'restructuredtext'
+
+import re
+import timeit
+import importlib
+import collections
+
+#: the modules which define the benchmarks of the suite
+BENCHMARK_MODULES = ['taurus.test.bench.bench_core',
+                     'taurus.test.bench.bench_tango',
+                     'taurus.test.bench.bench_qt']
+
+_BENCHMARKS = collections.OrderedDict()
+
+Benchmark = collections.namedtuple('Benchmark', 'name func number unit')
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark which cannot be run (e.g. because an optional
+    dependency is not installed)"""
+    pass
+
+
+def benchmark(name, number=1000, unit='op'):
+    '''Decorator which registers a benchmark function. The function receives
+    the number of operations to perform and returns the time (in seconds)
+    per operation (see :func:`measure`)::
+
+        @benchmark('core.attribute.read', number=10000)
+        def bench_read(number):
+            attr = taurus.Attribute('eval:1')
+            return measure(attr.read, number)
+
+    :param name: (str) the benchmark name (dot separated, group first)
+    :param number: (int) the default number of operations
+    :param unit: (str) the description of an operation (for the reports)
+    '''
+    def decorator(func):
+        _BENCHMARKS[name] = Benchmark(name, func, number, unit)
+        return func
+    return decorator
+
+
+def measure(func, number, repeat=3, setup=None):
+    '''Returns the best time (in seconds) per call of the given callable in
+    the given number of repetitions of number calls
+
+    :param func: (callable) the callable (without arguments) to measure
+    :param number: (int) the number of calls of each repetition
+    :param repeat: (int) the number of repetitions
+    :param setup: (callable) if given, it is called before each repetition
+
+    :return: (float) seconds per call
+    '''
+    timer = timeit.Timer(func, setup=setup or 'pass')
+    return min(timer.repeat(repeat, number)) / number
+
+
+def getBenchmarks(pattern=None):
+    '''Returns the registered benchmarks (importing the
+    :obj:`BENCHMARK_MODULES` first)
+
+    :param pattern: (str) if given, only the benchmarks whose name matches
+                    this regular expression (:func:`re.search`) are returned
+
+    :return: (list<Benchmark>) the benchmarks in the order of definition
+    '''
+    for module_name in BENCHMARK_MODULES:
+        importlib.import_module(module_name)
+    benchmarks = _BENCHMARKS.values()
+    if pattern is not None:
+        benchmarks = [b for b in benchmarks if re.search(pattern, b.name)]
+    return benchmarks
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Benchmarks of the taurus core: model creation, name validation, events,
+evaluation, polling, buffers and codecs"""
+
+__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import itertools
+
+import numpy
+
+from .base import benchmark, measure
+
+#: number of listeners of the event fan-out benchmark
+LISTENERS = 100
+
+#: number of attributes of the polling timer benchmark
+POLLED_ATTRIBUTES = 100
+
+_counter = itertools.count()
+
+
+class _Listener(object):
+    '''a listener which counts the events it receives'''
+
+    def __init__(self):
+        self.count = 0
+
+    def eventReceived(self, evt_src, evt_type, evt_value):
+        self.count += 1
+
+
+@benchmark('core.attribute.create.eval', number=1000)
+def bench_create_eval(number):
+    '''creation of new eval attributes'''
+    import taurus
+    names = ['eval:%d+1' % i for i in itertools.islice(_counter, 3 * number)]
+    it = iter(names)
+    return measure(lambda: taurus.Attribute(next(it)), number)
+
+
+@benchmark('core.attribute.create.res', number=1000)
+def bench_create_res(number):
+    '''creation of new attributes through resource names'''
+    import taurus
+    ids = list(itertools.islice(_counter, 3 * number))
+    resource = dict(('bench_%d' % i, 'eval:%d*2' % i) for i in ids)
+    taurus.Factory('res').reloadResource(obj=resource, name='bench')
+    it = iter(ids)
+    return measure(lambda: taurus.Attribute('res:bench_%d' % next(it)),
+                   number)
+
+
+@benchmark('core.attribute.get', number=10000)
+def bench_get_attribute(number):
+    '''retrieval of an existing attribute'''
+    import taurus
+    taurus.Attribute('eval:1')
+    return measure(lambda: taurus.Attribute('eval:1'), number)
+
+
+@benchmark('core.validator.eval', number=10000)
+def bench_validate_eval(number):
+    '''validation and splitting of eval attribute names'''
+    import taurus
+    validator = taurus.Factory('eval').getAttributeNameValidator()
+    names = itertools.cycle(['eval:1', 'eval:a=2;a*rand(3)',
+                             'eval://localhost/@DefaultEvaluator/x+1',
+                             'eval:{eval:1}+{eval:2}', 'eval:Q("1mm")'])
+    return measure(lambda: validator.getNames(next(names)), number)
+
+
+@benchmark('core.event.fanout', number=1000, unit='event to %d listeners'
+           % LISTENERS)
+def bench_event_fanout(number):
+    '''delivery of a change event to many listeners'''
+    import taurus
+    from taurus.core.taurusbasetypes import TaurusEventType
+    attr = taurus.Attribute('eval:%d' % next(_counter))
+    # only measure the delivery of the events (not the polling)
+    attr.disablePolling()
+    listeners = [_Listener() for _ in range(LISTENERS)]
+    for listener in listeners:
+        attr.addListener(listener)
+    value = attr.read()
+    try:
+        return measure(lambda: attr.fireEvent(TaurusEventType.Change, value),
+                       number)
+    finally:
+        for listener in listeners:
+            attr.removeListener(listener)
+
+
+@benchmark('core.eval.read', number=1000)
+def bench_eval_read(number):
+    '''evaluation of an expression (without cache)'''
+    import taurus
+    attr = taurus.Attribute('eval:x=%d;y=linspace(0,x,100);sum(sin(y)*x)'
+                            % (next(_counter) + 2))
+    return measure(lambda: attr.read(cache=False), number)
+
+
+@benchmark('core.pollingtimer.poll', number=100, unit='poll of %d attributes'
+           % POLLED_ATTRIBUTES)
+def bench_polling_timer(number):
+    '''polling of many attributes by a TaurusPollingTimer'''
+    import taurus
+    from taurus.core.tauruspollingtimer import TaurusPollingTimer
+    timer = TaurusPollingTimer(3600000)
+    attrs = [taurus.Attribute('eval:%d' % next(_counter))
+             for _ in range(POLLED_ATTRIBUTES)]
+    for attr in attrs:
+        timer.addAttribute(attr, auto_start=False)
+    try:
+        return measure(timer._pollAttributes, number)
+    finally:
+        for attr in attrs:
+            timer.removeAttribute(attr)
+
+
+@benchmark('core.arraybuffer.append', number=100000)
+def bench_arraybuffer_append(number):
+    '''append to a full (rolling) ArrayBuffer'''
+    from taurus.core.util.containers import ArrayBuffer
+    buf = ArrayBuffer(numpy.zeros(1000), maxSize=1000)
+    buf.extend(numpy.arange(1000.))
+    return measure(lambda: buf.append(1.), number)
+
+
+@benchmark('core.arraybuffer.extend', number=10000, unit='extend of 100')
+def bench_arraybuffer_extend(number):
+    '''extend of a full (rolling) ArrayBuffer'''
+    from taurus.core.util.containers import ArrayBuffer
+    buf = ArrayBuffer(numpy.zeros(1000), maxSize=1000)
+    buf.extend(numpy.arange(1000.))
+    chunk = numpy.arange(100.)
+    return measure(lambda: buf.extend(chunk), number)
+
+
+def _bench_decode(fmt, number):
+    from taurus.core.util.codecs import CodecFactory
+    factory = CodecFactory()
+    data = dict(name='sys/tg_test/1/double_scalar', value=range(100),
+                quality='ATTR_VALID', time=1234567890.123, units='mm')
+    encoded = factory.encode(fmt, ('', data))
+    return measure(lambda: factory.decode(encoded), number)
+
+
+@benchmark('core.codec.decode.json', number=10000)
+def bench_decode_json(number):
+    '''decoding of a json encoded dict'''
+    return _bench_decode('json', number)
+
+
+@benchmark('core.codec.decode.zip_json', number=10000)
+def bench_decode_zip_json(number):
+    '''decoding of a compressed json encoded dict'''
+    return _bench_decode('zip_json', number)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Benchmarks of the update of taurus widgets, which are rendered offscreen
+(on a pixmap). They are skipped if Qt is not available"""
+
+__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import os
+import sys
+
+from .base import SkipBenchmark, benchmark, measure
+
+_APP = None
+
+
+def _getApplication():
+    global _APP
+    if sys.platform.startswith('linux') and not os.environ.get('DISPLAY'):
+        # only effective for Qt5 (and before Qt is imported)
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    try:
+        from taurus.external.qt import Qt
+    except ImportError, e:
+        raise SkipBenchmark('Qt is not available: %s' % e)
+    _APP = Qt.QApplication.instance()
+    if _APP is None:
+        _APP = Qt.QApplication([])
+    return Qt
+
+
+def _bench_update(class_name, model, number):
+    import taurus
+    from taurus.core.taurusbasetypes import TaurusEventType
+    Qt = _getApplication()
+    from taurus.qt.qtgui import display
+    widget = getattr(display, class_name)()
+    widget.setModel(model)
+    widget.resize(100, 24)
+    pixmap = Qt.QPixmap(widget.size())
+    attr = taurus.Attribute(model)
+    value = attr.read()
+
+    def update():
+        widget.handleEvent(attr, TaurusEventType.Change, value)
+        widget.render(pixmap)
+
+    try:
+        return measure(update, number)
+    finally:
+        widget.setModel(None)
+
+
+@benchmark('qt.widget.update.label', number=1000)
+def bench_update_label(number):
+    '''update and rendering of a TaurusLabel'''
+    return _bench_update('TaurusLabel', 'eval:1.234', number)
+
+
+@benchmark('qt.widget.update.led', number=1000)
+def bench_update_led(number):
+    '''update and rendering of a TaurusLed'''
+    return _bench_update('TaurusLed', 'eval:True', number)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Benchmarks of the decoding of the values read from Tango. They use mock
+PyTango.DeviceAttribute objects (so no device server is needed), but they
+are skipped if PyTango is not installed"""
+
+__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import time
+
+import numpy
+
+from .base import SkipBenchmark, benchmark, measure
+
+
+class _MockAttribute(object):
+    '''the attributes of a TangoAttribute used by TangoAttrValue'''
+
+    def __init__(self, tango_data_type, data_format, data_type):
+        from taurus.external.pint import UR
+        self._tango_data_type = tango_data_type
+        self.data_format = data_format
+        self.type = data_type
+        self._units = UR.mm
+
+
+class _MockDeviceAttribute(object):
+    '''a PyTango.DeviceAttribute as read from a device'''
+
+    has_failed = False
+    is_empty = False
+
+    def __init__(self, value, tango_data_type):
+        import PyTango
+        self.value = value
+        self.w_value = value
+        self.type = tango_data_type
+        self.time = PyTango.TimeVal.fromtimestamp(time.time())
+        self.quality = PyTango.AttrQuality.ATTR_VALID
+
+
+def _bench_decode(value, data_format, number):
+    try:
+        import PyTango
+    except ImportError:
+        raise SkipBenchmark('PyTango is not installed')
+    from taurus.core.taurusbasetypes import DataType
+    from taurus.core.tango.tangoattribute import TangoAttrValue
+    tango_type = PyTango.CmdArgType.DevDouble
+    attr = _MockAttribute(tango_type, data_format, DataType.Float)
+    dev_attr = _MockDeviceAttribute(value, tango_type)
+    return measure(lambda: TangoAttrValue(attr=attr,
+                                          pytango_dev_attr=dev_attr),
+                   number)
+
+
+@benchmark('tango.attrvalue.decode.scalar', number=10000)
+def bench_decode_scalar(number):
+    '''decoding of a double scalar DeviceAttribute'''
+    from taurus.core.taurusbasetypes import DataFormat
+    return _bench_decode(1.5, DataFormat._0D, number)
+
+
+@benchmark('tango.attrvalue.decode.spectrum', number=10000)
+def bench_decode_spectrum(number):
+    '''decoding of a double spectrum (1000 elements) DeviceAttribute'''
+    from taurus.core.taurusbasetypes import DataFormat
+    return _bench_decode(numpy.arange(1000.), DataFormat._1D, number)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""This module runs the benchmarks and reports (and compares) their results"""
+
+__all__ = ['runBenchmarks', 'compareResults', 'main']
+
+__docformat__ = 'restructuredtext'
+
+import os
+import sys
+import json
+import time
+import platform
+import subprocess
+
+from .base import SkipBenchmark, getBenchmarks
+
+
+def _getCommit():
+    """returns the git commit of the taurus sources (or None)"""
+    import taurus
+    try:
+        cmd = ['git', 'rev-parse', 'HEAD']
+        out = subprocess.check_output(cmd, stderr=subprocess.STDOUT,
+                                      cwd=os.path.dirname(taurus.__file__))
+        return out.strip()
+    except Exception:
+        return None
+
+
+def runBenchmarks(pattern=None, quick=False, stream=None):
+    '''Runs the benchmarks and returns a report with their results. The
+    polling of the eval attributes is disabled (its threads would disturb
+    the measurements)
+
+    :param pattern: (str) regular expression selecting the benchmarks to run
+    :param quick: (bool) if True, each benchmark performs 10 times fewer
+                  operations (less accurate, for smoke tests)
+    :param stream: (file) if given, the results are written on it as they
+                   are obtained
+
+    :return: (dict) the report: a dict with the taurus version, the commit,
+             the python version, the platform, the date and the list of
+             results, each one a dict with the name, the number of operations,
+             the seconds and operations per second, the unit and the status
+             ('ok', 'skipped' or 'error') of a benchmark
+    '''
+    import taurus
+    from taurus import Release
+    taurus.disableLogOutput()
+    taurus.Factory('eval').disablePolling()
+    results = []
+    for bench in getBenchmarks(pattern):
+        number = max(1, bench.number // 10) if quick else bench.number
+        result = dict(name=bench.name, number=number, unit=bench.unit,
+                      status='ok', seconds=None, ops_per_second=None)
+        try:
+            seconds = bench.func(number)
+            result['seconds'] = seconds
+            result['ops_per_second'] = 1. / seconds if seconds else None
+        except SkipBenchmark, e:
+            result.update(status='skipped', message=str(e))
+        except Exception, e:
+            result.update(status='error', message=repr(e))
+        results.append(result)
+        if stream is not None:
+            stream.write(_formatResult(result) + '\n')
+            stream.flush()
+    return dict(taurus_version=Release.version, commit=_getCommit(),
+                python=platform.python_version(),
+                platform=platform.platform(),
+                date=time.strftime('%Y-%m-%dT%H:%M:%S'),
+                quick=quick, results=results)
+
+
+def compareResults(report, baseline, tolerance=0.2):
+    '''Compares the results of two reports
+
+    :param report: (dict) the report (see :func:`runBenchmarks`)
+    :param baseline: (dict) the report to compare with
+    :param tolerance: (float) relative slowdown above which a result is
+                      considered a regression
+
+    :return: (list<tuple<str,float,bool>>) the name, the ratio of the times
+             (report/baseline) and whether it is a regression for each
+             benchmark with results in both reports
+    '''
+    base = dict((r['name'], r['seconds']) for r in baseline['results']
+                if r.get('status') == 'ok' and r.get('seconds'))
+    comparison = []
+    for r in report['results']:
+        if r['status'] != 'ok' or r['name'] not in base:
+            continue
+        ratio = r['seconds'] / base[r['name']]
+        comparison.append((r['name'], ratio, ratio > 1 + tolerance))
+    return comparison
+
+
+def _formatResult(result):
+    if result['status'] != 'ok':
+        return '%-40s %s (%s)' % (result['name'], result['status'],
+                                  result['message'])
+    return '%-40s %14.3f %14.0f  %s' % (result['name'],
+                                        result['seconds'] * 1e6,
+                                        result['ops_per_second'],
+                                        result['unit'])
+
+
+def main():
+    from taurus.external import argparse
+    parser = argparse.ArgumentParser(
+        description='Benchmark suite of the hot paths of taurus')
+    parser.add_argument('-k', dest='pattern', default=None,
+                        help='regexp selecting the benchmarks to run')
+    parser.add_argument('-q', '--quick', action='store_true', default=False,
+                        help='run 10 times fewer operations')
+    parser.add_argument('-l', '--list', action='store_true', default=False,
+                        help='list the benchmarks and exit')
+    parser.add_argument('--json', dest='json', default=None,
+                        help='write the report as JSON in this file '
+                             '("-" for the standard output)')
+    parser.add_argument('--compare', dest='compare', default=None,
+                        help='compare with the JSON report in this file '
+                             '(the exit code is 1 if there are regressions)')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='relative slowdown considered a regression '
+                             '[default: 0.2]')
+    args = parser.parse_args()
+
+    if args.list:
+        for bench in getBenchmarks(args.pattern):
+            print bench.name
+        sys.exit(0)
+
+    stream = None if args.json == '-' else sys.stdout
+    if stream is not None:
+        stream.write('%-40s %14s %14s\n' % ('benchmark', 'us/op', 'op/s'))
+    report = runBenchmarks(args.pattern, quick=args.quick, stream=stream)
+
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+    elif args.json is not None:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    exit_code = 0
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        out = sys.stderr if args.json == '-' else sys.stdout
+        out.write('\ncompared with %s (%s)\n' % (args.compare,
+                                                 baseline.get('commit')))
+        for name, ratio, regression in compareResults(report, baseline,
+                                                      args.tolerance):
+            out.write('%-40s %8.2fx%s\n' % (name, ratio,
+                                            '  REGRESSION' if regression
+                                            else ''))
+            if regression:
+                exit_code = 1
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
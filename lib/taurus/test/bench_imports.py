@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Benchmark of the import time of the taurus packages. Each package is
+imported in a fresh interpreter and a report similar to the one of
+``python -X importtime`` (not available in python 2) is printed: the time
+spent importing each module, by itself and including the modules it imports.
+
+Run it with::
+
+    python -m taurus.test.bench_imports [-n N] [package ...]
+"""
+
+__all__ = ['import_times', 'loaded_modules', 'main']
+
+__docformat__ = 'restructuredtext'
+
+import sys
+import subprocess
+
+#: code run in the child interpreter. It wraps the __import__ builtin and
+#: reports the modules created by each call, with the same format as
+#: "python -X importtime"
+_HOOK = r'''
+import sys, time, __builtin__
+
+_import = __builtin__.__import__
+_stack = []
+
+
+def _loaded():
+    return set(k for k, v in sys.modules.items() if v is not None)
+
+
+def _timed_import(*args, **kwargs):
+    before = _loaded()
+    _stack.append([0., set()])
+    t0 = time.time()
+    try:
+        return _import(*args, **kwargs)
+    finally:
+        elapsed = time.time() - t0
+        nested, nested_modules = _stack.pop()
+        new = _loaded() - before
+        if _stack:
+            _stack[-1][0] += elapsed
+            _stack[-1][1].update(new)
+        for name in sorted(new - nested_modules, key=len)[:1]:
+            sys.stderr.write('import time: %9i | %10i | %s%s\n' %
+                             ((elapsed - nested) * 1e6, elapsed * 1e6,
+                              '  ' * len(_stack), name))
+
+__builtin__.__import__ = _timed_import
+'''
+
+_REPORT_LOADED = r'''
+sys.stderr.write(''.join('loaded module: %s\n' % m for m in _loaded()))
+'''
+
+
+def _run(package, python=None):
+    """imports package in a new interpreter and returns the list of
+    (self, cumulative, depth, name) records and the loaded module names"""
+    code = _HOOK + 'import %s\n' % package + _REPORT_LOADED
+    cmd = [python or sys.executable, '-c', code]
+    p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    _, err = p.communicate()
+    if p.returncode:
+        raise ImportError('cannot import %s:\n%s' % (package, err))
+    times, modules = [], set()
+    for line in err.splitlines():
+        if line.startswith('import time:'):
+            own, cumulative, name = line[12:].split('|')
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            times.append((int(own) * 1e-6, int(cumulative) * 1e-6, depth,
+                          name.strip()))
+        elif line.startswith('loaded module:'):
+            modules.add(line[14:].strip())
+    return times, modules
+
+
+def import_times(package, python=None):
+    '''Imports a package in a new interpreter and returns the time spent in
+    the import of each module.
+
+    :param package: (str) name of the package (or module) to import
+    :param python: (str) python executable (default: the current one)
+
+    :return: (list<tuple>) list of (self seconds, cumulative seconds, depth,
+             module name) tuples, in the order in which the imports finished
+    '''
+    return _run(package, python=python)[0]
+
+
+def loaded_modules(package, python=None):
+    '''Returns the names of the modules loaded by importing a package in a
+    new interpreter
+
+    :param package: (str) name of the package (or module) to import
+    :param python: (str) python executable (default: the current one)
+
+    :return: (set<str>) names of the modules
+    '''
+    return _run(package, python=python)[1]
+
+
+def main():
+    import optparse
+    parser = optparse.OptionParser(usage='%prog [-n N] [package ...]')
+    parser.add_option('-n', '--top', type='int', default=15,
+                      help='number of slowest modules shown per package')
+    parser.add_option('-a', '--all', action='store_true', default=False,
+                      help='print the full importtime-like report')
+    options, packages = parser.parse_args()
+    packages = packages or ['taurus', 'taurus.core', 'taurus.core.util']
+    for package in packages:
+        times, modules = _run(package)
+        total = sum(r[1] for r in times if r[2] == 0)
+        taurus_modules = [m for m in modules if m.startswith('taurus')]
+        print '%s: %.1f ms, %i modules loaded (%i from taurus)' % (
+            package, total * 1e3, len(modules), len(taurus_modules))
+        if options.all:
+            print 'import time: self [us] | cumulative | imported package'
+            for own, cumulative, depth, name in times:
+                print 'import time: %9i | %10i | %s%s' % (
+                    own * 1e6, cumulative * 1e6, '  ' * depth, name)
+        else:
+            print '  %10s %10s  %s' % ('self(ms)', 'cumul(ms)', 'module')
+            slowest = sorted(times, reverse=True)[:options.top]
+            for own, cumulative, depth, name in slowest:
+                print '  %10.2f %10.2f  %s' % (own * 1e3, cumulative * 1e3,
+                                               name)
+        print
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for taurus.test.bench"""
+
+import taurus
+from taurus.external import unittest
+from taurus.test.bench import (SkipBenchmark, benchmark, measure,
+                               getBenchmarks, runBenchmarks, compareResults)
+from taurus.test.bench.base import _BENCHMARKS
+
+
+class BenchmarkSuiteTestCase(unittest.TestCase):
+    """Test cases for the benchmark suite"""
+
+    def setUp(self):
+        self._polling = taurus.Factory('eval').isPollingEnabled()
+
+    def tearDown(self):
+        if self._polling:
+            taurus.Factory('eval').enablePolling()
+
+    def test_registry(self):
+        """Check that the benchmarks are registered and selected"""
+        names = [b.name for b in getBenchmarks()]
+        for name in ('core.attribute.create.eval', 'core.event.fanout',
+                     'tango.attrvalue.decode.scalar',
+                     'qt.widget.update.label'):
+            self.assertTrue(name in names, name)
+        self.assertEqual([b.name for b in getBenchmarks('^core.codec')],
+                         ['core.codec.decode.json',
+                          'core.codec.decode.zip_json'])
+
+    def test_run(self):
+        """Check the report of a run"""
+
+        @benchmark('test.bench.skipped')
+        def skipped(number):
+            raise SkipBenchmark('skipped')
+
+        @benchmark('test.bench.failed')
+        def failed(number):
+            raise RuntimeError('failed')
+
+        @benchmark('test.bench.ok', number=100)
+        def ok(number):
+            return measure(lambda: None, number)
+
+        try:
+            report = runBenchmarks('^test\.bench\.', quick=True)
+        finally:
+            for name in ('skipped', 'failed', 'ok'):
+                _BENCHMARKS.pop('test.bench.' + name)
+        for key in ('taurus_version', 'python', 'platform', 'date'):
+            self.assertTrue(report[key])
+        results = dict((r['name'], r) for r in report['results'])
+        self.assertEqual(results['test.bench.skipped']['status'], 'skipped')
+        self.assertEqual(results['test.bench.failed']['status'], 'error')
+        self.assertEqual(results['test.bench.ok']['status'], 'ok')
+        self.assertEqual(results['test.bench.ok']['number'], 10)
+        self.assertTrue(results['test.bench.ok']['seconds'] > 0)
+
+    def test_core(self):
+        """Check that the core benchmarks run"""
+        report = runBenchmarks('^core\.(arraybuffer|codec)', quick=True)
+        self.assertEqual(len(report['results']), 4)
+        for result in report['results']:
+            self.assertEqual(result['status'], 'ok', result)
+
+    def test_compare(self):
+        """Check the detection of regressions"""
+        def report(**seconds):
+            return dict(results=[dict(name=k, seconds=v, status='ok')
+                                 for k, v in sorted(seconds.items())])
+        comparison = compareResults(report(a=1.1, b=2., c=1.),
+                                    report(a=1., b=1., d=1.))
+        self.assertEqual([(n, r > 1.5, reg) for n, r, reg in comparison],
+                         [('a', False, False), ('b', True, True)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -79,6 +79,7 @@ extras_require = {
 
 console_scripts = [
     'taurustestsuite = taurus.test.testsuite:main',
+    'taurusbenchmark = taurus.test.bench.runner:main',
     # TODO: taurusdoc,
 ]
 